@@ -2,48 +2,42 @@
 # 최소한의 한글 주석, 구글 스타일 docstring
 
 import math
-from typing import List, Dict
+from typing import List, Dict, Sequence, Union
 
+import numpy as np
 
-def _stdev(data: List[float]) -> float:
+
+def _stdev(data: Union[Sequence[float], np.ndarray]) -> float:
     """
-    표준편차 계산.
+    표본 표준편차 계산.
 
     Args:
-        data (List[float]): 분산 계산 대상 리스트
+        data (Union[Sequence[float], np.ndarray]): 분산 계산 대상 리스트 또는 배열
 
     Returns:
         float: data의 표준편차
     """
     if len(data) < 2:
         return 0.0
-    mean_val = sum(data) / len(data)
-    var = sum((x - mean_val) ** 2 for x in data) / (len(data) - 1)
-    return math.sqrt(var)
+    return float(np.std(np.asarray(data, dtype=np.float64), ddof=1))
 
 
-def _calculate_mdd(equity_curve: List[float]) -> float:
+def _calculate_mdd(equity_curve: Union[Sequence[float], np.ndarray]) -> float:
     """
-    최대 낙폭(MDD) 계산.
+    최대 낙폭(MDD) 계산. (누적 최대값 대비 낙폭, 벡터화)
 
     Args:
-        equity_curve (List[float]): 시점별 누적자산 곡선
+        equity_curve (Union[Sequence[float], np.ndarray]): 시점별 누적자산 곡선
 
     Returns:
         float: MDD 값 (0 ~ 1 범위)
     """
-    if not equity_curve:
+    if len(equity_curve) == 0:
         return 0.0
 
-    peak = equity_curve[0]
-    max_drawdown = 0.0
-    for val in equity_curve:
-        if val > peak:
-            peak = val
-        dd = (peak - val) / peak
-        if dd > max_drawdown:
-            max_drawdown = dd
-    return max_drawdown
+    eq = np.asarray(equity_curve, dtype=np.float64)
+    peak = np.maximum.accumulate(eq)
+    return max(0.0, float(np.max((peak - eq) / peak)))
 
 
 def _infer_bars_per_year(timeframe: str) -> int:
@@ -72,8 +66,8 @@ def _infer_bars_per_year(timeframe: str) -> int:
     return 365  # fallback
 
 def calculate_metrics(
-    equity_curve: List[float],
-    daily_returns: List[float],
+    equity_curve: Union[Sequence[float], np.ndarray],
+    daily_returns: Union[Sequence[float], np.ndarray],
     start_capital: float,
     trades: List[Dict],
     timeframe: str = "1d",
@@ -84,8 +78,8 @@ def calculate_metrics(
     (StartCapital, EndCapital, Return, Trades, Sharpe, MDD)
 
     Args:
-        equity_curve (List[float]): 시점별 누적자산
-        daily_returns (List[float]): 각 시점별 봉단위 수익률
+        equity_curve (Union[Sequence[float], np.ndarray]): 시점별 누적자산 (리스트 또는 배열)
+        daily_returns (Union[Sequence[float], np.ndarray]): 각 시점별 봉단위 수익률
         start_capital (float): 초기자본
         trades (List[Dict]): 체결된 매매내역 (pnl, position_type 등)
         timeframe (str, optional): 봉 주기 ("1d", "4h" 등). Sharpe 연환산에 사용
@@ -101,13 +95,13 @@ def calculate_metrics(
             "MDD": ...,
         }
     """
-    if not equity_curve or len(equity_curve) != len(daily_returns):
+    if len(equity_curve) == 0 or len(equity_curve) != len(daily_returns):
         raise ValueError("equity_curve와 daily_returns 길이가 일치해야 합니다.")
     if len(equity_curve) < 2:
         raise ValueError("백테스트 데이터가 최소 2개 이상 필요합니다.")
 
     # 최종 자본, 총 수익률
-    end_capital = equity_curve[-1]
+    end_capital = float(equity_curve[-1])
     total_return = (end_capital / start_capital) - 1.0
 
     # 전체 트레이드 수
@@ -115,7 +109,7 @@ def calculate_metrics(
 
     # Sharpe Ratio
     bars_per_year = _infer_bars_per_year(timeframe)
-    avg_ret = sum(daily_returns) / len(daily_returns)
+    avg_ret = float(np.mean(np.asarray(daily_returns, dtype=np.float64)))
     std_ret = _stdev(daily_returns)
     rfr_per_bar = risk_free_rate_annual / bars_per_year
     if std_ret > 1e-12:
@@ -0,0 +1,317 @@
+# gptbitcoin/backtest/checkpoint.py
+"""
+중단/재시작 가능한 콤보 스윕을 위한 체크포인트 저장소.
+
+- 콤보 결과 행을 (데이터 지문, 타임프레임, 구간(phase), 엔진 설정, 콤보 키) 단위로 SQLite에 저장한다.
+- 같은 키의 결과가 이미 있으면 다시 계산하지 않는다.
+  (재시작 시 끝난 청크는 건너뛰고, INDICATOR_CONFIG에 파라미터를 추가하면 새 콤보와
+   값이 바뀐 지표를 쓰는 콤보만 계산)
+- 데이터 지문은 구간의 open_time/OHLCV 배열 해시다.
+- 콤보 키는 combo_id가 아니라 콤보 내용 해시(combo_key)와, 그 콤보가 실제로 읽는 지표 칼럼 값의 해시를
+  합친 것이다. 카탈로그 id가 바뀌어도 그대로 쓸 수 있고, 돌려줄 때는 이번 실행의 combo_id를 다시 붙인다.
+  (지표 값은 봉만으로 정해지지 않는다. 더 긴 lookback 파라미터를 추가하면 워밍업 시작점이 앞당겨져
+   EMA/Wilder 계열(MACD, RSI, ADX, PSAR, supertrend 등) 값이 구간 안에서도 바뀌므로, 그런 콤보는
+   다시 계산하고 값이 그대로인 지표만 쓰는 콤보의 결과는 유지한다.)
+- 결과는 항상 콤보 순서대로 돌려준다. (캐시된 행과 새로 계산한 행을 순서대로 섞음)
+"""
+
+import datetime
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from config.config import ALLOW_SHORT, CHECKPOINT_BLOCK_COMBOS
+from config.indicator_config import SIGNAL_COMBINE_METHOD
+from backtest.engine import run_backtest
+from backtest.worker_pool import BacktestWorkerPool
+from backtest.signal_dedup import evaluate_combos
+from indicators.combo_generator_for_backtest import combo_key
+from strategies.signal_factory import compute_indicator_signal
+from utils.bar_frame import BarFrame, BAR_FIELDS
+
+# 한 번에 조회할 콤보 키 수 (SQLite 변수 개수 제한 대비)
+_QUERY_BATCH = 500
+
+
+def frame_fingerprint(frame: BarFrame) -> str:
+    """
+    구간의 open_time/OHLCV 배열로 데이터 지문을 만든다.
+
+    Args:
+        frame (BarFrame): 백테스트 구간
+
+    Returns:
+        str: 32자리 16진수 해시
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(len(frame)).encode("ascii"))
+    for f in BAR_FIELDS:
+        h.update(np.ascontiguousarray(frame[f]).tobytes())
+    return h.hexdigest()
+
+
+class _ColumnRecorder:
+    """compute_indicator_signal이 읽는 칼럼 이름을 기록하는 BarFrame 래퍼."""
+
+    def __init__(self, frame: BarFrame):
+        self.frame = frame
+        self.names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        self.names.append(name)
+        return self.frame[name]
+
+
+class IndicatorDigests:
+    """
+    지표 파라미터 → 그 파라미터가 읽는 칼럼 값의 해시. (구간 1개 기준, 파라미터/칼럼별로 한 번만 계산)
+    """
+
+    def __init__(self, frame: BarFrame):
+        self.frame = frame
+        self._by_param: Dict[str, str] = {}
+        self._by_column: Dict[str, str] = {}
+
+    def _column(self, name: str) -> str:
+        digest = self._by_column.get(name)
+        if digest is None:
+            h = hashlib.blake2b(name.encode("utf-8"), digest_size=16)
+            h.update(np.ascontiguousarray(self.frame[name]).tobytes())
+            digest = h.hexdigest()
+            self._by_column[name] = digest
+        return digest
+
+    def param(self, param: Dict[str, Any]) -> str:
+        """파라미터 1개가 읽는 칼럼들의 값 해시."""
+        raw = json.dumps(param, sort_keys=True, ensure_ascii=False, default=_json_default)
+        digest = self._by_param.get(raw)
+        if digest is None:
+            # 실제 시그널 함수를 한 번 실행해 읽는 칼럼을 기록한다 (칼럼 이름 규칙을 따로 두지 않음)
+            recorder = _ColumnRecorder(self.frame)
+            compute_indicator_signal(recorder, param)
+            digest = "|".join(self._column(name) for name in recorder.names)
+            self._by_param[raw] = digest
+        return digest
+
+    def combo_key(self, combo: List[Dict[str, Any]]) -> str:
+        """체크포인트 저장 키: 콤보 내용 + 콤보가 읽는 지표 칼럼 값."""
+        h = hashlib.blake2b(combo_key(combo).encode("ascii"), digest_size=16)
+        for param in combo:
+            h.update(self.param(param).encode("ascii"))
+        return h.hexdigest()
+
+
+def _engine_settings(kwargs: Dict[str, Any]) -> str:
+    """
+    결과에 영향을 주는 설정(평가 함수 인자, 숏 허용, 시그널 결합, 엔진 기본값)의 해시.
+    """
+    engine_defaults = {
+        name: p.default for name, p in inspect.signature(run_backtest).parameters.items()
+        if p.default is not inspect.Parameter.empty
+    }
+    settings = {
+        "kwargs": {k: v for k, v in kwargs.items() if k != "timeframe"},
+        "allow_short": ALLOW_SHORT,
+        "signal_combine_method": SIGNAL_COMBINE_METHOD,
+        "engine_defaults": engine_defaults
+    }
+    raw = json.dumps(settings, sort_keys=True, default=_json_default)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _json_default(obj: Any) -> Any:
+    """numpy 스칼라를 파이썬 값으로 바꾼다. (json.dumps default)"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"JSON 직렬화 불가: {type(obj)}")
+
+
+class SweepCheckpoint:
+    """
+    콤보 결과 체크포인트 (SQLite).
+
+    사용 예:
+        ckpt = SweepCheckpoint(path)
+        rows = ckpt.map_combos(_evaluate_combo_is, frame, items, phase="is", pool=pool,
+                               timeframe="1d", start_capital=100_000, bh_return=0.1)
+        ckpt.close()
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): SQLite 파일 경로 (없으면 생성)
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS combo_results (
+                fingerprint TEXT NOT NULL,
+                timeframe TEXT NOT NULL,
+                phase TEXT NOT NULL,
+                settings TEXT NOT NULL,
+                combo_key TEXT NOT NULL,
+                row_json TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (fingerprint, timeframe, phase, settings, combo_key)
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # 저장 / 조회
+    # ------------------------------------------------------------------
+    def done_keys(self, ctx: Tuple[str, str, str, str], keys: Sequence[str]) -> Set[str]:
+        """ctx(지문, 타임프레임, phase, 설정)에서 keys 중 이미 저장된 콤보 키 집합."""
+        out: Set[str] = set()
+        for i in range(0, len(keys), _QUERY_BATCH):
+            batch = list(keys[i:i + _QUERY_BATCH])
+            marks = ", ".join(["?"] * len(batch))
+            cur = self._conn.execute(
+                "SELECT combo_key FROM combo_results "
+                "WHERE fingerprint=? AND timeframe=? AND phase=? AND settings=? "
+                f"AND combo_key IN ({marks})", (*ctx, *batch)
+            )
+            out.update(r[0] for r in cur)
+        return out
+
+    def load_rows(self, ctx: Tuple[str, str, str, str], keys: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """콤보 키 목록의 저장된 결과 행. (combo_id는 저장 당시 값이므로 호출 측에서 바꿔 쓴다)"""
+        out: Dict[str, Dict[str, Any]] = {}
+        for i in range(0, len(keys), _QUERY_BATCH):
+            batch = list(keys[i:i + _QUERY_BATCH])
+            marks = ", ".join(["?"] * len(batch))
+            cur = self._conn.execute(
+                "SELECT combo_key, row_json FROM combo_results "
+                "WHERE fingerprint=? AND timeframe=? AND phase=? AND settings=? "
+                f"AND combo_key IN ({marks})", (*ctx, *batch)
+            )
+            for k, row_json in cur:
+                out[k] = json.loads(row_json)
+        return out
+
+    def save_rows(self, ctx: Tuple[str, str, str, str], keyed_rows: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        (콤보 키, 결과 행) 목록을 저장하고 커밋한다. (칼럼 순서 유지를 위해 행 그대로 저장)
+
+        Raises:
+            sqlite3.Error: 저장 실패 (롤백 후 전달)
+        """
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        records = []
+        for k, row in keyed_rows:
+            records.append((*ctx, k, json.dumps(row, ensure_ascii=False, default=_json_default), now))
+        try:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO combo_results "
+                "(fingerprint, timeframe, phase, settings, combo_key, row_json, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", records
+            )
+            self._conn.commit()
+        except sqlite3.Error:
+            # 저장되지 않은 결과를 저장된 것처럼 넘어가지 않도록 롤백 후 그대로 올린다
+            self._conn.rollback()
+            raise
+
+    # ------------------------------------------------------------------
+    # 재시작 가능한 map_combos
+    # ------------------------------------------------------------------
+    def map_combos(
+        self,
+        fn: Callable[..., Dict[str, Any]],
+        frame: BarFrame,
+        items: Sequence[Tuple[int, List[Dict[str, Any]]]],
+        phase: str,
+        pool: Optional[BacktestWorkerPool] = None,
+        on_chunk: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        signal_dedup.evaluate_combos와 같지만, 저장된 콤보는 건너뛰고 새로 계산한 청크는 바로 저장한다.
+
+        Args:
+            fn (Callable): 콤보 1개를 평가하는 함수 (결과 행에 combo_id 포함)
+            frame (BarFrame): 평가 구간
+            items (Sequence[Tuple[int, List[Dict[str, Any]]]]): (combo_id, 콤보) 시퀀스
+                (ComboItems view면 CHECKPOINT_BLOCK_COMBOS개씩 나눠 처리하므로 전체 콤보를 만들지 않음)
+            phase (str): 구간 구분 ("is", "oos", "nosplit" 등)
+            pool (BacktestWorkerPool, optional): 재사용 워커 풀
+            on_chunk (Callable, optional): 주면 결과를 콤보 순서대로 넘기고 모으지 않는다.
+            **kwargs: fn에 넘길 인자 (timeframe 포함, 나머지는 설정 해시에 반영)
+
+        Returns:
+            List[Dict[str, Any]]: 콤보 순서의 결과 리스트 (on_chunk를 주면 빈 리스트)
+        """
+        ctx = (frame_fingerprint(frame), str(kwargs.get("timeframe", "")), phase, _engine_settings(kwargs))
+        digests = IndicatorDigests(frame)
+        out: List[Dict[str, Any]] = []
+        n_cached = 0
+
+        def _emit(rows: List[Dict[str, Any]]) -> None:
+            if not rows:
+                return
+            if on_chunk is not None:
+                on_chunk(rows)
+            else:
+                out.extend(rows)
+
+        # 콤보 공간이 커도 키/대기 목록은 블록 크기만큼만 만든다
+        for b0 in range(0, len(items), CHECKPOINT_BLOCK_COMBOS):
+            block = items[b0:b0 + CHECKPOINT_BLOCK_COMBOS]
+            block_ids = [cid for cid, _ in block]
+            key_of = {cid: digests.combo_key(combo) for cid, combo in block}
+            done = self.done_keys(ctx, list(key_of.values()))
+            pending = [(cid, combo) for cid, combo in block if key_of[cid] not in done]
+            n_cached += len(block) - len(pending)
+            pos = [0]  # block_ids에서 다음에 내보낼 위치
+
+            def _cached_until(stop_cid: Optional[int]) -> List[Dict[str, Any]]:
+                """block_ids[pos:]에서 stop_cid 전까지(없으면 끝까지)의 저장된 행을 읽는다."""
+                start = pos[0]
+                while pos[0] < len(block_ids) and block_ids[pos[0]] != stop_cid:
+                    pos[0] += 1
+                span = block_ids[start:pos[0]]
+                if not span:
+                    return []
+                loaded = self.load_rows(ctx, [key_of[cid] for cid in span])
+                rows = []
+                for cid in span:
+                    row = loaded[key_of[cid]]
+                    row["combo_id"] = cid  # 이번 실행의 id로 교체 (칼럼 위치 유지)
+                    rows.append(row)
+                return rows
+
+            def _on_new_chunk(rows: List[Dict[str, Any]]) -> None:
+                self.save_rows(ctx, [(key_of[r["combo_id"]], r) for r in rows])
+                merged: List[Dict[str, Any]] = []
+                for r in rows:
+                    merged.extend(_cached_until(r["combo_id"]))
+                    merged.append(r)
+                    pos[0] += 1
+                _emit(merged)
+
+            if pending:
+                evaluate_combos(fn, frame, pending, pool=pool, on_chunk=_on_new_chunk, **kwargs)
+            _emit(_cached_until(None))
+
+        print(f"[checkpoint] {phase}({ctx[1]}): 저장된 결과 {n_cached}개 건너뜀, "
+              f"계산 {len(items) - n_cached}개")
+
+        if on_chunk is not None:
+            return []
+        return out
+
+    def close(self) -> None:
+        """연결을 닫는다."""
+        self._conn.close()
@@ -3,12 +3,14 @@
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Sequence, Union
+
+from utils.bar_frame import BarFrame
 
 
 def run_backtest(
-    df: pd.DataFrame,
-    signals: List[int],
+    df: Union[BarFrame, pd.DataFrame],
+    signals: Union[Sequence[int], np.ndarray],
     start_capital: float = 100_000.0,
     allow_short: bool = True,
     leverage: float = 1.0,
@@ -22,8 +24,8 @@ def run_backtest(
     time_delay, holding_period 로직은 제거됨.
 
     Args:
-        df (pd.DataFrame): "close" 칼럼이 포함된 시계열 데이터, signals와 길이가 동일해야 함
-        signals (List[int]): 각 시점의 매매 신호 (-1: 매도, 0: 관망, +1: 매수)
+        df (Union[BarFrame, pd.DataFrame]): "close" 칼럼이 포함된 시계열 데이터, signals와 길이가 동일해야 함
+        signals (Union[Sequence[int], np.ndarray]): 각 시점의 매매 신호 (-1: 매도, 0: 관망, +1: 매수)
         start_capital (float): 초기 자본
         allow_short (bool): 숏 포지션 허용 여부
         leverage (float): 레버리지 배수
@@ -40,7 +42,7 @@ def run_backtest(
     """
     if df.empty:
         raise ValueError("DataFrame이 비어 있습니다.")
-    if "close" not in df.columns:
+    if "close" not in df:
         raise ValueError("DataFrame에 'close' 칼럼이 필요합니다.")
     if len(df) != len(signals):
         raise ValueError("df 길이와 signals 길이가 다릅니다.")
@@ -48,8 +50,8 @@ def run_backtest(
         print("[주의] margin_type은 'ISOLATED'만 가정합니다.")
 
     n = len(df)
-    close_arr = df["close"].values
-    signals_arr = np.array(signals, dtype=int)
+    close_arr = np.asarray(df["close"], dtype=np.float64)
+    signals_arr = np.asarray(signals, dtype=int)
 
     capital = start_capital
     position = 0        # 0: 포지션 없음, 1: 롱, -1: 숏
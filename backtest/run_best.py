@@ -3,12 +3,14 @@
 # 단일 콤보(베스트 콤보) 백테스트 + 바이앤홀드(B/H) 백테스트를 함께 진행하는 모듈.
 # 더 이상 buy_time_delay, sell_time_delay, holding_period는 사용하지 않는다.
 
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
 
 from backtest.engine import run_backtest
 from analysis.scoring import calculate_metrics
-from strategies.signal_factory import create_signals_for_combo
+from strategies.signal_factory import compute_combo_signal
+from utils.bar_frame import BarFrame, as_bar_frame
 from utils.date_time import ms_to_kst_str
 
 
@@ -37,14 +39,14 @@ def _detect_final_position(trades: List[Dict[str, Any]], df_len: int) -> str:
     return "FLAT"
 
 
-def _record_trades_info(df: pd.DataFrame, trades: List[Dict[str, Any]]) -> str:
+def _record_trades_info(open_time: np.ndarray, trades: List[Dict[str, Any]]) -> str:
     """
     트레이드 로그를 문자열로 요약한다.
     - Entry/Exit 시각을 KST 기준으로 변환해 출력
     - 간단히 매매 내역을 확인할 수 있도록 한다.
 
     Args:
-        df (pd.DataFrame): 백테스트에 사용된 DataFrame (open_time 칼럼 포함)
+        open_time (np.ndarray): 백테스트에 사용된 구간의 open_time 배열
         trades (List[Dict[str, Any]]): 매매 내역 (pnl, position_type 등 포함)
 
     Returns:
@@ -60,14 +62,14 @@ def _record_trades_info(df: pd.DataFrame, trades: List[Dict[str, Any]]) -> str:
         ptype = t.get("position_type", "N/A")
         pnl = t.get("pnl", 0.0)
 
-        if isinstance(e_idx, int) and 0 <= e_idx < len(df):
-            ms_val_entry = df.iloc[e_idx]["open_time"]
+        if isinstance(e_idx, int) and 0 <= e_idx < len(open_time):
+            ms_val_entry = open_time[e_idx]
             entry_time_str = ms_to_kst_str(ms_val_entry)
         else:
             entry_time_str = "N/A"
 
-        if isinstance(x_idx, int) and 0 <= x_idx < len(df):
-            ms_val_exit = df.iloc[x_idx]["open_time"]
+        if isinstance(x_idx, int) and 0 <= x_idx < len(open_time):
+            ms_val_exit = open_time[x_idx]
             exit_time_str = ms_to_kst_str(ms_val_exit)
         else:
             exit_time_str = "End"
@@ -80,7 +82,7 @@ def _record_trades_info(df: pd.DataFrame, trades: List[Dict[str, Any]]) -> str:
 
 
 def run_best_single(
-    df: pd.DataFrame,
+    df: Union[BarFrame, pd.DataFrame],
     combo_info: Dict[str, Any]
 ) -> Dict[str, Any]:
     """
@@ -94,7 +96,7 @@ def run_best_single(
     5) 두 결과를 모두 반환
 
     Args:
-        df (pd.DataFrame): 이미 보조지표가 계산된 DF (open_time, close 등 필수)
+        df (Union[BarFrame, pd.DataFrame]): 이미 보조지표가 계산된 데이터 (open_time, close 등 필수)
         combo_info (Dict[str, Any]): {
             "timeframe": str,
             "combo_params": [ {type=..., ...}, {...} ]
@@ -115,13 +117,12 @@ def run_best_single(
     combo_params = combo_info.get("combo_params", [])
     timeframe = combo_info.get("timeframe", "unknown")
 
-    df_combo = df.copy()
-    df_combo = create_signals_for_combo(df_combo, combo_params, out_col="signal_final")
-    combo_signals = df_combo["signal_final"].tolist()
+    frame = as_bar_frame(df)
+    combo_signals = compute_combo_signal(frame, combo_params)
 
     # 2) 콤보 백테스트 (즉시모드)
     combo_engine_out = run_backtest(
-        df=df_combo,
+        df=frame,
         signals=combo_signals,
         allow_short=True
     )
@@ -135,12 +136,12 @@ def run_best_single(
         timeframe=timeframe
     )
 
-    combo_trades_log = _record_trades_info(df_combo, combo_trades)
-    combo_position = _detect_final_position(combo_trades, len(df_combo))
+    combo_trades_log = _record_trades_info(frame.open_time, combo_trades)
+    combo_position = _detect_final_position(combo_trades, len(frame))
 
     # 3) 바이앤홀드(B/H) 백테스트
-    bh_signals = [1] * len(df)
-    bh_engine_out = run_backtest(df, signals=bh_signals)
+    bh_signals = [1] * len(frame)
+    bh_engine_out = run_backtest(frame, signals=bh_signals)
     bh_trades = bh_engine_out["trades"]
 
     bh_score = calculate_metrics(
@@ -150,7 +151,7 @@ def run_best_single(
         trades=bh_trades,
         timeframe=timeframe
     )
-    bh_trades_log = _record_trades_info(df, bh_trades)
+    bh_trades_log = _record_trades_info(frame.open_time, bh_trades)
 
     return {
         "combo_score": combo_score,
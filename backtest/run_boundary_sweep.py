@@ -0,0 +1,199 @@
+# gptbitcoin/backtest/run_boundary_sweep.py
+# 구글 스타일 Docstring, 최소한의 한글 주석
+# IS/OOS 경계 민감도 분석 모듈 (USE_BOUNDARY_SWEEP = True)
+#
+# IS_OOS_BOUNDARY_DATE 하나에 결과가 크게 좌우되는지 보기 위해, 경계 후보 여러 개를 한 번에 평가한다.
+# - 지표는 전체 기간에서 한 번 계산된 BarFrame을 그대로 쓰고,
+#   콤보 시그널도 워커에서 한 번만 만든 뒤 경계마다 [0, 경계) / [경계, 끝)으로 잘라 엔진만 다시 실행한다.
+# - 경계마다 모든 콤보의 IS 점수 순위와 OOS 점수 순위의 Spearman 상관계수,
+#   IS 상위 10%와 OOS 상위 10%의 겹침 비율, IS 최고 콤보의 OOS 순위를 보고한다.
+
+import math
+from typing import List, Dict, Any, Optional, Union, Callable, Tuple, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config.config import START_CAPITAL, BOUNDARY_SWEEP_METRIC
+from backtest.run_walk_forward import backtest_score
+from backtest.worker_pool import BacktestWorkerPool
+from backtest.signal_dedup import evaluate_combos
+from backtest.checkpoint import SweepCheckpoint
+from indicators.combo_generator_for_backtest import as_combo_items
+from strategies.signal_factory import compute_combo_signal
+from utils.bar_frame import BarFrame, as_bar_frame
+from utils.date_time import ms_to_kst_str
+
+# IS/OOS 상위 그룹 겹침 비율에 쓰는 상위 비율
+_TOP_FRACTION = 0.1
+
+
+def _evaluate_combo_splits(
+    frame: BarFrame,
+    combo_item: Tuple[int, List[Dict[str, Any]]],
+    cuts: List[int],
+    timeframe: str,
+    start_capital: float,
+    metric: str
+) -> Dict[str, Any]:
+    """
+    콤보 시그널을 전체 기간에서 한 번 만들고, 경계(행 번호)마다 IS/OOS로 잘라 엔진만 다시 돌린다.
+    (워커 풀에서 실행되므로 모듈 수준 함수)
+
+    Args:
+        frame (BarFrame): 전체 기간
+        combo_item (Tuple[int, List[Dict[str, Any]]]): (combo_id, 콤보)
+        cuts (List[int]): 경계 행 번호 목록 (IS = [0, cut), OOS = [cut, 끝))
+        timeframe (str): 타임프레임
+        start_capital (float): 초기자본
+        metric (str): calculate_metrics 키
+
+    Returns:
+        Dict[str, Any]: {"combo_id", "is_scores", "oos_scores"} (경계 순서)
+    """
+    combo_id, combo = combo_item
+    signals = compute_combo_signal(frame, combo)
+    n = len(frame)
+    is_scores, oos_scores = [], []
+    for cut in cuts:
+        _, is_score = backtest_score(frame.slice(0, cut), signals[:cut], timeframe, start_capital)
+        _, oos_score = backtest_score(frame.slice(cut, n), signals[cut:], timeframe, start_capital)
+        is_scores.append(float(is_score[metric]))
+        oos_scores.append(float(oos_score[metric]))
+    return {"combo_id": combo_id, "is_scores": is_scores, "oos_scores": oos_scores}
+
+
+def _rank_report(ids: np.ndarray, is_vals: np.ndarray, oos_vals: np.ndarray) -> Dict[str, Any]:
+    """
+    경계 1개의 IS/OOS 순위 비교. (둘 다 NaN이 아닌 콤보만)
+
+    Returns:
+        Dict[str, Any]: n_combos, spearman_is_oos, top_overlap, best_is 콤보 정보
+    """
+    valid = ~(np.isnan(is_vals) | np.isnan(oos_vals))
+    ids, is_vals, oos_vals = ids[valid], is_vals[valid], oos_vals[valid]
+    n = len(ids)
+    out = {
+        "n_combos": n,
+        "spearman_is_oos": None,
+        "top_overlap": None,
+        "best_is_score": None,
+        "best_oos_score": None,
+        "best_oos_rank": None,
+        "combo_id": None
+    }
+    if n == 0:
+        return out
+
+    # Spearman = 평균 순위(같은 점수는 평균)끼리의 Pearson 상관 (scipy 없이 계산)
+    is_rank = pd.Series(is_vals).rank(method="average").to_numpy()
+    oos_rank = pd.Series(oos_vals).rank(method="average").to_numpy()
+    if n >= 2 and is_rank.std() > 0 and oos_rank.std() > 0:
+        out["spearman_is_oos"] = float(np.corrcoef(is_rank, oos_rank)[0, 1])
+
+    # 상위 그룹 겹침 (같은 점수는 combo_id 오름차순)
+    k = max(1, math.ceil(n * _TOP_FRACTION))
+    top_is = np.lexsort((ids, -is_vals))[:k]
+    top_oos = np.lexsort((ids, -oos_vals))[:k]
+    out["top_overlap"] = len(np.intersect1d(top_is, top_oos)) / k
+
+    # IS 최고 콤보의 OOS 순위 (1 = OOS 최고)
+    best = top_is[0]
+    out["best_is_score"] = float(is_vals[best])
+    out["best_oos_score"] = float(oos_vals[best])
+    out["best_oos_rank"] = int((oos_vals > oos_vals[best]).sum()) + 1
+    out["combo_id"] = int(ids[best])
+    return out
+
+
+def run_boundary_sweep(
+    df_all: Union[BarFrame, pd.DataFrame],
+    combos: Union[Mapping[int, List[Dict[str, Any]]], List[List[Dict[str, Any]]]],
+    timeframe: str,
+    boundaries: Sequence[Tuple[str, int]],
+    start_capital: float = START_CAPITAL,
+    pool: Optional[BacktestWorkerPool] = None,
+    on_rows: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    checkpoint: Optional[SweepCheckpoint] = None,
+    metric: str = BOUNDARY_SWEEP_METRIC
+) -> List[Dict[str, Any]]:
+    """
+    IS/OOS 경계 후보마다 모든 콤보의 IS/OOS 점수를 구하고 순위 상관을 보고한다.
+
+    Args:
+        df_all (Union[BarFrame, pd.DataFrame]): 전체 기간 데이터 (OHLCV + 지표)
+        combos (Union[Mapping[int, List[Dict[str, Any]]], List[List[Dict[str, Any]]]]):
+            콤보 카탈로그(ComboSpace 등 combo_id → 조합) 또는 조합 리스트
+        timeframe (str): 타임프레임
+        boundaries (Sequence[Tuple[str, int]]): (경계 표시 문자열, UTC ms) 목록
+        start_capital (float, optional): 초기자본
+        pool (BacktestWorkerPool, optional): 재사용 워커 풀
+        on_rows (Callable, optional): 주면 결과 행을 이 함수에 넘기고 빈 리스트 반환
+        checkpoint (SweepCheckpoint, optional): 콤보별 경계 점수 저장/건너뛰기 (phase "boundary")
+        metric (str, optional): 순위 기준 (calculate_metrics 키)
+
+    Returns:
+        List[Dict[str, Any]]: 경계별 행
+            - "timeframe", "boundary", "is_bars", "oos_bars"
+            - "n_combos": 순위 비교에 쓴 콤보 수 (IS/OOS 점수가 모두 있는 콤보)
+            - "spearman_is_oos": IS 순위와 OOS 순위의 Spearman 상관계수
+            - "top_overlap": IS 상위 10% 중 OOS 상위 10%에도 든 비율
+            - "best_is_score", "best_oos_score", "best_oos_rank": IS 최고 콤보의 점수와 OOS 순위
+            - "combo_id": IS 최고 콤보
+    """
+    if df_all.empty:
+        return []
+    frame = as_bar_frame(df_all)
+    n = len(frame)
+
+    # 경계 → 행 번호 (BarFrame.split_at과 같은 기준), IS/OOS 한쪽이 비면 제외
+    splits = []
+    for label, ms in boundaries:
+        cut = int(np.searchsorted(frame.open_time, ms, side="left"))
+        if 0 < cut < n:
+            splits.append((label, cut))
+        else:
+            print(f"[run_boundary_sweep] 경계 {label}: IS 또는 OOS 구간이 비어 제외")
+    if not splits:
+        return []
+    cuts = [cut for _, cut in splits]
+    print(f"[INFO] Boundary sweep({timeframe}): 경계 {len(cuts)}개, metric={metric}, "
+          f"전체 {ms_to_kst_str(frame.open_time[0])} ~ {ms_to_kst_str(frame.open_time[-1])}")
+
+    # 콤보 순서대로 점수를 (콤보 수, 경계 수) 배열에 채운다
+    items = as_combo_items(combos)
+    ids = np.empty(len(items), dtype=np.int64)
+    is_mat = np.empty((len(items), len(cuts)), dtype=np.float64)
+    oos_mat = np.empty((len(items), len(cuts)), dtype=np.float64)
+    pos = [0]
+
+    def _collect(chunk: List[Dict[str, Any]]) -> None:
+        i = pos[0]
+        for j, r in enumerate(chunk):
+            ids[i + j] = r["combo_id"]
+            is_mat[i + j] = [math.nan if v is None else v for v in r["is_scores"]]
+            oos_mat[i + j] = [math.nan if v is None else v for v in r["oos_scores"]]
+        pos[0] = i + len(chunk)
+
+    run_kwargs = dict(cuts=cuts, timeframe=timeframe, start_capital=start_capital, metric=metric)
+    if checkpoint is not None:
+        checkpoint.map_combos(_evaluate_combo_splits, frame, items, phase="boundary", pool=pool,
+                              on_chunk=_collect, **run_kwargs)
+    else:
+        evaluate_combos(_evaluate_combo_splits, frame, items, pool=pool, on_chunk=_collect, **run_kwargs)
+
+    rows = []
+    for b, (label, cut) in enumerate(splits):
+        row = {"timeframe": timeframe, "boundary": label, "is_bars": cut, "oos_bars": n - cut}
+        row.update(_rank_report(ids, is_mat[:, b], oos_mat[:, b]))
+        rows.append(row)
+        rho = row["spearman_is_oos"]
+        print(f"[INFO] Boundary sweep({timeframe}) {label}: IS {cut}봉 / OOS {n - cut}봉, "
+              f"spearman={'N/A' if rho is None else f'{rho:.4f}'}, "
+              f"top{int(_TOP_FRACTION * 100)}% overlap={row['top_overlap']}, "
+              f"IS 최고 콤보 OOS 순위={row['best_oos_rank']}/{row['n_combos']}")
+
+    if on_rows is not None:
+        on_rows(rows)
+        return []
+    return rows
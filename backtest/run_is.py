@@ -2,64 +2,114 @@
 # 구글 스타일 Docstring, 최소한의 한글 주석
 # In-Sample(IS) 백테스트 모듈
 
-import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union, Callable, Tuple, Mapping, Sequence
 
 import pandas as pd
-from joblib import Parallel, delayed
 
 from utils.date_time import ms_to_kst_str
 from config.config import ALLOW_SHORT, START_CAPITAL
 from backtest.engine import run_backtest
 from analysis.scoring import calculate_metrics
-from strategies.signal_factory import create_signals_for_combo
+from strategies.signal_factory import compute_combo_signal
+from backtest.worker_pool import BacktestWorkerPool
+from backtest.signal_dedup import evaluate_combos
+from backtest.checkpoint import SweepCheckpoint
+from indicators.combo_generator_for_backtest import BUY_AND_HOLD_COMBO_ID, as_combo_items
+from utils.bar_frame import BarFrame, as_bar_frame
+
+
+def score_signals_is(
+    frame: BarFrame,
+    signals: Sequence[int],
+    combo_id: int,
+    timeframe: str,
+    start_capital: float,
+    bh_return: float
+) -> Dict[str, Any]:
+    """
+    최종 시그널 배열로 IS 백테스트 후 결과 행을 만든다.
+    (콤보 평가와 GA 탐색(backtest/run_is_ga.py)이 함께 쓴다)
 
+    Args:
+        frame (BarFrame): IS 구간
+        signals (Sequence[int]): 최종 시그널 (+1/-1/0)
+        combo_id (int): 결과 행에 실을 콤보 id
+        timeframe (str): 타임프레임
+        start_capital (float): 초기자본
+        bh_return (float): 같은 구간 Buy & Hold 수익률 (is_passed 판정용)
 
-def run_is(
-    df_is: pd.DataFrame,
-    combos: List[List[Dict[str, Any]]],
+    Returns:
+        Dict[str, Any]: 결과 행
+    """
+    # 백테스트 수행
+    engine_out = run_backtest(
+        df=frame,
+        signals=signals,
+        start_capital=start_capital,
+        allow_short=ALLOW_SHORT
+    )
+    score = calculate_metrics(
+        equity_curve=engine_out["equity_curve"],
+        daily_returns=engine_out["daily_returns"],
+        start_capital=start_capital,
+        trades=engine_out["trades"],
+        timeframe=timeframe
+    )
+
+    # Buy & Hold 대비 수익률 비교
+    pass_bool = (score["Return"] >= bh_return)
+
+    return {
+        "timeframe": timeframe,
+        "is_start_cap": score["StartCapital"],
+        "is_end_cap": score["EndCapital"],
+        "is_return": score["Return"],
+        "is_trades": score["Trades"],
+        "is_sharpe": score["Sharpe"],
+        "is_mdd": score["MDD"],
+        "combo_id": combo_id,
+        "is_passed": "True" if pass_bool else "False"
+    }
+
+
+def _evaluate_combo_is(
+    frame: BarFrame,
+    combo_item: Tuple[int, List[Dict[str, Any]]],
     timeframe: str,
-    start_capital: float = START_CAPITAL
-) -> List[Dict[str, Any]]:
+    start_capital: float,
+    bh_return: float
+) -> Dict[str, Any]:
     """
-    In-Sample (IS) 백테스트를 수행한다.
-    1) Buy & Hold 전략(항상 매수)의 수익률을 산출한다.
-    2) combos에 있는 각 지표 파라미터 조합을 병렬로 백테스트한다.
-    3) 각 콤보의 Return을 Buy & Hold Return과 비교해 is_passed 여부를 결정한다.
-    4) 각 콤보의 결과(성과 지표)를 dict 형태로 리스트에 담아 반환한다.
+    콤보(여러 지표 dict)로 IS 백테스트 후 결과를 반환한다.
+    (워커 풀에서 실행되므로 모듈 수준 함수)
 
     Args:
-        df_is (pd.DataFrame): IS 구간 시계열 데이터 (OHLCV + 지표)
-        combos (List[List[Dict[str, Any]]]): 지표 파라미터 조합들
-        timeframe (str): 예) "1d", "4h", "1h" 등
-        start_capital (float, optional): 초기자본
+        frame (BarFrame): IS 구간
+        combo_item (Tuple[int, List[Dict[str, Any]]]): (combo_id, 지표 파라미터 조합)
+        timeframe (str): 타임프레임
+        start_capital (float): 초기자본
+        bh_return (float): 같은 구간 Buy & Hold 수익률 (is_passed 판정용)
 
     Returns:
-        List[Dict[str, Any]]: 각 콤보의 백테스트 결과 리스트.
-            - "timeframe"
-            - "is_start_cap"
-            - "is_end_cap"
-            - "is_return"
-            - "is_trades"
-            - "is_sharpe"
-            - "is_mdd"
-            - "used_indicators"
-            - "is_passed"
+        Dict[str, Any]: 결과 행
     """
-    if df_is.empty:
-        return []
+    combo_id, combo = combo_item
 
-    # IS 구간 시작/끝 시점을 KST 문자열로 변환(로그용)
-    is_start_ms = df_is.iloc[0]["open_time"]
-    is_end_ms = df_is.iloc[-1]["open_time"]
-    is_start_kst = ms_to_kst_str(is_start_ms)
-    is_end_kst = ms_to_kst_str(is_end_ms)
-    print(f"[INFO] IS({timeframe}) range: {is_start_kst} ~ {is_end_kst}, rows={len(df_is)}")
+    # 콤보별 매매 시그널 생성 (칼럼 추가 없이 배열로)
+    signals = compute_combo_signal(frame, combo)
+    return score_signals_is(frame, signals, combo_id, timeframe, start_capital, bh_return)
+
+
+def buy_and_hold_is(frame: BarFrame, timeframe: str, start_capital: float) -> Tuple[Dict[str, Any], float]:
+    """
+    IS 구간 Buy & Hold(항상 매수) 결과 행과 수익률을 구한다.
 
-    # 1) Buy & Hold (IS): 항상 매수 신호
-    bh_signals = [1] * len(df_is)
+    Returns:
+        Tuple[Dict[str, Any], float]: (Buy & Hold 행, 수익률)
+    """
+    bh_signals = [1] * len(frame)
     bh_result = run_backtest(
-        df=df_is,
+        df=frame,
         signals=bh_signals,
         start_capital=start_capital,
         allow_short=False
@@ -71,9 +121,6 @@ def run_is(
         trades=bh_result["trades"],
         timeframe=timeframe
     )
-    bh_return = bh_score["Return"]
-
-    # 첫 행: Buy & Hold 결과
     bh_row = {
         "timeframe": f"{timeframe}(B/H)",
         "is_start_cap": bh_score["StartCapital"],
@@ -82,58 +129,115 @@ def run_is(
         "is_trades": bh_score["Trades"],
         "is_sharpe": bh_score["Sharpe"],
         "is_mdd": bh_score["MDD"],
-        "used_indicators": "Buy and Hold",
+        "combo_id": BUY_AND_HOLD_COMBO_ID,
         "is_passed": "N/A"
     }
+    return bh_row, bh_score["Return"]
 
-    # 2) combos 병렬 백테스트
-    def _process_combo(combo: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """
-        콤보(여러 지표 dict)로 IS 백테스트 후 결과를 반환한다.
-        """
-        # 콤보별 매매 시그널 생성
-        df_local = create_signals_for_combo(df_is, combo, out_col="signal_final")
-        signals = df_local["signal_final"].tolist()
-
-        # 백테스트 수행
-        engine_out = run_backtest(
-            df=df_local,
-            signals=signals,
-            start_capital=start_capital,
-            allow_short=ALLOW_SHORT
-        )
-        score = calculate_metrics(
-            equity_curve=engine_out["equity_curve"],
-            daily_returns=engine_out["daily_returns"],
-            start_capital=start_capital,
-            trades=engine_out["trades"],
-            timeframe=timeframe
+
+def evaluate_items_is(
+    frame: BarFrame,
+    items: Sequence[Tuple[int, List[Dict[str, Any]]]],
+    timeframe: str,
+    start_capital: float,
+    bh_return: float,
+    pool: Optional[BacktestWorkerPool] = None,
+    on_chunk: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    checkpoint: Optional[SweepCheckpoint] = None,
+    phase: str = "is"
+) -> List[Dict[str, Any]]:
+    """
+    (combo_id, 콤보) 목록을 IS 평가 함수로 병렬 평가한다. (Buy & Hold 행 제외)
+    run_is와 successive halving(backtest/run_is_halving.py)이 함께 쓴다.
+
+    Args:
+        frame (BarFrame): 평가 구간
+        items (Sequence[Tuple[int, List[Dict[str, Any]]]]): (combo_id, 콤보) 시퀀스
+        timeframe (str): 타임프레임
+        start_capital (float): 초기자본
+        bh_return (float): 같은 구간 Buy & Hold 수익률
+        pool (BacktestWorkerPool, optional): 재사용 워커 풀
+        on_chunk (Callable, optional): 주면 결과 청크를 순서대로 넘기고 빈 리스트 반환
+        checkpoint (SweepCheckpoint, optional): 저장된 콤보 건너뛰기/새 결과 저장
+        phase (str): 체크포인트 구간 구분
+
+    Returns:
+        List[Dict[str, Any]]: 콤보 순서의 결과 리스트
+    """
+    run_kwargs = dict(timeframe=timeframe, start_capital=start_capital, bh_return=bh_return)
+    if checkpoint is not None:
+        # 저장된 콤보는 건너뛰고 새 결과는 청크마다 저장
+        return checkpoint.map_combos(
+            _evaluate_combo_is, frame, items, phase=phase, pool=pool, on_chunk=on_chunk, **run_kwargs
         )
+    return evaluate_combos(_evaluate_combo_is, frame, items, pool=pool, on_chunk=on_chunk, **run_kwargs)
+
+
+def run_is(
+    df_is: Union[BarFrame, pd.DataFrame],
+    combos: Union[Mapping[int, List[Dict[str, Any]]], List[List[Dict[str, Any]]]],
+    timeframe: str,
+    start_capital: float = START_CAPITAL,
+    pool: Optional[BacktestWorkerPool] = None,
+    on_rows: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    checkpoint: Optional[SweepCheckpoint] = None
+) -> List[Dict[str, Any]]:
+    """
+    In-Sample (IS) 백테스트를 수행한다.
+    1) Buy & Hold 전략(항상 매수)의 수익률을 산출한다.
+    2) combos에 있는 각 지표 파라미터 조합을 병렬로 백테스트한다.
+    3) 각 콤보의 Return을 Buy & Hold Return과 비교해 is_passed 여부를 결정한다.
+    4) 각 콤보의 결과(성과 지표)를 dict 형태로 리스트에 담아 반환한다.
+
+    Args:
+        df_is (Union[BarFrame, pd.DataFrame]): IS 구간 시계열 데이터 (OHLCV + 지표)
+            BarFrame이면 복사 없이 모든 콤보가 공유한다.
+        combos (Union[Mapping[int, List[Dict[str, Any]]], List[List[Dict[str, Any]]]]):
+            콤보 카탈로그(ComboSpace 등 combo_id → 조합) 또는 조합 리스트(순서대로 id 0, 1, ...)
+        timeframe (str): 예) "1d", "4h", "1h" 등
+        start_capital (float, optional): 초기자본
+        pool (BacktestWorkerPool, optional): 재사용 워커 풀 (None이면 이번 호출용 임시 풀)
+        on_rows (Callable, optional): 주면 Buy & Hold 행과 콤보 결과 청크를 순서대로 이 함수에 넘기고
+            빈 리스트를 반환한다. (utils/result_sink.ResultSink.write_rows 등으로 바로 저장)
+        checkpoint (SweepCheckpoint, optional): 주면 이미 저장된 콤보 결과는 다시 계산하지 않고,
+            새로 계산한 결과는 청크마다 저장한다. (중단 후 재시작용)
+
+    Returns:
+        List[Dict[str, Any]]: 각 콤보의 백테스트 결과 리스트.
+            - "timeframe"
+            - "is_start_cap"
+            - "is_end_cap"
+            - "is_return"
+            - "is_trades"
+            - "is_sharpe"
+            - "is_mdd"
+            - "combo_id" (Buy & Hold는 BUY_AND_HOLD_COMBO_ID)
+            - "is_passed"
+    """
+    if df_is.empty:
+        return []
+    frame = as_bar_frame(df_is)
 
-        # Buy & Hold 대비 수익률 비교
-        pass_bool = (score["Return"] >= bh_return)
-
-        combo_info = {
-            "timeframe": timeframe,
-            "combo_params": combo
-        }
-        combo_json = json.dumps(combo_info, ensure_ascii=False)
-
-        return {
-            "timeframe": timeframe,
-            "is_start_cap": score["StartCapital"],
-            "is_end_cap": score["EndCapital"],
-            "is_return": score["Return"],
-            "is_trades": score["Trades"],
-            "is_sharpe": score["Sharpe"],
-            "is_mdd": score["MDD"],
-            "used_indicators": combo_json,
-            "is_passed": "True" if pass_bool else "False"
-        }
-
-    results = [bh_row]
-    parallel_out = Parallel(n_jobs=-1, verbose=5)(
-        delayed(_process_combo)(combo) for combo in combos
+    # IS 구간 시작/끝 시점을 KST 문자열로 변환(로그용)
+    is_start_ms = frame.open_time[0]
+    is_end_ms = frame.open_time[-1]
+    is_start_kst = ms_to_kst_str(is_start_ms)
+    is_end_kst = ms_to_kst_str(is_end_ms)
+    print(f"[INFO] IS({timeframe}) range: {is_start_kst} ~ {is_end_kst}, rows={len(frame)}")
+
+    # 1) Buy & Hold (IS): 첫 행
+    bh_row, bh_return = buy_and_hold_is(frame, timeframe, start_capital)
+
+    # 2) combos 병렬 백테스트
+    if on_rows is not None:
+        # 결과를 모으지 않고 바로 넘김
+        on_rows([bh_row])
+        results = []
+    else:
+        results = [bh_row]
+    parallel_out = evaluate_items_is(
+        frame, as_combo_items(combos), timeframe, start_capital, bh_return,
+        pool=pool, on_chunk=on_rows, checkpoint=checkpoint
     )
     results.extend(parallel_out)
     return results
@@ -0,0 +1,299 @@
+# gptbitcoin/backtest/run_is_ga.py
+# 구글 스타일 Docstring, 최소한의 한글 주석
+# In-Sample(IS) 단계의 유전 알고리즘(GA) 탐색 모듈 (IS_SEARCH_MODE = "ga")
+#
+# 크기 3~5 콤보는 itertools.combinations × product로 전부 평가할 수 없으므로,
+# 콤보를 지표 종류별 "파라미터 위치" 유전자(없으면 -1)로 표현하고 교차/돌연변이로 탐색한다.
+# - 개체군은 (개체 수, 지표 종류 수) int 행렬이라 선택/교차/돌연변이/보정이 모두 numpy 벡터 연산이다.
+# - 지표 1개짜리 시그널은 IS 구간에서 한 번만 계산해 (유전자 수, 봉 수) 행렬로 캐시하고,
+#   OHLCV와 함께 BarFrame으로 워커 풀에 공유한다. 워커는 행을 골라 합치기만 하면 된다.
+# - 한 번 평가한 콤보(combo_id)는 다시 평가하지 않는다.
+
+import math
+from typing import List, Dict, Any, Optional, Union, Callable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.config import (
+    START_CAPITAL,
+    GA_POPULATION,
+    GA_GENERATIONS,
+    GA_PATIENCE,
+    GA_ELITE,
+    GA_TOURNAMENT,
+    GA_CROSSOVER_RATE,
+    GA_MUTATION_RATE,
+    GA_FITNESS_METRIC,
+    GA_TOP_K,
+    GA_SEED
+)
+from backtest.run_is import buy_and_hold_is, score_signals_is
+from backtest.worker_pool import BacktestWorkerPool
+from indicators.combo_generator_for_backtest import ComboSpace
+from strategies.signal_factory import compute_indicator_signal, combine_signals
+from utils.bar_frame import BarFrame, BAR_FIELDS, as_bar_frame
+from utils.date_time import ms_to_kst_str
+
+
+def _evaluate_genome_is(
+    frame: BarFrame,
+    genome_item: Tuple[int, Tuple[int, ...]],
+    timeframe: str,
+    start_capital: float,
+    bh_return: float
+) -> Dict[str, Any]:
+    """
+    캐시된 지표별 시그널 행을 합쳐 IS 백테스트 후 결과를 반환한다.
+    (워커 풀에서 실행되므로 모듈 수준 함수)
+
+    Args:
+        frame (BarFrame): 지표 블록이 유전자별 시그널 행렬인 IS 구간 (build_signal_frame)
+        genome_item (Tuple[int, Tuple[int, ...]]): (combo_id, 시그널 행 번호들)
+        timeframe (str): 타임프레임
+        start_capital (float): 초기자본
+        bh_return (float): 같은 구간 Buy & Hold 수익률
+
+    Returns:
+        Dict[str, Any]: run_is와 같은 형식의 결과 행
+    """
+    combo_id, gene_rows = genome_item
+    signals = combine_signals([frame.indicators[r] for r in gene_rows], len(frame))
+    return score_signals_is(frame, signals, combo_id, timeframe, start_capital, bh_return)
+
+
+def build_signal_frame(frame: BarFrame, space: ComboSpace) -> Tuple[BarFrame, np.ndarray]:
+    """
+    모든 (지표, 파라미터)의 단일 지표 시그널을 한 번 계산해 OHLCV와 묶은 BarFrame을 만든다.
+
+    Args:
+        frame (BarFrame): IS 구간 (OHLCV + 지표)
+        space (ComboSpace): 유전자 정의에 쓸 콤보 공간 (param_tables 순서)
+
+    Returns:
+        Tuple[BarFrame, np.ndarray]: (시그널 행렬 BarFrame, 지표 종류별 첫 행 번호)
+    """
+    tables = space.param_tables
+    sizes = [len(params) for params in tables.values()]
+    gene_offset = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+
+    matrix = np.empty((sum(sizes), len(frame)), dtype=np.float64)
+    row = 0
+    for params in tables.values():
+        for param in params:
+            matrix[row] = compute_indicator_signal(frame, param)
+            row += 1
+    bars = {f: frame[f] for f in BAR_FIELDS}
+    index = {f"gene_{i}": i for i in range(len(matrix))}
+    return BarFrame(bars, matrix, index), gene_offset
+
+
+class _Genomes:
+    """
+    개체군 연산 모음. 개체 = 지표 종류별 파라미터 위치 배열(없는 지표는 -1).
+    """
+
+    def __init__(self, space: ComboSpace, combo_sizes: List[int], rng: np.random.Generator):
+        self.names = list(space.param_tables.keys())
+        self.radix = np.array([len(p) for p in space.param_tables.values()], dtype=np.int64)
+        self.n_types = len(self.names)
+        self.rng = rng
+        allowed = sorted({s for s in combo_sizes if 1 <= s <= self.n_types})
+        if not allowed:
+            raise ValueError(f"[run_is_ga] 사용할 수 있는 콤보 크기가 없습니다: {combo_sizes}")
+        self.allowed = np.array(allowed, dtype=np.int64)
+        # 개체 크기(0~지표 종류 수) → 가장 가까운 허용 크기
+        all_sizes = np.arange(self.n_types + 1)
+        nearest = np.abs(all_sizes[:, None] - self.allowed[None, :]).argmin(axis=1)
+        self.size_map = self.allowed[nearest]
+
+    def _random_params(self, shape: Tuple[int, int]) -> np.ndarray:
+        return (self.rng.random(shape) * self.radix).astype(np.int64)
+
+    def repair(self, genomes: np.ndarray, target: np.ndarray) -> np.ndarray:
+        """
+        개체마다 활성 지표 수를 target으로 맞춘다.
+        남는 지표는 임의로 끄고, 모자라면 꺼진 지표를 임의로 켜서 임의 파라미터를 준다.
+        """
+        active = genomes >= 0
+        priority = active * 2.0 + self.rng.random(genomes.shape)
+        rank = np.argsort(np.argsort(-priority, axis=1), axis=1)
+        keep = rank < target[:, None]
+        fresh = self._random_params(genomes.shape)
+        return np.where(keep, np.where(active, genomes, fresh), -1)
+
+    def initial(self, n: int) -> np.ndarray:
+        """허용 크기 중 임의 크기의 임의 개체 n개."""
+        target = self.rng.choice(self.allowed, size=n)
+        return self.repair(np.full((n, self.n_types), -1, dtype=np.int64), target)
+
+    def tournament(self, fitness: np.ndarray, n: int, k: int) -> np.ndarray:
+        """토너먼트 선택으로 부모 위치 n개를 고른다."""
+        entrants = self.rng.integers(0, len(fitness), size=(n, max(1, k)))
+        return entrants[np.arange(n), fitness[entrants].argmax(axis=1)]
+
+    def offspring(self, pa: np.ndarray, pb: np.ndarray, cx_rate: float, mut_rate: float) -> np.ndarray:
+        """
+        균등 교차 → 파라미터 변이 → 지표 교체 → 크기 보정으로 자식을 만든다.
+        """
+        n = len(pa)
+        take_a = self.rng.random(pa.shape) < 0.5
+        child = np.where(take_a, pa, pb)
+        child = np.where((self.rng.random(n) < cx_rate)[:, None], child, pa)
+        target = self.size_map[(child >= 0).sum(axis=1)]
+
+        # 파라미터 변이: 켜진 유전자마다 mut_rate 확률로 임의 파라미터
+        mutate = (child >= 0) & (self.rng.random(child.shape) < mut_rate)
+        child = np.where(mutate, self._random_params(child.shape), child)
+
+        # 지표 교체: mut_rate 확률로 켜진 지표 하나를 끄고, repair가 다른 지표로 채움
+        swap = self.rng.random(n) < mut_rate
+        if swap.any():
+            keys = np.where(child >= 0, self.rng.random(child.shape), -1.0)
+            drop = keys.argmax(axis=1)
+            rows = np.nonzero(swap)[0]
+            child[rows, drop[rows]] = -1
+        return self.repair(child, target)
+
+
+def run_is_ga(
+    df_is: Union[BarFrame, pd.DataFrame],
+    combos: ComboSpace,
+    timeframe: str,
+    start_capital: float = START_CAPITAL,
+    pool: Optional[BacktestWorkerPool] = None,
+    on_rows: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    population: int = GA_POPULATION,
+    generations: int = GA_GENERATIONS,
+    patience: Optional[int] = GA_PATIENCE,
+    elite: int = GA_ELITE,
+    tournament: int = GA_TOURNAMENT,
+    crossover_rate: float = GA_CROSSOVER_RATE,
+    mutation_rate: float = GA_MUTATION_RATE,
+    metric: str = GA_FITNESS_METRIC,
+    top_k: int = GA_TOP_K,
+    seed: int = GA_SEED
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """
+    유전 알고리즘으로 IS 구간의 좋은 콤보를 찾는다.
+    1) 단일 지표 시그널 행렬을 만들어 워커 풀에 공유한다.
+    2) 세대마다 새로 나온 콤보만 워커에서 병렬 평가하고 metric을 적합도로 쓴다.
+    3) 엘리트 보존 + 토너먼트 선택 + 균등 교차 + 돌연변이로 다음 세대를 만든다.
+    4) 평가한 전체 콤보 중 적합도 상위 top_k개를 run_is와 같은 형식의 IS 결과 행으로 남긴다.
+    (체크포인트/시그널 중복 제거는 쓰지 않는다. 같은 콤보는 실행 안에서 한 번만 평가)
+
+    Args:
+        df_is (Union[BarFrame, pd.DataFrame]): IS 구간 데이터 (OHLCV + 지표)
+        combos (ComboSpace): 콤보 카탈로그 (generate_combo_catalog(GA_COMBO_SIZES)), combo_id 부여용
+        timeframe (str): 타임프레임
+        start_capital (float, optional): 초기자본
+        pool (BacktestWorkerPool, optional): 재사용 워커 풀 (None이면 이번 호출용 임시 풀)
+        on_rows (Callable, optional): 주면 IS 결과 행(B/H + 상위 콤보)을 이 함수에 넘기고 rows는 빈 리스트
+        population (int, optional): 세대당 개체 수
+        generations (int, optional): 최대 세대 수
+        patience (int, optional): 최고 적합도가 오르지 않으면 멈출 세대 수 (None이면 끝까지)
+        elite (int, optional): 보존할 상위 개체 수
+        tournament (int, optional): 토너먼트 크기
+        crossover_rate (float, optional): 교차 확률
+        mutation_rate (float, optional): 돌연변이 확률
+        metric (str, optional): 적합도 IS 칼럼 (예: "is_sharpe", "is_return")
+        top_k (int, optional): 남길 콤보 수
+        seed (int, optional): 난수 시드
+
+    Returns:
+        Tuple[List[Dict[str, Any]], List[int]]: (IS 결과 행, 상위 combo_id 목록(오름차순))
+    """
+    if df_is.empty:
+        return [], []
+    if not isinstance(combos, ComboSpace):
+        raise TypeError("[run_is_ga] combos는 ComboSpace여야 합니다. (combo_id 인코딩용)")
+    frame = as_bar_frame(df_is)
+    rng = np.random.default_rng(seed)
+    combo_sizes = combos.combo_sizes
+    genomes = _Genomes(combos, combo_sizes, rng)
+    population = max(2, int(population))
+    elite = min(max(0, int(elite)), population - 1)
+
+    print(f"[INFO] IS GA({timeframe}) range: {ms_to_kst_str(frame.open_time[0])} ~ "
+          f"{ms_to_kst_str(frame.open_time[-1])}, 공간 {len(combos)}개(크기 {combo_sizes}), "
+          f"개체 {population}, 세대 {generations}, metric={metric}")
+
+    bh_row, bh_return = buy_and_hold_is(frame, timeframe, start_capital)
+    sig_frame, gene_offset = build_signal_frame(frame, combos)
+
+    # combo_id → 결과 행 / 적합도 (실행 안 캐시)
+    evaluated: Dict[int, Dict[str, Any]] = {}
+    fitness_of: Dict[int, float] = {}
+
+    def _encode(pop: np.ndarray) -> Tuple[np.ndarray, List[Tuple[int, Tuple[int, ...]]]]:
+        """개체군 → combo_id 배열과 아직 평가하지 않은 (combo_id, 시그널 행) 목록."""
+        ids = np.empty(len(pop), dtype=np.int64)
+        pending: Dict[int, Tuple[int, ...]] = {}
+        for i, g in enumerate(pop):
+            types = np.nonzero(g >= 0)[0]
+            cid = combos.encode([genomes.names[t] for t in types], g[types].tolist())
+            ids[i] = cid
+            if cid not in fitness_of and cid not in pending:
+                pending[cid] = tuple((gene_offset[types] + g[types]).tolist())
+        return ids, list(pending.items())
+
+    def _evaluate(items: List[Tuple[int, Tuple[int, ...]]], run_pool: BacktestWorkerPool) -> None:
+        rows = run_pool.map_combos(
+            _evaluate_genome_is, sig_frame, items,
+            timeframe=timeframe, start_capital=start_capital, bh_return=bh_return
+        )
+        for r in rows:
+            v = r.get(metric)
+            f = float(v) if v is not None else math.nan
+            evaluated[r["combo_id"]] = r
+            fitness_of[r["combo_id"]] = -math.inf if math.isnan(f) else f
+
+    own_pool = pool is None
+    run_pool = BacktestWorkerPool() if own_pool else pool
+    sig_frame = run_pool.share_frame(sig_frame)
+    try:
+        pop = genomes.initial(population)
+        best = -math.inf
+        stale = 0
+        for gen in range(1, max(1, int(generations)) + 1):
+            ids, pending = _encode(pop)
+            if pending:
+                _evaluate(pending, run_pool)
+            fit = np.array([fitness_of[cid] for cid in ids.tolist()], dtype=np.float64)
+
+            gen_best = float(fit.max())
+            if gen_best > best:
+                best, stale = gen_best, 0
+            else:
+                stale += 1
+            print(f"[INFO] IS GA({timeframe}) 세대 {gen}/{generations}: 새 평가 {len(pending)}개 "
+                  f"(누적 {len(evaluated)}), 최고 {metric}={best:.4f}")
+            if gen == generations or (patience is not None and stale >= patience):
+                break
+
+            # 엘리트: 적합도 상위의 서로 다른 콤보
+            order = np.lexsort((ids, -fit))
+            _, first = np.unique(ids[order], return_index=True)
+            elite_pos = order[np.sort(first)][:elite]
+
+            n_child = population - len(elite_pos)
+            pa = pop[genomes.tournament(fit, n_child, tournament)]
+            pb = pop[genomes.tournament(fit, n_child, tournament)]
+            children = genomes.offspring(pa, pb, crossover_rate, mutation_rate)
+            pop = np.concatenate([pop[elite_pos], children])
+    finally:
+        run_pool.release_frame(sig_frame)
+        if own_pool:
+            run_pool.shutdown()
+
+    # 평가한 전체 콤보 중 상위 top_k (적합도 내림차순, 같으면 combo_id 오름차순)
+    all_ids = np.fromiter(fitness_of.keys(), dtype=np.int64, count=len(fitness_of))
+    all_fit = np.fromiter(fitness_of.values(), dtype=np.float64, count=len(fitness_of))
+    top = np.sort(all_ids[np.lexsort((all_ids, -all_fit))[:max(1, int(top_k))]]).tolist()
+    print(f"[INFO] IS GA({timeframe}) 완료: 평가 {len(evaluated)}개 중 상위 {len(top)}개")
+
+    out = [bh_row] + [evaluated[cid] for cid in top]
+    if on_rows is not None:
+        on_rows(out)
+        return [], top
+    return out, top
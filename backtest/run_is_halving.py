@@ -0,0 +1,163 @@
+# gptbitcoin/backtest/run_is_halving.py
+# 구글 스타일 Docstring, 최소한의 한글 주석
+# In-Sample(IS) 단계의 successive halving 탐색 모듈 (IS_SEARCH_MODE = "halving")
+#
+# 모든 후보를 IS 끝부분의 짧은 구간에서 먼저 평가하고, 상위 1/eta만 남겨
+# 평가 구간을 eta배씩 늘려 가며 다시 평가한다. 마지막 단계는 IS 전체 구간이며,
+# 그 단계까지 살아남은 콤보만 IS 결과 행을 남기고 OOS로 넘어간다.
+
+import math
+from typing import List, Dict, Any, Optional, Union, Callable, Tuple, Mapping
+
+import numpy as np
+import pandas as pd
+
+from config.config import (
+    START_CAPITAL,
+    HALVING_ETA,
+    HALVING_MIN_FRACTION,
+    HALVING_MIN_BARS,
+    HALVING_MAX_CANDIDATES,
+    HALVING_METRIC,
+    HALVING_SEED
+)
+from backtest.run_is import buy_and_hold_is, evaluate_items_is
+from backtest.worker_pool import BacktestWorkerPool
+from backtest.checkpoint import SweepCheckpoint
+from indicators.combo_generator_for_backtest import as_combo_items
+from utils.bar_frame import BarFrame, as_bar_frame
+from utils.date_time import ms_to_kst_str
+
+
+def halving_schedule(n_bars: int, eta: int, min_fraction: float, min_bars: int) -> List[int]:
+    """
+    단계별 평가 구간 길이(봉 수)를 만든다. 마지막은 항상 n_bars(IS 전체)다.
+
+    Args:
+        n_bars (int): IS 봉 수
+        eta (int): 단계마다 구간 배수 / 생존 비율의 역수
+        min_fraction (float): 첫 단계 구간 비율 (0~1]
+        min_bars (int): 단계 구간 최소 봉 수 (이보다 짧은 단계는 생략)
+
+    Returns:
+        List[int]: 오름차순 구간 길이 목록
+    """
+    lengths = []
+    frac = min(1.0, max(min_fraction, 1e-9))
+    while frac < 1.0 - 1e-9:
+        length = int(n_bars * frac)
+        if length >= min_bars and (not lengths or length > lengths[-1]):
+            lengths.append(length)
+        frac *= eta
+    lengths.append(n_bars)
+    return lengths
+
+
+def _select_top(ids: np.ndarray, scores: np.ndarray, keep: int) -> np.ndarray:
+    """점수 내림차순(NaN은 최하위, 같으면 combo_id 오름차순) 상위 keep개 위치를 돌려준다."""
+    s = np.where(np.isnan(scores), -np.inf, scores)
+    order = np.lexsort((ids, -s))
+    return np.sort(order[:keep])
+
+
+def run_is_halving(
+    df_is: Union[BarFrame, pd.DataFrame],
+    combos: Union[Mapping[int, List[Dict[str, Any]]], List[List[Dict[str, Any]]]],
+    timeframe: str,
+    start_capital: float = START_CAPITAL,
+    pool: Optional[BacktestWorkerPool] = None,
+    on_rows: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    checkpoint: Optional[SweepCheckpoint] = None,
+    eta: int = HALVING_ETA,
+    min_fraction: float = HALVING_MIN_FRACTION,
+    max_candidates: Optional[int] = HALVING_MAX_CANDIDATES,
+    metric: str = HALVING_METRIC
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """
+    successive halving으로 IS 후보를 줄여 가며 평가한다.
+    1) (콤보가 max_candidates보다 많으면) 고정 시드로 후보를 표본 추출한다.
+    2) 단계 r에서 IS 끝부분 halving_schedule()[r]개 봉으로 모든 생존 후보를 평가하고,
+       metric 기준 상위 ceil(후보 수 / eta)개만 다음 단계로 넘긴다.
+    3) 마지막 단계(IS 전체)의 결과는 run_is와 같은 형식의 IS 결과 행으로 남긴다.
+
+    Args:
+        df_is (Union[BarFrame, pd.DataFrame]): IS 구간 데이터 (OHLCV + 지표)
+        combos (Union[Mapping[int, List[Dict[str, Any]]], List[List[Dict[str, Any]]]]):
+            콤보 카탈로그(ComboSpace 등 combo_id → 조합) 또는 조합 리스트
+        timeframe (str): 타임프레임
+        start_capital (float, optional): 초기자본
+        pool (BacktestWorkerPool, optional): 재사용 워커 풀
+        on_rows (Callable, optional): 주면 IS 결과 행(B/H + 최종 생존 콤보)을 이 함수에 넘기고 rows는 빈 리스트
+        checkpoint (SweepCheckpoint, optional): 단계별 결과 저장/건너뛰기 (마지막 단계는 run_is와 같은 "is")
+        eta (int, optional): 단계마다 남길 비율의 역수이자 구간 배수 (2 이상)
+        min_fraction (float, optional): 첫 단계 구간 비율
+        max_candidates (int, optional): 첫 단계 후보 수 상한 (예산), None이면 전체
+        metric (str, optional): 순위 기준 IS 칼럼 (예: "is_sharpe", "is_return")
+
+    Returns:
+        Tuple[List[Dict[str, Any]], List[int]]: (IS 결과 행, 최종 생존 combo_id 목록)
+    """
+    if df_is.empty:
+        return [], []
+    frame = as_bar_frame(df_is)
+    eta = max(2, int(eta))
+    n_bars = len(frame)
+
+    items = as_combo_items(combos)
+    n_all = len(items)
+    if max_candidates is not None and n_all > max_candidates:
+        rng = np.random.default_rng(HALVING_SEED)
+        positions = np.sort(rng.choice(n_all, size=max_candidates, replace=False))
+    else:
+        positions = np.arange(n_all)
+
+    lengths = halving_schedule(n_bars, eta, min_fraction, HALVING_MIN_BARS)
+    print(f"[INFO] IS halving({timeframe}): 후보 {len(positions)}/{n_all}, eta={eta}, "
+          f"구간(봉)={lengths}, metric={metric}")
+
+    rows: List[Dict[str, Any]] = []
+    for rung, length in enumerate(lengths):
+        sub = frame.slice(n_bars - length, n_bars)
+        # 표본 추출/탈락이 없으면 view 그대로 (ComboSpace를 펼치지 않음)
+        cand = items if len(positions) == n_all else [items[int(p)] for p in positions]
+        last = (rung == len(lengths) - 1)
+        bh_row, bh_return = buy_and_hold_is(sub, timeframe, start_capital)
+
+        if last:
+            # 마지막 단계: IS 전체, 결과 행을 그대로 남김
+            print(f"[INFO] IS halving({timeframe}) 최종: {ms_to_kst_str(sub.open_time[0])} ~ "
+                  f"{ms_to_kst_str(sub.open_time[-1])}, 후보 {len(cand)}")
+            if on_rows is not None:
+                on_rows([bh_row])
+            else:
+                rows.append(bh_row)
+            out = evaluate_items_is(
+                sub, cand, timeframe, start_capital, bh_return,
+                pool=pool, on_chunk=on_rows, checkpoint=checkpoint, phase="is"
+            )
+            rows.extend(out)
+            break
+
+        # 중간 단계: combo_id와 점수만 후보 순서대로 모음
+        ids_list: List[int] = []
+        vals_list: List[float] = []
+
+        def _collect(chunk: List[Dict[str, Any]]) -> None:
+            for r in chunk:
+                v = r.get(metric)
+                ids_list.append(r["combo_id"])
+                vals_list.append(float(v) if v is not None else math.nan)
+
+        evaluate_items_is(
+            sub, cand, timeframe, start_capital, bh_return,
+            pool=pool, on_chunk=_collect, checkpoint=checkpoint, phase="is_halving"
+        )
+        ids = np.asarray(ids_list, dtype=np.int64)
+        vals = np.asarray(vals_list, dtype=np.float64)
+        keep = max(1, math.ceil(len(cand) / eta))
+        positions = positions[_select_top(ids, vals, keep)]
+        print(f"[INFO] IS halving({timeframe}) 단계 {rung + 1}/{len(lengths)}: 봉 {length}개, "
+              f"{len(cand)} → {len(positions)}")
+
+    survivors = [int(items[int(p)][0]) for p in positions]
+    return rows, survivors
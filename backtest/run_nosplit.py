@@ -2,25 +2,29 @@
 # 최소한의 한글 주석, 구글 스타일 docstring을 사용하는 단일(전체) 구간 백테스트 모듈.
 # time_delay, holding_period 로직을 제거해 즉시모드 백테스트로 통일.
 
-import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union, Callable, Tuple, Mapping
 
+import numpy as np
 import pandas as pd
-from joblib import Parallel, delayed
 
 from config.config import ALLOW_SHORT, START_CAPITAL
 from backtest.engine import run_backtest
 from analysis.scoring import calculate_metrics
-from strategies.signal_factory import create_signals_for_combo
+from strategies.signal_factory import compute_combo_signal
+from backtest.worker_pool import BacktestWorkerPool
+from backtest.signal_dedup import evaluate_combos
+from backtest.checkpoint import SweepCheckpoint
+from indicators.combo_generator_for_backtest import BUY_AND_HOLD_COMBO_ID, as_combo_items
+from utils.bar_frame import BarFrame, as_bar_frame
 from utils.date_time import ms_to_kst_str
 
 
-def _record_trades_info(df: pd.DataFrame, trades: List[Dict[str, Any]]) -> str:
+def _record_trades_info(open_time: np.ndarray, trades: List[Dict[str, Any]]) -> str:
     """
     매매 내역(trades)을 KST 시각으로 요약하여 문자열로 반환한다.
 
     Args:
-        df (pd.DataFrame): 백테스트에 사용된 시계열 데이터 (open_time 칼럼 포함)
+        open_time (np.ndarray): 백테스트에 사용된 구간의 open_time 배열
         trades (List[Dict[str, Any]]): 매매 내역 (pnl, position_type 등)
 
     Returns:
@@ -37,17 +41,17 @@ def _record_trades_info(df: pd.DataFrame, trades: List[Dict[str, Any]]) -> str:
         pnl_val = t.get("pnl", 0.0)
 
         # 진입 시각
-        if isinstance(e_idx, int) and 0 <= e_idx < len(df):
-            ms_entry = df.iloc[e_idx]["open_time"]
+        if isinstance(e_idx, int) and 0 <= e_idx < len(open_time):
+            ms_entry = open_time[e_idx]
             entry_time_str = ms_to_kst_str(ms_entry)
         else:
             entry_time_str = "N/A"
 
         # 청산 시각
-        if isinstance(x_idx, int) and 0 <= x_idx < len(df):
-            ms_exit = df.iloc[x_idx]["open_time"]
+        if isinstance(x_idx, int) and 0 <= x_idx < len(open_time):
+            ms_exit = open_time[x_idx]
             exit_time_str = ms_to_kst_str(ms_exit)
-        elif isinstance(x_idx, int) and x_idx >= len(df):
+        elif isinstance(x_idx, int) and x_idx >= len(open_time):
             exit_time_str = "End"
         else:
             exit_time_str = "N/A"
@@ -60,12 +64,73 @@ def _record_trades_info(df: pd.DataFrame, trades: List[Dict[str, Any]]) -> str:
     return "; ".join(logs)
 
 
+def _evaluate_combo_nosplit(
+    frame: BarFrame,
+    combo_item: Tuple[int, List[Dict[str, Any]]],
+    timeframe: str,
+    start_capital: float,
+    risk_free_rate_annual: float
+) -> Dict[str, Any]:
+    """
+    단일 콤보(복수 지표)로 백테스트하여 성과 및 매매 로그를 반환한다. (즉시모드)
+    (워커 풀에서 실행되므로 모듈 수준 함수)
+
+    Args:
+        frame (BarFrame): 백테스트 구간
+        combo_item (Tuple[int, List[Dict[str, Any]]]): (combo_id, 지표 파라미터 조합)
+        timeframe (str): 타임프레임
+        start_capital (float): 초기자본
+        risk_free_rate_annual (float): 연간 무위험이자율
+
+    Returns:
+        Dict[str, Any]: 결과 행
+    """
+    combo_id, combo = combo_item
+
+    # 시그널 생성 (칼럼 추가 없이 배열로)
+    signals = compute_combo_signal(frame, combo)
+
+    # 즉시모드로 run_backtest
+    engine_out = run_backtest(
+        frame,
+        signals=signals,
+        start_capital=start_capital,
+        allow_short=ALLOW_SHORT
+    )
+    score = calculate_metrics(
+        equity_curve=engine_out["equity_curve"],
+        daily_returns=engine_out["daily_returns"],
+        start_capital=engine_out["equity_curve"][0] if engine_out["equity_curve"] else start_capital,
+        trades=engine_out["trades"],
+        timeframe=timeframe,
+        risk_free_rate_annual=risk_free_rate_annual
+    )
+
+    # 매매 내역 로그
+    combo_trades_log = _record_trades_info(frame.open_time, engine_out["trades"])
+
+    return {
+        "timeframe": timeframe,
+        "start_cap": score["StartCapital"],
+        "end_cap": score["EndCapital"],
+        "returns": score["Return"],
+        "trades": score["Trades"],
+        "sharpe": score["Sharpe"],
+        "mdd": score["MDD"],
+        "combo_id": combo_id,
+        "trades_log": combo_trades_log
+    }
+
+
 def run_nosplit(
-    df: pd.DataFrame,
-    combos: List[List[Dict[str, Any]]],
+    df: Union[BarFrame, pd.DataFrame],
+    combos: Union[Mapping[int, List[Dict[str, Any]]], List[List[Dict[str, Any]]]],
     timeframe: str,
     risk_free_rate_annual: float = 0.0,
-    start_capital: float = START_CAPITAL
+    start_capital: float = START_CAPITAL,
+    pool: Optional[BacktestWorkerPool] = None,
+    on_rows: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    checkpoint: Optional[SweepCheckpoint] = None
 ) -> List[Dict[str, Any]]:
     """
     단일(전체) 구간 백테스트 (즉시모드):
@@ -74,11 +139,17 @@ def run_nosplit(
       3) 결과(성과 + 매매 로그)를 리스트(dict)로 반환
 
     Args:
-        df (pd.DataFrame): 백테스트용 DataFrame (OHLCV + 지표)
-        combos (List[List[Dict[str, Any]]]): 지표 파라미터 조합 목록
+        df (Union[BarFrame, pd.DataFrame]): 백테스트용 데이터 (OHLCV + 지표)
+        combos (Union[Mapping[int, List[Dict[str, Any]]], List[List[Dict[str, Any]]]]):
+            콤보 카탈로그(ComboSpace 등 combo_id → 조합) 또는 조합 리스트(순서대로 id 0, 1, ...)
         timeframe (str): 예) "1d", "4h", "15m" 등
         risk_free_rate_annual (float, optional): 연간 무위험이자율 (샤프 계산용)
         start_capital (float, optional): 초기자본
+        pool (BacktestWorkerPool, optional): 재사용 워커 풀 (None이면 이번 호출용 임시 풀)
+        on_rows (Callable, optional): 주면 Buy & Hold 행과 콤보 결과 청크를 순서대로 이 함수에 넘기고
+            빈 리스트를 반환한다. (utils/result_sink.ResultSink.write_rows 등으로 바로 저장)
+        checkpoint (SweepCheckpoint, optional): 주면 이미 저장된 콤보 결과는 다시 계산하지 않고,
+            새로 계산한 결과는 청크마다 저장한다. (중단 후 재시작용)
 
     Returns:
         List[Dict[str, Any]]: 각 콤보와 Buy&Hold 결과가 담긴 리스트.
@@ -91,7 +162,7 @@ def run_nosplit(
                 "trades": int,
                 "sharpe": float,
                 "mdd": float,
-                "used_indicators": str,
+                "combo_id": int,
                 "trades_log": str
               },
               ...
@@ -99,20 +170,19 @@ def run_nosplit(
     """
     if df.empty:
         return []
+    frame = as_bar_frame(df)
 
     # 구간 시작/끝 시점(UTC ms)을 KST 문자열로 변환 (로그용)
-    start_ms = df.iloc[0]["open_time"]
-    end_ms = df.iloc[-1]["open_time"]
+    start_ms = frame.open_time[0]
+    end_ms = frame.open_time[-1]
     start_kst = ms_to_kst_str(start_ms)
     end_kst = ms_to_kst_str(end_ms)
-    print(f"[INFO] No-Split({timeframe}) range: {start_kst} ~ {end_kst}, rows={len(df)}")
-
-    results = []
+    print(f"[INFO] No-Split({timeframe}) range: {start_kst} ~ {end_kst}, rows={len(frame)}")
 
     # 1) Buy & Hold (항상 매수) 전략
-    bh_signals = [1] * len(df)
+    bh_signals = [1] * len(frame)
     bh_out = run_backtest(
-        df=df,
+        df=frame,
         signals=bh_signals,
         start_capital=start_capital,
         allow_short=False
@@ -127,10 +197,10 @@ def run_nosplit(
     )
 
     # 매매 내역 로그
-    bh_trades_log = _record_trades_info(df, bh_out["trades"])
+    bh_trades_log = _record_trades_info(frame.open_time, bh_out["trades"])
 
     # Buy & Hold 결과 저장
-    results.append({
+    bh_row = {
         "timeframe": f"{timeframe}(B/H)",
         "start_cap": bh_score["StartCapital"],
         "end_cap": bh_score["EndCapital"],
@@ -138,57 +208,28 @@ def run_nosplit(
         "trades": bh_score["Trades"],
         "sharpe": bh_score["Sharpe"],
         "mdd": bh_score["MDD"],
-        "used_indicators": "Buy and Hold",
+        "combo_id": BUY_AND_HOLD_COMBO_ID,
         "trades_log": bh_trades_log
-    })
+    }
 
     # 2) combos 병렬 백테스트
-    def _process_combo_single(combo: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """
-        단일 콤보(복수 지표)로 백테스트하여 성과 및 매매 로그를 반환한다. (즉시모드)
-        """
-        # 시그널 생성
-        df_local = create_signals_for_combo(df, combo, out_col="signal_final")
-        signals = df_local["signal_final"].tolist()
-
-        # 즉시모드로 run_backtest
-        engine_out = run_backtest(
-            df_local,
-            signals=signals,
-            start_capital=start_capital,
-            allow_short=ALLOW_SHORT
+    if on_rows is not None:
+        # 결과를 모으지 않고 바로 넘김
+        on_rows([bh_row])
+        results = []
+    else:
+        results = [bh_row]
+    items = as_combo_items(combos)
+    run_kwargs = dict(timeframe=timeframe, start_capital=start_capital, risk_free_rate_annual=risk_free_rate_annual)
+    if checkpoint is not None:
+        # 저장된 콤보는 건너뛰고 새 결과는 청크마다 저장
+        parallel_out = checkpoint.map_combos(
+            _evaluate_combo_nosplit, frame, items, phase="nosplit", pool=pool, on_chunk=on_rows, **run_kwargs
         )
-        score = calculate_metrics(
-            equity_curve=engine_out["equity_curve"],
-            daily_returns=engine_out["daily_returns"],
-            start_capital=engine_out["equity_curve"][0] if engine_out["equity_curve"] else start_capital,
-            trades=engine_out["trades"],
-            timeframe=timeframe,
-            risk_free_rate_annual=risk_free_rate_annual
+    else:
+        parallel_out = evaluate_combos(
+            _evaluate_combo_nosplit, frame, items, pool=pool, on_chunk=on_rows, **run_kwargs
         )
-
-        # 매매 내역 로그
-        combo_trades_log = _record_trades_info(df_local, engine_out["trades"])
-
-        # used_indicators 필드에 combo 정보를 저장
-        combo_info = {"timeframe": timeframe, "combo_params": combo}
-        used_str = json.dumps(combo_info, ensure_ascii=False)
-
-        return {
-            "timeframe": timeframe,
-            "start_cap": score["StartCapital"],
-            "end_cap": score["EndCapital"],
-            "returns": score["Return"],
-            "trades": score["Trades"],
-            "sharpe": score["Sharpe"],
-            "mdd": score["MDD"],
-            "used_indicators": used_str,
-            "trades_log": combo_trades_log
-        }
-
-    parallel_out = Parallel(n_jobs=-1, verbose=5)(
-        delayed(_process_combo_single)(combo) for combo in combos
-    )
     results.extend(parallel_out)
 
     return results
@@ -2,27 +2,30 @@
 # 구글 스타일 docstring 사용, 최소한의 한글 주석.
 # OOS(아웃샘플) 구간 백테스트 모듈
 
-import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union, Callable, Tuple, Mapping
 
+import numpy as np
 import pandas as pd
-from joblib import Parallel, delayed
 
 from config.config import ALLOW_SHORT, START_CAPITAL
 from analysis.scoring import calculate_metrics
 from backtest.engine import run_backtest
-from config.indicator_config import SIGNAL_COMBINE_METHOD
-from strategies.signal_factory import create_signals_for_combo
+from strategies.signal_factory import compute_combo_signal
+from backtest.worker_pool import BacktestWorkerPool
+from backtest.signal_dedup import evaluate_combos
+from backtest.checkpoint import SweepCheckpoint
+from indicators.combo_generator_for_backtest import BUY_AND_HOLD_COMBO_ID, as_combo_items
+from utils.bar_frame import BarFrame, as_bar_frame
 from utils.date_time import ms_to_kst_str
 
 
-def _record_trades_info(df: pd.DataFrame, trades: List[dict]) -> str:
+def _record_trades_info(open_time: np.ndarray, trades: List[dict]) -> str:
     """
     OOS 구간에서 발생한 매매 내역(trades)을 KST 시각으로 요약하여 단일 문자열로 반환.
     전체 거래 내역 중 최신 5건만 기록한다.
 
     Args:
-        df (pd.DataFrame): OOS 구간 DataFrame (open_time 칼럼 포함)
+        open_time (np.ndarray): OOS 구간 open_time 배열
         trades (List[dict]): 매매 내역 리스트
 
     Returns:
@@ -39,16 +42,16 @@ def _record_trades_info(df: pd.DataFrame, trades: List[dict]) -> str:
         ptype = t.get("position_type", "N/A")
         pnl_val = t.get("pnl", 0.0)
 
-        if isinstance(e_idx, int) and 0 <= e_idx < len(df):
-            ms_val_entry = df.iloc[e_idx]["open_time"]
+        if isinstance(e_idx, int) and 0 <= e_idx < len(open_time):
+            ms_val_entry = open_time[e_idx]
             entry_time_str = ms_to_kst_str(ms_val_entry)
         else:
             entry_time_str = "N/A"
 
-        if isinstance(x_idx, int) and x_idx < len(df):
-            ms_val_exit = df.iloc[x_idx]["open_time"]
+        if isinstance(x_idx, int) and x_idx < len(open_time):
+            ms_val_exit = open_time[x_idx]
             exit_time_str = ms_to_kst_str(ms_val_exit)
-        elif isinstance(x_idx, int) and x_idx >= len(df):
+        elif isinstance(x_idx, int) and x_idx >= len(open_time):
             exit_time_str = "End"
         else:
             exit_time_str = "N/A"
@@ -60,14 +63,14 @@ def _record_trades_info(df: pd.DataFrame, trades: List[dict]) -> str:
     return final_log
 
 
-def _detect_oos_current_position(trades: List[Dict[str, Any]], df: pd.DataFrame) -> int:
+def _detect_oos_current_position(trades: List[Dict[str, Any]], df: Union[BarFrame, pd.DataFrame]) -> int:
     """
     OOS 구간에서 마지막 포지션 상태를 판단한다.
     마지막 거래의 exit_index가 df 길이 이상이면 청산되지 않은 포지션으로 간주.
 
     Args:
         trades (List[Dict[str, Any]]): 매매 내역 리스트.
-        df (pd.DataFrame): OOS 구간 데이터프레임
+        df (Union[BarFrame, pd.DataFrame]): OOS 구간 데이터 (길이만 사용)
 
     Returns:
         int: 현재 포지션 (1: long, -1: short, 0: flat)
@@ -86,11 +89,66 @@ def _detect_oos_current_position(trades: List[Dict[str, Any]], df: pd.DataFrame)
     return 0
 
 
+def _evaluate_combo_oos(
+    frame: BarFrame,
+    combo_item: Tuple[int, List[Dict[str, Any]]],
+    timeframe: str,
+    start_capital: float
+) -> Dict[str, Any]:
+    """
+    주어진 콤보(복수 지표)로 OOS 구간 백테스트 후 결과(성과 + 매매 로그) 반환.
+    (워커 풀에서 실행되므로 모듈 수준 함수)
+
+    Args:
+        frame (BarFrame): OOS 구간
+        combo_item (Tuple[int, List[Dict[str, Any]]]): (combo_id, 지표 파라미터 조합)
+        timeframe (str): 타임프레임
+        start_capital (float): 초기자본
+
+    Returns:
+        Dict[str, Any]: 결과 행
+    """
+    combo_id, combo = combo_item
+    signals = compute_combo_signal(frame, combo)
+
+    engine_out = run_backtest(
+        df=frame,
+        signals=signals,
+        start_capital=start_capital,
+        allow_short=ALLOW_SHORT
+    )
+    score = calculate_metrics(
+        equity_curve=engine_out["equity_curve"],
+        daily_returns=engine_out["daily_returns"],
+        start_capital=start_capital,
+        trades=engine_out["trades"],
+        timeframe=timeframe
+    )
+    combo_trades_log = _record_trades_info(frame.open_time, engine_out["trades"])
+    current_position = _detect_oos_current_position(engine_out["trades"], frame)
+
+    return {
+        "timeframe": timeframe,
+        "oos_start_cap": score["StartCapital"],
+        "oos_end_cap": score["EndCapital"],
+        "oos_return": score["Return"],
+        "oos_trades": score["Trades"],
+        "oos_trades_log": combo_trades_log,
+        "oos_sharpe": score["Sharpe"],
+        "oos_mdd": score["MDD"],
+        "combo_id": combo_id,
+        "oos_current_position": current_position
+    }
+
+
 def run_oos(
-    df_oos: pd.DataFrame,
-    combos: List[List[Dict[str, Any]]],
+    df_oos: Union[BarFrame, pd.DataFrame],
+    combos: Union[Mapping[int, List[Dict[str, Any]]], List[List[Dict[str, Any]]]],
     timeframe: str,
-    start_capital: float = START_CAPITAL
+    start_capital: float = START_CAPITAL,
+    pool: Optional[BacktestWorkerPool] = None,
+    on_rows: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    checkpoint: Optional[SweepCheckpoint] = None
 ) -> List[Dict[str, Any]]:
     """
     OOS(아웃샘플) 백테스트:
@@ -100,10 +158,16 @@ def run_oos(
          매매 내역 로그(oos_trades_log)와 현재 포지션(oos_current_position)도 포함.
 
     Args:
-        df_oos (pd.DataFrame): OOS 구간 시계열 데이터 (OHLCV 및 지표)
-        combos (List[List[Dict[str, Any]]]): 파라미터 조합(콤보) 목록
+        df_oos (Union[BarFrame, pd.DataFrame]): OOS 구간 시계열 데이터 (OHLCV 및 지표)
+        combos (Union[Mapping[int, List[Dict[str, Any]]], List[List[Dict[str, Any]]]]):
+            콤보 카탈로그(ComboSpace 등 combo_id → 조합) 또는 조합 리스트(순서대로 id 0, 1, ...)
         timeframe (str): 예) "1d"
         start_capital (float, optional): OOS 구간 시작 자본
+        pool (BacktestWorkerPool, optional): 재사용 워커 풀 (None이면 이번 호출용 임시 풀)
+        on_rows (Callable, optional): 주면 Buy & Hold 행과 콤보 결과 청크를 순서대로 이 함수에 넘기고
+            빈 리스트를 반환한다. (utils/result_sink.ResultSink.write_rows 등으로 바로 저장)
+        checkpoint (SweepCheckpoint, optional): 주면 이미 저장된 콤보 결과는 다시 계산하지 않고,
+            새로 계산한 결과는 청크마다 저장한다. (중단 후 재시작용)
 
     Returns:
         List[Dict[str, Any]]: [
@@ -116,7 +180,7 @@ def run_oos(
                 "oos_trades_log": ...,
                 "oos_sharpe": ...,
                 "oos_mdd": ...,
-                "used_indicators": ...,
+                "combo_id": ...,
                 "oos_current_position": ...
             },
             ...
@@ -124,18 +188,19 @@ def run_oos(
     """
     if df_oos.empty:
         return []
+    frame = as_bar_frame(df_oos)
 
     # 로그용 시각
-    oos_start_ms = df_oos.iloc[0]["open_time"]
-    oos_end_ms = df_oos.iloc[-1]["open_time"]
+    oos_start_ms = frame.open_time[0]
+    oos_end_ms = frame.open_time[-1]
     oos_start_kst = ms_to_kst_str(oos_start_ms)
     oos_end_kst = ms_to_kst_str(oos_end_ms)
-    print(f"[INFO] OOS({timeframe}) range: {oos_start_kst} ~ {oos_end_kst}, rows={len(df_oos)}")
+    print(f"[INFO] OOS({timeframe}) range: {oos_start_kst} ~ {oos_end_kst}, rows={len(frame)}")
 
     # 1) Buy & Hold
-    bh_signals = [1] * len(df_oos)
+    bh_signals = [1] * len(frame)
     bh_result = run_backtest(
-        df=df_oos,
+        df=frame,
         signals=bh_signals,
         start_capital=start_capital,
         allow_short=False
@@ -147,8 +212,8 @@ def run_oos(
         trades=bh_result["trades"],
         timeframe=timeframe
     )
-    bh_trades_log = _record_trades_info(df_oos, bh_result["trades"])
-    bh_current_position = _detect_oos_current_position(bh_result["trades"], df_oos)
+    bh_trades_log = _record_trades_info(frame.open_time, bh_result["trades"])
+    bh_current_position = _detect_oos_current_position(bh_result["trades"], frame)
 
     bh_row = {
         "timeframe": f"{timeframe}(B/H)",
@@ -159,52 +224,27 @@ def run_oos(
         "oos_trades_log": bh_trades_log,
         "oos_sharpe": bh_score["Sharpe"],
         "oos_mdd": bh_score["MDD"],
-        "used_indicators": "Buy and Hold",
+        "combo_id": BUY_AND_HOLD_COMBO_ID,
         "oos_current_position": bh_current_position
     }
 
     # 2) combos 병렬 백테스트
-    def _process_combo_oos(combo: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """
-        주어진 콤보(복수 지표)로 OOS 구간 백테스트 후 결과(성과 + 매매 로그) 반환.
-        """
-        df_local = create_signals_for_combo(df_oos, combo, out_col="signal_oos_final")
-        signals = df_local["signal_oos_final"].tolist()
-
-        engine_out = run_backtest(
-            df=df_local,
-            signals=signals,
-            start_capital=start_capital,
-            allow_short=ALLOW_SHORT
+    if on_rows is not None:
+        # 결과를 모으지 않고 바로 넘김
+        on_rows([bh_row])
+        results = []
+    else:
+        results = [bh_row]
+    items = as_combo_items(combos)
+    run_kwargs = dict(timeframe=timeframe, start_capital=start_capital)
+    if checkpoint is not None:
+        # 저장된 콤보는 건너뛰고 새 결과는 청크마다 저장
+        parallel_out = checkpoint.map_combos(
+            _evaluate_combo_oos, frame, items, phase="oos", pool=pool, on_chunk=on_rows, **run_kwargs
         )
-        score = calculate_metrics(
-            equity_curve=engine_out["equity_curve"],
-            daily_returns=engine_out["daily_returns"],
-            start_capital=start_capital,
-            trades=engine_out["trades"],
-            timeframe=timeframe
+    else:
+        parallel_out = evaluate_combos(
+            _evaluate_combo_oos, frame, items, pool=pool, on_chunk=on_rows, **run_kwargs
         )
-        combo_trades_log = _record_trades_info(df_local, engine_out["trades"])
-        current_position = _detect_oos_current_position(engine_out["trades"], df_local)
-        combo_info = {"timeframe": timeframe, "SIGNAL_COMBINE_METHOD": SIGNAL_COMBINE_METHOD , "combo_params": combo}
-        used_str = json.dumps(combo_info, ensure_ascii=False)
-
-        return {
-            "timeframe": timeframe,
-            "oos_start_cap": score["StartCapital"],
-            "oos_end_cap": score["EndCapital"],
-            "oos_return": score["Return"],
-            "oos_trades": score["Trades"],
-            "oos_trades_log": combo_trades_log,
-            "oos_sharpe": score["Sharpe"],
-            "oos_mdd": score["MDD"],
-            "used_indicators": used_str,
-            "oos_current_position": current_position
-        }
-
-    results = [bh_row]
-    parallel_out = Parallel(n_jobs=-1, verbose=5)(
-        delayed(_process_combo_oos)(combo) for combo in combos
-    )
     results.extend(parallel_out)
     return results
@@ -0,0 +1,285 @@
+# gptbitcoin/backtest/run_walk_forward.py
+# 구글 스타일 Docstring, 최소한의 한글 주석
+# 워크포워드(walk-forward) 최적화 모듈 (USE_WALK_FORWARD = True)
+#
+# 전체 기간을 K개의 (IS, OOS) fold로 나누고(rolling 또는 anchored),
+# fold마다 IS 성과가 가장 좋은 콤보를 골라 그 fold의 OOS 구간을 백테스트한 뒤
+# OOS 구간들을 이어 붙여 하나의 아웃샘플 자산 곡선을 만든다.
+# - 지표는 전체 기간에서 한 번 계산된 BarFrame을 그대로 쓰고,
+#   콤보 시그널도 워커에서 전체 기간에 대해 한 번만 만든 뒤 fold마다 잘라 엔진만 다시 실행한다.
+#   (K fold 비용 ≈ 시그널 1회 + 엔진 K회, 전체 스윕 K회가 아님)
+# - 콤보 평가는 run_is와 같은 경로(체크포인트, 시그널 중복 제거)를 쓴다.
+
+import math
+from typing import List, Dict, Any, Optional, Union, Callable, Tuple, Mapping
+
+import numpy as np
+import pandas as pd
+
+from config.config import (
+    ALLOW_SHORT,
+    START_CAPITAL,
+    WF_FOLDS,
+    WF_WINDOW,
+    WF_IS_OOS_RATIO,
+    WF_METRIC
+)
+from analysis.scoring import calculate_metrics
+from backtest.engine import run_backtest
+from backtest.worker_pool import BacktestWorkerPool
+from backtest.signal_dedup import evaluate_combos
+from backtest.checkpoint import SweepCheckpoint
+from indicators.combo_generator_for_backtest import BUY_AND_HOLD_COMBO_ID, as_combo_items
+from strategies.signal_factory import compute_combo_signal
+from utils.bar_frame import BarFrame, as_bar_frame
+from utils.date_time import ms_to_kst_str
+
+
+def walk_forward_folds(
+    n_bars: int,
+    n_folds: int = WF_FOLDS,
+    window: str = WF_WINDOW,
+    is_oos_ratio: float = WF_IS_OOS_RATIO
+) -> List[Tuple[int, int, int, int]]:
+    """
+    fold별 (IS 시작, IS 끝, OOS 시작, OOS 끝) 행 번호를 만든다. (끝은 미포함)
+    OOS 구간은 겹치지 않고 이어지며 마지막 OOS는 마지막 봉에서 끝난다.
+
+    Args:
+        n_bars (int): 전체 봉 수
+        n_folds (int): fold 수
+        window (str): "rolling"(IS 길이 고정) 또는 "anchored"(IS 시작 = 0)
+        is_oos_ratio (float): 첫 fold IS 길이 / OOS 길이
+
+    Returns:
+        List[Tuple[int, int, int, int]]: fold 목록
+
+    Raises:
+        ValueError: window 값이 잘못됐거나 봉이 fold를 나누기에 부족한 경우
+    """
+    if window not in ("rolling", "anchored"):
+        raise ValueError(f"[run_walk_forward] WF_WINDOW는 rolling/anchored 중 하나여야 합니다: {window}")
+    n_folds = max(1, int(n_folds))
+    oos_len = int(n_bars // (is_oos_ratio + n_folds))
+    if oos_len < 1:
+        raise ValueError(f"[run_walk_forward] 봉 {n_bars}개로 fold {n_folds}개를 만들 수 없습니다.")
+    # 나머지 봉은 첫 IS에 붙여 마지막 OOS가 끝 봉에서 끝나게 한다
+    is_len = n_bars - n_folds * oos_len
+
+    folds = []
+    for k in range(n_folds):
+        oos_start = is_len + k * oos_len
+        is_start = oos_start - is_len if window == "rolling" else 0
+        folds.append((is_start, oos_start, oos_start, oos_start + oos_len))
+    return folds
+
+
+def backtest_score(
+    frame: BarFrame,
+    signals: np.ndarray,
+    timeframe: str,
+    start_capital: float,
+    allow_short: bool = ALLOW_SHORT
+) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """엔진 실행 + 성과 계산. (엔진 결과, calculate_metrics 결과)"""
+    engine_out = run_backtest(df=frame, signals=signals, start_capital=start_capital, allow_short=allow_short)
+    score = calculate_metrics(
+        equity_curve=engine_out["equity_curve"],
+        daily_returns=engine_out["daily_returns"],
+        start_capital=start_capital,
+        trades=engine_out["trades"],
+        timeframe=timeframe
+    )
+    return engine_out, score
+
+
+def _evaluate_combo_folds(
+    frame: BarFrame,
+    combo_item: Tuple[int, List[Dict[str, Any]]],
+    folds: List[Tuple[int, int, int, int]],
+    timeframe: str,
+    start_capital: float,
+    metric: str
+) -> Dict[str, Any]:
+    """
+    콤보 시그널을 전체 기간에서 한 번 만들고, fold별 IS 구간으로 잘라 엔진만 다시 돌린다.
+    (워커 풀에서 실행되므로 모듈 수준 함수)
+
+    Args:
+        frame (BarFrame): 전체 기간
+        combo_item (Tuple[int, List[Dict[str, Any]]]): (combo_id, 콤보)
+        folds (List[Tuple[int, int, int, int]]): walk_forward_folds 결과
+        timeframe (str): 타임프레임
+        start_capital (float): 초기자본
+        metric (str): calculate_metrics 키
+
+    Returns:
+        Dict[str, Any]: {"combo_id", "fold_scores": fold별 IS metric 값}
+    """
+    combo_id, combo = combo_item
+    signals = compute_combo_signal(frame, combo)
+    fold_scores = []
+    for is_start, is_stop, _, _ in folds:
+        _, score = backtest_score(frame.slice(is_start, is_stop), signals[is_start:is_stop],
+                                  timeframe, start_capital)
+        fold_scores.append(float(score[metric]))
+    return {"combo_id": combo_id, "fold_scores": fold_scores}
+
+
+def run_walk_forward(
+    df_all: Union[BarFrame, pd.DataFrame],
+    combos: Union[Mapping[int, List[Dict[str, Any]]], List[List[Dict[str, Any]]]],
+    timeframe: str,
+    start_capital: float = START_CAPITAL,
+    pool: Optional[BacktestWorkerPool] = None,
+    on_rows: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    checkpoint: Optional[SweepCheckpoint] = None,
+    n_folds: int = WF_FOLDS,
+    window: str = WF_WINDOW,
+    is_oos_ratio: float = WF_IS_OOS_RATIO,
+    metric: str = WF_METRIC
+) -> Tuple[List[Dict[str, Any]], pd.DataFrame]:
+    """
+    워크포워드 최적화를 수행한다.
+    1) 전체 기간을 walk_forward_folds()로 나눈다.
+    2) 모든 콤보를 워커에서 평가해 fold별 IS metric 최고 콤보를 고른다. (같으면 combo_id가 작은 쪽)
+    3) fold마다 최고 콤보의 OOS 구간을 앞 fold의 마지막 자산으로 이어서 백테스트한다.
+       (fold 경계에서 포지션은 청산된 상태로 새로 시작)
+    4) 이어 붙인 OOS 자산 곡선의 성과와 같은 구간 Buy & Hold를 함께 남긴다.
+
+    Args:
+        df_all (Union[BarFrame, pd.DataFrame]): 전체 기간 데이터 (OHLCV + 지표)
+        combos (Union[Mapping[int, List[Dict[str, Any]]], List[List[Dict[str, Any]]]]):
+            콤보 카탈로그(ComboSpace 등 combo_id → 조합) 또는 조합 리스트
+        timeframe (str): 타임프레임
+        start_capital (float, optional): 초기자본
+        pool (BacktestWorkerPool, optional): 재사용 워커 풀
+        on_rows (Callable, optional): 주면 결과 행을 이 함수에 넘기고 rows는 빈 리스트
+        checkpoint (SweepCheckpoint, optional): 콤보별 fold 점수 저장/건너뛰기 (phase "wf")
+        n_folds (int, optional): fold 수
+        window (str, optional): "rolling" 또는 "anchored"
+        is_oos_ratio (float, optional): 첫 fold IS 길이 / OOS 길이
+        metric (str, optional): 선택 기준 (calculate_metrics 키)
+
+    Returns:
+        Tuple[List[Dict[str, Any]], pd.DataFrame]:
+            - 결과 행: fold별 행(timeframe, fold, 구간, is_*, oos_*, combo_id) +
+              "{tf}(WF)" 연결 OOS 행 + "{tf}(B/H)" 같은 구간 Buy & Hold 행
+            - 연결 OOS 자산 곡선 (open_time, timestamp_kst, fold, equity)
+    """
+    if df_all.empty:
+        return [], pd.DataFrame()
+    frame = as_bar_frame(df_all)
+    folds = walk_forward_folds(len(frame), n_folds, window, is_oos_ratio)
+    ot = frame.open_time
+    print(f"[INFO] WF({timeframe}) {window}, fold {len(folds)}개, metric={metric}, "
+          f"전체 {ms_to_kst_str(ot[0])} ~ {ms_to_kst_str(ot[-1])}")
+
+    # 1) 콤보별 fold 점수 → fold별 최고 콤보 (콤보 순서대로 들어오므로 더 클 때만 교체)
+    best_score = [-math.inf] * len(folds)
+    best_id: List[Optional[int]] = [None] * len(folds)
+
+    def _collect(chunk: List[Dict[str, Any]]) -> None:
+        for r in chunk:
+            for k, v in enumerate(r["fold_scores"]):
+                if v is not None and not math.isnan(v) and (best_id[k] is None or v > best_score[k]):
+                    best_score[k], best_id[k] = v, r["combo_id"]
+
+    items = as_combo_items(combos)
+    run_kwargs = dict(folds=folds, timeframe=timeframe, start_capital=start_capital, metric=metric)
+    if checkpoint is not None:
+        checkpoint.map_combos(_evaluate_combo_folds, frame, items, phase="wf", pool=pool,
+                              on_chunk=_collect, **run_kwargs)
+    else:
+        evaluate_combos(_evaluate_combo_folds, frame, items, pool=pool, on_chunk=_collect, **run_kwargs)
+
+    # 2) fold별 최고 콤보로 OOS 구간을 이어서 백테스트
+    catalog = combos if isinstance(combos, Mapping) else dict(items)
+    rows: List[Dict[str, Any]] = []
+    eq_parts: List[pd.DataFrame] = []
+    ret_parts: List[np.ndarray] = []
+    all_trades: List[Dict[str, Any]] = []
+    capital = start_capital
+    for k, (is_start, is_stop, oos_start, oos_stop) in enumerate(folds):
+        cid = best_id[k]
+        row = {
+            "timeframe": timeframe,
+            "fold": k + 1,
+            "is_start": ms_to_kst_str(ot[is_start]),
+            "is_end": ms_to_kst_str(ot[is_stop - 1]),
+            "oos_start": ms_to_kst_str(ot[oos_start]),
+            "oos_end": ms_to_kst_str(ot[oos_stop - 1])
+        }
+        oos_frame = frame.slice(oos_start, oos_stop)
+        if cid is None:
+            # 모든 콤보의 IS 점수가 NaN → 이 fold는 관망
+            signals = np.zeros(len(frame), dtype=int)
+            row.update({"is_return": None, "is_trades": None, "is_sharpe": None, "is_mdd": None})
+        else:
+            signals = compute_combo_signal(frame, catalog[cid])
+            _, is_score = backtest_score(frame.slice(is_start, is_stop), signals[is_start:is_stop],
+                                         timeframe, start_capital)
+            row.update({
+                "is_return": is_score["Return"],
+                "is_trades": is_score["Trades"],
+                "is_sharpe": is_score["Sharpe"],
+                "is_mdd": is_score["MDD"]
+            })
+        engine_out, oos_score = backtest_score(oos_frame, signals[oos_start:oos_stop], timeframe, capital)
+        row.update({
+            "oos_start_cap": oos_score["StartCapital"],
+            "oos_end_cap": oos_score["EndCapital"],
+            "oos_return": oos_score["Return"],
+            "oos_trades": oos_score["Trades"],
+            "oos_sharpe": oos_score["Sharpe"],
+            "oos_mdd": oos_score["MDD"],
+            "combo_id": cid
+        })
+        rows.append(row)
+        print(f"[INFO] WF({timeframe}) fold {k + 1}/{len(folds)}: IS {row['is_start']} ~ {row['is_end']}, "
+              f"OOS {row['oos_start']} ~ {row['oos_end']}, combo_id={cid}, oos_return={oos_score['Return']:.4f}")
+
+        eq_parts.append(pd.DataFrame({
+            "open_time": oos_frame.open_time,
+            "fold": k + 1,
+            "equity": np.asarray(engine_out["equity_curve"], dtype=np.float64)
+        }))
+        ret_parts.append(np.asarray(engine_out["daily_returns"], dtype=np.float64))
+        all_trades.extend(engine_out["trades"])
+        capital = oos_score["EndCapital"]
+
+    # 3) 연결 OOS 곡선 성과 + 같은 구간 Buy & Hold
+    equity_df = pd.concat(eq_parts, ignore_index=True)
+    equity_df.insert(1, "timestamp_kst", [ms_to_kst_str(t) for t in equity_df["open_time"]])
+    wf_score = calculate_metrics(
+        equity_curve=equity_df["equity"].to_numpy(),
+        daily_returns=np.concatenate(ret_parts),
+        start_capital=start_capital,
+        trades=all_trades,
+        timeframe=timeframe
+    )
+    span_start, span_stop = folds[0][2], folds[-1][3]
+    span = {"oos_start": ms_to_kst_str(ot[span_start]), "oos_end": ms_to_kst_str(ot[span_stop - 1])}
+    _, bh_score = backtest_score(frame.slice(span_start, span_stop), [1] * (span_stop - span_start),
+                                 timeframe, start_capital, allow_short=False)
+    for label, score, cid in ((f"{timeframe}(WF)", wf_score, None),
+                              (f"{timeframe}(B/H)", bh_score, BUY_AND_HOLD_COMBO_ID)):
+        rows.append({
+            "timeframe": label,
+            "fold": "all",
+            **span,
+            "oos_start_cap": score["StartCapital"],
+            "oos_end_cap": score["EndCapital"],
+            "oos_return": score["Return"],
+            "oos_trades": score["Trades"],
+            "oos_sharpe": score["Sharpe"],
+            "oos_mdd": score["MDD"],
+            "combo_id": cid
+        })
+    print(f"[INFO] WF({timeframe}) 연결 OOS: return={wf_score['Return']:.4f}, sharpe={wf_score['Sharpe']:.4f}, "
+          f"mdd={wf_score['MDD']:.4f} (B/H return={bh_score['Return']:.4f})")
+
+    if on_rows is not None:
+        on_rows(rows)
+        return [], equity_df
+    return rows, equity_df
@@ -0,0 +1,130 @@
+# gptbitcoin/backtest/signal_dedup.py
+"""
+최종 시그널이 같은 콤보를 묶어 백테스트를 한 번만 하는 중복 제거 단계.
+
+- 1단계: 워커에서 콤보별 최종 시그널(int8 배열)의 해시만 계산한다. (벡터 연산이라 엔진보다 훨씬 빠름)
+- 2단계: 해시별 첫 콤보(대표)만 평가 함수(fn)로 백테스트한다.
+- 3단계: 대표 결과 행을 같은 해시의 모든 콤보에 combo_id만 바꿔 콤보 순서대로 넘긴다.
+
+평가 함수 결과는 시그널과 kwargs(구간, 자본 등)로만 정해지고 콤보별로 다른 값은 combo_id뿐이어야 한다.
+(run_is/run_oos/run_nosplit의 _evaluate_combo_* 가 그렇다)
+예) 테스트 구간에서 한쪽 지표가 전부 NaN(0)인 2개 조합, "and" 결합에서 한쪽 지표가 결과를 좌우하는 조합.
+
+콤보 공간이 커도 메모리가 일정하도록 SIGNAL_DEDUP_BLOCK_COMBOS 단위로 처리한다. (블록 안에서만 중복 제거)
+"""
+
+import hashlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.config import SIGNAL_DEDUP, SIGNAL_DEDUP_BLOCK_COMBOS
+from backtest.worker_pool import BacktestWorkerPool, map_combos
+from strategies.signal_factory import compute_combo_signal
+from utils.bar_frame import BarFrame
+
+# 실행 전체 누적 통계 (main.py 종료 시 출력)
+_STATS = {"combos": 0, "unique": 0}
+
+
+def _signal_digest(frame: BarFrame, combo_item: Tuple[int, List[Dict[str, Any]]]) -> bytes:
+    """
+    콤보의 최종 시그널 해시. (워커에서 실행되므로 모듈 수준 함수)
+
+    Args:
+        frame (BarFrame): 평가 구간
+        combo_item (Tuple[int, List[Dict[str, Any]]]): (combo_id, 콤보)
+
+    Returns:
+        bytes: 16바이트 해시
+    """
+    signals = np.ascontiguousarray(compute_combo_signal(frame, combo_item[1]), dtype=np.int8)
+    return hashlib.blake2b(signals.tobytes(), digest_size=16).digest()
+
+
+def map_combos_dedup(
+    fn: Callable[..., Dict[str, Any]],
+    frame: BarFrame,
+    items: Sequence[Tuple[int, List[Dict[str, Any]]]],
+    pool: Optional[BacktestWorkerPool] = None,
+    on_chunk: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    **kwargs
+) -> List[Dict[str, Any]]:
+    """
+    worker_pool.map_combos와 같지만, 최종 시그널이 같은 콤보는 한 번만 백테스트한다.
+
+    Args:
+        fn (Callable): 콤보 1개를 평가하는 함수 (결과 행에 combo_id 포함)
+        frame (BarFrame): 평가 구간
+        items (Sequence[Tuple[int, List[Dict[str, Any]]]]): (combo_id, 콤보) 시퀀스
+        pool (BacktestWorkerPool, optional): 재사용 워커 풀 (None이면 호출마다 임시 풀)
+        on_chunk (Callable, optional): 주면 블록 결과를 콤보 순서대로 넘기고 모으지 않는다.
+        **kwargs: fn에 그대로 넘길 인자
+
+    Returns:
+        List[Dict[str, Any]]: 콤보 순서의 결과 리스트 (on_chunk를 주면 빈 리스트)
+    """
+    out: List[Dict[str, Any]] = []
+    n_total = 0
+    n_unique = 0
+
+    for b0 in range(0, len(items), SIGNAL_DEDUP_BLOCK_COMBOS):
+        block = items[b0:b0 + SIGNAL_DEDUP_BLOCK_COMBOS]
+
+        # 1) 시그널 해시
+        digests = map_combos(_signal_digest, frame, block, pool=pool)
+
+        # 2) 해시별 대표 콤보만 백테스트
+        rep_index: Dict[bytes, int] = {}
+        reps = []
+        for item, d in zip(block, digests):
+            if d not in rep_index:
+                rep_index[d] = len(reps)
+                reps.append(item)
+        rep_rows = map_combos(fn, frame, reps, pool=pool, **kwargs)
+
+        # 3) 같은 해시의 모든 콤보로 펼침 (combo_id만 교체, 칼럼 위치 유지)
+        rows = []
+        for (cid, _), d in zip(block, digests):
+            row = dict(rep_rows[rep_index[d]])
+            row["combo_id"] = cid
+            rows.append(row)
+
+        n_total += len(block)
+        n_unique += len(reps)
+        if on_chunk is not None:
+            on_chunk(rows)
+        else:
+            out.extend(rows)
+
+    _STATS["combos"] += n_total
+    _STATS["unique"] += n_unique
+    if n_total:
+        saved = n_total - n_unique
+        print(f"[signal_dedup] {kwargs.get('timeframe', '')}: 콤보 {n_total}개 → 고유 시그널 {n_unique}개 "
+              f"(백테스트 {saved}개 생략, {saved / n_total * 100:.1f}%)")
+    return out
+
+
+def evaluate_combos(
+    fn: Callable[..., Dict[str, Any]],
+    frame: BarFrame,
+    items: Sequence[Tuple[int, List[Dict[str, Any]]]],
+    pool: Optional[BacktestWorkerPool] = None,
+    on_chunk: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    **kwargs
+) -> List[Dict[str, Any]]:
+    """SIGNAL_DEDUP이면 map_combos_dedup, 아니면 worker_pool.map_combos로 콤보를 평가한다."""
+    if SIGNAL_DEDUP:
+        return map_combos_dedup(fn, frame, items, pool=pool, on_chunk=on_chunk, **kwargs)
+    return map_combos(fn, frame, items, pool=pool, on_chunk=on_chunk, **kwargs)
+
+
+def dedup_report() -> str:
+    """실행 전체의 중복 제거 통계 문자열."""
+    total, unique = _STATS["combos"], _STATS["unique"]
+    if not total:
+        return "[signal_dedup] 평가한 콤보 없음"
+    saved = total - unique
+    return (f"[signal_dedup] 전체: 콤보 {total}개 중 고유 시그널 {unique}개만 백테스트 "
+            f"({saved}개, {saved / total * 100:.1f}% 절약)")
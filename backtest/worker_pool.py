@@ -0,0 +1,284 @@
+# gptbitcoin/backtest/worker_pool.py
+"""
+IS/OOS/타임프레임 전체에서 재사용하는 백테스트 워커 풀.
+
+- main.py에서 한 번 만들고, 모든 타임프레임/구간(IS, OOS, No-Split)의 콤보 작업을 같은 워커에 보낸다.
+  (joblib Parallel을 호출마다 새로 띄우던 방식의 워커 기동, 모듈 import, 데이터 전송 비용 제거)
+- initializer(_init_worker)가 워커 기동 시 numpy/pandas/엔진/시그널 모듈을 미리 import한다.
+- share_frame()은 타임프레임마다 BarFrame을 임시 폴더의 읽기 전용 파일(np.memmap)로 한 번만 내보낸다.
+  공유된 BarFrame(과 그 slice인 IS/OOS 구간)은 pickle 시 (스펙, 행 구간)만 전달되고,
+  워커는 처음 받을 때 파일을 매핑해 캐시해 둔다. (타임프레임당 워커별 1회)
+- 콤보는 청크 단위로 묶어 보내 작업당 왕복 비용을 줄인다.
+- on_chunk 콜백을 주면 결과를 모으지 않고 청크가 끝나는 대로 (콤보 순서를 지켜) 넘겨준다.
+  (utils/result_sink.py로 바로 흘려보내 메모리 사용량을 청크 크기로 제한)
+"""
+
+import math
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config.config import BACKTEST_MAX_WORKERS, BACKTEST_CHUNKS_PER_WORKER, BACKTEST_SHARED_DIR
+from utils.bar_frame import BarFrame, BAR_FIELDS
+
+# 워커별로 매핑해 둔 공유 프레임 (spec.key → 전체 BarFrame), 최근 것만 유지
+_ATTACHED: "OrderedDict[str, BarFrame]" = OrderedDict()
+_MAX_ATTACHED = 2
+# main.py 파이프라인에서 준비 스레드(share_frame)와 저장 스레드(release_frame)가 함께 접근
+_ATTACH_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class SharedFrameSpec:
+    """
+    파일로 내보낸 BarFrame의 위치/모양 정보. (pickle로 워커에 전달)
+
+    Attributes:
+        key (str): 고유 키
+        folder (str): open_time.i8, values.f8 파일이 있는 폴더
+        n_rows (int): 봉 수
+        indicator_index (Dict[str, int]): 지표 칼럼명 → 지표 블록 행 번호
+    """
+    key: str
+    folder: str
+    n_rows: int
+    indicator_index: Dict[str, int]
+
+    def _load(self) -> BarFrame:
+        """파일을 읽기 전용으로 매핑해 전체 BarFrame을 만든다."""
+        n = self.n_rows
+        n_ind = len(self.indicator_index)
+        ot = np.memmap(os.path.join(self.folder, "open_time.i8"), dtype=np.int64, mode="r", shape=(n,))
+        values = np.memmap(os.path.join(self.folder, "values.f8"), dtype=np.float64, mode="r",
+                           shape=(len(BAR_FIELDS) - 1 + n_ind, n))
+        bars = {"open_time": ot}
+        for i, f in enumerate(BAR_FIELDS[1:]):
+            bars[f] = values[i]
+        return BarFrame(bars, values[len(BAR_FIELDS) - 1:], self.indicator_index, shared=self)
+
+    def attach(self, start: int, stop: int) -> BarFrame:
+        """
+        워커(또는 메인)에서 공유 프레임의 [start, stop) 구간을 얻는다.
+        같은 스펙은 프로세스당 한 번만 매핑한다.
+        """
+        with _ATTACH_LOCK:
+            frame = _ATTACHED.get(self.key)
+            if frame is None:
+                frame = self._load()
+                _ATTACHED[self.key] = frame
+                while len(_ATTACHED) > _MAX_ATTACHED:
+                    _ATTACHED.popitem(last=False)
+            else:
+                _ATTACHED.move_to_end(self.key)
+        return frame.slice(start, stop)
+
+
+def _init_worker() -> None:
+    """워커 기동 시 무거운 모듈을 미리 import한다."""
+    import pandas  # noqa: F401
+    import backtest.engine  # noqa: F401
+    import analysis.scoring  # noqa: F401
+    import strategies.signal_factory  # noqa: F401
+    try:
+        import pandas_ta  # noqa: F401
+    except ImportError:
+        pass
+
+
+def _run_chunk(
+    fn: Callable[..., Dict[str, Any]],
+    frame: BarFrame,
+    combos: Sequence[Any],
+    kwargs: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """워커에서 콤보 청크를 순서대로 평가한다."""
+    return [fn(frame, combo, **kwargs) for combo in combos]
+
+
+class BacktestWorkerPool:
+    """
+    ProcessPoolExecutor 기반의 재사용 워커 풀.
+
+    사용 예:
+        with BacktestWorkerPool() as pool:
+            frame = pool.share_frame(frame)
+            rows = pool.map_combos(_evaluate_combo, frame, combos, timeframe="1d")
+            pool.release_frame(frame)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = BACKTEST_MAX_WORKERS,
+        chunks_per_worker: int = BACKTEST_CHUNKS_PER_WORKER,
+        shared_dir: Optional[str] = BACKTEST_SHARED_DIR
+    ):
+        """
+        Args:
+            max_workers (int, optional): 워커 수 (None이면 CPU 코어 수)
+            chunks_per_worker (int): 워커당 청크 수 (클수록 부하 분산↑, 왕복 비용↑)
+            shared_dir (str, optional): 공유 파일 임시 폴더의 상위 경로 (None이면 /dev/shm 또는 OS 임시 폴더)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunks_per_worker = max(1, chunks_per_worker)
+        if shared_dir is None and os.path.isdir("/dev/shm"):
+            shared_dir = "/dev/shm"
+        self._tmp_root = tempfile.mkdtemp(prefix="gptbitcoin_pool_", dir=shared_dir)
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+        print(f"[worker_pool] 워커 {self.max_workers}개 시작 (shared={self._tmp_root})")
+
+    # ------------------------------------------------------------------
+    # 공유 데이터
+    # ------------------------------------------------------------------
+    def share_frame(self, frame: BarFrame) -> BarFrame:
+        """
+        BarFrame을 읽기 전용 파일로 내보내고, 그 파일을 매핑한 BarFrame을 돌려준다.
+        반환된 BarFrame과 그 slice는 워커로 보낼 때 배열을 복사하지 않는다.
+        (export용 비숫자 칼럼은 메인 프로세스에만 유지)
+
+        Args:
+            frame (BarFrame): 공유할 프레임
+
+        Returns:
+            BarFrame: 공유 파일 기반 프레임
+        """
+        if frame.is_shared or frame.empty:
+            return frame
+
+        key = uuid.uuid4().hex
+        folder = os.path.join(self._tmp_root, key)
+        os.makedirs(folder)
+        n = len(frame)
+        n_ind = frame.indicators.shape[0]
+
+        ot = np.memmap(os.path.join(folder, "open_time.i8"), dtype=np.int64, mode="w+", shape=(n,))
+        ot[:] = frame.open_time
+        ot.flush()
+        values = np.memmap(os.path.join(folder, "values.f8"), dtype=np.float64, mode="w+",
+                           shape=(len(BAR_FIELDS) - 1 + n_ind, n))
+        for i, f in enumerate(BAR_FIELDS[1:]):
+            values[i] = frame[f]
+        values[len(BAR_FIELDS) - 1:] = frame.indicators
+        values.flush()
+        del ot, values
+
+        index = {name: frame._index[name] for name in frame._index}
+        spec = SharedFrameSpec(key=key, folder=folder, n_rows=n, indicator_index=index)
+        shared = spec.attach(0, n)
+        # export용 비숫자 칼럼과 칼럼 순서는 원본 것을 유지
+        return BarFrame(
+            {f: shared[f] for f in BAR_FIELDS},
+            shared.indicators, index, frame._extras, frame.columns, spec, 0
+        )
+
+    def release_frame(self, frame: BarFrame) -> None:
+        """share_frame으로 만든 공유 파일을 지운다. (워커 쪽 매핑은 다음 프레임이 들어오면 정리됨)"""
+        spec = frame._shared
+        if spec is None:
+            return
+        with _ATTACH_LOCK:
+            _ATTACHED.pop(spec.key, None)
+        shutil.rmtree(spec.folder, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # 작업 실행
+    # ------------------------------------------------------------------
+    def map_combos(
+        self,
+        fn: Callable[..., Dict[str, Any]],
+        frame: BarFrame,
+        combos: Sequence[Any],
+        on_chunk: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        fn(frame, combo, **kwargs)를 모든 콤보에 대해 워커에서 실행하고, 콤보 순서대로 결과를 모은다.
+        fn은 pickle 가능한 모듈 수준 함수여야 한다.
+
+        Args:
+            fn (Callable): 콤보 1개를 평가하는 함수
+            frame (BarFrame): 평가 구간 (공유되지 않았으면 이 호출 동안만 임시로 공유)
+            combos (Sequence[Any]): 콤보 목록
+            on_chunk (Callable, optional): 주면 청크 결과를 콤보 순서대로 이 함수에 넘기고 모으지 않는다.
+                (앞 청크가 아직이면 끝난 뒤 청크는 잠시 보관했다가 순서가 되면 넘김)
+            **kwargs: fn에 그대로 넘길 인자
+
+        Returns:
+            List[Dict[str, Any]]: 콤보 순서의 결과 리스트 (on_chunk를 주면 빈 리스트)
+        """
+        if not combos:
+            return []
+
+        temp_shared = not frame.is_shared
+        if temp_shared:
+            frame = self.share_frame(frame)
+
+        try:
+            n_chunks = min(len(combos), self.max_workers * self.chunks_per_worker)
+            size = math.ceil(len(combos) / n_chunks)
+            futures = {}
+            for ci, start in enumerate(range(0, len(combos), size)):
+                # list slice는 복사본, ComboItems(combo_generator_for_backtest)는 id 구간 view로 전달
+                chunk = combos[start:start + size]
+                futures[self._executor.submit(_run_chunk, fn, frame, chunk, kwargs)] = ci
+
+            results: List[Optional[List[Dict[str, Any]]]] = [None] * len(futures)
+            next_emit = 0
+            step = max(1, len(futures) // 10)
+            for done, fut in enumerate(as_completed(futures), start=1):
+                results[futures[fut]] = fut.result()
+                if on_chunk is not None:
+                    # 순서가 된 청크부터 넘기고 메모리에서 뺀다
+                    while next_emit < len(results) and results[next_emit] is not None:
+                        on_chunk(results[next_emit])
+                        results[next_emit] = []
+                        next_emit += 1
+                if done % step == 0 or done == len(futures):
+                    print(f"[worker_pool] {done}/{len(futures)} 청크 완료 ({len(combos)} 콤보)")
+        finally:
+            if temp_shared:
+                self.release_frame(frame)
+
+        if on_chunk is not None:
+            return []
+        return [row for chunk_rows in results for row in chunk_rows]
+
+    # ------------------------------------------------------------------
+    # 종료
+    # ------------------------------------------------------------------
+    def shutdown(self) -> None:
+        """워커를 종료하고 공유 파일 폴더를 지운다."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        _ATTACHED.clear()
+        shutil.rmtree(self._tmp_root, ignore_errors=True)
+
+    def __enter__(self) -> "BacktestWorkerPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
+
+
+def map_combos(
+    fn: Callable[..., Dict[str, Any]],
+    frame: BarFrame,
+    combos: Sequence[Any],
+    pool: Optional[BacktestWorkerPool] = None,
+    on_chunk: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    **kwargs
+) -> List[Dict[str, Any]]:
+    """
+    pool이 있으면 그 워커에서, 없으면 이번 호출용 임시 풀을 만들어 콤보를 평가한다.
+    (run_is/run_oos/run_nosplit을 단독으로 호출할 때의 호환용)
+    """
+    if pool is not None:
+        return pool.map_combos(fn, frame, combos, on_chunk=on_chunk, **kwargs)
+    with BacktestWorkerPool() as tmp_pool:
+        return tmp_pool.map_combos(fn, frame, combos, on_chunk=on_chunk, **kwargs)
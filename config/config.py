@@ -18,6 +18,15 @@ load_dotenv()
 BINANCE_API_KEY = os.getenv("BINANCE_ACCESS_KEY")
 BINANCE_SECRET_KEY = os.getenv("BINANCE_SECRET_KEY")
 
+# 바이낸스 선물 시세(REST) 기본 URL. 로컬 모의 서버로 돌리려면 .env에서 교체
+BINANCE_FAPI_BASE_URL = os.getenv("BINANCE_FAPI_BASE_URL", "https://fapi.binance.com")
+
+# 과거 구간 병렬 수집(backfill) 설정 (data/fetch_data.fetch_ohlcv_concurrent)
+BACKFILL_MAX_WORKERS = 8            # 동시에 요청할 윈도우 수 (1이면 순차 수집)
+BINANCE_WEIGHT_LIMIT_1M = 2400      # 바이낸스 선물 REQUEST_WEIGHT 한도(1분)
+BINANCE_WEIGHT_SAFETY_RATIO = 0.8   # 한도의 이 비율까지만 사용
+OHLCV_COMMIT_BATCH_ROWS = 50_000    # 수집 중 DB 커밋 단위(행 수), 중단 시 커밋된 봉까지는 보존
+
 # 거래소 및 레버리지 설정
 MARGIN_TYPE = "ISOLATED"  # 마진 유형 (예: ISOLATED)
 LEVERAGE = 1              # 레버리지 배수
@@ -28,18 +37,35 @@ COMMISSION_RATE = 0.0004  # 커미션 비율
 SLIPPAGE_RATE = 0.0002    # 슬리피지 비율
 START_CAPITAL = 100_000   # 백테스트 시작 자본
 
+# 백테스트 워커 풀 (backtest/worker_pool.py, main.py에서 한 번 만들어 모든 타임프레임/구간에 재사용)
+BACKTEST_MAX_WORKERS = None       # 워커 프로세스 수 (None이면 CPU 코어 수)
+BACKTEST_CHUNKS_PER_WORKER = 4    # 콤보 목록을 워커당 몇 청크로 나눠 보낼지
+BACKTEST_SHARED_DIR = None        # 공유 데이터 임시 폴더 상위 경로 (None이면 /dev/shm 또는 OS 임시 폴더)
+PIPELINE_TIMEFRAMES = True        # main.py: 현재 타임프레임 스윕 중 다음 타임프레임 DB 업데이트/지표 계산을 미리 수행
+SIGNAL_DEDUP = True               # 최종 시그널이 같은 콤보는 한 번만 백테스트 (backtest/signal_dedup.py)
+SIGNAL_DEDUP_BLOCK_COMBOS = 20_000  # 시그널 중복 제거 단위(콤보 수), 블록마다 결과를 넘김
+
 # 심볼, 타임프레임 관련
 SYMBOL = "BTCUSDT"        # 기본 심볼
 TIMEFRAMES = ["1d", "4h", "1h", "15m"]  # 사용할 타임프레임 목록
 # TIMEFRAMES = ["1d"]       # 테스트용 삭제 금지
 
+# 로컬 리샘플링 (data/resample.py)
+#   RESAMPLED_TIMEFRAMES의 타임프레임은 API에서 받지 않고 DB에 저장된
+#   RESAMPLE_BASE_TIMEFRAME 봉을 UTC 경계로 집계해 만든다. (빈 리스트면 모두 API 수집)
+#   기본은 빈 리스트(API 수집). 켜기 전에 리샘플 봉이 거래소 봉과 같은지 확인할 것.
+#   (오프라인: test/resample_test.py, 실거래소: data/resample.py __main__)
+RESAMPLE_BASE_TIMEFRAME = "15m"
+RESAMPLED_TIMEFRAMES = []
+# RESAMPLED_TIMEFRAMES = ["1d", "4h", "1h"]  # 로컬 리샘플링 사용 예 삭제 금지
+
 # 바이낸스 비트코인 선물 오픈일 (API 요청 시 구간 참조, UTC 기준)
 EXCHANGE_OPEN_DATE = "2019-09-08 00:00:00"
 
 # DB_BOUNDARY_DATE:
-#   DB에 저장할 때 old_data/recent_data를 분리하는 기준 시점(UTC).
-#   old_data: open_time < DB_BOUNDARY_DATE
-#   recent_data: open_time >= DB_BOUNDARY_DATE
+#   DB(ohlcv 테이블)에 저장할 때 봉인(sealed) 여부를 가르는 기준 시점(UTC).
+#   sealed=1: open_time < DB_BOUNDARY_DATE (recent 갱신 시 절대 수정하지 않음)
+#   sealed=0: open_time >= DB_BOUNDARY_DATE
 DB_BOUNDARY_DATE = "2025-02-01 00:00:00"
 
 # USE_IS_OOS:
@@ -54,6 +80,54 @@ USE_IS_OOS = True
 #   open_time >= IS_OOS_BOUNDARY_DATE => OOS 구간
 IS_OOS_BOUNDARY_DATE = subtract_months(today(), 1)
 
+# IS_SEARCH_MODE:
+#   "grid"    : 모든 콤보를 IS 전체 구간에서 평가 (기존 방식)
+#   "halving" : successive halving (backtest/run_is_halving.py)
+#               IS 끝부분 짧은 구간에서 모든 후보를 평가 → 상위 1/HALVING_ETA만 남기고 구간을 HALVING_ETA배로 늘려 재평가
+#               → 마지막 IS 전체 구간까지 살아남은 콤보만 IS 결과로 남기고 OOS 평가
+#   "ga"      : 유전 알고리즘 탐색 (backtest/run_is_ga.py)
+#               GA_COMBO_SIZES 크기 콤보를 (지표, 파라미터 위치) 유전자로 보고 교차/돌연변이로 탐색
+#               → 적합도 상위 GA_TOP_K개만 IS 결과로 남기고 OOS 평가
+IS_SEARCH_MODE = "grid"
+HALVING_ETA = 3                  # 단계마다 남길 비율의 역수 / 구간 배수
+HALVING_MIN_FRACTION = 1 / 9     # 첫 단계 평가 구간 = IS 봉 수 × 이 비율
+HALVING_MIN_BARS = 50            # 이보다 짧은 단계는 생략
+HALVING_MAX_CANDIDATES = None    # 첫 단계 후보 수 상한(예산), 넘으면 HALVING_SEED로 표본 추출 (None이면 전체)
+HALVING_METRIC = "is_sharpe"     # 순위 기준 (is_sharpe, is_return 등 IS 결과 칼럼)
+HALVING_SEED = 42                # 후보 표본 추출 시드
+
+# GA 탐색 (IS_SEARCH_MODE = "ga")
+GA_COMBO_SIZES = [3, 4, 5]       # 콤보 크기 (전수 조합이 불가능한 크기)
+GA_POPULATION = 200              # 세대당 개체 수
+GA_GENERATIONS = 30              # 최대 세대 수
+GA_PATIENCE = 10                 # 최고 적합도가 이 세대 수 동안 안 오르면 조기 종료 (None이면 끝까지)
+GA_ELITE = 10                    # 그대로 다음 세대로 넘길 상위 개체 수
+GA_TOURNAMENT = 3                # 토너먼트 선택 크기
+GA_CROSSOVER_RATE = 0.9          # 교차 확률 (아니면 부모 1 복제)
+GA_MUTATION_RATE = 0.2           # 유전자별 파라미터 변이 확률 / 개체별 지표 교체 확률
+GA_FITNESS_METRIC = "is_sharpe"  # 적합도 (IS 결과 칼럼, NaN은 최하위)
+GA_TOP_K = 50                    # IS 결과로 남기고 OOS로 넘길 콤보 수
+GA_SEED = 42                     # 난수 시드
+
+# USE_WALK_FORWARD:
+#   True이면 USE_IS_OOS/IS_OOS_BOUNDARY_DATE 대신 워크포워드 최적화 (backtest/run_walk_forward.py)
+#   전체 기간을 WF_FOLDS개의 IS/OOS fold로 나눠 fold마다 IS 최적 콤보를 고르고,
+#   그 콤보의 OOS 구간들을 이어 붙여 하나의 아웃샘플 자산 곡선을 만든다.
+#   (지표/콤보 시그널은 전체 기간에서 한 번만 계산하고 fold마다 잘라 엔진만 다시 실행)
+USE_WALK_FORWARD = False
+WF_FOLDS = 5                     # OOS 구간(fold) 수
+WF_WINDOW = "rolling"            # "rolling": IS 길이 고정으로 이동 / "anchored": IS 시작을 첫 봉에 고정
+WF_IS_OOS_RATIO = 4              # 첫 fold의 IS 길이 ≈ OOS 길이 × 이 값
+WF_METRIC = "Sharpe"             # fold별 IS 최적 콤보 선택 기준 (calculate_metrics 키: Sharpe, Return 등)
+
+# USE_BOUNDARY_SWEEP:
+#   True이면 IS_OOS_BOUNDARY_DATE 하나 대신 BOUNDARY_SWEEP_DATES의 경계 후보를 한 번에 평가 (backtest/run_boundary_sweep.py)
+#   같은 지표 프레임과 콤보 시그널을 재사용해 경계마다 엔진만 다시 실행하고,
+#   경계별 IS 순위와 OOS 순위의 Spearman 상관계수를 보고한다. (USE_WALK_FORWARD가 우선)
+USE_BOUNDARY_SWEEP = False
+BOUNDARY_SWEEP_DATES = [subtract_months(today(), m) for m in (1, 2, 3)]  # 경계 후보 (UTC)
+BOUNDARY_SWEEP_METRIC = "Sharpe"  # 순위 기준 (calculate_metrics 키: Sharpe, Return 등)
+
 # 백테스트 전체 기간 (UTC)
 # START_DATE = "2024-11-10 00:00:00"  # 시작
 START_DATE = subtract_months(today(), 4)
@@ -64,9 +138,42 @@ END_DATE = today()                  # 종료 (오늘 날짜를 기본값)
 RESULTS_DIR = "results"   # 백테스트 결과가 저장될 폴더
 LOGS_DIR = "logs"         # 로그 파일 폴더
 
+# 성과 결과 저장소 (utils/result_sink.py)
+#   main.py는 성과 행을 메모리에 모으지 않고 워커 청크가 끝날 때마다 이 SQLite 파일에 추가한다.
+#   실행마다 run_id로 구분되며, 중간에 중단돼도 커밋된 청크까지는 남는다.
+RESULT_SINK_PATH = os.path.join(RESULTS_DIR, "perf_results.sqlite")
+RESULT_SINK_READ_CHUNK_ROWS = 50_000    # 저장소에서 읽어 CSV로 쓸 때 청크 행 수
+RESULT_EXCEL_MAX_ROWS = 200_000         # 최종 성과 행이 이보다 많으면 엑셀(서식) 생략, CSV만 저장
+
+# 스윕 체크포인트 (backtest/checkpoint.py)
+#   (데이터 지문, 타임프레임, 구간, 엔진 설정, 콤보) 단위로 콤보 결과를 저장해 두고,
+#   재시작하거나 INDICATOR_CONFIG에 파라미터를 추가했을 때 이미 계산한 콤보는 건너뛴다.
+USE_SWEEP_CHECKPOINT = True
+SWEEP_CHECKPOINT_PATH = os.path.join(RESULTS_DIR, "sweep_checkpoint.sqlite")
+CHECKPOINT_BLOCK_COMBOS = 100_000   # 저장 여부 확인/건너뛰기를 이 콤보 수 단위로 처리 (메모리 상한)
+
 # DB 경로 설정
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # 프로젝트 최상위 디렉토리
 DATA_DIR = os.path.join(BASE_DIR, "data")                               # 데이터 폴더
 DB_FOLDER = os.path.join(DATA_DIR, "db")                                # DB 폴더
 os.makedirs(DB_FOLDER, exist_ok=True)
 DB_PATH = os.path.join(DB_FOLDER, "ohlcv.sqlite")                       # sqlite DB 파일 경로
+
+# 컬럼형 봉 저장소 (utils/bar_store.py, SQLite와 동기화되는 memmap용 사본)
+USE_BAR_STORE = True                                                    # 조회 시 컬럼형 저장소 사용 여부
+BAR_STORE_DIR = os.path.join(DB_FOLDER, "bars")                         # (symbol, timeframe)별 폴더 루트
+
+# 마감된 klines 페이지 디스크 캐시 (data/kline_cache.py)
+USE_KLINE_CACHE = True                                                  # REST klines 응답 캐시 사용 여부
+KLINE_CACHE_DIR = os.path.join(DATA_DIR, "cache", "klines")             # {symbol}/{interval}/{startTime}_{limit}.json.gz
+
+# 바이낸스 공개 데이터(data.binance.vision) klines 아카이브 (data/import_archive.py)
+#   예) {BINANCE_ARCHIVE_DIR}/futures/um/monthly/klines/BTCUSDT/15m/BTCUSDT-15m-2023-01.zip
+#   full 모드에서 아카이브가 있으면 먼저 가져오고, REST는 그 이후 꼬리 구간만 받는다.
+BINANCE_ARCHIVE_DIR = os.getenv("BINANCE_ARCHIVE_DIR", os.path.join(DATA_DIR, "archive"))
+ARCHIVE_IMPORT_WORKERS = 4                                              # 파일 파싱 프로세스 수
+
+# SQLite 연결 설정 (utils/db_utils.get_connection에서 사용)
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024   # mmap 크기(bytes)
+SQLITE_CACHE_SIZE_KB = 64 * 1024        # 페이지 캐시 크기(KiB)
+SQLITE_BUSY_TIMEOUT_MS = 30_000         # 다른 쓰기 작업 대기 시간(ms)
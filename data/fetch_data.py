@@ -3,22 +3,124 @@
 바이낸스 선물 API에서 OHLCV 데이터를 안전하게 수집하여 pandas DataFrame으로 반환하는 모듈.
 NaN(결측치)이 하나라도 발견되면 예외를 발생시킨다.
 (입력 파라미터인 start_time, end_time은 모두 UTC 기준 문자열로 가정한다.)
+
+- iter_ohlcv_chunks: 페이지를 순차적으로 이어 받아 페이지마다 numpy 배열 chunk로 내보내는 제너레이터
+- iter_ohlcv_chunks_concurrent: 전체 구간을 1500봉 윈도우로 나눠 병렬 요청하고 순서대로 chunk를 내보냄
+- get_ohlcv_from_binance / fetch_ohlcv_concurrent: 위 제너레이터를 이어 붙인 DataFrame 버전
+  (DB 저장은 update_data.py에서 chunk 단위로 바로 커밋하므로 전체를 메모리에 들고 있지 않는다.)
 """
 
 import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import pytz
-from binance.client import Client
 
-from config.config import (
-    BINANCE_API_KEY,
-    BINANCE_SECRET_KEY,
-)
+from config.config import BACKFILL_MAX_WORKERS
+from data.market_client import get_market_client
+from utils.date_time import timeframe_to_timedelta
 
 # 바이낸스 선물 API는 최대 1500봉(batch)만 요청 가능
 BATCH_LIMIT = 1500
 
+# chunk 배열 필드 (open_time: int64 UTC ms, 나머지: float64)
+OHLCV_CHUNK_FIELDS = ("open_time", "open", "high", "low", "close", "volume")
+
+
+def _ms_from_utc_str(dt_str: str) -> int:
+    """"YYYY-MM-DD HH:MM:SS"(UTC) 문자열을 UTC ms로 변환."""
+    naive = datetime.datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S")
+    return int(pytz.utc.localize(naive).timestamp() * 1000)
+
+
+def klines_to_arrays(klines: list) -> Dict[str, np.ndarray]:
+    """
+    klines 원본 1페이지를 필드별 numpy 배열 dict로 변환한다.
+
+    Args:
+        klines (list): klines 원본 리스트 (비어 있지 않아야 함)
+
+    Returns:
+        Dict[str, np.ndarray]: OHLCV_CHUNK_FIELDS 키의 배열 dict
+
+    Raises:
+        ValueError: 숫자로 바꿀 수 없는 값이나 결측치가 있으면 발생
+    """
+    n = len(klines)
+    open_time = np.fromiter((k[0] for k in klines), dtype=np.int64, count=n)
+    values = np.array([k[1:6] for k in klines], dtype=np.float64).reshape(n, 5)
+    if np.isnan(values).any():
+        raise ValueError("OHLCV 데이터 내 결측치(NaN)가 발견되었습니다.")
+    chunk = {"open_time": open_time}
+    for i, field in enumerate(OHLCV_CHUNK_FIELDS[1:]):
+        chunk[field] = values[:, i].copy()
+    return chunk
+
+
+def _chunks_to_df(chunks: Iterable[Dict[str, np.ndarray]]) -> pd.DataFrame:
+    """
+    chunk 배열들을 ["open_time", "open", "high", "low", "close", "volume"] DataFrame으로 이어 붙인다.
+
+    Raises:
+        ValueError: 결과가 비었으면 발생
+    """
+    chunk_list = list(chunks)
+    if not chunk_list:
+        raise ValueError("수집된 데이터가 없습니다. (빈 결과)")
+    return pd.DataFrame({
+        field: np.concatenate([c[field] for c in chunk_list])
+        for field in OHLCV_CHUNK_FIELDS
+    })
+
+
+def iter_ohlcv_chunks(
+    symbol: str,
+    timeframe: str,
+    start_ms: int,
+    end_ms: int,
+    base_url: Optional[str] = None
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    [start_ms, end_ms] 구간 klines를 페이지 순서대로 받아 페이지마다 배열 chunk로 내보낸다.
+    다음 페이지는 소비자가 chunk를 처리한 뒤에 요청하므로 메모리에는 1페이지만 남는다.
+
+    Args:
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "1d", "4h", "1h" 등
+        start_ms (int): UTC ms 시작
+        end_ms (int): UTC ms 종료
+        base_url (str, optional): REST 기본 URL
+
+    Yields:
+        Dict[str, np.ndarray]: klines_to_arrays 결과 (1페이지, 최대 BATCH_LIMIT봉)
+    """
+    # 프로세스 공용 클라이언트 (keep-alive 커넥션 재사용, 가중치 추적)
+    client = get_market_client(base_url)
+    current_ms = start_ms
+
+    while True:
+        klines = client.get_klines(
+            symbol=symbol,
+            interval=timeframe,
+            start_ms=current_ms,
+            end_ms=end_ms,
+            limit=BATCH_LIMIT
+        )
+        if not klines:
+            break
+
+        yield klines_to_arrays(klines)
+
+        next_time = klines[-1][0] + 1
+        if next_time > end_ms or len(klines) < BATCH_LIMIT:
+            break
+        current_ms = next_time
+
+
 def get_ohlcv_from_binance(
         symbol: str,
         timeframe: str,
@@ -44,69 +146,157 @@ def get_ohlcv_from_binance(
         ValueError: 데이터프레임에 결측치가 존재하거나, 수집 결과가 없으면 발생
     """
 
-    client = Client(api_key=BINANCE_API_KEY, api_secret=BINANCE_SECRET_KEY)
+    start_ms = _ms_from_utc_str(start_time)
+    end_ms = _ms_from_utc_str(end_time)
+    return _chunks_to_df(iter_ohlcv_chunks(symbol, timeframe, start_ms, end_ms))
+
+
+def split_kline_windows(
+    start_ms: int,
+    end_ms: int,
+    timeframe: str,
+    limit: int = BATCH_LIMIT
+) -> List[Tuple[int, int]]:
+    """
+    [start_ms, end_ms] 구간을 봉 경계에 맞춘 limit봉 단위 윈도우로 나눈다.
+    봉 간격이 고정된 타임프레임(분/시간/일)에서만 사용할 수 있다.
+
+    Args:
+        start_ms (int): UTC ms 시작
+        end_ms (int): UTC ms 종료
+        timeframe (str): 예) "15m", "1h", "1d"
+        limit (int): 윈도우당 최대 봉 수
 
-    # 입력받은 시간(UTC 문자열)을 datetime + pytz.utc 로 해석
-    dt_format = "%Y-%m-%d %H:%M:%S"
-    naive_start = datetime.datetime.strptime(start_time, dt_format)
-    naive_end = datetime.datetime.strptime(end_time, dt_format)
-    utc = pytz.utc
-    start_utc = utc.localize(naive_start)
-    end_utc = utc.localize(naive_end)
+    Returns:
+        List[Tuple[int, int]]: (윈도우 시작 open_time, 윈도우 마지막 open_time) 목록
+    """
+    tf = timeframe.strip().lower()
+    if not tf or tf[-1] not in ("m", "h", "d"):
+        raise ValueError(f"고정 간격이 아닌 타임프레임은 윈도우 분할 불가: {timeframe}")
 
-    start_ms = int(start_utc.timestamp() * 1000)
-    end_ms = int(end_utc.timestamp() * 1000)
+    step_ms = int(timeframe_to_timedelta(timeframe).total_seconds() * 1000)
+    # 첫 봉 경계(UTC 정렬)로 올림
+    first_ot = -(-start_ms // step_ms) * step_ms
+    windows = []
+    w_start = first_ot
+    while w_start <= end_ms:
+        w_end = min(w_start + (limit - 1) * step_ms, end_ms)
+        windows.append((w_start, w_end))
+        w_start += limit * step_ms
+    return windows
 
-    # 결과 담을 리스트
-    all_candles = []
 
-    # 수집 시작 지점
-    current_ms = start_ms
+def validate_kline_continuity(open_times: np.ndarray, step_ms: int) -> List[Tuple[int, int]]:
+    """
+    재조립된 open_time 배열이 오름차순·무중복인지 확인하고, 빠진 봉 구간을 반환한다.
 
-    while True:
-        klines = client.futures_klines(
-            symbol=symbol,
-            interval=timeframe,
-            startTime=current_ms,
-            endTime=end_ms,
-            limit=BATCH_LIMIT
-        )
-        if not klines:
-            break
+    Args:
+        open_times (np.ndarray): UTC ms 배열
+        step_ms (int): 봉 간격(ms)
 
-        all_candles.extend(klines)
-        last_open_time = klines[-1][0]
-        next_time = last_open_time + 1
+    Returns:
+        List[Tuple[int, int]]: 빠진 구간 (첫 누락 open_time, 마지막 누락 open_time) 목록
 
-        if next_time > end_ms:
-            break
+    Raises:
+        ValueError: 정렬이 깨졌거나 중복 봉이 있으면 발생
+    """
+    if len(open_times) < 2:
+        return []
+    diffs = np.diff(open_times)
+    if (diffs <= 0).any():
+        raise ValueError("재조립된 봉의 open_time이 오름차순이 아니거나 중복이 있습니다.")
+    gap_idx = np.flatnonzero(diffs != step_ms)
+    return [
+        (int(open_times[i] + step_ms), int(open_times[i + 1] - step_ms))
+        for i in gap_idx
+    ]
 
-        current_ms = next_time
-        if len(klines) < BATCH_LIMIT:
-            break
 
-    if not all_candles:
-        raise ValueError("수집된 데이터가 없습니다. (빈 결과)")
+def iter_ohlcv_chunks_concurrent(
+    symbol: str,
+    timeframe: str,
+    start_ms: int,
+    end_ms: int,
+    max_workers: int = BACKFILL_MAX_WORKERS,
+    base_url: Optional[str] = None
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    [start_ms, end_ms] 구간을 1500봉 윈도우로 나눠 스레드 풀에서 동시에 요청하고,
+    윈도우 순서대로 배열 chunk를 내보낸다.
+    미리 요청해 두는 윈도우는 max_workers의 2배까지로 제한해, 소비가 느려도 메모리가 일정하다.
 
-    df = pd.DataFrame(
-        all_candles,
-        columns=[
-            "open_time", "open", "high", "low", "close", "volume",
-            "close_time", "ignore1", "ignore2", "ignore3", "ignore4", "ignore5"
-        ]
-    )
-    # 필요한 칼럼만 사용
-    df = df[["open_time", "open", "high", "low", "close", "volume"]]
-
-    # 숫자 변환
-    df["open"] = pd.to_numeric(df["open"], errors="coerce")
-    df["high"] = pd.to_numeric(df["high"], errors="coerce")
-    df["low"] = pd.to_numeric(df["low"], errors="coerce")
-    df["close"] = pd.to_numeric(df["close"], errors="coerce")
-    df["volume"] = pd.to_numeric(df["volume"], errors="coerce")
-
-    # 결측치 검사
-    if df.isnull().any().any():
-        raise ValueError("OHLCV 데이터 내 결측치(NaN)가 발견되었습니다.")
+    Args:
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "15m", "1h", "1d" (고정 간격만 지원)
+        start_ms (int): UTC ms 시작
+        end_ms (int): UTC ms 종료
+        max_workers (int): 동시 요청 수
+        base_url (str, optional): REST 기본 URL
+
+    Yields:
+        Dict[str, np.ndarray]: 윈도우 1개 분량의 klines_to_arrays 결과
+    """
+    windows = split_kline_windows(start_ms, end_ms, timeframe)
+    client = get_market_client(base_url)
+
+    def _fetch_window(window: Tuple[int, int]) -> list:
+        w_start, w_end = window
+        return client.get_klines(symbol, timeframe, w_start, w_end, limit=BATCH_LIMIT)
+
+    workers = max(1, max_workers)
+    print(f"[fetch_data] 병렬 수집: {symbol} {timeframe}, 윈도우 {len(windows)}개, workers={workers}")
+    window_iter = iter(windows)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque(executor.submit(_fetch_window, w) for w in islice(window_iter, workers * 2))
+        while pending:
+            page = pending.popleft().result()
+            next_window = next(window_iter, None)
+            if next_window is not None:
+                pending.append(executor.submit(_fetch_window, next_window))
+            if page:
+                yield klines_to_arrays(page)
+
+
+def fetch_ohlcv_concurrent(
+    symbol: str,
+    timeframe: str,
+    start_time: str,  # "YYYY-MM-DD HH:MM:SS" (UTC 기준)
+    end_time: str,    # "YYYY-MM-DD HH:MM:SS" (UTC 기준)
+    max_workers: int = BACKFILL_MAX_WORKERS,
+    base_url: Optional[str] = None,
+    allow_gaps: bool = False
+) -> pd.DataFrame:
+    """
+    (symbol, timeframe, UTC의 start_time~end_time) 구간을 1500봉 윈도우로 미리 나누고,
+    각 윈도우를 스레드 풀에서 동시에 요청한 뒤 순서대로 재조립한다.
+    요청은 프로세스 공용 MarketDataClient(커넥션 풀, 가중치 추적/대기)를 통해 나간다.
+    재조립 후 open_time 연속성을 검사한다.
+
+    Args:
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "15m", "1h", "1d" (고정 간격만 지원)
+        start_time (str): "YYYY-MM-DD HH:MM:SS" (UTC 기준)
+        end_time (str): "YYYY-MM-DD HH:MM:SS" (UTC 기준)
+        max_workers (int): 동시 요청 수
+        base_url (str, optional): REST 기본 URL (None이면 config.BINANCE_FAPI_BASE_URL)
+        allow_gaps (bool): True면 빠진 봉을 경고만 하고 반환
+
+    Returns:
+        pd.DataFrame: ["open_time", "open", "high", "low", "close", "volume"]
+
+    Raises:
+        ValueError: 결측치/빈 결과/연속성 오류
+    """
+    start_ms = _ms_from_utc_str(start_time)
+    end_ms = _ms_from_utc_str(end_time)
+    step_ms = int(timeframe_to_timedelta(timeframe).total_seconds() * 1000)
+    df = _chunks_to_df(iter_ohlcv_chunks_concurrent(symbol, timeframe, start_ms, end_ms, max_workers, base_url))
+
+    gaps = validate_kline_continuity(df["open_time"].to_numpy(dtype=np.int64), step_ms)
+    if gaps:
+        msg = f"재조립 결과 빠진 봉 구간 {len(gaps)}개: {gaps[:5]}"
+        if not allow_gaps:
+            raise ValueError(msg)
+        print(f"[fetch_data] 경고: {msg}")
 
     return df
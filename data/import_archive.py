@@ -0,0 +1,281 @@
+# gptbitcoin/data/import_archive.py
+"""
+바이낸스 공개 데이터(data.binance.vision) klines 아카이브를 DB에 일괄 저장하는 모듈.
+
+- 로컬 폴더에서 {symbol}-{interval}-YYYY-MM(.zip|.csv)(월별), {symbol}-{interval}-YYYY-MM-DD(일별)
+  파일을 하위 폴더까지 찾는다. (폴더 구조는 data.binance.vision과 같아도, 평평해도 된다.)
+- ZIP은 압축을 풀어 임시 파일을 만들지 않고 스트림으로 읽는다. (파일 전체를 메모리에 올리지 않음)
+- 파일 파싱/검증은 여러 프로세스에서 병렬로, DB 쓰기는 메인 프로세스 1곳에서 파일 순서대로 한다.
+- 헤더 행 유무(2022년 이후 파일은 헤더 있음)와 마이크로초 타임스탬프를 모두 처리한다.
+- import_archives는 실제로 저장한 봉 구간 목록을 돌려준다. 아카이브가 늦게 시작하거나 빠진 월/일,
+  파일 안의 빈 구간이 있으면 uncovered_ranges로 나머지 구간을 구해 REST로 채운다. (update_data.py full 모드)
+"""
+
+import os
+import re
+import sqlite3
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.config import (
+    DB_PATH,
+    DB_BOUNDARY_DATE,
+    BINANCE_ARCHIVE_DIR,
+    ARCHIVE_IMPORT_WORKERS,
+)
+from data.resample import timeframe_to_ms
+from utils.db_utils import get_connection, insert_ohlcv, iter_ohlcv_rows
+
+# 아카이브 CSV의 앞 6개 칼럼
+_ARCHIVE_FIELDS = ["open_time", "open", "high", "low", "close", "volume"]
+
+# open_time이 이 값보다 크면 마이크로초 단위로 본다. (ms 기준 약 5138년)
+_MICROSECOND_THRESHOLD = 10 ** 14
+
+
+def find_archive_files(symbol: str, timeframe: str, archive_dir: Optional[str] = None) -> List[str]:
+    """
+    (symbol, timeframe) 아카이브 파일을 찾아 기간 순으로 정렬해 반환한다.
+    같은 기간의 .zip과 .csv가 모두 있으면 .zip만 사용한다.
+
+    Args:
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "15m"
+        archive_dir (str, optional): 아카이브 루트 (None이면 config.BINANCE_ARCHIVE_DIR)
+
+    Returns:
+        List[str]: 파일 경로 리스트 (월별/일별 모두, 기간 문자열 순)
+    """
+    root = archive_dir or BINANCE_ARCHIVE_DIR
+    if not os.path.isdir(root):
+        return []
+
+    pattern = re.compile(
+        rf"^{re.escape(symbol)}-{re.escape(timeframe)}-(\d{{4}}-\d{{2}}(?:-\d{{2}})?)\.(zip|csv)$"
+    )
+    found: Dict[str, str] = {}
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            m = pattern.match(name)
+            if not m:
+                continue
+            period, ext = m.group(1), m.group(2)
+            if period in found and ext == "csv":
+                continue
+            found[period] = os.path.join(dirpath, name)
+    return [found[p] for p in sorted(found)]
+
+
+def _read_csv_stream(stream) -> pd.DataFrame:
+    """
+    CSV 바이너리 스트림에서 앞 6개 칼럼을 읽는다. 첫 행이 헤더면 건너뛴다.
+    첫 행만 읽어 헤더 여부를 본 뒤 처음으로 되돌려(seek) 스트림 그대로 pandas에 넘긴다.
+    """
+    first = stream.readline()
+    has_header = bool(first) and not first.split(b",", 1)[0].strip().isdigit()
+    stream.seek(0)
+    return pd.read_csv(
+        stream,
+        header=None,
+        skiprows=1 if has_header else 0,
+        usecols=range(6),
+        names=_ARCHIVE_FIELDS,
+        dtype={"open_time": np.int64},
+        engine="c",
+    )
+
+
+def parse_archive_file(path: str, step_ms: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    아카이브 파일 1개를 읽고 검증해 배열 dict로 반환한다.
+
+    Args:
+        path (str): .zip 또는 .csv 경로
+        step_ms (int, optional): 봉 간격(ms). 주면 open_time이 간격 경계에 있는지도 검사한다.
+
+    Returns:
+        Dict[str, np.ndarray]: open_time(int64, ms)과 open/high/low/close/volume(float64)
+
+    Raises:
+        ValueError: 빈 파일, 결측치, 정렬/중복 오류, 0 이하 가격 등 검증 실패
+    """
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as zf:
+            members = [n for n in zf.namelist() if n.endswith(".csv")]
+            if len(members) != 1:
+                raise ValueError(f"[import_archive] CSV가 1개가 아닌 ZIP: {path}")
+            with zf.open(members[0]) as stream:
+                df = _read_csv_stream(stream)
+    else:
+        with open(path, "rb") as stream:
+            df = _read_csv_stream(stream)
+
+    if df.empty:
+        raise ValueError(f"[import_archive] 빈 파일: {path}")
+    if df.isnull().any().any():
+        raise ValueError(f"[import_archive] 결측치(NaN) 존재: {path}")
+
+    ot = df["open_time"].to_numpy(dtype=np.int64)
+    if ot[0] > _MICROSECOND_THRESHOLD:
+        ot = ot // 1000
+
+    if np.any(np.diff(ot) <= 0):
+        raise ValueError(f"[import_archive] open_time 정렬/중복 오류: {path}")
+    if step_ms is not None and np.any(ot % step_ms != 0):
+        raise ValueError(f"[import_archive] 봉 경계가 맞지 않는 open_time 존재: {path}")
+
+    arrays = {"open_time": ot}
+    for f in _ARCHIVE_FIELDS[1:]:
+        arrays[f] = df[f].to_numpy(dtype=np.float64)
+    if (arrays["open"] <= 0).any() or (arrays["high"] <= 0).any() or \
+            (arrays["low"] <= 0).any() or (arrays["close"] <= 0).any() or (arrays["volume"] < 0).any():
+        raise ValueError(f"[import_archive] 이상치(0 이하 가격 또는 음수 거래량) 존재: {path}")
+    return arrays
+
+
+def _parse_task(args: Tuple[str, int]) -> Dict[str, np.ndarray]:
+    """ProcessPoolExecutor용 래퍼."""
+    path, step_ms = args
+    return parse_archive_file(path, step_ms)
+
+
+def _extend_ranges(covered: List[Tuple[int, int]], ot: np.ndarray, step_ms: int) -> None:
+    """오름차순 open_time 배열을 연속 구간으로 나눠 covered 뒤에 붙인다. (앞 구간과 이어지면 합침)"""
+    breaks = np.flatnonzero(np.diff(ot) != step_ms)
+    starts = np.concatenate(([0], breaks + 1))
+    stops = np.concatenate((breaks, [len(ot) - 1]))
+    for i, j in zip(starts.tolist(), stops.tolist()):
+        first, last = int(ot[i]), int(ot[j])
+        if covered and covered[-1][1] + step_ms == first:
+            covered[-1] = (covered[-1][0], last)
+        else:
+            covered.append((first, last))
+
+
+def uncovered_ranges(
+    covered: List[Tuple[int, int]],
+    start_ms: int,
+    end_ms: int,
+    step_ms: int
+) -> List[Tuple[int, int]]:
+    """
+    [start_ms, end_ms] 중 covered(import_archives 결과)에 없는 봉 구간을 구한다.
+
+    Args:
+        covered (List[Tuple[int, int]]): 저장한 구간 (첫 open_time, 마지막 open_time) 목록, 오름차순
+        start_ms (int): UTC ms 시작
+        end_ms (int): UTC ms 종료
+        step_ms (int): 봉 간격(ms)
+
+    Returns:
+        List[Tuple[int, int]]: 남은 구간 (첫 open_time, 마지막 open_time) 목록, 오름차순
+    """
+    out = []
+    cursor = -(-start_ms // step_ms) * step_ms
+    for first, last in covered:
+        if first > cursor:
+            out.append((cursor, min(first - step_ms, end_ms)))
+        cursor = max(cursor, last + step_ms)
+        if cursor > end_ms:
+            break
+    if cursor <= end_ms:
+        out.append((cursor, end_ms))
+    return [(a, b) for a, b in out if a <= b]
+
+
+def import_archives(
+    symbol: str,
+    timeframe: str,
+    start_ms: int,
+    end_ms: int,
+    boundary_ts: int,
+    archive_dir: Optional[str] = None,
+    db_path: str = DB_PATH,
+    max_workers: int = ARCHIVE_IMPORT_WORKERS
+) -> List[Tuple[int, int]]:
+    """
+    아카이브 파일을 병렬로 파싱해 [start_ms, end_ms] 구간 봉을 DB에 UPSERT한다.
+    쓰기는 파일 순서대로 메인 프로세스에서만 하며, 파일마다 한 트랜잭션으로 커밋한다.
+    저장한 봉은 빈틈 없이 이어지는 구간 단위로 돌려준다. (빠진 월/일, 파일 안의 빈 봉은 구간 사이로 남는다)
+
+    Args:
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "15m"
+        start_ms (int): UTC ms 시작
+        end_ms (int): UTC ms 종료
+        boundary_ts (int): 이 시점 이전 봉은 sealed=1 (DB_BOUNDARY_DATE)
+        archive_dir (str, optional): 아카이브 루트
+        db_path (str, optional): DB 경로
+        max_workers (int, optional): 파싱 프로세스 수 (1이면 현재 프로세스에서 순차 처리)
+
+    Returns:
+        List[Tuple[int, int]]: 저장한 구간 (첫 open_time, 마지막 open_time) 목록, 오름차순.
+            파일이 없거나 가져온 봉이 없으면 빈 리스트
+
+    Raises:
+        ValueError: 파일 검증 실패
+        sqlite3.Error: DB 작업 실패
+    """
+    files = find_archive_files(symbol, timeframe, archive_dir)
+    if not files:
+        return []
+
+    step_ms = timeframe_to_ms(timeframe)
+    conn = get_connection(db_path)
+    print(f"[import_archive] {symbol} {timeframe}: 아카이브 {len(files)}개 파일 가져오기 (workers={max_workers})")
+
+    tasks = [(path, step_ms) for path in files]
+    executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+    results = executor.map(_parse_task, tasks) if executor else map(_parse_task, tasks)
+
+    total = 0
+    last_ot = None
+    covered: List[Tuple[int, int]] = []
+    try:
+        for path, arrays in zip(files, results):
+            ot = arrays["open_time"]
+            mask = (ot >= start_ms) & (ot <= end_ms)
+            if last_ot is not None:
+                # 월별/일별 파일이 겹치면 이미 저장한 구간은 건너뜀
+                mask &= ot > last_ot
+            if not mask.any():
+                continue
+            insert_ohlcv(conn, iter_ohlcv_rows(
+                symbol=symbol,
+                timeframe=timeframe,
+                open_time=ot[mask],
+                open_=arrays["open"][mask],
+                high=arrays["high"][mask],
+                low=arrays["low"][mask],
+                close=arrays["close"][mask],
+                volume=arrays["volume"][mask],
+                sealed_before_ot=boundary_ts
+            ))
+            total += int(mask.sum())
+            _extend_ranges(covered, ot[mask], step_ms)
+            last_ot = covered[-1][1]
+    except sqlite3.Error as e:
+        raise sqlite3.Error(f"[import_archive] INSERT 실패: {e}")
+    finally:
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    print(f"[import_archive] {total}개 봉 저장 완료. (연속 구간 {len(covered)}개)")
+    return covered
+
+
+if __name__ == "__main__":
+    """
+    예:
+      BINANCE_ARCHIVE_DIR=/path/to/data.binance.vision python -m data.import_archive
+    """
+    import datetime
+    import pytz
+
+    dt_format = "%Y-%m-%d %H:%M:%S"
+    boundary = int(pytz.utc.localize(datetime.datetime.strptime(DB_BOUNDARY_DATE, dt_format)).timestamp() * 1000)
+    import_archives("BTCUSDT", "15m", 0, 2 ** 62, boundary)
@@ -0,0 +1,100 @@
+# gptbitcoin/data/kline_cache.py
+"""
+마감된(closed) kline 페이지를 디스크에 캐시하는 모듈.
+
+마지막 봉의 close_time이 현재 시각보다 이전인 페이지는 다시는 바뀌지 않으므로,
+(symbol, interval, startTime, limit) 키로 gzip 압축한 원본 JSON을 저장해 두고
+같은 요청은 네트워크 없이 돌려준다.
+- limit만큼 꽉 찬 페이지만 저장한다. (endTime에 잘린 짧은 페이지는 다른 endTime 요청과 내용이 다를 수 있음)
+- 진행 중인 봉이 들어 있는 페이지는 저장하지 않으므로 항상 서버에서 다시 받는다.
+"""
+
+import gzip
+import json
+import os
+import time
+from typing import List, Optional
+
+from config.config import KLINE_CACHE_DIR
+
+# kline 원본 리스트에서 close_time 위치
+_CLOSE_TIME_IDX = 6
+
+
+def _cache_path(symbol: str, interval: str, start_ms: int, limit: int, cache_dir: Optional[str] = None) -> str:
+    """캐시 파일 경로: {cache_dir}/{symbol}/{interval}/{startTime}_{limit}.json.gz"""
+    return os.path.join(
+        cache_dir or KLINE_CACHE_DIR, symbol, interval, f"{int(start_ms)}_{int(limit)}.json.gz"
+    )
+
+
+def is_page_closed(klines: list, now_ms: Optional[int] = None) -> bool:
+    """
+    페이지의 모든 봉이 마감됐는지(마지막 봉 close_time < 현재 시각) 확인한다.
+
+    Args:
+        klines (list): klines 원본 리스트
+        now_ms (int, optional): 기준 시각(UTC ms), None이면 현재 시각
+
+    Returns:
+        bool: 마감된 페이지면 True
+    """
+    if not klines:
+        return False
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+    return int(klines[-1][_CLOSE_TIME_IDX]) < now_ms
+
+
+def load_page(
+    symbol: str,
+    interval: str,
+    start_ms: int,
+    limit: int,
+    end_ms: Optional[int] = None,
+    cache_dir: Optional[str] = None
+) -> Optional[List[list]]:
+    """
+    캐시된 페이지를 읽는다. end_ms가 주어지면 그 이후 봉은 잘라서 돌려준다.
+
+    Returns:
+        Optional[List[list]]: klines 원본 리스트, 캐시에 없으면 None
+    """
+    path = _cache_path(symbol, interval, start_ms, limit, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            klines = json.load(f)
+    except (OSError, ValueError):
+        # 깨진 캐시 파일은 무시하고 다시 받는다.
+        return None
+    if end_ms is not None:
+        klines = [k for k in klines if int(k[0]) <= end_ms]
+    return klines
+
+
+def store_page(
+    symbol: str,
+    interval: str,
+    start_ms: int,
+    limit: int,
+    klines: list,
+    cache_dir: Optional[str] = None
+) -> bool:
+    """
+    마감되고 limit만큼 꽉 찬 페이지만 캐시에 저장한다.
+
+    Returns:
+        bool: 저장했으면 True
+    """
+    if len(klines) < limit or not is_page_closed(klines):
+        return False
+
+    path = _cache_path(symbol, interval, start_ms, limit, cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(klines, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    return True
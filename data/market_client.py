@@ -0,0 +1,279 @@
+# gptbitcoin/data/market_client.py
+"""
+바이낸스 선물 시세(REST) 요청용 프로세스 공용 HTTP 클라이언트 모듈.
+
+- requests.Session 커넥션 풀을 재사용(keep-alive)하므로 매 호출마다 TLS 핸드셰이크를 하지 않는다.
+- 응답 헤더의 X-MBX-USED-WEIGHT-1M 값을 추적하고, 한도에 가까워지면 요청 전에 대기한다.
+- 기본 URL은 config.BINANCE_FAPI_BASE_URL로 바꿀 수 있어 로컬 모의 서버를 대상으로 돌릴 수 있다.
+- 마감된 klines 페이지는 data/kline_cache.py 디스크 캐시에서 네트워크 없이 돌려준다.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.config import (
+    BINANCE_FAPI_BASE_URL,
+    BACKFILL_MAX_WORKERS,
+    BINANCE_WEIGHT_LIMIT_1M,
+    BINANCE_WEIGHT_SAFETY_RATIO,
+    USE_KLINE_CACHE,
+    KLINE_CACHE_DIR,
+)
+from data import kline_cache
+
+# 선물 klines 엔드포인트 경로
+KLINES_PATH = "/fapi/v1/klines"
+
+# 서버가 돌려주는 1분 사용 가중치 헤더
+USED_WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1M"
+
+# 429/418 응답 시 최대 재시도 횟수
+MAX_RETRIES = 5
+
+# 요청 타임아웃(초)
+REQUEST_TIMEOUT_SEC = 30
+
+# 실제 바이낸스 선물 REST 주소 (이 외의 주소는 캐시 폴더를 따로 쓴다)
+BINANCE_FAPI_OFFICIAL_URL = "https://fapi.binance.com"
+
+
+def klines_request_weight(limit: int) -> int:
+    """
+    선물 klines 요청 1회의 REQUEST_WEIGHT (limit 구간별 가중치).
+
+    Args:
+        limit (int): 요청 봉 수
+
+    Returns:
+        int: 요청 가중치
+    """
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+class WeightRateLimiter:
+    """
+    최근 60초 동안 사용한 요청 가중치 합이 한도를 넘지 않도록 대기시키는 스레드 안전 리미터.
+    서버가 알려준 사용량(observe_server_weight)이 더 크면 그 값을 기준으로 한다.
+    """
+
+    def __init__(self, limit_per_min: int, window_sec: float = 60.0):
+        self.limit_per_min = limit_per_min
+        self.window_sec = window_sec
+        self._events = deque()  # (timestamp, weight)
+        self._used = 0
+        self._server_used = 0
+        self._server_minute = -1
+        self._paused_until = 0.0  # 429/418 이후 모든 스레드가 대기할 시각 (monotonic)
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._events and now - self._events[0][0] >= self.window_sec:
+            _, w = self._events.popleft()
+            self._used -= w
+
+    def _current_server_used(self) -> int:
+        # 서버 가중치는 UTC 분 단위로 초기화된다.
+        if self._server_minute != int(time.time() // 60):
+            return 0
+        return self._server_used
+
+    @property
+    def used_weight(self) -> int:
+        """현재 기준 사용 가중치 (로컬 집계와 서버 보고값 중 큰 값)."""
+        with self._lock:
+            self._evict(time.monotonic())
+            return max(self._used, self._current_server_used())
+
+    def observe_server_weight(self, used_weight: int) -> None:
+        """
+        응답 헤더의 사용 가중치를 반영한다.
+
+        Args:
+            used_weight (int): X-MBX-USED-WEIGHT-1M 값
+        """
+        with self._lock:
+            minute = int(time.time() // 60)
+            if minute != self._server_minute:
+                self._server_minute = minute
+                self._server_used = used_weight
+            else:
+                self._server_used = max(self._server_used, used_weight)
+
+    def pause(self, seconds: float) -> None:
+        """
+        서버가 Retry-After를 주면 모든 스레드의 다음 요청을 그 시간만큼 멈춘다.
+        (한 스레드만 쉬고 다른 스레드가 계속 요청하면 418 차단으로 이어진다.)
+
+        Args:
+            seconds (float): 대기 시간(초)
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def acquire(self, weight: int) -> None:
+        """
+        weight만큼 여유가 생길 때까지 대기한 뒤 사용량에 기록한다.
+
+        Args:
+            weight (int): 이번 요청의 가중치
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._evict(now)
+                if now < self._paused_until:
+                    # 429/418 Retry-After 대기 중
+                    wait_sec = self._paused_until - now
+                else:
+                    server_used = self._current_server_used()
+                    local_ok = self._used + weight <= self.limit_per_min or not self._events
+                    server_ok = server_used + weight <= self.limit_per_min
+                    if local_ok and server_ok:
+                        self._events.append((now, weight))
+                        self._used += weight
+                        # 같은 분 안의 다음 요청도 서버 보고값 기준으로 누적
+                        if self._server_minute == int(time.time() // 60):
+                            self._server_used += weight
+                        return
+                    if not server_ok:
+                        wait_sec = 60.0 - (time.time() % 60.0)
+                    else:
+                        wait_sec = self.window_sec - (now - self._events[0][0])
+            time.sleep(max(wait_sec, 0.01))
+
+
+class MarketDataClient:
+    """
+    바이낸스 선물 시세 REST 클라이언트 (keep-alive 커넥션 풀 + 가중치 추적).
+    여러 스레드에서 동시에 사용해도 된다.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BINANCE_FAPI_BASE_URL,
+        weight_limit_1m: int = BINANCE_WEIGHT_LIMIT_1M,
+        safety_ratio: float = BINANCE_WEIGHT_SAFETY_RATIO,
+        pool_size: int = BACKFILL_MAX_WORKERS,
+        use_cache: bool = USE_KLINE_CACHE,
+        cache_dir: Optional[str] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.use_cache = use_cache
+        if cache_dir is None and self.base_url != BINANCE_FAPI_OFFICIAL_URL:
+            # 모의 서버 등 다른 주소의 응답이 실제 데이터 캐시와 섞이지 않도록 호스트별 폴더 사용
+            cache_dir = os.path.join(KLINE_CACHE_DIR, urlparse(self.base_url).netloc.replace(":", "_"))
+        self.cache_dir = cache_dir
+        self.limiter = WeightRateLimiter(int(weight_limit_1m * safety_ratio))
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max(1, pool_size), pool_maxsize=max(1, pool_size))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @property
+    def used_weight(self) -> int:
+        """최근 1분 사용 가중치."""
+        return self.limiter.used_weight
+
+    def get_klines(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: int,
+        end_ms: Optional[int] = None,
+        limit: int = 1500
+    ) -> list:
+        """
+        klines 1페이지를 요청한다. 429/418 응답이면 Retry-After만큼 쉬고 재시도한다.
+        캐시를 쓰면 마감된 페이지는 디스크에서 읽고, 새로 받은 페이지가 마감됐으면 저장한다.
+
+        Args:
+            symbol (str): 예) "BTCUSDT"
+            interval (str): 예) "1h"
+            start_ms (int): startTime (UTC ms)
+            end_ms (int, optional): endTime (UTC ms)
+            limit (int): 최대 봉 수
+
+        Returns:
+            list: klines 원본 리스트
+
+        Raises:
+            RuntimeError: 재시도 횟수 초과
+            requests.HTTPError: 그 외 HTTP 오류
+        """
+        if self.use_cache:
+            cached = kline_cache.load_page(symbol, interval, start_ms, limit, end_ms, self.cache_dir)
+            if cached is not None:
+                return cached
+
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "startTime": start_ms,
+            "limit": limit,
+        }
+        if end_ms is not None:
+            params["endTime"] = end_ms
+        weight = klines_request_weight(limit)
+        url = self.base_url + KLINES_PATH
+
+        for attempt in range(MAX_RETRIES + 1):
+            self.limiter.acquire(weight)
+            resp = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT_SEC)
+
+            used_header = resp.headers.get(USED_WEIGHT_HEADER)
+            if used_header is not None and used_header.isdigit():
+                self.limiter.observe_server_weight(int(used_header))
+
+            if resp.status_code in (418, 429):
+                retry_after = float(resp.headers.get("Retry-After", 2 ** attempt))
+                print(f"[market_client] HTTP {resp.status_code}, {retry_after}s 대기 후 재시도")
+                self.limiter.pause(retry_after)
+                continue
+            resp.raise_for_status()
+            klines = resp.json()
+            if self.use_cache:
+                kline_cache.store_page(symbol, interval, start_ms, limit, klines, self.cache_dir)
+            return klines
+
+        raise RuntimeError(f"klines 요청 재시도 초과: {symbol} {interval} startTime={start_ms}")
+
+    def close(self) -> None:
+        """커넥션 풀을 닫는다."""
+        self.session.close()
+
+
+# 기본 URL별 프로세스 공용 클라이언트
+_clients: Dict[str, MarketDataClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_market_client(base_url: Optional[str] = None) -> MarketDataClient:
+    """
+    프로세스 공용 MarketDataClient를 반환한다. (기본 URL별로 1개)
+
+    Args:
+        base_url (str, optional): REST 기본 URL (None이면 config.BINANCE_FAPI_BASE_URL)
+
+    Returns:
+        MarketDataClient: 재사용 클라이언트
+    """
+    key = (base_url or BINANCE_FAPI_BASE_URL).rstrip("/")
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = MarketDataClient(base_url=key)
+            _clients[key] = client
+        return client
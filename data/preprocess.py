@@ -2,19 +2,42 @@
 """
 Collector 단계에서 이미 결측치가 제거된 OHLCV 데이터에 대해
 중복·이상치가 발견되면 예외를 발생시키고 즉시 종료하는 전처리 모듈.
+빠진 봉(open_time 불연속)은 np.diff로 검사해 경고한다.
 (보조지표 계산은 indicators/ 폴더에서 수행)
 """
 
+from typing import List, Optional, Tuple
+
 import pandas as pd
 
-def clean_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+from utils.gap_index import find_gaps, timeframe_step_ms
+
+
+def find_missing_bars(df: pd.DataFrame, timeframe: str) -> List[Tuple[int, int]]:
+    """
+    open_time 간격이 타임프레임 간격보다 큰 곳(빠진 봉 구간)을 O(n) 벡터화로 찾는다.
+
+    Args:
+        df (pd.DataFrame): 'open_time'(UTC ms, 오름차순) 칼럼이 포함된 DataFrame
+        timeframe (str): 예) "1h"
+
+    Returns:
+        List[Tuple[int, int]]: (첫 누락 open_time, 마지막 누락 open_time) 목록
+    """
+    gaps = find_gaps(df["open_time"].to_numpy(), timeframe_step_ms(timeframe))
+    return [(int(g0), int(g1)) for g0, g1 in gaps]
+
+
+def clean_ohlcv(df: pd.DataFrame, timeframe: Optional[str] = None) -> pd.DataFrame:
     """
     OHLCV 데이터에 대해 중복 여부와 간단한 이상치를 검사한다.
     중복이나 이상치가 하나라도 발견되면 예외를 발생시키고 프로그램을 종료한다.
     결측치(NaN)는 Collector 단계에서 허용되지 않으므로 여기서는 전제하지 않는다.
+    timeframe을 주면 빠진 봉 구간도 검사해 경고를 출력한다. (거래소 점검 등 실제 결측이 있으므로 예외는 아님)
 
     Args:
         df (pd.DataFrame): 'open_time', 'open', 'high', 'low', 'close', 'volume' 칼럼이 포함된 DataFrame
+        timeframe (str, optional): 예) "1h" (None이면 연속성 검사 생략)
 
     Returns:
         pd.DataFrame: 원본 그대로 반환 (단, 중복/이상이 발견되면 예외 발생)
@@ -42,6 +65,12 @@ def clean_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
     if anomalies_count > 0:
         raise ValueError(f"이상치(0 또는 음수) 데이터가 {anomalies_count}개 발견되었습니다. Collector 단계에서 데이터 정합성 확인 필요.")
 
+    # 3) 연속성 검사 (빠진 봉)
+    if timeframe is not None and len(df) > 1:
+        gaps = find_missing_bars(df, timeframe)
+        if gaps:
+            print(f"[preprocess] 경고: 빠진 봉 구간 {len(gaps)}개 발견: {gaps[:5]}")
+
     # 문제가 없으면 그대로 리턴
     return df
 
@@ -0,0 +1,201 @@
+# gptbitcoin/data/resample.py
+"""
+저장된 기준(base) 타임프레임 봉을 상위 타임프레임 봉으로 집계(리샘플링)하는 모듈.
+
+- 그룹 경계는 UTC epoch 기준으로 정렬한다. (open_time // step * step)
+  바이낸스 선물의 m/h/d 봉 경계와 같다. (주봉/월봉은 지원하지 않음)
+- 집계는 np.maximum.reduceat / np.minimum.reduceat / np.add.reduceat로 벡터화한다.
+  open=그룹 첫 봉 open, close=그룹 마지막 봉 close.
+- 기간이 끝나지 않은 마지막 그룹(진행 중인 봉)은 include_partial=True일 때만 포함한다.
+- 구간 시작이 잘려 첫 봉이 경계에 있지 않은 첫 그룹은 버린다.
+  중간의 결측(거래소 점검 등)으로 봉 수가 모자란 그룹은 있는 봉으로 집계하고 개수만 보고한다.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.date_time import timeframe_to_timedelta
+
+OHLCV_FIELDS = ("open_time", "open", "high", "low", "close", "volume")
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """타임프레임 문자열을 ms 간격으로 변환한다. 예) "4h" -> 14400000"""
+    return int(timeframe_to_timedelta(timeframe).total_seconds() * 1000)
+
+
+def check_resample_pair(base_timeframe: str, target_timeframe: str) -> int:
+    """
+    base → target 리샘플링이 가능한지 확인하고 그룹당 봉 수를 반환한다.
+
+    Raises:
+        ValueError: target이 base의 정수배가 아니거나 지원하지 않는 타임프레임
+    """
+    for tf in (base_timeframe, target_timeframe):
+        if tf.lower().strip()[-1:] not in ("m", "h", "d"):
+            raise ValueError(f"[resample] 지원하지 않는 타임프레임: {tf}")
+    base_ms = timeframe_to_ms(base_timeframe)
+    target_ms = timeframe_to_ms(target_timeframe)
+    if target_ms <= base_ms or target_ms % base_ms != 0:
+        raise ValueError(f"[resample] {target_timeframe}은(는) {base_timeframe}의 정수배가 아님")
+    return target_ms // base_ms
+
+
+def resample_ohlcv_arrays(
+    arrays: Dict[str, np.ndarray],
+    base_timeframe: str,
+    target_timeframe: str,
+    include_partial: bool = False
+) -> Tuple[Dict[str, np.ndarray], Dict[str, int]]:
+    """
+    기준 타임프레임 봉 배열을 상위 타임프레임 봉 배열로 집계한다.
+
+    Args:
+        arrays (Dict[str, np.ndarray]): open_time(int64, 오름차순)과 open/high/low/close/volume 배열
+        base_timeframe (str): 기준 타임프레임 (예: "15m")
+        target_timeframe (str): 만들 타임프레임 (예: "4h")
+        include_partial (bool): 기간이 끝나지 않은 마지막 그룹 포함 여부
+
+    Returns:
+        Tuple[Dict[str, np.ndarray], Dict[str, int]]:
+            (집계된 배열 dict,
+             {"groups", "incomplete", "dropped_head", "partial_tail"} 통계)
+    """
+    ratio = check_resample_pair(base_timeframe, target_timeframe)
+    base_ms = timeframe_to_ms(base_timeframe)
+    target_ms = timeframe_to_ms(target_timeframe)
+
+    ot = np.asarray(arrays["open_time"], dtype=np.int64)
+    stats = {"groups": 0, "incomplete": 0, "dropped_head": 0, "partial_tail": 0}
+    if len(ot) == 0:
+        return {f: np.empty(0, dtype=np.int64 if f == "open_time" else np.float64) for f in OHLCV_FIELDS}, stats
+    if np.any(np.diff(ot) <= 0):
+        raise ValueError("[resample] open_time이 오름차순이 아니거나 중복이 있습니다.")
+
+    keys = ot - ot % target_ms
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+    ends = np.append(starts[1:], len(ot))
+    counts = ends - starts
+
+    out = {
+        "open_time": keys[starts],
+        "open": np.asarray(arrays["open"], dtype=np.float64)[starts],
+        "high": np.maximum.reduceat(np.asarray(arrays["high"], dtype=np.float64), starts),
+        "low": np.minimum.reduceat(np.asarray(arrays["low"], dtype=np.float64), starts),
+        "close": np.asarray(arrays["close"], dtype=np.float64)[ends - 1],
+        "volume": np.add.reduceat(np.asarray(arrays["volume"], dtype=np.float64), starts),
+    }
+
+    keep = np.ones(len(starts), dtype=bool)
+    # 첫 그룹: 구간 시작이 잘린 경우(첫 봉이 경계가 아님) 버림
+    if ot[0] != keys[0]:
+        keep[0] = False
+        stats["dropped_head"] = 1
+    # 마지막 그룹: 기간이 끝나지 않았으면(마지막 기준 봉 이후 기간이 남음) 진행 중인 봉
+    tail_open = ot[-1] + base_ms < keys[-1] + target_ms
+    if tail_open:
+        stats["partial_tail"] = 1
+        if not include_partial:
+            keep[-1] = False
+
+    interior = keep.copy()
+    if tail_open:
+        interior[-1] = False
+    stats["incomplete"] = int(np.count_nonzero(interior & (counts < ratio)))
+
+    out = {f: v[keep] for f, v in out.items()}
+    stats["groups"] = int(keep.sum())
+    return out, stats
+
+
+def resample_ohlcv_df(
+    df: pd.DataFrame,
+    base_timeframe: str,
+    target_timeframe: str,
+    include_partial: bool = False
+) -> pd.DataFrame:
+    """
+    resample_ohlcv_arrays의 DataFrame 버전.
+
+    Args:
+        df (pd.DataFrame): open_time, open, high, low, close, volume 칼럼 포함
+        base_timeframe (str): 기준 타임프레임
+        target_timeframe (str): 만들 타임프레임
+        include_partial (bool): 진행 중인 마지막 봉 포함 여부
+
+    Returns:
+        pd.DataFrame: [open_time, open, high, low, close, volume]
+    """
+    df_sorted = df.sort_values("open_time")
+    arrays = {f: df_sorted[f].to_numpy() for f in OHLCV_FIELDS}
+    out, _ = resample_ohlcv_arrays(arrays, base_timeframe, target_timeframe, include_partial)
+    return pd.DataFrame(out, columns=list(OHLCV_FIELDS))
+
+
+def compare_with_reference(
+    resampled: pd.DataFrame,
+    reference: pd.DataFrame,
+    rtol: float = 1e-9
+) -> Dict[str, int]:
+    """
+    리샘플링 결과를 거래소에서 받은 같은 타임프레임 봉과 비교한다. (공통 open_time만)
+
+    Args:
+        resampled (pd.DataFrame): resample_ohlcv_df 결과
+        reference (pd.DataFrame): 거래소 수집 봉 (open_time, open, high, low, close, volume)
+        rtol (float): 가격/거래량 상대 허용 오차 (거래량 합의 부동소수 오차 감안)
+
+    Returns:
+        Dict[str, int]: {"common", "only_resampled", "only_reference", "mismatch"}
+    """
+    merged = resampled.merge(reference, on="open_time", how="outer", suffixes=("_rs", "_ref"), indicator=True)
+    both = merged[merged["_merge"] == "both"]
+    mismatch = np.zeros(len(both), dtype=bool)
+    for f in ("open", "high", "low", "close", "volume"):
+        a = both[f"{f}_rs"].to_numpy(dtype=np.float64)
+        b = both[f"{f}_ref"].to_numpy(dtype=np.float64)
+        mismatch |= ~np.isclose(a, b, rtol=rtol, atol=0.0)
+    return {
+        "common": int(len(both)),
+        "only_resampled": int((merged["_merge"] == "left_only").sum()),
+        "only_reference": int((merged["_merge"] == "right_only").sum()),
+        "mismatch": int(mismatch.sum()),
+    }
+
+
+def verify_resample_against_exchange(
+    symbol: str,
+    base_timeframe: str,
+    target_timeframe: str,
+    start_str: str,
+    end_str: str
+) -> Dict[str, int]:
+    """
+    같은 구간의 기준 봉과 상위 봉을 거래소에서 받아, 리샘플링 결과가 일치하는지 확인한다.
+
+    Args:
+        symbol (str): 예) "BTCUSDT"
+        base_timeframe (str): 예) "15m"
+        target_timeframe (str): 예) "4h"
+        start_str (str): "YYYY-MM-DD HH:MM:SS" (UTC)
+        end_str (str): "YYYY-MM-DD HH:MM:SS" (UTC)
+
+    Returns:
+        Dict[str, int]: compare_with_reference 결과
+    """
+    from data.fetch_data import get_ohlcv_from_binance
+
+    df_base = get_ohlcv_from_binance(symbol, base_timeframe, start_str, end_str)
+    df_ref = get_ohlcv_from_binance(symbol, target_timeframe, start_str, end_str)
+    resampled = resample_ohlcv_df(df_base, base_timeframe, target_timeframe, include_partial=False)
+    report = compare_with_reference(resampled, df_ref)
+    print(f"[resample] 검증 {symbol} {base_timeframe}->{target_timeframe}: {report}")
+    return report
+
+
+if __name__ == "__main__":
+    # 예: 최근 구간을 거래소 봉과 비교
+    for tf in ("1h", "4h", "1d"):
+        verify_resample_against_exchange("BTCUSDT", "15m", tf, "2024-01-01 00:00:00", "2024-03-01 00:00:00")
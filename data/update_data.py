@@ -3,41 +3,88 @@
 Collector 단계에서 신규 OHLCV 데이터를 DB에 반영하는 모듈.
 utils/db_utils.py의 함수들을 호출해 DB에 INSERT 한다.
 
-[요구사항]
-1) __main__으로 실행할 때는 update_mode="full" 방식(구간 내 old_data+recent_data 전부 삭제 후 재수집).
-2) main.py에서 (자동) 호출할 때는 update_mode="recent" 방식(절대 old_data 테이블은 건드리지 않고,
-   DB_BOUNDARY_DATE 이후(=recent_data 테이블)만 삭제 후 최신 데이터를 저장).
-3) DB_BOUNDARY_DATE 이전 old_data는 절대 수정하지 않는다.
-4) DB_BOUNDARY_DATE 이후 구간은 항상 삭제 후 최신 데이터를 저장한다.
-
-데이터베이스에는 다음 컬럼을 저장:
-  symbol, timeframe, timestamp_kst, open_time, open, high, low, close, volume
+[업데이트 모드]
+1) "sync" (main.py 자동 호출): 아무것도 삭제하지 않고, DB에 저장된 마지막 봉(MAX(open_time),
+   미완성일 수 있음)부터 end까지만 받아 UPSERT한다. 저장된 봉이 없으면 start부터 받는다.
+   중단된 수집도 이 모드로 마지막 커밋 봉부터 이어 받는다. (sync_start_str)
+2) "full" (__main__ 기본값): start~end 구간을 sealed 여부와 무관하게 삭제 후 재수집한다.
+   BINANCE_ARCHIVE_DIR에 아카이브가 있으면 먼저 가져오고, 아카이브가 채우지 못한 구간만 REST로 받는다.
+3) "recent" (명시적 복구 명령): sealed 봉은 건드리지 않고 DB_BOUNDARY_DATE 이후 sealed=0 봉만
+   삭제 후 재수집한다.
+4) "repair" (__main__ 전용): 결측 인덱스의 미확인 결측 구간만 골라 다시 받는다. (repair_gaps)
+DB_BOUNDARY_DATE 이전 봉은 sealed=1로 저장되며, UPSERT는 sealed=1 행을 덮어쓰지 않는다.
+(sealed 봉을 지우는 것은 full 모드의 구간 삭제뿐이다.)
+
+데이터베이스(ohlcv 단일 테이블)에는 다음 컬럼을 저장:
+  symbol, timeframe, timestamp_kst, open_time, open, high, low, close, volume, sealed
 
 주의:
 - 바이낸스 선물 API 호출 시, 결측(NaN)이 발견되면 즉시 ValueError 발생.
-- DELETE → INSERT 로직을 통해 중복을 방지한다.
+- 중복 봉은 PRIMARY KEY(symbol, timeframe, open_time) UPSERT로 막는다. (full/recent는 삭제 후 재수집)
+- 수집한 페이지는 배열 chunk로 받아 OHLCV_COMMIT_BATCH_ROWS 단위로 바로 커밋한다.
+  (메모리 사용량이 구간 길이와 무관하며, 중단된 수집은 sync 모드로 마지막 커밋 봉부터 이어 받는다.)
+- config.RESAMPLED_TIMEFRAMES의 타임프레임은 API 대신 RESAMPLE_BASE_TIMEFRAME 봉을
+  집계해 만든다. (update_timeframe_db / update_resampled_db)
 """
 
 import datetime
 import sqlite3
 import sys
-from datetime import timedelta
+from typing import Dict, Iterable, List, Tuple
 
+import numpy as np
 import pytz
 
 from config.config import (
     DB_PATH,
     DB_BOUNDARY_DATE,
+    USE_BAR_STORE,
+    BACKFILL_MAX_WORKERS,
+    RESAMPLE_BASE_TIMEFRAME,
+    RESAMPLED_TIMEFRAMES,
+    OHLCV_COMMIT_BATCH_ROWS,
+)
+from data.fetch_data import (
+    OHLCV_CHUNK_FIELDS,
+    _ms_from_utc_str,
+    iter_ohlcv_chunks,
+    iter_ohlcv_chunks_concurrent,
+    validate_kline_continuity,
 )
-from data.fetch_data import get_ohlcv_from_binance
+from data.import_archive import import_archives, uncovered_ranges
+from data.resample import resample_ohlcv_arrays, timeframe_to_ms
+from utils.bar_store import sync_bar_store
+from utils.gap_index import get_gaps, mark_gap_confirmed
 from utils.db_utils import (
-    connect_db,
-    init_db,
+    get_connection,
+    get_max_open_time,
+    fetch_ohlcv,
     delete_ohlcv,
     insert_ohlcv,
+    iter_ohlcv_rows,
 )
 
 
+def sync_start_str(symbol: str, timeframe: str, start_str: str, db_path: str = DB_PATH) -> str:
+    """
+    sync 모드가 실제로 수집을 시작할 시각을 구한다.
+    DB에 start_str 이후 저장된 봉이 있으면 마지막 저장 봉(MAX(open_time)), 없으면 start_str.
+
+    Args:
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "1h"
+        start_str (str): "YYYY-MM-DD HH:MM:SS" (UTC 기준)
+        db_path (str, optional): DB 경로
+
+    Returns:
+        str: "YYYY-MM-DD HH:MM:SS" (UTC 기준)
+    """
+    last_ot = get_max_open_time(get_connection(db_path), symbol, timeframe)
+    if last_ot is not None and last_ot > _ms_from_utc_str(start_str):
+        return datetime.datetime.utcfromtimestamp(last_ot / 1000.0).strftime("%Y-%m-%d %H:%M:%S")
+    return start_str
+
+
 def update_data_db(
     symbol: str,
     timeframe: str,
@@ -52,9 +99,15 @@ def update_data_db(
     DB에 저장한다.
 
     update_mode:
-      - "full": old_data + recent_data 테이블 모두 (start_str~end_str) 삭제 후 재수집
-      - "recent": DB_BOUNDARY_DATE 이전(old_data)은 건드리지 않고,
-                  DB_BOUNDARY_DATE 이후(recent_data) 구간만 삭제 후 최신 데이터로 갱신
+      - "full": (start_str~end_str) 구간을 sealed 여부와 무관하게 삭제 후 재수집
+                (DB_BOUNDARY_DATE 이전 봉은 sealed=1로 저장)
+                BINANCE_ARCHIVE_DIR에 아카이브 파일이 있으면 먼저 가져오고,
+                REST는 아카이브가 채우지 못한 구간(첫 파일 이전, 빠진 월/일, 파일 안 빈 구간,
+                마지막 파일 이후)만 받는다.
+      - "recent": sealed 봉(DB_BOUNDARY_DATE 이전)은 건드리지 않고,
+                  DB_BOUNDARY_DATE 이후 구간만 삭제 후 최신 데이터로 갱신 (복구용)
+      - "sync": 삭제 없이 저장된 마지막 봉(MAX(open_time), 미완성일 수 있음)부터
+                end_str까지만 받아 UPSERT. 저장된 봉이 없으면 start_str부터 받는다.
 
     Args:
         symbol (str): 예) "BTCUSDT"
@@ -63,26 +116,18 @@ def update_data_db(
         end_str   (str): "YYYY-MM-DD HH:MM:SS" (UTC 기준)
         db_path (str, optional): DB 경로
         boundary_date (str, optional): DB_BOUNDARY_DATE (UTC 기준)
-        update_mode (str, optional): "full" 또는 "recent"
+        update_mode (str, optional): "full", "recent", "sync"
 
     Raises:
         RuntimeError: 데이터 수집 실패
-        ValueError: 수집된 데이터에 NaN 존재
+        ValueError: 알 수 없는 update_mode, 수집된 데이터에 NaN 존재 또는 open_time 정렬/중복 오류
         sqlite3.Error: DB 작업 실패
     """
-    # DB 연결
+    # DB 연결 (프로세스당 1회 연결 + 스키마 확인, 이후 재사용)
     try:
-        conn = connect_db(db_path)
+        conn = get_connection(db_path)
     except sqlite3.Error as e:
-        print(f"[update_data_db] DB 연결 실패: {e}")
-        sys.exit(1)
-
-    # 테이블 생성
-    try:
-        init_db(conn)
-    except sqlite3.Error as e:
-        conn.close()
-        print(f"[update_data_db] 테이블 생성 실패: {e}")
+        print(f"[update_data_db] DB 연결/테이블 생성 실패: {e}")
         sys.exit(1)
 
     # 입력받은 boundary_date, start_str, end_str은 모두 UTC 기준 문자열로 간주
@@ -108,109 +153,387 @@ def update_data_db(
     print(f" - 기간(UTC): {start_str} ~ {end_str}")
     print(f" - boundary_date(UTC)={boundary_date}")
 
+    if update_mode not in ("full", "recent", "sync"):
+        raise ValueError(f"[update_data_db] 알 수 없는 update_mode: {update_mode}")
+
+    # REST로 받을 구간 목록 (full 모드에서 아카이브가 있으면 여러 개)
+    fetch_ranges: List[Tuple[int, int]] = []
+    archive_bars = 0
+
     # 삭제 구간 결정
-    # "full" => old_data + recent_data 둘 다 (start_ms ~ end_ms) 삭제
-    # "recent" => old_data는 절대 건드리지 않고, boundary_ts ~ end_ms만 recent_data에서 삭제
-    if update_mode == "full":
+    # "full" => sealed 포함 (start_ms ~ end_ms) 삭제
+    # "recent" => sealed 봉은 절대 건드리지 않고, boundary_ts ~ end_ms의 sealed=0 봉만 삭제
+    # "sync" => 삭제 없음 (마지막 저장 봉부터 UPSERT)
+    if update_mode == "sync":
+        sync_start = sync_start_str(symbol, timeframe, start_str, db_path)
+        if sync_start != start_str:
+            print(f"[update_data_db] (sync) 마지막 저장 봉 {sync_start}(UTC)부터 재수집")
+        else:
+            print(f"[update_data_db] (sync) 저장된 봉 없음 → {start_str}(UTC)부터 수집")
+    elif update_mode == "full":
         try:
-            delete_ohlcv(conn, "old_data", symbol, timeframe, start_ms, end_ms)
-            delete_ohlcv(conn, "recent_data", symbol, timeframe, start_ms, end_ms)
-            print("[update_data_db] (full) old_data + recent_data 레코드 삭제 완료.")
+            delete_ohlcv(conn, symbol, timeframe, start_ms, end_ms, include_sealed=True)
+            print("[update_data_db] (full) 구간 레코드 삭제 완료.")
         except sqlite3.Error as e:
-            conn.close()
             raise sqlite3.Error(f"[update_data_db] full 모드 DELETE 실패: {e}")
+
+        # 로컬 아카이브가 있으면 일괄 저장 (REST는 아카이브가 채우지 못한 구간만)
+        covered = import_archives(symbol, timeframe, start_ms, end_ms, boundary_ts, db_path=db_path)
+        if covered:
+            step_ms = timeframe_to_ms(timeframe)
+            archive_bars = sum((last - first) // step_ms + 1 for first, last in covered)
+            fetch_ranges = uncovered_ranges(covered, start_ms, end_ms, step_ms)
+            print(f"[update_data_db] (full) 아카이브 {archive_bars}봉 저장 완료, "
+                  f"나머지 {len(fetch_ranges)}개 구간만 REST 수집")
+            for first, last in fetch_ranges[:5]:
+                first_str = datetime.datetime.utcfromtimestamp(first / 1000.0).strftime(dt_format)
+                last_str = datetime.datetime.utcfromtimestamp(last / 1000.0).strftime(dt_format)
+                print(f"   - {first_str} ~ {last_str}(UTC)")
     else:
         # update_mode == "recent"
-        # old_data는 절대 건드리지 않고, boundary_ts~end_ms만 recent_data에서 삭제
         recent_start = boundary_ts if start_ms < boundary_ts else start_ms
         try:
-            delete_ohlcv(conn, "recent_data", symbol, timeframe, recent_start, end_ms)
-            print("[update_data_db] (recent) recent_data 테이블 삭제 완료.")
+            delete_ohlcv(conn, symbol, timeframe, recent_start, end_ms)
+            print("[update_data_db] (recent) 최신 구간(sealed=0) 삭제 완료.")
         except sqlite3.Error as e:
-            conn.close()
             raise sqlite3.Error(f"[update_data_db] recent 모드 DELETE 실패: {e}")
 
-    # 새 데이터 수집
+    # 새 데이터 수집 구간 결정
+    fetch_start_ms = start_ms
+    if update_mode == "sync":
+        fetch_start_ms = _ms_from_utc_str(sync_start)
+    elif update_mode == "recent" and start_ms < boundary_ts:
+        # update_mode="recent"인데 start_ms < boundary_ts라면 API 호출 시점은 boundary_ts로 조정
+        adj_start_dt = datetime.datetime.utcfromtimestamp(boundary_ts / 1000.0)
+        print(f"[update_data_db] (recent) start_str={start_str} -> {adj_start_dt.strftime(dt_format)}로 조정(UTC)")
+        fetch_start_ms = boundary_ts
+    if archive_bars == 0:
+        fetch_ranges = [(fetch_start_ms, end_ms)]
+
+    # 페이지(chunk)를 받는 대로 배치 커밋 (전체 구간을 메모리에 모으지 않음)
+    # full/sync 모드 => sealed 봉도 삽입 (기존 sealed 봉은 UPSERT 조건으로 보호)
+    # recent 모드 => sealed 봉은 절대 수정 금지
+    rc_sealed = rc_recent = rc_skipped = 0
     try:
-        # update_mode="recent"인데 start_ms < boundary_ts라면,
-        # API 호출 시점은 boundary_ts로 조정
-        # (최근 구간만 가져옴)
-        if update_mode == "recent" and start_ms < boundary_ts:
-            adj_start_dt = datetime.datetime.utcfromtimestamp(boundary_ts / 1000.0)
-            adj_start_str = adj_start_dt.strftime(dt_format)
-            print(f"[update_data_db] (recent) start_str={start_str} -> {adj_start_str}로 조정(UTC)")
-            df = get_ohlcv_from_binance(symbol, timeframe, adj_start_str, end_str)
-        else:
-            df = get_ohlcv_from_binance(symbol, timeframe, start_str, end_str)
+        for range_start, range_end in fetch_ranges:
+            if update_mode == "full" and BACKFILL_MAX_WORKERS > 1:
+                # 과거 재수집: 윈도우 병렬 수집 (실제 거래소 결측 봉은 경고만)
+                chunks = iter_ohlcv_chunks_concurrent(symbol, timeframe, range_start, range_end)
+            else:
+                chunks = iter_ohlcv_chunks(symbol, timeframe, range_start, range_end)
+            n_sealed, n_recent, n_skipped = write_ohlcv_chunks(
+                conn, symbol, timeframe, chunks, boundary_ts,
+                insert_sealed=(update_mode != "recent")
+            )
+            rc_sealed += n_sealed
+            rc_recent += n_recent
+            rc_skipped += n_skipped
+    except sqlite3.Error as e:
+        raise sqlite3.Error(f"[update_data_db] INSERT 실패: {e}")
+    except ValueError:
+        # 연속성/NaN 검사 오류는 그대로 (docstring의 Raises: ValueError)
+        raise
     except Exception as e:
-        conn.close()
         raise RuntimeError(f"[update_data_db] 데이터 수집 실패: {e}")
 
-    if df.isnull().any().any():
-        conn.close()
-        raise ValueError("[update_data_db] 수집된 DataFrame에 NaN 존재. 중단.")
-
-    print(f"[update_data_db] 수집 성공. {len(df)}개 봉 데이터.")
-
-    # 테이블 삽입 준비
-    rows_old = []
-    rows_recent = []
-
-    for _, row in df.iterrows():
-        ot = int(row["open_time"])  # UTC ms
-        dt_utc = datetime.datetime.utcfromtimestamp(ot / 1000.0)
-        dt_kst = dt_utc + timedelta(hours=9)
-        timestamp_kst_str = dt_kst.strftime("%Y-%m-%d %H:%M:%S")
-
-        o = float(row["open"])
-        h = float(row["high"])
-        l = float(row["low"])
-        c = float(row["close"])
-        v = float(row["volume"])
-
-        data_tuple = (
-            symbol,
-            timeframe,
-            timestamp_kst_str,  # KST로 변환된 문자열
-            ot,
-            o,
-            h,
-            l,
-            c,
-            v
-        )
-        if ot < boundary_ts:
-            # old_data
-            rows_old.append(data_tuple)
-        else:
-            # recent_data
-            rows_recent.append(data_tuple)
+    if archive_bars + rc_sealed + rc_recent + rc_skipped == 0:
+        raise RuntimeError("[update_data_db] 데이터 수집 실패: 수집된 데이터가 없습니다. (빈 결과)")
 
-    # 삽입
-    try:
-        rc_old = len(rows_old)
-        rc_recent = len(rows_recent)
-
-        # full 모드면 old_data도 새로 삽입 가능
-        # recent 모드 => old_data는 절대 수정 금지
-        if update_mode == "full":
-            if rc_old > 0:
-                insert_ohlcv(conn, "old_data", rows_old)
-        else:
-            # recent 모드 => rows_old는 무시
-            if rc_old > 0:
-                print(f"[update_data_db] (recent) old_data는 수정 불가, {rc_old}건 무시")
+    if rc_skipped > 0:
+        print(f"[update_data_db] (recent) sealed 봉은 수정 불가, {rc_skipped}건 무시")
+    if archive_bars > 0:
+        print(f"[update_data_db] (full) 아카이브 삽입: {archive_bars}건")
+    print(f"[update_data_db] sealed 삽입: {rc_sealed}건, recent 삽입: {rc_recent}건")
+    print("[update_data_db] DB 업데이트 완료.")
+
+    # 컬럼형 저장소 동기화 (full 모드는 과거 구간이 바뀌므로 전체 재생성)
+    if USE_BAR_STORE:
+        bar_count = sync_bar_store(conn, symbol, timeframe, rebuild=(update_mode == "full"))
+        print(f"[update_data_db] 컬럼형 저장소 동기화 완료: {bar_count}봉")
+
+
+def write_ohlcv_chunks(
+    conn: sqlite3.Connection,
+    symbol: str,
+    timeframe: str,
+    chunks: Iterable[Dict[str, np.ndarray]],
+    boundary_ts: int,
+    insert_sealed: bool = True,
+    batch_rows: int = OHLCV_COMMIT_BATCH_ROWS
+) -> Tuple[int, int, int]:
+    """
+    배열 chunk 스트림을 batch_rows 단위로 모아 한 트랜잭션씩 DB에 UPSERT한다.
+    커밋된 배치까지는 중단돼도 남으므로, 중단된 수집은 sync 모드(MAX(open_time)부터)로 이어 받을 수 있다.
+    chunk 사이의 open_time 순서를 검사하고, 빠진 봉 구간은 경고만 출력한다.
+
+    Args:
+        conn (sqlite3.Connection): DB 연결
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "1h"
+        chunks (Iterable[Dict[str, np.ndarray]]): fetch_data.iter_ohlcv_chunks 등의 결과
+        boundary_ts (int): 이 시점 이전 봉은 sealed=1
+        insert_sealed (bool): False면 sealed 대상 봉은 버린다. (recent 모드)
+        batch_rows (int): 커밋 단위 행 수
+
+    Returns:
+        Tuple[int, int, int]: (sealed 삽입 수, recent 삽입 수, 버린 sealed 봉 수)
+
+    Raises:
+        ValueError: chunk 사이 open_time 정렬/중복 오류
+        sqlite3.Error: INSERT 실패
+    """
+    step_ms = timeframe_to_ms(timeframe)
+    rc_sealed = rc_recent = rc_skipped = 0
+    pending: List[Dict[str, np.ndarray]] = []
+    pending_rows = 0
+    prev_last_ot = None
+
+    def _flush() -> None:
+        nonlocal pending, pending_rows
+        if not pending:
+            return
+        batch = {f: np.concatenate([c[f] for c in pending]) for f in OHLCV_CHUNK_FIELDS}
+        insert_ohlcv(conn, iter_ohlcv_rows(
+            symbol=symbol,
+            timeframe=timeframe,
+            open_time=batch["open_time"],
+            open_=batch["open"],
+            high=batch["high"],
+            low=batch["low"],
+            close=batch["close"],
+            volume=batch["volume"],
+            sealed_before_ot=boundary_ts
+        ))
+        pending = []
+        pending_rows = 0
+
+    for chunk in chunks:
+        ot = chunk["open_time"]
+        if len(ot) == 0:
+            continue
+        check_ot = ot if prev_last_ot is None else np.concatenate(([prev_last_ot], ot))
+        gaps = validate_kline_continuity(check_ot, step_ms)
+        if gaps:
+            print(f"[update_data_db] 경고: 빠진 봉 구간 {len(gaps)}개: {gaps[:5]}")
+        prev_last_ot = int(ot[-1])
+
+        sealed_mask = ot < boundary_ts
+        n_sealed = int(sealed_mask.sum())
+        if not insert_sealed and n_sealed > 0:
+            rc_skipped += n_sealed
+            chunk = {f: v[~sealed_mask] for f, v in chunk.items()}
+            n_sealed = 0
+        n_rows = len(chunk["open_time"])
+        if n_rows == 0:
+            continue
+
+        rc_sealed += n_sealed
+        rc_recent += n_rows - n_sealed
+        pending.append(chunk)
+        pending_rows += n_rows
+        if pending_rows >= batch_rows:
+            _flush()
+
+    _flush()
+    return rc_sealed, rc_recent, rc_skipped
+
+
+def update_resampled_db(
+    symbol: str,
+    timeframe: str,
+    start_str: str,
+    end_str: str,
+    db_path: str = DB_PATH,
+    boundary_date: str = DB_BOUNDARY_DATE,
+    update_mode: str = "sync",
+    base_timeframe: str = RESAMPLE_BASE_TIMEFRAME
+) -> None:
+    """
+    DB에 저장된 base_timeframe 봉을 집계해 timeframe 봉을 만들고 DB에 저장한다. (API 호출 없음)
+    base_timeframe 봉은 미리 update_data_db로 갱신돼 있어야 한다.
+
+    update_mode:
+      - "full": (start_str~end_str) 구간의 timeframe 봉을 sealed 여부와 무관하게 삭제 후 재생성
+      - "sync": 저장된 마지막 timeframe 봉(진행 중일 수 있음)부터 다시 집계해 UPSERT
+
+    진행 중인 마지막 봉도 거래소처럼 저장하되 sealed=0으로 두어 다음 sync에서 덮어쓴다.
+
+    Args:
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 만들 타임프레임 (예: "4h")
+        start_str (str): "YYYY-MM-DD HH:MM:SS" (UTC 기준)
+        end_str (str): "YYYY-MM-DD HH:MM:SS" (UTC 기준)
+        db_path (str, optional): DB 경로
+        boundary_date (str, optional): DB_BOUNDARY_DATE (UTC 기준)
+        update_mode (str, optional): "full", "sync"
+        base_timeframe (str, optional): 기준 타임프레임
 
-        if rc_recent > 0:
-            insert_ohlcv(conn, "recent_data", rows_recent)
+    Raises:
+        ValueError: 알 수 없는 update_mode 또는 리샘플링 불가한 타임프레임 조합
+        sqlite3.Error: DB 작업 실패
+    """
+    if update_mode not in ("full", "sync"):
+        raise ValueError(f"[update_resampled_db] 지원하지 않는 update_mode: {update_mode}")
 
-        conn.close()
-        print(f"[update_data_db] old_data 삽입: {rc_old}건, recent_data 삽입: {rc_recent}건")
-        print("[update_data_db] DB 업데이트 완료.")
+    conn = get_connection(db_path)
+    dt_format = "%Y-%m-%d %H:%M:%S"
+    utc = pytz.utc
+    boundary_ts = int(utc.localize(datetime.datetime.strptime(boundary_date, dt_format)).timestamp() * 1000)
+    start_ms = int(utc.localize(datetime.datetime.strptime(start_str, dt_format)).timestamp() * 1000)
+    end_ms = int(utc.localize(datetime.datetime.strptime(end_str, dt_format)).timestamp() * 1000)
+    target_ms = timeframe_to_ms(timeframe)
+
+    print(f"\n[update_resampled_db] mode={update_mode}, symbol={symbol}, {base_timeframe} -> {timeframe}")
+
+    # 집계 시작 시점: 항상 상위 봉 경계로 맞춘다.
+    agg_start = start_ms - start_ms % target_ms
+    if update_mode == "sync":
+        last_ot = get_max_open_time(conn, symbol, timeframe)
+        if last_ot is not None and last_ot > agg_start:
+            agg_start = last_ot
+    else:
+        try:
+            delete_ohlcv(conn, symbol, timeframe, agg_start, end_ms, include_sealed=True)
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"[update_resampled_db] full 모드 DELETE 실패: {e}")
+
+    df_base = fetch_ohlcv(conn, symbol, base_timeframe, agg_start, end_ms)
+    if df_base.empty:
+        print(f"[update_resampled_db] {base_timeframe} 기준 봉 없음. 건너뜀.")
+        return
+
+    arrays, stats = resample_ohlcv_arrays(
+        {f: df_base[f].to_numpy() for f in ("open_time", "open", "high", "low", "close", "volume")},
+        base_timeframe,
+        timeframe,
+        include_partial=True
+    )
+    print(f"[update_resampled_db] 집계 결과: {stats}")
+    if stats["incomplete"] > 0:
+        print(f"[update_resampled_db] 경고: 기준 봉이 일부 빠진 {timeframe} 봉 {stats['incomplete']}개")
+    if stats["groups"] == 0:
+        return
+
+    # 진행 중인 마지막 봉은 boundary와 무관하게 sealed=0
+    sealed_before = boundary_ts
+    if stats["partial_tail"]:
+        sealed_before = min(boundary_ts, int(arrays["open_time"][-1]))
 
+    try:
+        insert_ohlcv(conn, iter_ohlcv_rows(
+            symbol=symbol,
+            timeframe=timeframe,
+            open_time=arrays["open_time"],
+            open_=arrays["open"],
+            high=arrays["high"],
+            low=arrays["low"],
+            close=arrays["close"],
+            volume=arrays["volume"],
+            sealed_before_ot=sealed_before
+        ))
     except sqlite3.Error as e:
-        conn.close()
-        raise sqlite3.Error(f"[update_data_db] INSERT 실패: {e}")
+        raise sqlite3.Error(f"[update_resampled_db] INSERT 실패: {e}")
+    print(f"[update_resampled_db] {stats['groups']}개 봉 저장 완료.")
+
+    if USE_BAR_STORE:
+        bar_count = sync_bar_store(conn, symbol, timeframe, rebuild=(update_mode == "full"))
+        print(f"[update_resampled_db] 컬럼형 저장소 동기화 완료: {bar_count}봉")
+
+
+def update_timeframe_db(
+    symbol: str,
+    timeframe: str,
+    start_str: str,
+    end_str: str,
+    db_path: str = DB_PATH,
+    boundary_date: str = DB_BOUNDARY_DATE,
+    update_mode: str = "sync",
+    update_base: bool = True
+) -> None:
+    """
+    타임프레임 종류에 따라 API 수집(update_data_db) 또는 로컬 리샘플링(update_resampled_db)으로 갱신한다.
+    RESAMPLED_TIMEFRAMES에 속하면 update_base=True일 때 기준 타임프레임을 먼저 같은 모드로 갱신한다.
+    ("recent" 모드는 리샘플 타임프레임에서 boundary_date 이후 구간만 "full"로 재생성)
+
+    Args:
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "4h"
+        start_str (str): "YYYY-MM-DD HH:MM:SS" (UTC 기준)
+        end_str (str): "YYYY-MM-DD HH:MM:SS" (UTC 기준)
+        db_path (str, optional): DB 경로
+        boundary_date (str, optional): DB_BOUNDARY_DATE (UTC 기준)
+        update_mode (str, optional): "full", "recent", "sync"
+        update_base (bool, optional): 리샘플 타임프레임일 때 기준 타임프레임도 갱신할지 여부
+    """
+    if timeframe not in RESAMPLED_TIMEFRAMES:
+        update_data_db(symbol, timeframe, start_str, end_str, db_path, boundary_date, update_mode)
+        return
+
+    if update_base:
+        update_data_db(symbol, RESAMPLE_BASE_TIMEFRAME, start_str, end_str, db_path, boundary_date, update_mode)
+    if update_mode == "recent":
+        start_str = max(start_str, boundary_date)
+    update_resampled_db(
+        symbol, timeframe, start_str, end_str, db_path, boundary_date,
+        update_mode="sync" if update_mode == "sync" else "full"
+    )
+
+
+def repair_gaps(
+    symbol: str,
+    timeframe: str,
+    db_path: str = DB_PATH,
+    boundary_date: str = DB_BOUNDARY_DATE
+) -> int:
+    """
+    결측 인덱스(ohlcv_gaps)의 미확인 결측 구간만 골라 다시 채운다.
+    - API 타임프레임: 해당 구간만 REST로 요청해 UPSERT한다.
+    - 리샘플 타임프레임(RESAMPLED_TIMEFRAMES): 기준 봉에서 해당 구간만 다시 집계한다.
+    다시 채운 뒤 결측 인덱스를 구간 안에서 다시 조회해, 그래도 빈 봉 구간(일부만 채워진 경우 포함)은
+    confirmed로 표시해 이후 복구 대상에서 뺀다.
+
+    Args:
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "1h"
+        db_path (str, optional): DB 경로
+        boundary_date (str, optional): DB_BOUNDARY_DATE (UTC 기준)
+
+    Returns:
+        int: 복구 후에도 남은 미확인 결측 구간 수
+    """
+    conn = get_connection(db_path)
+    gaps = get_gaps(conn, symbol, timeframe, include_confirmed=False)
+    print(f"\n[repair_gaps] {symbol} {timeframe}: 미확인 결측 구간 {len(gaps)}개")
+    if not gaps:
+        return 0
+
+    dt_format = "%Y-%m-%d %H:%M:%S"
+    boundary_ts = _ms_from_utc_str(boundary_date)
+    step_ms = timeframe_to_ms(timeframe)
+
+    for gap_start, gap_end, _ in gaps:
+        if timeframe in RESAMPLED_TIMEFRAMES:
+            start_str = datetime.datetime.utcfromtimestamp(gap_start / 1000.0).strftime(dt_format)
+            # 마지막 누락 봉의 기준 봉까지 모두 포함되도록 구간 끝을 봉 하나만큼 늘린다.
+            end_str = datetime.datetime.utcfromtimestamp((gap_end + step_ms - 1) / 1000.0).strftime(dt_format)
+            update_resampled_db(symbol, timeframe, start_str, end_str, db_path, boundary_date, update_mode="full")
+        else:
+            write_ohlcv_chunks(
+                conn, symbol, timeframe,
+                iter_ohlcv_chunks(symbol, timeframe, gap_start, gap_end),
+                boundary_ts
+            )
+        # 일부만 채워졌으면 결측 인덱스가 남은 봉 구간으로 다시 나뉘어 있다.
+        # 다시 받아도 없는 봉(거래소 점검 등)이므로 남은 구간은 모두 confirmed로 표시한다.
+        for left_start, _, _ in get_gaps(conn, symbol, timeframe, gap_start, gap_end, include_confirmed=False):
+            mark_gap_confirmed(conn, symbol, timeframe, left_start)
+
+    remaining = len(get_gaps(conn, symbol, timeframe, include_confirmed=False))
+    print(f"[repair_gaps] 완료. 남은 미확인 결측 구간 {remaining}개")
+
+    if USE_BAR_STORE:
+        sync_bar_store(conn, symbol, timeframe, rebuild=True)
+    return remaining
 
 
 if __name__ == "__main__":
@@ -218,7 +541,10 @@ if __name__ == "__main__":
     직접 이 스크립트를 실행하여 과거 데이터를 DB에 저장하고자 하는 경우,
     update_mode="full"를 권장.
     예:
-      python update_data.py
+      python update_data.py            # full (기본, 전체 재수집)
+      python update_data.py sync       # 마지막 저장 봉 이후만 증분 수집 (중단된 full 수집 이어 받기)
+      python update_data.py recent     # DB_BOUNDARY_DATE 이후 구간 삭제 후 재수집 (복구용)
+      python update_data.py repair     # 결측 인덱스의 빠진 봉 구간만 골라 재수집
 
     아래 symbol, timeframes, start_str, end_str 등은 모두 UTC 기준 날짜/시각 문자열임에 유의.
     """
@@ -227,17 +553,29 @@ if __name__ == "__main__":
     # 아래 start_str, end_str도 "UTC 기준"으로 작성해야 함
     start_str = "2019-01-01 00:00:00"   # UTC
     end_str = "2025-03-01 00:00:00"    # UTC
-    mode = "full"
-
-    print("=== OHLCV 데이터 업데이트(UTC) 시작 ===")
-    for tf in timeframes:
+    mode = sys.argv[1] if len(sys.argv) > 1 else "full"
+
+    print(f"=== OHLCV 데이터 업데이트(UTC, mode={mode}) 시작 ===")
+    # 기준 타임프레임을 먼저 받고, 리샘플 타임프레임은 기준 봉을 다시 받지 않고 집계만 한다.
+    api_tfs = [tf for tf in timeframes if tf not in RESAMPLED_TIMEFRAMES]
+    if any(tf in RESAMPLED_TIMEFRAMES for tf in timeframes) and RESAMPLE_BASE_TIMEFRAME not in api_tfs:
+        api_tfs.insert(0, RESAMPLE_BASE_TIMEFRAME)
+    ordered_tfs = api_tfs + [tf for tf in timeframes if tf in RESAMPLED_TIMEFRAMES]
+    for tf in ordered_tfs:
+        if mode == "repair":
+            try:
+                repair_gaps(symbol, tf)
+            except Exception as e:
+                print(f"[__main__] {tf} 결측 복구 중 오류 발생: {e}")
+            continue
         try:
-            update_data_db(
+            update_timeframe_db(
                 symbol=symbol,
                 timeframe=tf,
                 start_str=start_str,
                 end_str=end_str,
-                update_mode=mode
+                update_mode=mode,
+                update_base=False
             )
         except Exception as e:
             print(f"[__main__] {tf} 업데이트 중 오류 발생: {e}")
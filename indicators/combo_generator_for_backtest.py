@@ -1,15 +1,28 @@
 # gptbitcoin/indicators/combo_generator_for_backtest.py
 # 보조지표 파라미터 조합을 생성하는 모듈.
 # main.py에서 combos를 생성할 때 사용.
+# 결과 행에는 콤보 전체 대신 정수 combo_id만 싣고, 사람이 읽는 JSON(used_indicators)은
+# 최종 export 시점에 render_used_indicators()로 만든다.
 
+import bisect
+import hashlib
 import itertools
-from typing import List, Dict
+import json
+import math
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
 
 from config.indicator_config import (
     INDICATOR_CONFIG,
-    INDICATOR_COMBO_SIZES
+    INDICATOR_COMBO_SIZES,
+    SIGNAL_COMBINE_METHOD
 )
 
+# Buy & Hold 행의 combo_id (카탈로그 id는 0부터)
+BUY_AND_HOLD_COMBO_ID = -1
+
 
 def get_ma_param_dicts(cfg: dict) -> List[dict]:
     """
@@ -325,13 +338,163 @@ def get_indicator_param_dicts() -> Dict[str, List[dict]]:
     return result
 
 
+class ComboItems(Sequence):
+    """
+    ComboSpace의 [start, stop) 구간을 (combo_id, 콤보) 시퀀스로 보여주는 가벼운 view.
+    slice하면 다시 view를 돌려주고, 콤보는 꺼낼 때마다 디코딩한다.
+    pickle 시 콤보 목록 대신 (공간, 구간)만 전달되므로 워커 풀 청크로 그대로 보낼 수 있다.
+    """
+
+    def __init__(self, space: "ComboSpace", start: int, stop: int):
+        self.space = space
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, i):
+        ids = range(self.start, self.stop)[i]
+        if isinstance(i, slice):
+            if ids.step != 1:
+                raise ValueError("[combo_generator] ComboItems는 step 1 slice만 지원합니다.")
+            return ComboItems(self.space, ids.start, max(ids.start, ids.stop))
+        return ids, self.space[ids]
+
+    def __iter__(self) -> Iterator[Tuple[int, List[dict]]]:
+        for cid in range(self.start, self.stop):
+            yield cid, self.space[cid]
+
+    def __repr__(self) -> str:
+        return f"ComboItems({self.start}~{self.stop})"
+
+
+class ComboSpace(Mapping):
+    """
+    지표 파라미터 조합 공간. 콤보를 미리 만들어 두지 않고 combo_id → 콤보를 그때그때 디코딩한다.
+
+    - 순서는 generate_indicator_combos()와 같다.
+      (INDICATOR_COMBO_SIZES 순 → 지표 부분집합(itertools.combinations) 순 → 파라미터 곱(itertools.product) 순)
+    - 부분집합마다 시작 id(offset)와 지표별 파라미터 수(radix)만 들고 있다가,
+      id가 들어오면 offset 이진 탐색 + 혼합 기수(mixed-radix) 분해로 파라미터 위치를 찾는다.
+      (마지막 지표가 가장 빨리 바뀜)
+    - Mapping(combo_id → 콤보)이므로 기존 카탈로그(dict)처럼 len / [] / in / items()를 쓸 수 있다.
+    - items_view / shards는 id 구간 단위 view를 돌려준다. (워커 풀 청크, 분할 실행용)
+    """
+
+    def __init__(
+        self,
+        param_tables: Optional[Dict[str, List[dict]]] = None,
+        combo_sizes: Optional[Sequence[int]] = None
+    ):
+        """
+        Args:
+          param_tables (Dict[str, List[dict]], optional): 지표명 → 파라미터 dict 목록
+            (None이면 get_indicator_param_dicts())
+          combo_sizes (Sequence[int], optional): 조합 크기 목록 (None이면 INDICATOR_COMBO_SIZES)
+        """
+        self._tables = get_indicator_param_dicts() if param_tables is None else param_tables
+        sizes = INDICATOR_COMBO_SIZES if combo_sizes is None else combo_sizes
+        names = list(self._tables.keys())
+
+        self._subsets: List[Tuple[str, ...]] = []
+        self._radices: List[Tuple[int, ...]] = []
+        self._offsets: List[int] = [0]
+        for combo_size in sizes:
+            for subset in itertools.combinations(names, combo_size):
+                radix = tuple(len(self._tables[name]) for name in subset)
+                count = math.prod(radix)
+                if count == 0:
+                    continue
+                self._subsets.append(subset)
+                self._radices.append(radix)
+                self._offsets.append(self._offsets[-1] + count)
+        self._subset_pos = {subset: s for s, subset in enumerate(self._subsets)}
+
+    def __len__(self) -> int:
+        return self._offsets[-1]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self)))
+
+    def __contains__(self, combo_id: object) -> bool:
+        return isinstance(combo_id, (int, np.integer)) and 0 <= combo_id < len(self)
+
+    def __getitem__(self, combo_id: int) -> List[dict]:
+        """
+        combo_id를 콤보(파라미터 dict 리스트)로 디코딩한다.
+
+        Raises:
+          KeyError: 범위 밖 id (Buy & Hold의 -1 포함)
+        """
+        if combo_id not in self:
+            raise KeyError(combo_id)
+        combo_id = int(combo_id)
+        s = bisect.bisect_right(self._offsets, combo_id) - 1
+        rem = combo_id - self._offsets[s]
+        subset = self._subsets[s]
+        radix = self._radices[s]
+        digits = [0] * len(radix)
+        for pos in range(len(radix) - 1, -1, -1):
+            rem, digits[pos] = divmod(rem, radix[pos])
+        return [self._tables[name][d] for name, d in zip(subset, digits)]
+
+    @property
+    def param_tables(self) -> Dict[str, List[dict]]:
+        """지표명 → 파라미터 dict 목록 (지표 순서 = 부분집합 안의 지표 순서)"""
+        return self._tables
+
+    @property
+    def combo_sizes(self) -> List[int]:
+        """이 공간에 실제로 있는 조합 크기 (오름차순)"""
+        return sorted({len(subset) for subset in self._subsets})
+
+    def encode(self, subset: Sequence[str], digits: Sequence[int]) -> int:
+        """
+        __getitem__의 역변환. 지표 부분집합과 지표별 파라미터 위치로 combo_id를 구한다.
+
+        Args:
+          subset (Sequence[str]): 지표명 (param_tables 순서)
+          digits (Sequence[int]): 지표별 파라미터 위치
+
+        Returns:
+          int: combo_id
+
+        Raises:
+          KeyError: 이 공간에 없는 부분집합(조합 크기 포함)
+          IndexError: 파라미터 위치가 범위 밖
+        """
+        s = self._subset_pos[tuple(subset)]
+        radix = self._radices[s]
+        rem = 0
+        for d, r in zip(digits, radix):
+            if not 0 <= d < r:
+                raise IndexError(f"[combo_generator] 파라미터 위치 {d}가 범위(0~{r - 1}) 밖입니다.")
+            rem = rem * r + int(d)
+        return self._offsets[s] + rem
+
+    def items_view(self, start: int = 0, stop: Optional[int] = None) -> ComboItems:
+        """[start, stop) id 구간의 (combo_id, 콤보) view."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        return ComboItems(self, start, max(start, stop))
+
+    def shards(self, n_shards: int) -> List[ComboItems]:
+        """전체 id 구간을 크기가 거의 같은 n_shards개 view로 나눈다."""
+        n = len(self)
+        n_shards = max(1, min(n_shards, n)) if n else 1
+        bounds = [n * i // n_shards for i in range(n_shards + 1)]
+        return [self.items_view(bounds[i], bounds[i + 1]) for i in range(n_shards)]
+
+    def __repr__(self) -> str:
+        return f"ComboSpace(size={len(self)}, subsets={len(self._subsets)})"
+
+
 def generate_indicator_combos() -> List[List[dict]]:
     """
     INDICATOR_COMBO_SIZES에 기초해 여러 지표를 조합한 파라미터 세트들을 생성.
     - 예: combo_size=1 이면 단일 지표.
     - combo_size=2 이면 2개 지표 조합(예: MA + RSI).
-    - 현재 config에서 INDICATOR_COMBO_SIZES = [1] 로 두어,
-      각 지표를 개별적으로만 쓰는 콤보들을 만든다.
+    - 모든 콤보를 리스트로 만들어 두므로, 콤보가 많으면 generate_combo_catalog()(ComboSpace)를 쓴다.
 
     Returns:
       List[List[dict]]: 각 콤보별 파라미터 dict의 리스트.
@@ -340,17 +503,68 @@ def generate_indicator_combos() -> List[List[dict]]:
               ...
             ]
     """
-    indicator_param_dicts = get_indicator_param_dicts()
-    indicator_names = list(indicator_param_dicts.keys())
-    all_combos = []
+    return [combo for _, combo in ComboSpace().items_view()]
+
+
+def generate_combo_catalog(combo_sizes: Optional[Sequence[int]] = None) -> ComboSpace:
+    """
+    combo_id(0부터, generate_indicator_combos() 순서) → 콤보 카탈로그를 만든다.
+    콤보를 미리 만들지 않는 ComboSpace이며, 백테스트 결과 행은 이 id(combo_id)만 갖는다.
+
+    Args:
+      combo_sizes (Sequence[int], optional): 조합 크기 목록 (None이면 INDICATOR_COMBO_SIZES,
+        GA 탐색은 GA_COMBO_SIZES)
+
+    Returns:
+      ComboSpace: combo_id → 콤보(파라미터 dict 리스트)
+    """
+    return ComboSpace(combo_sizes=combo_sizes)
 
-    for combo_size in INDICATOR_COMBO_SIZES:
-        for indicator_subset in itertools.combinations(indicator_names, combo_size):
-            param_lists = [indicator_param_dicts[name] for name in indicator_subset]
-            for merged_tuple in itertools.product(*param_lists):
-                all_combos.append(list(merged_tuple))
 
-    return all_combos
+def as_combo_items(
+    combos: Union[ComboSpace, Mapping, List[List[dict]]]
+) -> Sequence[Tuple[int, List[dict]]]:
+    """
+    run_is/run_oos/run_nosplit에 들어온 콤보를 (combo_id, 콤보) 시퀀스로 바꾼다.
+    ComboSpace면 디코딩 view(콤보를 만들지 않음), 일반 dict면 items 리스트,
+    콤보 리스트면 순서대로 id 0, 1, ...을 붙인다.
+    """
+    if isinstance(combos, ComboSpace):
+        return combos.items_view()
+    if isinstance(combos, Mapping):
+        return list(combos.items())
+    return list(enumerate(combos))
+
+
+def combo_key(combo: List[dict]) -> str:
+    """
+    콤보 내용으로 만든 고정 키. (INDICATOR_CONFIG에 파라미터를 추가해 combo_id가 바뀌어도 같은 콤보는 같은 키)
+    백테스트 체크포인트(backtest/checkpoint.py)의 저장 키로 쓴다.
+    """
+    raw = json.dumps(combo, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def render_used_indicators(combo_id: int, catalog: Mapping, timeframe: str) -> str:
+    """
+    combo_id를 결과 파일용 used_indicators 문자열로 바꾼다.
+
+    Args:
+      combo_id (int): 콤보 id (BUY_AND_HOLD_COMBO_ID면 "Buy and Hold")
+      catalog (Mapping): generate_combo_catalog() 결과 (ComboSpace 또는 combo_id → 콤보 dict)
+      timeframe (str): 타임프레임 (run_best.run_best_single의 combo_info 형식)
+
+    Returns:
+      str: {"timeframe", "SIGNAL_COMBINE_METHOD", "combo_params"} JSON 문자열
+    """
+    if combo_id == BUY_AND_HOLD_COMBO_ID:
+        return "Buy and Hold"
+    combo_info = {
+        "timeframe": timeframe,
+        "SIGNAL_COMBINE_METHOD": SIGNAL_COMBINE_METHOD,
+        "combo_params": catalog[combo_id]
+    }
+    return json.dumps(combo_info, ensure_ascii=False)
 
 
 def _test_count() -> None:
@@ -5,10 +5,13 @@
 
 import os
 import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
 import pytz
 import pandas as pd
 
-from indicators.combo_generator_for_backtest import generate_indicator_combos
+from indicators.combo_generator_for_backtest import ComboSpace, generate_combo_catalog, render_used_indicators
 
 # 기존 aggregator.py 대신 새로 작성된 param_generator_for_aggregation 모듈 사용
 # from indicators.aggregator import calc_all_indicators_by_combos  # 삭제
@@ -18,8 +21,15 @@ from indicators.param_generator_for_aggregation import calc_all_indicators_for_a
 from config.indicator_config import INDICATOR_CONFIG
 
 from backtest.run_is import run_is
+from backtest.run_is_halving import run_is_halving
+from backtest.run_is_ga import run_is_ga
+from backtest.run_walk_forward import run_walk_forward
+from backtest.run_boundary_sweep import run_boundary_sweep
 from backtest.run_oos import run_oos
 from backtest.run_nosplit import run_nosplit
+from backtest.worker_pool import BacktestWorkerPool
+from backtest.checkpoint import SweepCheckpoint
+from backtest.signal_dedup import dedup_report
 
 from config.config import (
     SYMBOL,
@@ -33,19 +43,236 @@ from config.config import (
     RESULTS_DIR,
     LOG_LEVEL,
     USE_IS_OOS,
-    START_CAPITAL
+    USE_WALK_FORWARD,
+    USE_BOUNDARY_SWEEP,
+    BOUNDARY_SWEEP_DATES,
+    IS_SEARCH_MODE,
+    GA_COMBO_SIZES,
+    START_CAPITAL,
+    PIPELINE_TIMEFRAMES,
+    SIGNAL_DEDUP,
+    RESULT_SINK_PATH,
+    RESULT_EXCEL_MAX_ROWS,
+    USE_SWEEP_CHECKPOINT,
+    SWEEP_CHECKPOINT_PATH
 )
 
 # DB 업데이트
-from data.update_data import update_data_db
+from data.update_data import sync_start_str, update_timeframe_db
 from data.preprocess import clean_ohlcv
 from utils.db_utils import prepare_ohlcv_with_warmup
+from utils.bar_frame import BarFrame
 from utils.indicator_utils import get_required_warmup_bars
+from utils.result_sink import ResultSink
 from utils.data_export import (
-    export_ohlcv_with_indicators
+    export_ohlcv_with_indicators,
+    export_performance,
+    export_performance_chunks,
+    export_equity_curve
 )
 
 
+def _utc_str_to_ms(date_str: str) -> int:
+    """"YYYY-MM-DD HH:MM:SS"(UTC) 문자열을 UTC ms로 변환."""
+    naive = datetime.datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
+    return int(pytz.utc.localize(naive).timestamp() * 1000)
+
+
+def prepare_timeframe(
+    tf: str,
+    warmup_bars: int,
+    start_ms: int,
+    end_ms: int,
+    pool: BacktestWorkerPool
+) -> Optional[BarFrame]:
+    """
+    타임프레임 1개의 데이터 준비 단계 (네트워크 + 지표 계산).
+      (A) DB 업데이트 → (B) 워밍업 포함 로딩 → (C) 전처리 → (D) 지표 계산
+      → (E) 메인 기간 BarFrame + 워커 풀 공유
+
+    파이프라인 모드에서는 이전 타임프레임 스윕과 겹쳐 백그라운드 스레드에서 실행된다.
+
+    Returns:
+        Optional[BarFrame]: 공유된 백테스트 구간, 실패하거나 비어 있으면 None
+    """
+    # (A) Update DB (sync mode: 삭제 없이 마지막 저장 봉부터 증분 수집)
+    try:
+        sync_from = sync_start_str(SYMBOL, tf, DB_BOUNDARY_DATE, DB_PATH)
+        print(f"[main.py] Update DB from {sync_from} to {END_DATE}, TF={tf}, mode=sync")
+        update_timeframe_db(
+            symbol=SYMBOL,
+            timeframe=tf,
+            start_str=DB_BOUNDARY_DATE,
+            end_str=END_DATE,
+            update_mode="sync"
+        )
+    except Exception as e:
+        print(f"[main.py] update_timeframe_db error: {e}")
+        return None
+
+    # (B) Prepare data from DB + warmup
+    try:
+        df_merged = prepare_ohlcv_with_warmup(
+            symbol=SYMBOL,
+            timeframe=tf,
+            start_utc_str=START_DATE,
+            end_utc_str=END_DATE,
+            warmup_bars=warmup_bars,
+            exchange_open_date_utc_str=EXCHANGE_OPEN_DATE,
+            db_path=DB_PATH
+        )
+
+        # (C) Clean data
+        df_clean = clean_ohlcv(df_merged)
+        if df_clean.empty:
+            print(f"[main.py] Merged DF empty. TF={tf}")
+            return None
+
+        if "open_time" not in df_clean.columns:
+            print("[main.py] No 'open_time' in DF. Cannot set DatetimeIndex.")
+            return None
+
+        df_clean["datetime"] = pd.to_datetime(df_clean["open_time"], unit="ms")
+        df_clean.set_index("datetime", inplace=True)
+        df_clean.sort_index(inplace=True)
+
+        # (D) 새로 작성된 param_generator_for_aggregation 모듈로
+        # 모든 지표를 한 번에 계산 (config 기반, 중복 칼럼 방지)
+        df_with_ind = calc_all_indicators_for_aggregation(df_clean, INDICATOR_CONFIG)
+
+        # (E) 메인 기간 필터
+        # 지표 계산 후에는 BarFrame(읽기 전용 배열)으로 한 번만 변환하고,
+        # 이후 구간 필터/IS·OOS 분할은 복사 없는 view로 처리한다.
+        frame_test = BarFrame.from_dataframe(df_with_ind).slice_time(start_ms, end_ms)
+        del df_with_ind
+        if frame_test.empty:
+            print(f"[main.py] Backtest DF empty. TF={tf}")
+            return None
+
+        # 워커가 파일 매핑으로 읽도록 한 번만 내보낸다. (IS/OOS slice도 같은 파일 사용)
+        return pool.share_frame(frame_test)
+
+    except Exception as e:
+        print(f"[main.py] prepare data error: {e}")
+        return None
+
+
+def sweep_timeframe(
+    tf: str,
+    frame_test: BarFrame,
+    combos: ComboSpace,
+    pool: BacktestWorkerPool,
+    is_boundary_ms: int,
+    is_boundary_str: str,
+    sink: ResultSink,
+    checkpoint: Optional[SweepCheckpoint] = None
+) -> int:
+    """
+    타임프레임 1개의 백테스트 스윕 단계 (워커 풀 사용).
+    성과 행은 워커 청크가 끝나는 대로 sink에 저장하고, 최종 행은 sink의 "final"에 group=tf로 쌓는다.
+    (IS/OOS 모드는 "is"/"oos"에 먼저 저장한 뒤 이 타임프레임 것만 읽어 병합)
+    (워크포워드/경계 민감도 모드는 요약 행을 "final"에 바로 저장)
+
+    Returns:
+        int: 이 타임프레임의 최종 성과 행 수
+    """
+    def _writer(phase: str):
+        return lambda rows: sink.write_rows(phase, rows, group=tf)
+
+    if USE_WALK_FORWARD:
+        print("[main.py] Walk-forward mode")
+        # fold별 행은 "final"에, 연결 OOS 자산 곡선은 타임프레임 폴더에 CSV로 저장
+        _, equity_df = run_walk_forward(frame_test, combos, timeframe=tf, start_capital=START_CAPITAL, pool=pool,
+                                        on_rows=_writer("final"), checkpoint=checkpoint)
+        export_equity_curve(equity_df, SYMBOL, tf, os.path.join(RESULTS_DIR, tf))
+        return sink.count("final", group=tf)
+
+    if USE_BOUNDARY_SWEEP:
+        print(f"[main.py] Boundary sweep mode, boundaries={BOUNDARY_SWEEP_DATES}")
+        # 경계별 순위 상관 행을 "final"에 저장
+        boundaries = [(f"{d} UTC", _utc_str_to_ms(d)) for d in BOUNDARY_SWEEP_DATES]
+        run_boundary_sweep(frame_test, combos, timeframe=tf, boundaries=boundaries, start_capital=START_CAPITAL,
+                           pool=pool, on_rows=_writer("final"), checkpoint=checkpoint)
+        return sink.count("final", group=tf)
+
+    if USE_IS_OOS:
+        print(f"[main.py] IS/OOS mode, boundary={is_boundary_str}")
+        frame_is, frame_oos = frame_test.split_at(is_boundary_ms)
+        print(f" - IS rows={len(frame_is)}, OOS rows={len(frame_oos)}")
+
+        if IS_SEARCH_MODE == "halving":
+            # run_is_halving: 최종 생존 콤보만 IS 결과로 남기고 OOS 평가
+            _, survivors = run_is_halving(frame_is, combos=combos, timeframe=tf, start_capital=START_CAPITAL,
+                                          pool=pool, on_rows=_writer("is"), checkpoint=checkpoint)
+            oos_combos = {cid: combos[cid] for cid in survivors}
+        elif IS_SEARCH_MODE == "ga":
+            # run_is_ga: 적합도 상위 콤보만 IS 결과로 남기고 OOS 평가
+            _, survivors = run_is_ga(frame_is, combos=combos, timeframe=tf, start_capital=START_CAPITAL,
+                                     pool=pool, on_rows=_writer("is"))
+            oos_combos = {cid: combos[cid] for cid in survivors}
+        else:
+            # run_is
+            run_is(frame_is, combos=combos, timeframe=tf, start_capital=START_CAPITAL, pool=pool,
+                   on_rows=_writer("is"), checkpoint=checkpoint)
+            oos_combos = combos
+        # run_oos
+        run_oos(frame_oos, combos=oos_combos, timeframe=tf, start_capital=START_CAPITAL, pool=pool,
+                on_rows=_writer("oos"), checkpoint=checkpoint)
+
+        # IS + OOS 행을 (combo_id, timeframe)으로 완전 외부 조인해 "final"에 저장
+        # (결과 저장소 SQLite 안에서 처리하므로 콤보 수와 무관하게 메모리 일정)
+        columns_order = [
+            "timeframe",
+            "is_start_cap", "is_end_cap", "is_return", "is_trades",
+            "is_sharpe", "is_mdd", "is_passed",
+            "oos_start_cap", "oos_end_cap", "oos_return", "oos_trades",
+            "oos_sharpe", "oos_mdd", "oos_current_position",
+            "combo_id"
+        ]
+        if "is_trades_log" in sink.columns("is"):
+            columns_order.append("is_trades_log")
+        if "oos_trades_log" in sink.columns("oos"):
+            columns_order.append("oos_trades_log")
+
+        return sink.write_join("final", "is", "oos", on=["combo_id", "timeframe"],
+                               columns=columns_order, group=tf)
+
+    print("[main.py] Single (No IS/OOS) mode")
+    run_nosplit(frame_test, combos, timeframe=tf, start_capital=START_CAPITAL, pool=pool,
+                on_rows=_writer("final"), checkpoint=checkpoint)
+    return sink.count("final", group=tf)
+
+
+def export_timeframe(tf: str, frame_test: BarFrame, pool: BacktestWorkerPool) -> None:
+    """
+    (G) OHLCV+지표 CSV 저장 후 공유 파일 해제. 파이프라인 모드에서는 백그라운드 writer에서 실행된다.
+    """
+    try:
+        tf_folder = os.path.join(RESULTS_DIR, tf)
+        export_ohlcv_with_indicators(frame_test.to_dataframe(), SYMBOL, tf, tf_folder)
+    except Exception as e:
+        print(f"[main.py] export error TF={tf}: {e}")
+    finally:
+        pool.release_frame(frame_test)
+
+
+def _render_perf_frame(df: pd.DataFrame, catalog: ComboSpace) -> pd.DataFrame:
+    """
+    최종 export 직전에 combo_id 칼럼을 같은 위치의 used_indicators(JSON 문자열) 칼럼으로 바꾼다.
+    """
+    if "combo_id" not in df.columns:
+        return df
+    # 콤보가 없는 행(워크포워드 연결 OOS 행 등)은 빈 문자열
+    used = [
+        render_used_indicators(int(cid), catalog, str(tf).replace("(B/H)", "")) if pd.notna(cid) else ""
+        for cid, tf in zip(df["combo_id"], df["timeframe"])
+    ]
+    pos = df.columns.get_loc("combo_id")
+    df = df.drop(columns=["combo_id"])
+    df.insert(pos, "used_indicators", used)
+    return df
+
+
 def run_main():
     """
     메인 실행 함수.
@@ -53,18 +280,29 @@ def run_main():
       2) DB 업데이트
       3) 데이터 병합 + 전처리
       4) param_generator_for_aggregation.py로 모든 지표 계산 (중복 칼럼 방지)
-      5) IS/OOS 혹은 단일 구간 백테스트
+      5) IS/OOS, 워크포워드, 경계 민감도 혹은 단일 구간 백테스트
       6) CSV/엑셀 등 결과 출력
+
+    PIPELINE_TIMEFRAMES=True이면 현재 타임프레임 스윕(5)이 워커 풀을 쓰는 동안
+    다음 타임프레임의 2)~4)를 백그라운드 스레드 1개에서 미리 준비하고,
+    6)의 OHLCV CSV 저장은 백그라운드 writer 1개가 처리한다.
+    준비/스윕/저장 각 단계는 타임프레임 순서대로 하나씩만 실행되므로 결과는 순차 실행과 같다.
+
+    성과 행은 메모리에 모으지 않고 결과 저장소(RESULT_SINK_PATH)에 청크 단위로 저장한 뒤,
+    마지막에 저장소에서 읽어 CSV(행 수가 RESULT_EXCEL_MAX_ROWS 이하면 엑셀도)로 내보낸다.
     """
     print(f"[main.py] Start - SYMBOL={SYMBOL}, TIMEFRAMES={TIMEFRAMES}, "
-          f"LOG_LEVEL={LOG_LEVEL}, USE_IS_OOS={USE_IS_OOS}")
+          f"LOG_LEVEL={LOG_LEVEL}, USE_IS_OOS={USE_IS_OOS}, WALK_FORWARD={USE_WALK_FORWARD}, "
+          f"PIPELINE={PIPELINE_TIMEFRAMES}")
 
     if not TIMEFRAMES:
         print("[main.py] No TIMEFRAMES. Exiting.")
         return
 
-    # 1) combos
-    combos = generate_indicator_combos()
+    # 1) combos (combo_id → 파라미터 ComboSpace, 콤보는 필요할 때 디코딩, 결과 행에는 combo_id만 저장)
+    #    GA 탐색은 전수 평가하지 않으므로 GA_COMBO_SIZES(크기 3~5) 공간을 카탈로그로 쓴다
+    use_ga = USE_IS_OOS and not (USE_WALK_FORWARD or USE_BOUNDARY_SWEEP) and IS_SEARCH_MODE == "ga"
+    combos = generate_combo_catalog(GA_COMBO_SIZES if use_ga else None)
     if not combos:
         print("[main.py] No combos generated. Exiting.")
         return
@@ -72,145 +310,88 @@ def run_main():
     warmup_bars = get_required_warmup_bars(INDICATOR_CONFIG)
 
     # IS/OOS boundary
-    dt_format = "%Y-%m-%d %H:%M:%S"
-    utc = pytz.utc
-    naive_is_boundary = datetime.datetime.strptime(IS_OOS_BOUNDARY_DATE, dt_format)
-    is_boundary_utc = utc.localize(naive_is_boundary)
-    is_boundary_str = is_boundary_utc.strftime("%Y-%m-%d %H:%M:%S UTC")
+    is_boundary_ms = _utc_str_to_ms(IS_OOS_BOUNDARY_DATE)
+    is_boundary_str = f"{IS_OOS_BOUNDARY_DATE} UTC"
+    start_ms = _utc_str_to_ms(START_DATE)
+    end_ms = _utc_str_to_ms(END_DATE)
 
     os.makedirs(RESULTS_DIR, exist_ok=True)
-    all_perf_rows = []
-
-    for tf in TIMEFRAMES:
-        print(f"\n[main.py] --- Timeframe: {tf} ---")
-
-        # (A) Update DB (recent mode)
-        try:
-            print(f"[main.py] Update DB from {DB_BOUNDARY_DATE} to {END_DATE}, TF={tf}, mode=recent")
-            update_data_db(
-                symbol=SYMBOL,
-                timeframe=tf,
-                start_str=DB_BOUNDARY_DATE,
-                end_str=END_DATE,
-                update_mode="recent"
-            )
-        except Exception as e:
-            print(f"[main.py] update_data_db error: {e}")
-            continue
-
-        # (B) Prepare data from DB + warmup
-        try:
-            df_merged = prepare_ohlcv_with_warmup(
-                symbol=SYMBOL,
-                timeframe=tf,
-                start_utc_str=START_DATE,
-                end_utc_str=END_DATE,
-                warmup_bars=warmup_bars,
-                exchange_open_date_utc_str=EXCHANGE_OPEN_DATE,
-                boundary_date_utc_str=DB_BOUNDARY_DATE,
-                db_path=DB_PATH
-            )
-
-            # (C) Clean data
-            df_clean = clean_ohlcv(df_merged)
-            if df_clean.empty:
-                print(f"[main.py] Merged DF empty. TF={tf}")
-                continue
-
-            if "open_time" not in df_clean.columns:
-                print("[main.py] No 'open_time' in DF. Cannot set DatetimeIndex.")
-                continue
-
-            df_clean["datetime"] = pd.to_datetime(df_clean["open_time"], unit="ms")
-            df_clean.set_index("datetime", inplace=True)
-            df_clean.sort_index(inplace=True)
-
-            # (D) 새로 작성된 param_generator_for_aggregation 모듈로
-            # 모든 지표를 한 번에 계산 (config 기반, 중복 칼럼 방지)
-            df_with_ind = calc_all_indicators_for_aggregation(df_clean, INDICATOR_CONFIG)
-
-            # (E) 메인 기간 필터
-            naive_start = datetime.datetime.strptime(START_DATE, dt_format)
-            start_utc_dt = utc.localize(naive_start)
-            start_ms = int(start_utc_dt.timestamp() * 1000)
-
-            naive_end = datetime.datetime.strptime(END_DATE, dt_format)
-            end_utc_dt = utc.localize(naive_end)
-            end_ms = int(end_utc_dt.timestamp() * 1000)
-
-            df_test = df_with_ind[
-                (df_with_ind["open_time"] >= start_ms) &
-                (df_with_ind["open_time"] <= end_ms)
-            ].copy()
-            if df_test.empty:
-                print(f"[main.py] Backtest DF empty. TF={tf}")
+    sink = ResultSink(RESULT_SINK_PATH)
+    print(f"[main.py] Result sink: {RESULT_SINK_PATH} (run_id={sink.run_id})")
+    swept = False
+
+    # 체크포인트: 이전 실행에서 끝낸 콤보는 건너뜀
+    checkpoint = SweepCheckpoint(SWEEP_CHECKPOINT_PATH) if USE_SWEEP_CHECKPOINT else None
+
+    # 워커 풀: 모든 타임프레임/구간(IS, OOS)에서 같은 워커를 재사용
+    pool = BacktestWorkerPool()
+    prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tf_prepare") if PIPELINE_TIMEFRAMES else None
+    writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tf_export") if PIPELINE_TIMEFRAMES else None
+    export_futures = []
+
+    def _prepare(tf: str) -> Optional[BarFrame]:
+        return prepare_timeframe(tf, warmup_bars, start_ms, end_ms, pool)
+
+    try:
+        next_frame: Optional[Future] = prefetcher.submit(_prepare, TIMEFRAMES[0]) if prefetcher else None
+
+        for idx, tf in enumerate(TIMEFRAMES):
+            if prefetcher:
+                frame_test = next_frame.result()
+                # 현재 스윕 동안 다음 타임프레임 준비 (DB 업데이트는 항상 타임프레임 순서대로 1개씩)
+                if idx + 1 < len(TIMEFRAMES):
+                    next_frame = prefetcher.submit(_prepare, TIMEFRAMES[idx + 1])
+            else:
+                frame_test = _prepare(tf)
+
+            print(f"\n[main.py] --- Timeframe: {tf} ---")
+            if frame_test is None:
                 continue
-            df_test.reset_index(drop=True, inplace=True)
 
-        except Exception as e:
-            print(f"[main.py] prepare data error: {e}")
-            continue
-
-        # (F) 백테스트
-        if USE_IS_OOS:
-            print(f"[main.py] IS/OOS mode, boundary={is_boundary_str}")
-            is_boundary_ms = int(is_boundary_utc.timestamp() * 1000)
-            df_is = df_test[df_test["open_time"] < is_boundary_ms].copy()
-            df_oos = df_test[df_test["open_time"] >= is_boundary_ms].copy()
-            print(f" - IS rows={len(df_is)}, OOS rows={len(df_oos)}")
-
-            # run_is
-            is_rows = run_is(df_is, combos=combos, timeframe=tf, start_capital=START_CAPITAL)
-            # run_oos
-            oos_rows = run_oos(df_oos, combos=combos, timeframe=tf, start_capital=START_CAPITAL)
-
-            df_is_ = pd.DataFrame(is_rows)
-            df_oos_ = pd.DataFrame(oos_rows)
-
-            merged_df = pd.merge(
-                df_is_, df_oos_,
-                on=["used_indicators", "timeframe"],
-                how="outer",
-                suffixes=("_is", "_oos")
-            )
-            columns_order = [
-                "timeframe",
-                "is_start_cap", "is_end_cap", "is_return", "is_trades",
-                "is_sharpe", "is_mdd", "is_passed",
-                "oos_start_cap", "oos_end_cap", "oos_return", "oos_trades",
-                "oos_sharpe", "oos_mdd", "oos_current_position",
-                "used_indicators"
-            ]
-            if "is_trades_log" in merged_df.columns:
-                columns_order.append("is_trades_log")
-            if "oos_trades_log" in merged_df.columns:
-                columns_order.append("oos_trades_log")
-
-            for col in columns_order:
-                if col not in merged_df.columns:
-                    merged_df[col] = None
-            merged_df = merged_df[columns_order]
-
-            final_rows = merged_df.to_dict("records")
-            all_perf_rows.extend(final_rows)
-
-        else:
-            print("[main.py] Single (No IS/OOS) mode")
-            single_rows = run_nosplit(df_test, combos, timeframe=tf, start_capital=START_CAPITAL)
-            all_perf_rows.extend(single_rows)
-
-        # (G) Export OHLCV+indicators CSV
-        tf_folder = os.path.join(RESULTS_DIR, tf)
-        export_ohlcv_with_indicators(df_test, SYMBOL, tf, tf_folder)
+            # (F) 백테스트 (성과 행은 sink에 저장)
+            sweep_timeframe(tf, frame_test, combos, pool, is_boundary_ms, is_boundary_str, sink, checkpoint)
+
+            # (G) Export OHLCV+indicators CSV
+            if writer:
+                export_futures.append(writer.submit(export_timeframe, tf, frame_test, pool))
+            else:
+                export_timeframe(tf, frame_test, pool)
+
+        for fut in export_futures:
+            fut.result()
+        swept = True
+        if SIGNAL_DEDUP:
+            print(dedup_report())
+    finally:
+        if prefetcher:
+            prefetcher.shutdown(wait=True, cancel_futures=True)
+        if writer:
+            writer.shutdown(wait=True)
+        pool.shutdown()
+        if checkpoint is not None:
+            checkpoint.close()
+        if not swept:
+            # 중단 시에도 이미 커밋된 성과 행은 sink에 남는다
+            sink.close(status="failed")
 
     # (H) Export performance
-    if not all_perf_rows:
-        print("[main.py] No performance data.")
-    else:
-        df_perf = pd.DataFrame(all_perf_rows)
-        from utils.data_export import export_performance
-        export_performance(df_perf, SYMBOL, RESULTS_DIR, "final_performance")
-        print("[main.py] All timeframes done. Output saved.")
+    try:
+        n_rows = sink.count("final")
+        if n_rows == 0:
+            print("[main.py] No performance data.")
+        elif n_rows <= RESULT_EXCEL_MAX_ROWS:
+            df_perf = _render_perf_frame(sink.read_frame("final"), combos)
+            export_performance(df_perf, SYMBOL, RESULTS_DIR, "final_performance")
+            print("[main.py] All timeframes done. Output saved.")
+        else:
+            print(f"[main.py] {n_rows} rows > RESULT_EXCEL_MAX_ROWS={RESULT_EXCEL_MAX_ROWS}, CSV only.")
+            export_performance_chunks(
+                (_render_perf_frame(df, combos) for df in sink.iter_frames("final")),
+                SYMBOL, RESULTS_DIR, "final_performance"
+            )
+            print("[main.py] All timeframes done. Output saved.")
+    finally:
+        sink.close(status="done")
 
 
 if __name__ == "__main__":
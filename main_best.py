@@ -49,7 +49,7 @@ from config.config import (
 from config.indicator_config import INDICATOR_CONFIG
 
 # DB 업데이트 (API 요청 → SQLite)
-from data.update_data import update_data_db
+from data.update_data import update_timeframe_db
 
 # 전처리(NaN/이상치)
 from data.preprocess import clean_ohlcv
@@ -63,6 +63,9 @@ from utils.indicator_utils import get_required_warmup_bars
 # DB 병합 로딩
 from utils.db_utils import prepare_ohlcv_with_warmup
 
+# 백테스트 구간용 읽기 전용 배열 컨테이너
+from utils.bar_frame import BarFrame
+
 # 콤보 + B/H 백테스트 (단일 콤보)
 from backtest.run_best import run_best_single
 
@@ -154,12 +157,12 @@ def main_loop(
 
     # DB 업데이트
     try:
-        update_data_db(
+        update_timeframe_db(
             symbol=SYMBOL,
             timeframe=timeframe,
             start_str=DB_BOUNDARY_DATE,
             end_str=end_date_str,
-            update_mode="recent"
+            update_mode="sync"
         )
         logging.info("[main_best] DB 업데이트 완료.")
     except Exception as e:
@@ -178,7 +181,6 @@ def main_loop(
             end_utc_str=end_date_str,
             warmup_bars=warmup_bars,
             exchange_open_date_utc_str=EXCHANGE_OPEN_DATE,
-            boundary_date_utc_str=DB_BOUNDARY_DATE,
             db_path=DB_PATH
         )
         df_merged = clean_ohlcv(df_merged)
@@ -206,21 +208,15 @@ def main_loop(
         end_utc_dt = utc.localize(naive_end)
         end_ms = int(end_utc_dt.timestamp() * 1000)
 
-        # open_time이 ms 이므로 아래처럼 필터
-        df_test = df_ind[
-            (df_ind["open_time"] >= start_ms) & (df_ind["open_time"] <= end_ms)
-        ].copy()
-
-        # 백테스트 시점에서 추가 지표 계산이 없다면 reset_index(drop=True) 가능
-        # (만약 시그널 생성 시 pandas-ta를 쓴다면, DatetimeIndex를 유지해야 함)
-        df_test.reset_index(drop=True, inplace=True)
+        # open_time이 ms 이므로 아래처럼 필터 (BarFrame view, 복사 없음)
+        frame_test = BarFrame.from_dataframe(df_ind).slice_time(start_ms, end_ms)
 
-        if df_test.empty:
+        if frame_test.empty:
             notify_user("[main_best] 백테스트 구간 DF가 비어있음.")
             return
 
         # 6) 콤보 + B/H 백테스트 실행
-        result = run_best_single(df_test, combo_info)
+        result = run_best_single(frame_test, combo_info)
         combo_score = result["combo_score"]
         combo_position = result["combo_position"]
         combo_trades_log = result["combo_trades_log"]
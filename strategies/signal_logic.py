@@ -1,12 +1,125 @@
 # gptbitcoin/strategies/signal_logic.py
 """
 구글 스타일 Docstring, 필요한 최소한의 한글 주석만 추가.
+
+*_array 함수: NumPy 배열만 받아 시그널 배열(+1/-1/0)을 돌려주는 핵심 로직.
+            (BarFrame 칼럼 view를 그대로 넘기며, 칼럼 추가/복사가 없다.)
+그 외 함수: 기존 DataFrame 인터페이스. 핵심 로직을 호출해 signal_col에 저장한다.
 """
 
 import numpy as np
 import pandas as pd
 
 
+def cross_signal_array(fast: np.ndarray, slow: np.ndarray) -> np.ndarray:
+    """
+    두 시계열 비교 시그널.
+    - fast > slow → +1, fast < slow → -1, NaN은 0.
+
+    Args:
+        fast (np.ndarray): 비교 대상 (단기 MA, MACD 라인, 가격 등)
+        slow (np.ndarray): 기준 (장기 MA, 시그널 라인, PSAR 등)
+
+    Returns:
+        np.ndarray: int 시그널 배열
+    """
+    valid = ~(np.isnan(fast) | np.isnan(slow))
+    signals = np.zeros(len(fast), dtype=int)
+    signals[valid & (fast > slow)] = 1
+    signals[valid & (fast < slow)] = -1
+    return signals
+
+
+def band_signal_array(price: np.ndarray, upper: np.ndarray, lower: np.ndarray) -> np.ndarray:
+    """
+    밴드 돌파 시그널 (볼린저, 돈채널).
+    - price > upper → +1, price < lower → -1, NaN은 0.
+    """
+    valid = ~(np.isnan(price) | np.isnan(upper) | np.isnan(lower))
+    signals = np.zeros(len(price), dtype=int)
+    signals[valid & (price > upper)] = 1
+    signals[valid & (price < lower)] = -1
+    return signals
+
+
+def threshold_signal_array(arr: np.ndarray, lower_bound: float, upper_bound: float) -> np.ndarray:
+    """
+    단일 오실레이터 임계값 시그널 (RSI).
+    - arr > upper_bound → +1, arr < lower_bound → -1, NaN은 0.
+    """
+    valid = ~np.isnan(arr)
+    signals = np.zeros(len(arr), dtype=int)
+    signals[valid & (arr > upper_bound)] = 1
+    signals[valid & (arr < lower_bound)] = -1
+    return signals
+
+
+def dual_threshold_signal_array(
+    k_arr: np.ndarray,
+    d_arr: np.ndarray,
+    lower_threshold: float,
+    upper_threshold: float
+) -> np.ndarray:
+    """
+    K/D 두 선 임계값 시그널 (스토캐스틱, 스토캐스틱 RSI).
+    - K & D >= upper_threshold → +1, K & D <= lower_threshold → -1, NaN은 0.
+    """
+    valid = ~(np.isnan(k_arr) | np.isnan(d_arr))
+    signals = np.zeros(len(k_arr), dtype=int)
+    signals[valid & (k_arr >= upper_threshold) & (d_arr >= upper_threshold)] = 1
+    signals[valid & (k_arr <= lower_threshold) & (d_arr <= lower_threshold)] = -1
+    return signals
+
+
+def dmi_adx_signal_array(
+    plus_arr: np.ndarray,
+    minus_arr: np.ndarray,
+    adx_arr: np.ndarray,
+    adx_threshold: float
+) -> np.ndarray:
+    """
+    DMI & ADX 시그널.
+    - ADX >= adx_threshold일 때만 +DI/-DI 비교 (+1/-1), 그 외 0.
+    """
+    valid = ~(np.isnan(plus_arr) | np.isnan(minus_arr) | np.isnan(adx_arr)) & (adx_arr >= adx_threshold)
+    signals = np.zeros(len(plus_arr), dtype=int)
+    signals[valid & (plus_arr > minus_arr)] = 1
+    signals[valid & (plus_arr < minus_arr)] = -1
+    return signals
+
+
+def ichimoku_signal_array(
+    ten_arr: np.ndarray,
+    kij_arr: np.ndarray,
+    span_a_arr: np.ndarray,
+    span_b_arr: np.ndarray,
+    price_arr: np.ndarray
+) -> np.ndarray:
+    """
+    일목균형표 시그널.
+    - 전환>기준 & 종가>구름상단 → +1, 전환<기준 & 종가<구름하단 → -1
+    """
+    valid = ~(np.isnan(ten_arr) | np.isnan(kij_arr) | np.isnan(span_a_arr)
+              | np.isnan(span_b_arr) | np.isnan(price_arr))
+    cloud_top = np.maximum(span_a_arr, span_b_arr)
+    cloud_bot = np.minimum(span_a_arr, span_b_arr)
+    signals = np.zeros(len(ten_arr), dtype=int)
+    signals[valid & (ten_arr > kij_arr) & (price_arr > cloud_top)] = 1
+    signals[valid & (ten_arr < kij_arr) & (price_arr < cloud_bot)] = -1
+    return signals
+
+
+def vwap_signal_array(vwap_arr: np.ndarray, price_arr: np.ndarray) -> np.ndarray:
+    """
+    VWAP 시그널.
+    - 가격 > VWAP → +1, 그 외(NaN 포함) → -1
+    """
+    valid = ~(np.isnan(vwap_arr) | np.isnan(price_arr))
+    signals = np.full(len(vwap_arr), -1, dtype=int)  # 디폴트 -1
+    signals[valid & (price_arr > vwap_arr)] = 1
+    return signals
+
+
 def ma_crossover_signal(
     df: pd.DataFrame,
     short_ma_col: str,
@@ -26,17 +139,7 @@ def ma_crossover_signal(
     Returns:
         pd.DataFrame
     """
-    short_arr = df[short_ma_col].values
-    long_arr = df[long_ma_col].values
-    n = len(df)
-
-    mask_nan = np.isnan(short_arr) | np.isnan(long_arr)
-    signals = np.zeros(n, dtype=int)
-
-    signals[~mask_nan & (short_arr > long_arr)] = 1
-    signals[~mask_nan & (short_arr < long_arr)] = -1
-
-    df[signal_col] = signals
+    df[signal_col] = cross_signal_array(df[short_ma_col].values, df[long_ma_col].values)
     return df
 
 
@@ -58,17 +161,7 @@ def obv_ma_signal(
     Returns:
         pd.DataFrame
     """
-    short_arr = df[obv_short_col].values
-    long_arr = df[obv_long_col].values
-    n = len(df)
-
-    mask_nan = np.isnan(short_arr) | np.isnan(long_arr)
-    signals = np.zeros(n, dtype=int)
-
-    signals[~mask_nan & (short_arr > long_arr)] = 1
-    signals[~mask_nan & (short_arr < long_arr)] = -1
-
-    df[signal_col] = signals
+    df[signal_col] = cross_signal_array(df[obv_short_col].values, df[obv_long_col].values)
     return df
 
 
@@ -93,16 +186,7 @@ def rsi_signal(
     Returns:
         pd.DataFrame
     """
-    arr = df[rsi_col].values
-    n = len(df)
-
-    mask_nan = np.isnan(arr)
-    signals = np.zeros(n, dtype=int)
-
-    signals[~mask_nan & (arr > upper_bound)] = 1
-    signals[~mask_nan & (arr < lower_bound)] = -1
-
-    df[signal_col] = signals
+    df[signal_col] = threshold_signal_array(df[rsi_col].values, lower_bound, upper_bound)
     return df
 
 
@@ -125,17 +209,7 @@ def macd_signal(
     Returns:
         pd.DataFrame
     """
-    macd_arr = df[macd_line_col].values
-    sig_arr = df[macd_signal_col].values
-    n = len(df)
-
-    mask_nan = np.isnan(macd_arr) | np.isnan(sig_arr)
-    signals = np.zeros(n, dtype=int)
-
-    signals[~mask_nan & (macd_arr > sig_arr)] = 1
-    signals[~mask_nan & (macd_arr < sig_arr)] = -1
-
-    df[signal_col] = signals
+    df[signal_col] = cross_signal_array(df[macd_line_col].values, df[macd_signal_col].values)
     return df
 
 
@@ -162,21 +236,9 @@ def dmi_adx_signal_trend(
     Returns:
         pd.DataFrame
     """
-    plus_arr = df[plus_di_col].values
-    minus_arr = df[minus_di_col].values
-    adx_arr = df[adx_col].values
-    n = len(df)
-
-    mask_nan = (np.isnan(plus_arr) | np.isnan(minus_arr) | np.isnan(adx_arr))
-    mask_low_adx = adx_arr < adx_threshold
-    signals = np.zeros(n, dtype=int)
-
-    # adx >= threshold
-    valid_mask = (~mask_nan) & (~mask_low_adx)
-    signals[valid_mask & (plus_arr > minus_arr)] = 1
-    signals[valid_mask & (plus_arr < minus_arr)] = -1
-
-    df[signal_col] = signals
+    df[signal_col] = dmi_adx_signal_array(
+        df[plus_di_col].values, df[minus_di_col].values, df[adx_col].values, adx_threshold
+    )
     return df
 
 
@@ -203,18 +265,7 @@ def bollinger_signal(
     Returns:
         pd.DataFrame
     """
-    price_arr = df[price_col].values
-    up_arr = df[upper_col].values
-    lo_arr = df[lower_col].values
-    n = len(df)
-
-    mask_nan = np.isnan(price_arr) | np.isnan(up_arr) | np.isnan(lo_arr)
-    signals = np.zeros(n, dtype=int)
-
-    signals[~mask_nan & (price_arr > up_arr)] = 1
-    signals[~mask_nan & (price_arr < lo_arr)] = -1
-
-    df[signal_col] = signals
+    df[signal_col] = band_signal_array(df[price_col].values, df[upper_col].values, df[lower_col].values)
     return df
 
 
@@ -243,28 +294,10 @@ def ichimoku_signal_trend(
     Returns:
         pd.DataFrame
     """
-    ten_arr = df[tenkan_col].values
-    kij_arr = df[kijun_col].values
-    span_a_arr = df[span_a_col].values
-    span_b_arr = df[span_b_col].values
-    price_arr = df[price_col].values
-    n = len(df)
-
-    mask_nan = np.isnan(ten_arr) | np.isnan(kij_arr) | np.isnan(span_a_arr) \
-               | np.isnan(span_b_arr) | np.isnan(price_arr)
-
-    cloud_top = np.maximum(span_a_arr, span_b_arr)
-    cloud_bot = np.minimum(span_a_arr, span_b_arr)
-
-    signals = np.zeros(n, dtype=int)
-
-    cond_long = (ten_arr > kij_arr) & (price_arr > cloud_top) & (~mask_nan)
-    cond_short = (ten_arr < kij_arr) & (price_arr < cloud_bot) & (~mask_nan)
-
-    signals[cond_long] = 1
-    signals[cond_short] = -1
-
-    df[signal_col] = signals
+    df[signal_col] = ichimoku_signal_array(
+        df[tenkan_col].values, df[kijun_col].values,
+        df[span_a_col].values, df[span_b_col].values, df[price_col].values
+    )
     return df
 
 
@@ -287,17 +320,7 @@ def psar_signal(
     Returns:
         pd.DataFrame
     """
-    psar_arr = df[psar_col].values
-    price_arr = df[price_col].values
-    n = len(df)
-
-    mask_nan = np.isnan(psar_arr) | np.isnan(price_arr)
-    signals = np.zeros(n, dtype=int)
-
-    signals[~mask_nan & (psar_arr < price_arr)] = 1
-    signals[~mask_nan & (psar_arr > price_arr)] = -1
-
-    df[signal_col] = signals
+    df[signal_col] = cross_signal_array(df[price_col].values, df[psar_col].values)
     return df
 
 
@@ -320,17 +343,7 @@ def supertrend_signal(
     Returns:
         pd.DataFrame
     """
-    st_arr = df[st_col].values
-    price_arr = df[price_col].values
-    n = len(df)
-
-    mask_nan = np.isnan(st_arr) | np.isnan(price_arr)
-    signals = np.zeros(n, dtype=int)
-
-    signals[~mask_nan & (price_arr > st_arr)] = 1
-    signals[~mask_nan & (price_arr < st_arr)] = -1
-
-    df[signal_col] = signals
+    df[signal_col] = cross_signal_array(df[price_col].values, df[st_col].values)
     return df
 
 
@@ -355,18 +368,7 @@ def donchian_signal(
     Returns:
         pd.DataFrame
     """
-    price_arr = df[price_col].values
-    low_arr = df[lower_col].values
-    up_arr = df[upper_col].values
-    n = len(df)
-
-    mask_nan = np.isnan(price_arr) | np.isnan(low_arr) | np.isnan(up_arr)
-    signals = np.zeros(n, dtype=int)
-
-    signals[~mask_nan & (price_arr > up_arr)] = 1
-    signals[~mask_nan & (price_arr < low_arr)] = -1
-
-    df[signal_col] = signals
+    df[signal_col] = band_signal_array(df[price_col].values, df[upper_col].values, df[lower_col].values)
     return df
 
 
@@ -393,20 +395,9 @@ def stoch_signal(
     Returns:
         pd.DataFrame
     """
-    k_arr = df[stoch_k_col].values
-    d_arr = df[stoch_d_col].values
-    n = len(df)
-
-    mask_nan = np.isnan(k_arr) | np.isnan(d_arr)
-    signals = np.zeros(n, dtype=int)
-
-    cond_long = (k_arr >= upper_threshold) & (d_arr >= upper_threshold) & (~mask_nan)
-    cond_short = (k_arr <= lower_threshold) & (d_arr <= lower_threshold) & (~mask_nan)
-
-    signals[cond_long] = 1
-    signals[cond_short] = -1
-
-    df[signal_col] = signals
+    df[signal_col] = dual_threshold_signal_array(
+        df[stoch_k_col].values, df[stoch_d_col].values, lower_threshold, upper_threshold
+    )
     return df
 
 
@@ -433,20 +424,9 @@ def stoch_rsi_signal(
     Returns:
         pd.DataFrame
     """
-    k_arr = df[k_col].values
-    d_arr = df[d_col].values
-    n = len(df)
-
-    mask_nan = np.isnan(k_arr) | np.isnan(d_arr)
-    signals = np.zeros(n, dtype=int)
-
-    cond_long = (k_arr >= upper_threshold) & (d_arr >= upper_threshold) & (~mask_nan)
-    cond_short = (k_arr <= lower_threshold) & (d_arr <= lower_threshold) & (~mask_nan)
-
-    signals[cond_long] = 1
-    signals[cond_short] = -1
-
-    df[signal_col] = signals
+    df[signal_col] = dual_threshold_signal_array(
+        df[k_col].values, df[d_col].values, lower_threshold, upper_threshold
+    )
     return df
 
 def vwap_signal(
@@ -468,13 +448,5 @@ def vwap_signal(
     Returns:
         pd.DataFrame
     """
-    vw_arr = df[vwap_col].values
-    pr_arr = df[price_col].values
-    n = len(df)
-
-    mask_nan = np.isnan(vw_arr) | np.isnan(pr_arr)
-    signals = np.full(n, -1, dtype=int)  # 디폴트 -1
-    signals[~mask_nan & (pr_arr > vw_arr)] = 1
-
-    df[signal_col] = signals
+    df[signal_col] = vwap_signal_array(df[vwap_col].values, df[price_col].values)
     return df
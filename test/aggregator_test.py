@@ -110,7 +110,6 @@ def run_aggregator_test() -> None:
                 end_utc_str=END_DATE,
                 warmup_bars=warmup_bars,
                 exchange_open_date_utc_str=EXCHANGE_OPEN_DATE,
-                boundary_date_utc_str=DB_BOUNDARY_DATE,
                 db_path=DB_PATH
             )
             print(f"[aggregator_test] df_merged.shape={df_merged.shape}")
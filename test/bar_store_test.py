@@ -0,0 +1,176 @@
+# gptbitcoin/test/bar_store_test.py
+"""
+컬럼형 봉 저장소(utils/bar_store.py)가 업데이트 모드마다 SQLite(원본)와 같은 봉을 돌려주는지 검사한다.
+모의 서버(test/binance/mock_futures_server.py)와 임시 DB/저장소 폴더를 쓰므로 네트워크 없이 실행된다.
+
+검사 항목:
+  1) full → sync → recent → repair → 리샘플 재생성 후 load_ohlcv_frame == fetch_ohlcv
+  2) SQLite에서 직접 바꾼 봉(close=-1)이 recent 재수집 후 저장소에도 반영되는지
+  3) 봉 수가 줄어도 필드 파일을 줄이지 않는지 (이전 header를 본 쪽이 짧은 파일을 열지 않게)
+  4) 저장소 루트를 같이 써도 DB마다 따로 저장되는지, USE_BAR_STORE=False인 쪽이 쓴 변경도 dirty로 남는지
+
+사용 예 (프로젝트 최상위에서):
+  PYTHONPATH=. python test/bar_store_test.py
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "binance"))
+
+from mock_futures_server import mock_as_default  # noqa: E402
+import utils.bar_store as bar_store  # noqa: E402
+import utils.db_utils as db_utils  # noqa: E402
+from data.update_data import repair_gaps, update_data_db, update_resampled_db  # noqa: E402
+from utils.db_utils import (  # noqa: E402
+    OHLCV_TABLE, delete_ohlcv, fetch_ohlcv, get_connection, prepare_ohlcv_with_warmup
+)
+
+SYMBOL = "BTCUSDT"
+START_STR = "2024-01-01 00:00:00"
+END_STR = "2024-02-29 23:59:59"
+BOUNDARY_STR = "2024-02-15 00:00:00"
+ALL_START, ALL_END = 0, 2 ** 62
+
+
+def _ms(dt_str: str) -> int:
+    return int(pd.Timestamp(dt_str, tz="UTC").timestamp() * 1000)
+
+
+def _assert_store_matches_db(conn, timeframe: str, label: str) -> None:
+    db = fetch_ohlcv(conn, SYMBOL, timeframe, ALL_START, ALL_END)
+    store = bar_store.load_ohlcv_frame(SYMBOL, timeframe, ALL_START, ALL_END, bar_store.db_path_of(conn))
+    assert store is not None, f"{label}: 저장소 조회 불가(dirty)"
+    assert len(store) == len(db), (label, len(store), len(db))
+    for f in ("open_time", "open", "high", "low", "close", "volume"):
+        assert np.array_equal(store[f].to_numpy(), db[f].to_numpy()), (label, f)
+    print(f"[bar_store_test] {timeframe} {label}: 저장소 == SQLite ({len(db)}봉)")
+
+
+class _TempStore:
+    """임시 DB 경로와 저장소 폴더 (블록을 나가면 BAR_STORE_DIR 원복)."""
+
+    def __enter__(self):
+        self.tmp = tempfile.mkdtemp(prefix="bar_store_test_")
+        self.db_path = os.path.join(self.tmp, "ohlcv.sqlite")
+        self.original = bar_store.BAR_STORE_DIR
+        bar_store.BAR_STORE_DIR = os.path.join(self.tmp, "bars")
+        return self
+
+    def __exit__(self, *exc):
+        bar_store.BAR_STORE_DIR = self.original
+        return False
+
+
+def test_store_matches_db_after_each_mode() -> None:
+    with _TempStore() as ts, mock_as_default():
+        conn = get_connection(ts.db_path)
+        update_data_db(SYMBOL, "15m", START_STR, END_STR, ts.db_path, BOUNDARY_STR, "full")
+        _assert_store_matches_db(conn, "15m", "full")
+
+        update_data_db(SYMBOL, "15m", START_STR, END_STR, ts.db_path, BOUNDARY_STR, "sync")
+        _assert_store_matches_db(conn, "15m", "sync")
+
+        # SQLite만 직접 고친 봉 → 저장소는 옛 값 → recent 재수집 후 원래 값으로 복구돼야 한다
+        bad_ot = _ms("2024-02-20 00:00:00")
+        conn.execute(f"UPDATE {OHLCV_TABLE} SET close=-1 WHERE symbol=? AND timeframe=? AND open_time=?",
+                     (SYMBOL, "15m", bad_ot))
+        conn.commit()
+        bar_store.sync_bar_store(conn, SYMBOL, "15m", rebuild=True)
+        assert bar_store.load_bars(SYMBOL, "15m", bad_ot, bad_ot, ts.db_path)["close"][0] == -1.0
+        update_data_db(SYMBOL, "15m", START_STR, END_STR, ts.db_path, BOUNDARY_STR, "recent")
+        assert bar_store.load_bars(SYMBOL, "15m", bad_ot, bad_ot, ts.db_path)["close"][0] != -1.0
+        _assert_store_matches_db(conn, "15m", "recent")
+
+        # 과거(sealed) 구간을 지우고 저장소를 맞춘 뒤, 결측 복구로 다시 채운다
+        delete_ohlcv(conn, SYMBOL, "15m", _ms("2024-01-10 00:00:00"), _ms("2024-01-10 05:45:00"),
+                     include_sealed=True)
+        bar_store.sync_bar_store(conn, SYMBOL, "15m")
+        _assert_store_matches_db(conn, "15m", "gap")
+        assert repair_gaps(SYMBOL, "15m", ts.db_path, BOUNDARY_STR) == 0
+        _assert_store_matches_db(conn, "15m", "repair")
+
+        # 리샘플 타임프레임: 기준 봉이 바뀐 뒤 재생성
+        update_resampled_db(SYMBOL, "4h", START_STR, END_STR, ts.db_path, BOUNDARY_STR, "full", "15m")
+        _assert_store_matches_db(conn, "4h", "resample full")
+        conn.execute(f"UPDATE {OHLCV_TABLE} SET high=high+100 WHERE symbol=? AND timeframe=? AND open_time=?",
+                     (SYMBOL, "15m", _ms("2024-01-20 00:00:00")))
+        conn.commit()
+        update_resampled_db(SYMBOL, "4h", "2024-01-20 00:00:00", END_STR, ts.db_path, BOUNDARY_STR, "full", "15m")
+        _assert_store_matches_db(conn, "4h", "resample regen")
+
+
+def test_unsynced_change_is_not_served() -> None:
+    with _TempStore() as ts, mock_as_default():
+        conn = get_connection(ts.db_path)
+        update_data_db(SYMBOL, "1h", START_STR, END_STR, ts.db_path, BOUNDARY_STR, "full")
+        cut = _ms("2024-02-20 00:00:00")
+        delete_ohlcv(conn, SYMBOL, "1h", cut, ALL_END)
+        # 동기화 전: 바뀐 구간이 걸치면 None(SQLite로 조회), 그 이전 구간은 저장소에서 읽는다
+        assert bar_store.load_bars(SYMBOL, "1h", ALL_START, ALL_END, ts.db_path) is None
+        assert bar_store.load_bars(SYMBOL, "1h", ALL_START, cut - 1, ts.db_path) is not None
+        bar_store.sync_bar_store(conn, SYMBOL, "1h")
+        _assert_store_matches_db(conn, "1h", "delete tail")
+
+
+def test_files_never_shrink() -> None:
+    with _TempStore() as ts:
+        n = 100
+        ot = np.arange(n, dtype=np.int64) * 3_600_000
+        arrays = {f: (ot if f == "open_time" else np.arange(n, dtype=np.float64)) for f in bar_store.BAR_FIELDS}
+        assert bar_store.write_bars(SYMBOL, "1h", arrays, ts.db_path) == n
+        close_path = os.path.join(bar_store._store_dir(SYMBOL, "1h", ts.db_path), "close.f8")
+        size_before = os.path.getsize(close_path)
+
+        # 뒤 40봉을 지우고 10봉으로 덮어쓰기 → count 70, 파일 크기는 그대로
+        tail = {f: v[60:70] + (1000 if f != "open_time" else 0) for f, v in arrays.items()}
+        assert bar_store.write_bars(SYMBOL, "1h", tail, ts.db_path, from_ot=int(ot[60])) == 70
+        assert os.path.getsize(close_path) == size_before
+        loaded = bar_store.load_bars(SYMBOL, "1h", ALL_START, ALL_END, ts.db_path)
+        assert len(loaded["close"]) == 70 and loaded["close"][-1] == 1069.0
+        print(f"[bar_store_test] shrink: count 100 -> 70, 파일 {size_before}바이트 유지")
+
+
+def test_store_is_per_db() -> None:
+    with _TempStore() as ts, mock_as_default():
+        other_path = os.path.join(ts.tmp, "other.sqlite")
+        conn = get_connection(ts.db_path)
+        other = get_connection(other_path)
+        update_data_db(SYMBOL, "1h", START_STR, END_STR, ts.db_path, BOUNDARY_STR, "full")
+        update_data_db(SYMBOL, "1h", START_STR, "2024-01-31 23:00:00", other_path, BOUNDARY_STR, "full")
+
+        # 저장소 루트가 같아도 DB별로 따로 읽는다
+        for path, c in ((ts.db_path, conn), (other_path, other)):
+            df = prepare_ohlcv_with_warmup(SYMBOL, "1h", START_STR, END_STR, 0, START_STR, db_path=path)
+            db = fetch_ohlcv(c, SYMBOL, "1h", ALL_START, ALL_END)
+            assert np.array_equal(df["open_time"].to_numpy(), db["open_time"].to_numpy()), path
+        assert bar_store.load_bars(SYMBOL, "1h", ALL_START, ALL_END, os.path.join(ts.tmp, "none.sqlite")) is None
+
+        # 저장소를 쓰지 않는 프로세스가 지워도 dirty로 남아 옛 봉을 돌려주지 않는다
+        original = db_utils.USE_BAR_STORE
+        db_utils.USE_BAR_STORE = False
+        try:
+            delete_ohlcv(conn, SYMBOL, "1h", _ms("2024-02-20 00:00:00"), ALL_END)
+        finally:
+            db_utils.USE_BAR_STORE = original
+        assert bar_store.load_bars(SYMBOL, "1h", ALL_START, ALL_END, ts.db_path) is None
+        assert bar_store.load_bars(SYMBOL, "1h", ALL_START, ALL_END, other_path) is not None
+        df = prepare_ohlcv_with_warmup(SYMBOL, "1h", START_STR, END_STR, 0, START_STR, db_path=ts.db_path)
+        assert df["open_time"].iloc[-1] < _ms("2024-02-20 00:00:00")
+        _assert_store_matches_db(conn, "1h", "per-db")
+        _assert_store_matches_db(other, "1h", "per-db other")
+
+
+def main():
+    test_store_matches_db_after_each_mode()
+    test_unsynced_change_is_not_served()
+    test_files_never_shrink()
+    test_store_is_per_db()
+
+
+if __name__ == "__main__":
+    main()
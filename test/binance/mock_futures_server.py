@@ -0,0 +1,436 @@
+# gptbitcoin/test/binance/mock_futures_server.py
+"""
+바이낸스 선물 시세 REST(/fapi/v1/klines)를 흉내 내는 로컬 모의 서버.
+네트워크 없이 수집(fetch_data) → 저장(update_data) 경로를 테스트/벤치마크하기 위해 사용한다.
+
+재현하는 동작:
+- startTime / endTime / limit(기본 500, 최대 1500) 페이지네이션 규칙
+  (startTime 없이 endTime만 주면 endTime 이전 마지막 limit봉, 둘 다 없으면 최신 limit봉)
+- 요청 가중치(limit 구간별)와 X-MBX-USED-WEIGHT-1M 헤더 (UTC 분 단위 초기화)
+- 1분 가중치 한도 초과 시 429 + Retry-After
+  Retry-After 대기 중 다시 요청하면 429를 또 돌려주고, 그런 위반이 ban_after회 쌓이면 418(IP 차단)
+- 진행 중인(마감 전) 마지막 봉: 현재 시각까지 생성되며 요청할 때마다 값이 바뀐다.
+
+데이터:
+- 기본은 symbol별 시드로 만든 BASE_INTERVAL(15m) 합성 랜덤워크 봉 (start부터 현재 시각까지)
+  BASE_INTERVAL의 배수인 interval(1h, 4h, 1d 등)은 이 봉을 UTC 경계로 집계해 만들므로
+  거래소처럼 상위 봉이 하위 봉의 집계와 일치한다. (그 외 interval은 interval별 시드로 따로 만든다.)
+- --data-dir를 주면 data.binance.vision 형식 아카이브(zip/csv)를 그대로 서빙한다. (기록 데이터)
+
+실행 예 (프로젝트 최상위에서):
+  PYTHONPATH=. python test/binance/mock_futures_server.py --port 8765
+  BINANCE_FAPI_BASE_URL=http://127.0.0.1:8765 PYTHONPATH=. python data/update_data.py sync
+
+코드에서 띄울 때:
+  server, base_url = start_mock_server()
+  client = MarketDataClient(base_url=base_url)
+"""
+
+import argparse
+import contextlib
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from data.import_archive import find_archive_files, parse_archive_file
+from data import market_client
+from data.market_client import KLINES_PATH, USED_WEIGHT_HEADER, MarketDataClient, klines_request_weight
+from data.resample import timeframe_to_ms
+
+DEFAULT_START = "2019-09-08 00:00:00"
+# 합성 데이터의 기준 interval (이 interval의 배수는 기준 봉을 집계해 만든다)
+BASE_INTERVAL = "15m"
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1500
+
+
+def _utc_ms(dt_str: str) -> int:
+    return int(np.datetime64(dt_str.replace(" ", "T"), "ms").astype(np.int64))
+
+
+class MockKlineDataset:
+    """
+    (symbol, interval)별 봉 배열을 만들고 캐시한다. 마지막 봉은 현재 시각 기준으로 진행 중인 봉이다.
+    """
+
+    def __init__(self, start: str = DEFAULT_START, data_dir: Optional[str] = None, seed: int = 0):
+        self.start_ms = _utc_ms(start)
+        self.data_dir = data_dir
+        self.seed = seed
+        self._cache: Dict[Tuple[str, str], Dict[str, np.ndarray]] = {}
+        # 집계 interval이 기준 봉을 같은 잠금 안에서 다시 요청하므로 RLock
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _is_derived(interval: str, step_ms: int) -> bool:
+        """BASE_INTERVAL 봉을 집계해 만드는 interval인지 여부."""
+        base_ms = timeframe_to_ms(BASE_INTERVAL)
+        return interval[-1:] in ("m", "h", "d") and step_ms > base_ms and step_ms % base_ms == 0
+
+    def _aggregate(self, symbol: str, step_ms: int) -> Dict[str, np.ndarray]:
+        """기준 봉(마감분)을 step_ms 경계로 묶어 기준 봉이 모두 있는 구간만 봉으로 만든다."""
+        base = self.closed_bars(symbol, BASE_INTERVAL)
+        per_bar = step_ms // timeframe_to_ms(BASE_INTERVAL)
+        group = base["open_time"] // step_ms
+        starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        sizes = np.diff(np.r_[starts, len(group)])
+        ends = starts + sizes - 1
+        full = sizes == per_bar
+        return {
+            "open_time": (group[starts] * step_ms)[full],
+            "open": base["open"][starts][full],
+            "high": np.maximum.reduceat(base["high"], starts)[full],
+            "low": np.minimum.reduceat(base["low"], starts)[full],
+            "close": base["close"][ends][full],
+            "volume": np.add.reduceat(base["volume"], starts)[full],
+        }
+
+    def _synthetic(self, symbol: str, interval: str, step_ms: int) -> Dict[str, np.ndarray]:
+        if self._is_derived(interval, step_ms):
+            return self._aggregate(symbol, step_ms)
+
+        now_ms = int(time.time() * 1000)
+        first = self.start_ms - self.start_ms % step_ms
+        open_time = np.arange(first, now_ms - now_ms % step_ms, step_ms, dtype=np.int64)
+        n = len(open_time)
+
+        # 필드마다 별도 난수열을 써서, 봉 수가 늘어나도 기존 봉 값이 바뀌지 않게 한다.
+        def _rng(field: str) -> np.random.Generator:
+            return np.random.default_rng(zlib.crc32(f"{symbol}|{interval}|{self.seed}|{field}".encode()))
+
+        # 응답 자릿수(가격 2, 거래량 3)로 미리 반올림해 집계 봉과 기준 봉의 응답 값이 어긋나지 않게 한다.
+        close = np.round(10000.0 * np.exp(np.cumsum(_rng("ret").normal(0.0, 0.01, n))), 2)
+        open_ = np.concatenate(([10000.0], close[:-1]))
+        spread = np.round(np.abs(_rng("spread").normal(0.0, 0.004, n)) * close, 2)
+        return {
+            "open_time": open_time,
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": np.round(_rng("volume").gamma(2.0, 50.0, n), 3),
+        }
+
+    def closed_bars(self, symbol: str, interval: str) -> Dict[str, np.ndarray]:
+        """마감된 봉 배열 (기록 데이터이면 파일 내용 전체)."""
+        key = (symbol, interval)
+        step_ms = timeframe_to_ms(interval)
+        with self._lock:
+            bars = self._cache.get(key)
+            # 합성 데이터는 시간이 흘러 새로 마감된 봉이 생기면 다시 만든다. (시드가 같아 과거 봉은 동일)
+            if bars is not None and self.data_dir is None and len(bars["open_time"]) > 0:
+                now_ms = int(time.time() * 1000)
+                if bars["open_time"][-1] + 2 * step_ms <= now_ms:
+                    bars = None
+            if bars is None:
+                if self.data_dir:
+                    files = find_archive_files(symbol, interval, self.data_dir)
+                    parts = [parse_archive_file(f, step_ms) for f in files]
+                    bars = {
+                        f: np.concatenate([p[f] for p in parts]) if parts else np.empty(0)
+                        for f in ("open_time", "open", "high", "low", "close", "volume")
+                    }
+                    bars["open_time"] = bars["open_time"].astype(np.int64)
+                else:
+                    bars = self._synthetic(symbol, interval, step_ms)
+                self._cache[key] = bars
+            return bars
+
+    def live_bar(self, symbol: str, interval: str, closed: Dict[str, np.ndarray]) -> Optional[list]:
+        """진행 중인 봉 1개 (합성 데이터에서만, 현재 시각에 따라 값이 바뀐다)."""
+        if self.data_dir or len(closed["open_time"]) == 0:
+            return None
+        step_ms = timeframe_to_ms(interval)
+        now_ms = int(time.time() * 1000)
+        ot = now_ms - now_ms % step_ms
+        if ot != closed["open_time"][-1] + step_ms:
+            return None
+        if self._is_derived(interval, step_ms):
+            # 집계 interval: 이 구간의 마감된 기준 봉 + 진행 중인 기준 봉
+            base = self.closed_bars(symbol, BASE_INTERVAL)
+            lo = int(np.searchsorted(base["open_time"], ot, side="left"))
+            parts = [[float(base[f][lo:][i]) for f in ("open", "high", "low", "close", "volume")]
+                     for i in range(len(base["open_time"]) - lo)]
+            base_live = self.live_bar(symbol, BASE_INTERVAL, base)
+            if base_live is not None:
+                parts.append(base_live[1:])
+            if not parts:
+                return None
+            return [ot, parts[0][0], max(p[1] for p in parts), min(p[2] for p in parts),
+                    parts[-1][3], sum(p[4] for p in parts)]
+        progress = (now_ms - ot) / step_ms
+        o = float(closed["close"][-1])
+        c = o * (1.0 + 0.002 * np.sin(now_ms / 1000.0))
+        return [ot, o, max(o, c) * 1.001, min(o, c) * 0.999, c, 100.0 * progress]
+
+    def klines(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: Optional[int],
+        end_ms: Optional[int],
+        limit: int
+    ) -> list:
+        """바이낸스 klines 응답 형식의 리스트를 만든다."""
+        step_ms = timeframe_to_ms(interval)
+        bars = self.closed_bars(symbol, interval)
+        ot = bars["open_time"]
+        live = self.live_bar(symbol, interval, bars)
+        # 진행 중인 봉은 마감 봉 뒤의 가상 인덱스 len(ot)로 취급
+        total = len(ot) + (1 if live is not None else 0)
+
+        lo = 0 if start_ms is None else int(np.searchsorted(ot, start_ms, side="left"))
+        if end_ms is None:
+            hi = total
+        else:
+            hi = int(np.searchsorted(ot, end_ms, side="right"))
+            if live is not None and hi == len(ot) and live[0] <= end_ms:
+                hi = total
+        if start_ms is None:
+            lo = max(hi - limit, 0)
+        hi = min(hi, lo + limit)
+
+        out = []
+        for i in range(lo, hi):
+            if i == len(ot):
+                out.append(_kline_row(live[0], step_ms, *live[1:]))
+            else:
+                out.append(_kline_row(
+                    int(ot[i]), step_ms, bars["open"][i], bars["high"][i],
+                    bars["low"][i], bars["close"][i], bars["volume"][i]
+                ))
+        return out
+
+
+def _kline_row(ot: int, step_ms: int, o: float, h: float, l: float, c: float, v: float) -> list:
+    """바이낸스 klines 행 형식: 가격/거래량은 문자열."""
+    return [
+        ot, f"{o:.2f}", f"{h:.2f}", f"{l:.2f}", f"{c:.2f}", f"{v:.3f}",
+        ot + step_ms - 1, f"{v * c:.4f}", 100, f"{v / 2:.3f}", f"{v * c / 2:.4f}", "0",
+    ]
+
+
+class MockFuturesServer(ThreadingHTTPServer):
+    """가중치 한도/차단 상태를 들고 있는 모의 서버."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        dataset: MockKlineDataset,
+        weight_limit_1m: int = 2400,
+        ban_seconds: int = 2,
+        fail_every: int = 0,
+        ban_after: int = 10
+    ):
+        super().__init__(address, _Handler)
+        self.dataset = dataset
+        self.weight_limit_1m = weight_limit_1m
+        self.ban_seconds = ban_seconds
+        self.fail_every = fail_every
+        self.ban_after = ban_after
+        self.request_count = 0
+        self._violations = 0
+        self._banned_until = 0.0
+        self._minute = -1
+        self._used = 0
+        self._retry_until = 0.0
+        self._state_lock = threading.Lock()
+
+    def charge(self, weight: int) -> Tuple[int, int, int]:
+        """
+        가중치를 차감한다.
+
+        Returns:
+            Tuple[int, int, int]: (HTTP 상태, 사용 가중치, Retry-After 초)
+        """
+        with self._state_lock:
+            now = time.time()
+            self.request_count += 1
+            minute = int(now // 60)
+            if minute != self._minute:
+                self._minute = minute
+                self._used = 0
+
+            if now < self._banned_until:
+                return 418, self._used, max(1, int(self._banned_until - now + 0.999))
+
+            if now < self._retry_until:
+                # Retry-After를 지키지 않은 요청: 위반이 쌓이면 IP 차단(418)
+                self._violations += 1
+                if self._violations >= self.ban_after:
+                    self._violations = 0
+                    self._banned_until = now + self.ban_seconds
+                    return 418, self._used, self.ban_seconds
+                return 429, self._used, max(1, int(self._retry_until - now + 0.999))
+
+            if self.fail_every and self.request_count % self.fail_every == 0:
+                self._retry_until = now + 1
+                return 429, self._used, 1
+
+            if self._used + weight > self.weight_limit_1m:
+                retry_after = max(1, int(60 - now % 60))
+                self._retry_until = now + retry_after
+                return 429, self._used, retry_after
+
+            self._used += weight
+            return 200, self._used, 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockFuturesServer
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def _send_json(self, status: int, body, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):  # noqa: N802
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if url.path == "/fapi/v1/ping":
+            self._send_json(200, {})
+            return
+        if url.path == "/fapi/v1/time":
+            self._send_json(200, {"serverTime": int(time.time() * 1000)})
+            return
+        if url.path != KLINES_PATH:
+            self._send_json(404, {"code": -1, "msg": "Not found"})
+            return
+
+        try:
+            symbol = query["symbol"]
+            interval = query["interval"]
+            limit = int(query.get("limit", DEFAULT_LIMIT))
+            start_ms = int(query["startTime"]) if "startTime" in query else None
+            end_ms = int(query["endTime"]) if "endTime" in query else None
+            timeframe_to_ms(interval)
+        except (KeyError, ValueError):
+            self._send_json(400, {"code": -1102, "msg": "Mandatory parameter was not sent or malformed."})
+            return
+        if interval[-1:] not in ("m", "h", "d"):
+            self._send_json(400, {"code": -1120, "msg": "Invalid interval."})
+            return
+        if limit < 1 or limit > MAX_LIMIT:
+            self._send_json(400, {"code": -1130, "msg": "Invalid limit."})
+            return
+
+        status, used, retry_after = self.server.charge(klines_request_weight(limit))
+        headers = {USED_WEIGHT_HEADER: str(used)}
+        if status != 200:
+            headers["Retry-After"] = str(retry_after)
+            self._send_json(status, {"code": -1003, "msg": "Too many requests."}, headers)
+            return
+
+        body = self.server.dataset.klines(symbol, interval, start_ms, end_ms, limit)
+        self._send_json(200, body, headers)
+
+
+def start_mock_server(
+    port: int = 0,
+    start: str = DEFAULT_START,
+    data_dir: Optional[str] = None,
+    weight_limit_1m: int = 2400,
+    ban_seconds: int = 2,
+    fail_every: int = 0,
+    ban_after: int = 10
+) -> Tuple[MockFuturesServer, str]:
+    """
+    모의 서버를 데몬 스레드로 띄운다.
+
+    Args:
+        port (int): 포트 (0이면 빈 포트 자동 선택)
+        start (str): 합성 데이터 시작 시각 (UTC)
+        data_dir (str, optional): 기록 데이터(아카이브) 폴더
+        weight_limit_1m (int): 1분 가중치 한도
+        ban_seconds (int): 418 차단 시간(초)
+        fail_every (int): N번째 요청마다 강제 429 (0이면 끔)
+        ban_after (int): Retry-After 대기 중 요청이 이만큼 쌓이면 418
+
+    Returns:
+        Tuple[MockFuturesServer, str]: (서버, 기본 URL) — 종료는 server.shutdown()
+    """
+    dataset = MockKlineDataset(start=start, data_dir=data_dir)
+    server = MockFuturesServer(("127.0.0.1", port), dataset, weight_limit_1m, ban_seconds, fail_every, ban_after)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def use_uncached_client(base_url: str) -> MarketDataClient:
+    """
+    base_url용 프로세스 공용 클라이언트를 캐시 없는 클라이언트로 등록한다.
+    (테스트가 data/cache에 모의 서버 응답을 남기지 않도록, fetch_data 함수들보다 먼저 호출)
+
+    Args:
+        base_url (str): start_mock_server가 돌려준 기본 URL
+
+    Returns:
+        MarketDataClient: 등록된 클라이언트
+    """
+    client = MarketDataClient(base_url=base_url, use_cache=False)
+    with market_client._clients_lock:
+        market_client._clients[base_url.rstrip("/")] = client
+    return client
+
+
+@contextlib.contextmanager
+def mock_as_default(**server_kwargs) -> Iterator[Tuple[MockFuturesServer, str]]:
+    """
+    모의 서버를 띄우고 config.BINANCE_FAPI_BASE_URL 대신 기본 주소로 쓰게 한다. (캐시 없음)
+    base_url을 받지 않는 update_data_db 등도 모의 서버로 수집한다. 블록을 나가면 원래대로 되돌린다.
+
+    Args:
+        **server_kwargs: start_mock_server 인자
+
+    Yields:
+        Tuple[MockFuturesServer, str]: (서버, 기본 URL)
+    """
+    server, base_url = start_mock_server(**server_kwargs)
+    use_uncached_client(base_url)
+    original = market_client.BINANCE_FAPI_BASE_URL
+    market_client.BINANCE_FAPI_BASE_URL = base_url
+    try:
+        yield server, base_url
+    finally:
+        market_client.BINANCE_FAPI_BASE_URL = original
+        with market_client._clients_lock:
+            market_client._clients.pop(base_url, None)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="바이낸스 선물 klines 모의 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--start", default=DEFAULT_START, help="합성 데이터 시작 시각(UTC)")
+    parser.add_argument("--data-dir", default=None, help="data.binance.vision 형식 아카이브 폴더")
+    parser.add_argument("--weight-limit", type=int, default=2400)
+    parser.add_argument("--ban-seconds", type=int, default=2)
+    parser.add_argument("--fail-every", type=int, default=0)
+    parser.add_argument("--ban-after", type=int, default=10)
+    args = parser.parse_args()
+
+    srv, base = start_mock_server(
+        args.port, args.start, args.data_dir, args.weight_limit, args.ban_seconds, args.fail_every, args.ban_after
+    )
+    print(f"[mock_futures_server] {base} 에서 서빙 중 (Ctrl+C 종료)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        srv.shutdown()
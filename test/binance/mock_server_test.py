@@ -0,0 +1,100 @@
+# gptbitcoin/test/binance/mock_server_test.py
+"""
+모의 바이낸스 선물 서버(mock_futures_server.py)를 대상으로 수집 경로를 검사하는 테스트 스크립트.
+네트워크 없이 실행된다.
+
+검사 항목:
+  1) iter_ohlcv_chunks 페이지네이션: 구간 봉이 빠짐/중복 없이 이어지는지
+  2) 상위 interval(1h, 4h, 1d) 봉이 15m 봉의 UTC 경계 집계와 같은지 (리샘플 검증의 전제)
+  3) 429(Retry-After)를 받아도 클라이언트가 재시도해 같은 결과를 받는지
+
+사용 예 (프로젝트 최상위에서):
+  PYTHONPATH=. python test/binance/mock_server_test.py
+  PYTHONPATH=. python -m pytest -q test/binance/mock_server_test.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_futures_server import start_mock_server, use_uncached_client  # noqa: E402
+from data.fetch_data import iter_ohlcv_chunks  # noqa: E402
+from data.resample import timeframe_to_ms  # noqa: E402
+
+SYMBOL = "BTCUSDT"
+START_MS = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp() * 1000)
+END_MS = int(pd.Timestamp("2024-03-01", tz="UTC").timestamp() * 1000) - 1
+
+
+def _fetch(base_url: str, interval: str, start_ms: int = START_MS, end_ms: int = END_MS) -> pd.DataFrame:
+    chunks = list(iter_ohlcv_chunks(SYMBOL, interval, start_ms, end_ms, base_url=base_url))
+    return pd.DataFrame({f: np.concatenate([c[f] for c in chunks]) for f in chunks[0]})
+
+
+def test_pagination_continuous() -> None:
+    server, base_url = start_mock_server()
+    try:
+        use_uncached_client(base_url)
+        df = _fetch(base_url, "15m")
+        step = timeframe_to_ms("15m")
+        ot = df["open_time"].to_numpy()
+        # 60일 × 96봉, 여러 페이지(1500봉)에 걸쳐 빠짐/중복 없음
+        assert len(ot) == 60 * 96, len(ot)
+        assert ot[0] == START_MS and np.all(np.diff(ot) == step)
+        print(f"[mock_server_test] pagination OK: {len(ot)}봉, 요청 {server.request_count}회")
+    finally:
+        server.shutdown()
+
+
+def test_derived_intervals_match_base() -> None:
+    server, base_url = start_mock_server()
+    try:
+        use_uncached_client(base_url)
+        base = _fetch(base_url, "15m")
+        for interval in ("1h", "4h", "1d"):
+            step = timeframe_to_ms(interval)
+            # resample 모듈과 별개로 pandas groupby로 집계
+            g = base.groupby(base["open_time"] // step * step)
+            expected = pd.DataFrame({
+                "open": g["open"].first(),
+                "high": g["high"].max(),
+                "low": g["low"].min(),
+                "close": g["close"].last(),
+                "volume": g["volume"].sum(),
+            })
+            fetched = _fetch(base_url, interval).set_index("open_time")
+            assert list(fetched.index) == list(expected.index), interval
+            for f in ("open", "high", "low", "close"):
+                assert np.array_equal(fetched[f].to_numpy(), expected[f].to_numpy()), (interval, f)
+            assert np.allclose(fetched["volume"].to_numpy(), expected["volume"].to_numpy(), rtol=0, atol=1e-6)
+            print(f"[mock_server_test] {interval} = 15m 집계 OK: {len(fetched)}봉")
+    finally:
+        server.shutdown()
+
+
+def test_retry_after_429() -> None:
+    server, base_url = start_mock_server(fail_every=2)
+    try:
+        client = use_uncached_client(base_url)
+        df = _fetch(base_url, "15m")
+        assert len(df) == 60 * 96
+        # 15m 60일 = 4페이지, 짝수 번째 요청마다 429를 받고 재시도
+        assert server.request_count > 4
+        assert client.used_weight > 0
+        print(f"[mock_server_test] 429 재시도 OK: 요청 {server.request_count}회")
+    finally:
+        server.shutdown()
+
+
+def main():
+    test_pagination_continuous()
+    test_derived_intervals_match_base()
+    test_retry_after_429()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# gptbitcoin/test/checkpoint_test.py
+"""
+스윕 체크포인트(backtest/checkpoint.py) 검사 스크립트. (합성 데이터, 네트워크/DB 불필요)
+
+검사 항목:
+  1) 처음 실행 / 재시작 실행 결과가 worker_pool.map_combos(체크포인트·중복 제거 없음)와 같은지
+  2) combo_id가 바뀌어도(카탈로그 재번호) 저장된 결과를 이번 id로 돌려주는지
+  3) 콤보가 읽는 지표 칼럼 값이 바뀌면(워밍업 시작점 이동 등) 그 콤보만 다시 계산하는지
+  4) 저장 실패(sqlite3.Error)가 삼켜지지 않고 전달되는지
+
+사용 예 (프로젝트 최상위에서):
+  PYTHONPATH=. python test/checkpoint_test.py
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_frame import make_dataframe, make_space  # noqa: E402
+from backtest.checkpoint import SweepCheckpoint  # noqa: E402
+from backtest.run_is import _evaluate_combo_is  # noqa: E402
+from backtest.worker_pool import BacktestWorkerPool  # noqa: E402
+from utils.bar_frame import BarFrame  # noqa: E402
+
+RUN_KWARGS = dict(timeframe="1d", start_capital=100_000, bh_return=0.5)
+
+
+def _assert_rows_equal(rows, expected, label: str) -> None:
+    # NaN 위치까지 같아야 같다고 본다 (DataFrame.equals)
+    assert pd.DataFrame(rows).equals(pd.DataFrame(expected)), label
+    print(f"[checkpoint_test] {label}: {len(rows)}행 일치")
+
+
+def _saved_count(ckpt: SweepCheckpoint) -> int:
+    return ckpt._conn.execute("SELECT COUNT(*) FROM combo_results").fetchone()[0]
+
+
+def test_resume_matches_plain_map_combos() -> None:
+    frame = BarFrame.from_dataframe(make_dataframe())
+    items = list(make_space((1, 2)).items())
+    path = os.path.join(tempfile.mkdtemp(prefix="checkpoint_test_"), "ckpt.sqlite")
+    with BacktestWorkerPool(max_workers=2) as pool:
+        expected = pool.map_combos(_evaluate_combo_is, frame, items, **RUN_KWARGS)
+
+        ckpt = SweepCheckpoint(path)
+        # 앞 절반만 먼저 끝낸 뒤 중단된 상황
+        half = ckpt.map_combos(_evaluate_combo_is, frame, items[:len(items) // 2], phase="is", pool=pool,
+                               **RUN_KWARGS)
+        _assert_rows_equal(half, expected[:len(items) // 2], "중단 전")
+        resumed = ckpt.map_combos(_evaluate_combo_is, frame, items, phase="is", pool=pool, **RUN_KWARGS)
+        _assert_rows_equal(resumed, expected, "재시작")
+        assert _saved_count(ckpt) == len(items)
+
+        # 카탈로그 재번호: 같은 콤보, 다른 id → 계산 없이 이번 id로
+        shifted = [(cid + 1000, combo) for cid, combo in items]
+        rows = ckpt.map_combos(_evaluate_combo_is, frame, shifted, phase="is", pool=pool, **RUN_KWARGS)
+        assert [r["combo_id"] for r in rows] == [cid for cid, _ in shifted]
+        _assert_rows_equal([{**r, "combo_id": r["combo_id"] - 1000} for r in rows], expected, "재번호")
+        assert _saved_count(ckpt) == len(items)
+        ckpt.close()
+
+
+def test_changed_indicator_values_recompute() -> None:
+    df = make_dataframe()
+    frame = BarFrame.from_dataframe(df)
+    items = list(make_space((1, 2)).items())
+    path = os.path.join(tempfile.mkdtemp(prefix="checkpoint_test_"), "ckpt.sqlite")
+    with BacktestWorkerPool(max_workers=2) as pool:
+        ckpt = SweepCheckpoint(path)
+        ckpt.map_combos(_evaluate_combo_is, frame, items, phase="is", pool=pool, **RUN_KWARGS)
+        n_saved = _saved_count(ckpt)
+
+        # OHLCV는 그대로, rsi_14 값만 바뀐 구간 (더 긴 워밍업으로 Wilder 계열 값이 달라진 경우)
+        df2 = df.copy()
+        df2["rsi_14"] = df2["rsi_14"] * 0.9 + 5
+        frame2 = BarFrame.from_dataframe(df2)
+        expected = pool.map_combos(_evaluate_combo_is, frame2, items, **RUN_KWARGS)
+        rows = ckpt.map_combos(_evaluate_combo_is, frame2, items, phase="is", pool=pool, **RUN_KWARGS)
+        _assert_rows_equal(rows, expected, "rsi_14 변경")
+
+        uses_rsi14 = sum(any(p["type"] == "RSI" and p["lookback"] == 14 for p in combo) for _, combo in items)
+        assert 0 < uses_rsi14 < len(items)
+        assert _saved_count(ckpt) == n_saved + uses_rsi14, (_saved_count(ckpt), n_saved, uses_rsi14)
+        print(f"[checkpoint_test] rsi_14를 쓰는 콤보 {uses_rsi14}개만 다시 계산")
+        ckpt.close()
+
+
+def test_save_error_propagates() -> None:
+    path = os.path.join(tempfile.mkdtemp(prefix="checkpoint_test_"), "ckpt.sqlite")
+    ckpt = SweepCheckpoint(path)
+    other = sqlite3.connect(path)
+    other.execute("DROP TABLE combo_results")
+    other.commit()
+    other.close()
+    try:
+        ckpt.save_rows(("fp", "1d", "is", "settings"), [("key", {"combo_id": 0})])
+    except sqlite3.Error as e:
+        print(f"[checkpoint_test] 저장 실패 전달 OK: {e}")
+    else:
+        raise AssertionError("save_rows가 sqlite3.Error를 삼켰습니다.")
+    finally:
+        ckpt.close()
+
+
+def main():
+    test_resume_matches_plain_map_combos()
+    test_changed_indicator_values_recompute()
+    test_save_error_propagates()
+
+
+if __name__ == "__main__":
+    main()
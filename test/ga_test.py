@@ -0,0 +1,52 @@
+# gptbitcoin/test/ga_test.py
+"""
+GA IS 탐색(backtest/run_is_ga.py) 검사 스크립트. (합성 데이터, 네트워크/DB 불필요)
+
+검사 항목:
+  1) 같은 시드면 결과 행/상위 콤보가 같은지
+  2) GA 행이 combo_id로 찾은 콤보를 run_is로 평가한 행과 같은지 (시그널 캐시/ID 인코딩 확인)
+
+사용 예 (프로젝트 최상위에서):
+  PYTHONPATH=. python test/ga_test.py
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_frame import make_frame, make_space  # noqa: E402
+from backtest.run_is import run_is  # noqa: E402
+from backtest.run_is_ga import run_is_ga  # noqa: E402
+from backtest.worker_pool import BacktestWorkerPool  # noqa: E402
+
+GA_KWARGS = dict(population=16, generations=5, patience=None, elite=2, tournament=3,
+                 crossover_rate=0.8, mutation_rate=0.2, metric="is_sharpe", top_k=5)
+
+
+def _frame_equal(a, b) -> bool:
+    return pd.DataFrame(a).equals(pd.DataFrame(b))
+
+
+def test_ga_deterministic() -> None:
+    frame = make_frame()
+    space = make_space((3, 4, 5))
+    with BacktestWorkerPool(max_workers=2) as pool:
+        rows_a, top_a = run_is_ga(frame, space, "1d", start_capital=100_000, pool=pool, seed=11, **GA_KWARGS)
+        rows_b, top_b = run_is_ga(frame, space, "1d", start_capital=100_000, pool=pool, seed=11, **GA_KWARGS)
+        assert top_a == top_b and _frame_equal(rows_a, rows_b)
+
+        # GA 행 = combo_id로 카탈로그에서 찾은 콤보를 run_is로 평가한 행
+        expected = run_is(frame, {cid: space[cid] for cid in top_a}, "1d", start_capital=100_000, pool=pool)
+        assert _frame_equal(rows_a, expected)
+    print(f"[ga_test] GA(seed=11): 상위 {top_a} 재현 및 run_is 행 일치")
+
+
+def main():
+    test_ga_deterministic()
+
+
+if __name__ == "__main__":
+    main()
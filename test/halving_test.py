@@ -0,0 +1,68 @@
+# gptbitcoin/test/halving_test.py
+"""
+successive halving IS 탐색(backtest/run_is_halving.py) 검사 스크립트. (합성 데이터, 네트워크/DB 불필요)
+
+검사 항목:
+  1) halving_schedule: 오름차순, 마지막 = IS 전체, min_bars보다 짧은 단계 없음
+  2) run_is_halving: 두 번 실행 결과가 같고, 최종 행이 run_is의 같은 콤보 행과 같은지
+     (max_candidates 표본 추출 포함)
+
+사용 예 (프로젝트 최상위에서):
+  PYTHONPATH=. python test/halving_test.py
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_frame import make_frame, make_space  # noqa: E402
+from backtest.run_is import run_is  # noqa: E402
+from backtest.run_is_halving import halving_schedule, run_is_halving  # noqa: E402
+from backtest.worker_pool import BacktestWorkerPool  # noqa: E402
+
+
+def _frame_equal(a, b) -> bool:
+    return pd.DataFrame(a).equals(pd.DataFrame(b))
+
+
+def test_halving_schedule() -> None:
+    for n_bars in (50, 365, 1200, 10_000):
+        for eta in (2, 3, 4):
+            for min_fraction in (0.01, 0.1, 0.25, 1.0):
+                lengths = halving_schedule(n_bars, eta, min_fraction, min_bars=30)
+                assert lengths[-1] == n_bars
+                assert all(a < b for a, b in zip(lengths, lengths[1:])), lengths
+                assert all(x >= 30 for x in lengths[:-1]), lengths
+    print("[halving_test] halving_schedule 확인")
+
+
+def test_halving_matches_run_is() -> None:
+    frame = make_frame()
+    space = make_space((1, 2))
+    with BacktestWorkerPool(max_workers=2) as pool:
+        full = {r["combo_id"]: r for r in run_is(frame, space, "1d", start_capital=100_000, pool=pool)}
+        for max_candidates in (None, 40):
+            kwargs = dict(start_capital=100_000, pool=pool, eta=3, min_fraction=0.1,
+                          max_candidates=max_candidates, metric="is_sharpe")
+            rows_a, surv_a = run_is_halving(frame, space, "1d", **kwargs)
+            rows_b, surv_b = run_is_halving(frame, space, "1d", **kwargs)
+            assert surv_a == surv_b and _frame_equal(rows_a, rows_b)
+
+            # B/H 행 다음은 최종 단계(IS 전체) 생존 콤보 행 = run_is 행
+            final = [r for r in rows_a if r["combo_id"] in set(surv_a)]
+            assert [r["combo_id"] for r in final] == surv_a
+            assert _frame_equal(final, [full[cid] for cid in surv_a])
+            print(f"[halving_test] halving(max_candidates={max_candidates}): "
+                  f"생존 {surv_a} 재현 및 run_is 행 일치")
+
+
+def main():
+    test_halving_schedule()
+    test_halving_matches_run_is()
+
+
+if __name__ == "__main__":
+    main()
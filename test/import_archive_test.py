@@ -0,0 +1,135 @@
+# gptbitcoin/test/import_archive_test.py
+"""
+아카이브 가져오기(data/import_archive.py)와 full 모드 수집(data/update_data.py)을 검사한다.
+모의 서버(test/binance/mock_futures_server.py)의 봉으로 data.binance.vision 형식 파일을 만들어 쓰므로
+네트워크 없이 실행된다.
+
+아카이브 구성 (1h, 2024-01 ~ 2024-04):
+  - 2024-01: 파일 없음 (아카이브가 수집 시작보다 늦게 시작)
+  - 2024-02: 헤더 없는 .csv
+  - 2024-03: 파일 없음 (빠진 월)
+  - 2024-04: 헤더 있는 .zip, 4월 10일 봉이 빠져 있음 (파일 안 빈 구간)
+
+검사 항목:
+  1) parse_archive_file이 헤더 유무와 무관하게 원래 봉을 읽는지
+  2) import_archives가 실제로 저장한 구간만 돌려주고, uncovered_ranges가 나머지 구간을 구하는지
+  3) update_data_db(full) 후 DB 봉이 모의 서버 봉과 같고 빠진 봉이 없는지
+
+사용 예 (프로젝트 최상위에서):
+  PYTHONPATH=. python test/import_archive_test.py
+"""
+
+import os
+import sys
+import tempfile
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "binance"))
+
+from mock_futures_server import mock_as_default  # noqa: E402
+import data.import_archive as import_archive  # noqa: E402
+import utils.bar_store as bar_store  # noqa: E402
+from data.fetch_data import get_ohlcv_from_binance  # noqa: E402
+from data.update_data import update_data_db  # noqa: E402
+from utils.db_utils import fetch_ohlcv, get_connection  # noqa: E402
+from utils.gap_index import get_gaps  # noqa: E402
+
+SYMBOL = "BTCUSDT"
+START_STR = "2024-01-01 00:00:00"
+END_STR = "2024-04-30 23:00:00"
+BOUNDARY_STR = "2024-04-01 00:00:00"
+HOUR_MS = 3_600_000
+FIELDS = ["open_time", "open", "high", "low", "close", "volume"]
+# 아카이브 CSV 칼럼 (앞 6개만 읽는다)
+CSV_COLUMNS = FIELDS + ["close_time", "quote_volume", "count",
+                        "taker_buy_volume", "taker_buy_quote_volume", "ignore"]
+
+
+def _ms(dt_str: str) -> int:
+    return int(pd.Timestamp(dt_str, tz="UTC").timestamp() * 1000)
+
+
+def _to_csv_text(df: pd.DataFrame, header: bool) -> str:
+    out = df[FIELDS].copy()
+    out["close_time"] = out["open_time"] + HOUR_MS - 1
+    for col in CSV_COLUMNS[7:]:
+        out[col] = 0
+    return out.to_csv(index=False, header=header)
+
+
+def _write_archives(root: str, df: pd.DataFrame) -> None:
+    month = pd.to_datetime(df["open_time"], unit="ms", utc=True).dt.strftime("%Y-%m")
+    feb = df[month == "2024-02"]
+    with open(os.path.join(root, f"{SYMBOL}-1h-2024-02.csv"), "w", encoding="utf-8") as f:
+        f.write(_to_csv_text(feb, header=False))
+
+    apr = df[month == "2024-04"]
+    apr = apr[(apr["open_time"] < _ms("2024-04-10 00:00:00")) | (apr["open_time"] >= _ms("2024-04-11 00:00:00"))]
+    sub = os.path.join(root, "futures", "um", "monthly", "klines", SYMBOL, "1h")
+    os.makedirs(sub)
+    with zipfile.ZipFile(os.path.join(sub, f"{SYMBOL}-1h-2024-04.zip"), "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(f"{SYMBOL}-1h-2024-04.csv", _to_csv_text(apr, header=True))
+
+
+def test_archive_gaps_are_fetched() -> None:
+    tmp = tempfile.mkdtemp(prefix="import_archive_test_")
+    archive_dir = os.path.join(tmp, "archive")
+    os.makedirs(archive_dir)
+    db_path = os.path.join(tmp, "ohlcv.sqlite")
+    original_archive, original_store = import_archive.BINANCE_ARCHIVE_DIR, bar_store.BAR_STORE_DIR
+    import_archive.BINANCE_ARCHIVE_DIR = archive_dir
+    bar_store.BAR_STORE_DIR = os.path.join(tmp, "bars")
+    try:
+        with mock_as_default():
+            expected = get_ohlcv_from_binance(SYMBOL, "1h", START_STR, END_STR)
+            _write_archives(archive_dir, expected)
+
+            # 1) 헤더 없는 csv / 헤더 있는 zip 모두 원래 봉
+            files = import_archive.find_archive_files(SYMBOL, "1h", archive_dir)
+            assert [os.path.basename(p) for p in files] == [f"{SYMBOL}-1h-2024-02.csv", f"{SYMBOL}-1h-2024-04.zip"]
+            for path in files:
+                arrays = import_archive.parse_archive_file(path, HOUR_MS)
+                ref = expected.set_index("open_time").loc[arrays["open_time"]]
+                for f in FIELDS[1:]:
+                    assert np.array_equal(arrays[f], ref[f].to_numpy()), (path, f)
+
+            # 2) 저장 구간 / 남은 구간
+            start_ms, end_ms = _ms(START_STR), _ms(END_STR)
+            scratch = os.path.join(tmp, "scratch.sqlite")
+            covered = import_archive.import_archives(SYMBOL, "1h", start_ms, end_ms, 0, db_path=scratch,
+                                                     max_workers=1)
+            assert covered == [
+                (_ms("2024-02-01 00:00:00"), _ms("2024-02-29 23:00:00")),
+                (_ms("2024-04-01 00:00:00"), _ms("2024-04-09 23:00:00")),
+                (_ms("2024-04-11 00:00:00"), _ms("2024-04-30 23:00:00")),
+            ], covered
+            assert import_archive.uncovered_ranges(covered, start_ms, end_ms, HOUR_MS) == [
+                (_ms("2024-01-01 00:00:00"), _ms("2024-01-31 23:00:00")),
+                (_ms("2024-03-01 00:00:00"), _ms("2024-03-31 23:00:00")),
+                (_ms("2024-04-10 00:00:00"), _ms("2024-04-10 23:00:00")),
+            ]
+
+            # 3) full 모드: 아카이브 + 나머지 구간 REST → 모의 서버와 같은 봉, 결측 없음
+            update_data_db(SYMBOL, "1h", START_STR, END_STR, db_path, BOUNDARY_STR, "full")
+
+        conn = get_connection(db_path)
+        db = fetch_ohlcv(conn, SYMBOL, "1h", 0, 2 ** 62)
+        assert len(db) == len(expected) == 121 * 24, (len(db), len(expected))
+        for f in FIELDS:
+            assert np.array_equal(db[f].to_numpy(), expected[f].to_numpy()), f
+        assert get_gaps(conn, SYMBOL, "1h", include_confirmed=True) == []
+        print(f"[import_archive_test] 아카이브 {len(covered)}구간 + REST 3구간 → {len(db)}봉, 결측 없음")
+    finally:
+        import_archive.BINANCE_ARCHIVE_DIR = original_archive
+        bar_store.BAR_STORE_DIR = original_store
+
+
+def main():
+    test_archive_gaps_are_fetched()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# gptbitcoin/test/repair_gaps_test.py
+"""
+결측 복구(data/update_data.py repair_gaps)를 검사한다.
+모의 서버를 아카이브 모드(--data-dir)로 띄워 거래소 자체에 없는 봉(점검 구간)을 흉내 내므로
+네트워크 없이 실행된다.
+
+시나리오 (1h, 2024-01):
+  - 거래소: 2024-01-10 06:00 ~ 11:00 봉 없음 (점검)
+  - DB: 2024-01-10 00:00 ~ 11:00 결측 (앞 6봉은 지워진 것, 뒤 6봉은 거래소에도 없음)
+
+검사 항목:
+  1) repair_gaps가 받을 수 있는 앞 6봉을 채우고, 그래도 빈 뒤 6봉 구간을 confirmed로 표시하는지
+  2) 다시 실행하면 미확인 결측이 없어 요청을 보내지 않는지
+
+사용 예 (프로젝트 최상위에서):
+  PYTHONPATH=. python test/repair_gaps_test.py
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "binance"))
+
+from mock_futures_server import mock_as_default  # noqa: E402
+import utils.bar_store as bar_store  # noqa: E402
+from data.fetch_data import get_ohlcv_from_binance  # noqa: E402
+from data.update_data import repair_gaps, update_data_db  # noqa: E402
+from utils.db_utils import delete_ohlcv, fetch_ohlcv, get_connection  # noqa: E402
+from utils.gap_index import get_gaps  # noqa: E402
+
+SYMBOL = "BTCUSDT"
+START_STR = "2024-01-01 00:00:00"
+END_STR = "2024-01-31 23:00:00"
+BOUNDARY_STR = "2024-01-20 00:00:00"
+FIELDS = ["open_time", "open", "high", "low", "close", "volume"]
+
+
+def _ms(dt_str: str) -> int:
+    return int(pd.Timestamp(dt_str, tz="UTC").timestamp() * 1000)
+
+
+def test_partial_fill_confirms_rest() -> None:
+    tmp = tempfile.mkdtemp(prefix="repair_gaps_test_")
+    db_path = os.path.join(tmp, "ohlcv.sqlite")
+    original_store = bar_store.BAR_STORE_DIR
+    bar_store.BAR_STORE_DIR = os.path.join(tmp, "bars")
+    outage = (_ms("2024-01-10 06:00:00"), _ms("2024-01-10 11:00:00"))
+    try:
+        # 합성 봉에서 점검 구간을 뺀 아카이브 → 이 아카이브를 서빙하는 모의 거래소
+        with mock_as_default():
+            df = get_ohlcv_from_binance(SYMBOL, "1h", START_STR, END_STR)
+        df = df[(df["open_time"] < outage[0]) | (df["open_time"] > outage[1])]
+        with open(os.path.join(tmp, f"{SYMBOL}-1h-2024-01.csv"), "w", encoding="utf-8") as f:
+            f.write(df[FIELDS].to_csv(index=False, header=False))
+
+        with mock_as_default(data_dir=tmp) as (server, _):
+            update_data_db(SYMBOL, "1h", START_STR, END_STR, db_path, BOUNDARY_STR, "full")
+            conn = get_connection(db_path)
+            delete_ohlcv(conn, SYMBOL, "1h", _ms("2024-01-10 00:00:00"), _ms("2024-01-10 05:00:00"),
+                         include_sealed=True)
+            assert get_gaps(conn, SYMBOL, "1h") == [(_ms("2024-01-10 00:00:00"), outage[1], 0)]
+
+            assert repair_gaps(SYMBOL, "1h", db_path, BOUNDARY_STR) == 0
+            assert get_gaps(conn, SYMBOL, "1h") == [(outage[0], outage[1], 1)]
+            assert len(fetch_ohlcv(conn, SYMBOL, "1h", 0, 2 ** 62)) == len(df)
+
+            requests_before = server.request_count
+            assert repair_gaps(SYMBOL, "1h", db_path, BOUNDARY_STR) == 0
+            assert server.request_count == requests_before
+        print("[repair_gaps_test] 앞 6봉 복구, 점검 구간 6봉 confirmed, 재실행 시 요청 없음")
+    finally:
+        bar_store.BAR_STORE_DIR = original_store
+
+
+def main():
+    test_partial_fill_confirms_rest()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# gptbitcoin/test/resample_test.py
+"""
+로컬 리샘플링(data/resample.py)이 거래소에서 받은 상위 타임프레임 봉과 같은지 오프라인으로 검사한다.
+(config.RESAMPLED_TIMEFRAMES를 켜기 전 확인용)
+
+거래소 대신 모의 서버(test/binance/mock_futures_server.py)를 쓴다.
+모의 서버의 1h/4h/1d 봉은 15m 봉의 집계이므로 실제 거래소와 같은 관계를 가진다.
+
+검사 항목:
+  1) 받은 15m 봉 → resample_ohlcv_df 결과 == 받은 1h/4h/1d 봉 (compare_with_reference)
+  2) update_data_db(15m) + update_resampled_db(4h)로 DB에 만든 봉 == update_data_db(4h)로 받은 봉
+
+사용 예 (프로젝트 최상위에서):
+  PYTHONPATH=. python test/resample_test.py
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "binance"))
+
+from mock_futures_server import mock_as_default  # noqa: E402
+import utils.bar_store as bar_store  # noqa: E402
+from data.fetch_data import get_ohlcv_from_binance  # noqa: E402
+from data.resample import compare_with_reference, resample_ohlcv_df  # noqa: E402
+from data.update_data import update_data_db, update_resampled_db  # noqa: E402
+from utils.db_utils import fetch_ohlcv, get_connection  # noqa: E402
+
+SYMBOL = "BTCUSDT"
+START_STR = "2024-01-01 00:00:00"
+END_STR = "2024-02-29 23:59:59"
+BOUNDARY_STR = "2024-02-15 00:00:00"
+
+
+def test_resample_matches_fetched() -> None:
+    with mock_as_default():
+        df_base = get_ohlcv_from_binance(SYMBOL, "15m", START_STR, END_STR)
+        for tf in ("1h", "4h", "1d"):
+            df_ref = get_ohlcv_from_binance(SYMBOL, tf, START_STR, END_STR)
+            resampled = resample_ohlcv_df(df_base, "15m", tf, include_partial=False)
+            report = compare_with_reference(resampled, df_ref)
+            print(f"[resample_test] 15m->{tf}: {report}")
+            assert report["mismatch"] == 0 and report["only_resampled"] == 0 and report["only_reference"] == 0
+            assert report["common"] == len(df_ref)
+
+
+def test_update_resampled_db_matches_fetched() -> None:
+    tmp = tempfile.mkdtemp(prefix="resample_test_")
+    db_resampled = os.path.join(tmp, "resampled.sqlite")
+    db_fetched = os.path.join(tmp, "fetched.sqlite")
+    original_store = bar_store.BAR_STORE_DIR
+    bar_store.BAR_STORE_DIR = os.path.join(tmp, "bars")
+    try:
+        with mock_as_default():
+            update_data_db(SYMBOL, "15m", START_STR, END_STR, db_resampled, BOUNDARY_STR, "full")
+            update_resampled_db(SYMBOL, "4h", START_STR, END_STR, db_resampled, BOUNDARY_STR, "full", "15m")
+            update_data_db(SYMBOL, "4h", START_STR, END_STR, db_fetched, BOUNDARY_STR, "full")
+
+        start_ot, end_ot = 0, 2 ** 62
+        a = fetch_ohlcv(get_connection(db_resampled), SYMBOL, "4h", start_ot, end_ot)
+        b = fetch_ohlcv(get_connection(db_fetched), SYMBOL, "4h", start_ot, end_ot)
+        assert len(a) == len(b) == 60 * 6, (len(a), len(b))
+        assert np.array_equal(a["open_time"].to_numpy(), b["open_time"].to_numpy())
+        for f in ("open", "high", "low", "close", "volume"):
+            assert np.allclose(a[f].to_numpy(), b[f].to_numpy(), rtol=1e-9, atol=0.0), f
+        print(f"[resample_test] DB 4h(리샘플) == DB 4h(수집): {len(a)}봉")
+    finally:
+        bar_store.BAR_STORE_DIR = original_store
+
+
+def main():
+    test_resample_matches_fetched()
+    test_update_resampled_db_matches_fetched()
+
+
+if __name__ == "__main__":
+    main()
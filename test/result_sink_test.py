@@ -0,0 +1,103 @@
+# gptbitcoin/test/result_sink_test.py
+"""
+결과 저장소(utils/result_sink.py)의 SQLite 조인(write_join)이 main.py가 예전에 쓰던
+pandas.merge(how="outer")와 같은 "final" 행을 만드는지 검사한다.
+
+검사 항목:
+  1) IS/OOS 모두 있는 콤보, IS에만 있는 콤보(halving/GA 탈락), OOS에만 있는 행, B/H 행
+  2) 다른 group(타임프레임)과 다른 run의 행이 섞이지 않는지
+  3) 칼럼 순서, 값, 행 순서((combo_id, timeframe) 오름차순)
+
+사용 예 (프로젝트 최상위에서):
+  PYTHONPATH=. python test/result_sink_test.py
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from utils.result_sink import ResultSink
+
+BH_ID = -1
+COLUMNS = [
+    "timeframe",
+    "is_start_cap", "is_end_cap", "is_return", "is_trades",
+    "is_sharpe", "is_mdd", "is_passed",
+    "oos_start_cap", "oos_end_cap", "oos_return", "oos_trades",
+    "oos_sharpe", "oos_mdd", "oos_current_position",
+    "combo_id", "is_trades_log", "oos_trades_log"
+]
+
+
+def _is_row(tf: str, cid: int, rng: np.random.Generator) -> dict:
+    return {
+        "timeframe": tf if cid != BH_ID else f"{tf}(B/H)",
+        "is_start_cap": 100_000, "is_end_cap": float(rng.uniform(5e4, 2e5)),
+        "is_return": float(rng.normal()), "is_trades": int(rng.integers(0, 50)),
+        "is_sharpe": float(rng.normal()) if cid % 7 else None, "is_mdd": float(rng.uniform()),
+        "is_passed": int(rng.integers(0, 2)), "combo_id": cid, "is_trades_log": f"[is {cid}]",
+    }
+
+
+def _oos_row(tf: str, cid: int, rng: np.random.Generator) -> dict:
+    return {
+        "timeframe": tf if cid != BH_ID else f"{tf}(B/H)",
+        "oos_start_cap": 100_000, "oos_end_cap": float(rng.uniform(5e4, 2e5)),
+        "oos_return": float(rng.normal()), "oos_trades": int(rng.integers(0, 50)),
+        "oos_sharpe": float(rng.normal()), "oos_mdd": float(rng.uniform()),
+        "oos_current_position": int(rng.integers(-1, 2)), "combo_id": cid, "oos_trades_log": f"[oos {cid}]",
+    }
+
+
+def _pandas_final(is_rows: list, oos_rows: list) -> pd.DataFrame:
+    """main.py가 예전에 쓰던 pandas 조인."""
+    merged = pd.merge(pd.DataFrame(is_rows), pd.DataFrame(oos_rows),
+                      on=["combo_id", "timeframe"], how="outer", suffixes=("_is", "_oos"))
+    for col in COLUMNS:
+        if col not in merged.columns:
+            merged[col] = None
+    return merged[COLUMNS]
+
+
+def test_write_join_matches_pandas_merge() -> None:
+    path = os.path.join(tempfile.mkdtemp(prefix="result_sink_test_"), "results.sqlite")
+    rng = np.random.default_rng(3)
+
+    # 다른 run의 같은 group 행 (섞이면 안 됨)
+    old = ResultSink(path, run_id="old")
+    old.write_rows("is", [_is_row("1d", 5, rng)], group="1d")
+    old.write_rows("oos", [_oos_row("1d", 5, rng)], group="1d")
+    old.close()
+
+    sink = ResultSink(path, run_id="new")
+    expected = {}
+    for tf, is_ids, oos_ids in (("1d", [BH_ID, 9, 3, 5, 1, 12], [BH_ID, 3, 9, 12, 40]),
+                                ("4h", [BH_ID, 2, 7], [BH_ID, 7])):
+        is_rows = [_is_row(tf, cid, rng) for cid in is_ids]
+        oos_rows = [_oos_row(tf, cid, rng) for cid in oos_ids]
+        # 워커 청크처럼 나눠서 쓴다
+        sink.write_rows("is", is_rows[:2], group=tf)
+        sink.write_rows("is", is_rows[2:], group=tf)
+        sink.write_rows("oos", oos_rows, group=tf)
+        expected[tf] = _pandas_final(is_rows, oos_rows)
+
+    for tf, exp in expected.items():
+        assert sink.write_join("final", "is", "oos", on=["combo_id", "timeframe"],
+                               columns=COLUMNS, group=tf) == len(exp)
+    for tf, exp in expected.items():
+        got = sink.read_frame("final", group=tf)
+        assert list(got.columns) == COLUMNS
+        pd.testing.assert_frame_equal(got.reset_index(drop=True), exp.reset_index(drop=True),
+                                      check_dtype=False)
+        print(f"[result_sink_test] {tf}: final {len(got)}행 == pandas outer merge")
+    sink.close()
+
+
+def main():
+    test_write_join_matches_pandas_merge()
+
+
+if __name__ == "__main__":
+    main()
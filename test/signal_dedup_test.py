@@ -0,0 +1,83 @@
+# gptbitcoin/test/signal_dedup_test.py
+"""
+시그널 중복 제거(backtest/signal_dedup.py) 검사 스크립트. (합성 데이터, 네트워크/DB 불필요)
+
+검사 항목:
+  1) map_combos_dedup 결과 행이 worker_pool.map_combos(중복 제거 없음)와 콤보 순서까지 같은지
+     (IS/OOS/nosplit 평가 함수 모두)
+  2) 같은 콤보를 다른 id로 넣으면 실제로 백테스트를 건너뛰는지
+  3) 블록 경계(SIGNAL_DEDUP_BLOCK_COMBOS)를 넘어도 순서가 유지되는지
+
+사용 예 (프로젝트 최상위에서):
+  PYTHONPATH=. python test/signal_dedup_test.py
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_frame import make_frame, make_space  # noqa: E402
+import backtest.signal_dedup as signal_dedup  # noqa: E402
+from backtest.run_is import _evaluate_combo_is  # noqa: E402
+from backtest.run_oos import _evaluate_combo_oos  # noqa: E402
+from backtest.run_nosplit import _evaluate_combo_nosplit  # noqa: E402
+from backtest.worker_pool import BacktestWorkerPool  # noqa: E402
+
+EVALUATORS = {
+    "is": (_evaluate_combo_is, dict(timeframe="1d", start_capital=100_000, bh_return=0.5)),
+    "oos": (_evaluate_combo_oos, dict(timeframe="1d", start_capital=100_000)),
+    "nosplit": (_evaluate_combo_nosplit,
+                dict(timeframe="1d", start_capital=100_000, risk_free_rate_annual=0.0)),
+}
+
+
+def _items_with_duplicates():
+    items = list(make_space((1, 2)).items())
+    # 앞 20개 콤보를 다른 id로 한 번 더 (시그널이 같으므로 백테스트 생략 대상)
+    return items + [(cid + 10_000, combo) for cid, combo in items[:20]]
+
+
+def test_dedup_rows_match_plain() -> None:
+    frame = make_frame()
+    items = _items_with_duplicates()
+    with BacktestWorkerPool(max_workers=2) as pool:
+        for phase, (fn, kwargs) in EVALUATORS.items():
+            expected = pool.map_combos(fn, frame, items, **kwargs)
+            before = dict(signal_dedup._STATS)
+            rows = signal_dedup.map_combos_dedup(fn, frame, items, pool=pool, **kwargs)
+            assert pd.DataFrame(rows).equals(pd.DataFrame(expected)), phase
+            unique = signal_dedup._STATS["unique"] - before["unique"]
+            assert signal_dedup._STATS["combos"] - before["combos"] == len(items)
+            assert unique <= len(items) - 20, (phase, unique)
+            print(f"[signal_dedup_test] {phase}: {len(rows)}행 일치, 백테스트 {unique}개")
+
+
+def test_block_boundaries_keep_order() -> None:
+    frame = make_frame()
+    items = _items_with_duplicates()
+    fn, kwargs = EVALUATORS["is"]
+    original = signal_dedup.SIGNAL_DEDUP_BLOCK_COMBOS
+    signal_dedup.SIGNAL_DEDUP_BLOCK_COMBOS = 7
+    try:
+        with BacktestWorkerPool(max_workers=2) as pool:
+            expected = pool.map_combos(fn, frame, items, **kwargs)
+            chunks = []
+            signal_dedup.map_combos_dedup(fn, frame, items, pool=pool, on_chunk=chunks.append, **kwargs)
+        assert all(len(c) <= 7 for c in chunks)
+        rows = [r for c in chunks for r in c]
+        assert pd.DataFrame(rows).equals(pd.DataFrame(expected))
+        print(f"[signal_dedup_test] 블록 7개 단위 {len(chunks)}청크, 순서 일치")
+    finally:
+        signal_dedup.SIGNAL_DEDUP_BLOCK_COMBOS = original
+
+
+def main():
+    test_dedup_rows_match_plain()
+    test_block_boundaries_keep_order()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# gptbitcoin/test/synthetic_frame.py
+"""
+백테스트 테스트 스크립트용 합성 데이터.
+pandas_ta 없이 numpy/pandas만으로 OHLCV와 일부 지표 칼럼(MA, RSI, OBV SMA, 돈키언, 볼린저)을 만들고,
+그 칼럼만 쓰는 작은 지표 파라미터 표(ComboSpace 입력)를 제공한다.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from indicators.combo_generator_for_backtest import ComboSpace
+from utils.bar_frame import BarFrame
+
+DAY_MS = 86_400_000
+START_MS = 1_546_300_800_000  # 2019-01-01 00:00:00 UTC
+
+MA_PERIODS = (5, 10, 20, 50)
+RSI_PERIODS = (7, 14)
+OBV_PERIODS = (5, 20)
+DONCHIAN_PERIODS = (10, 20)
+BOLL_SETTINGS = ((20, 2),)
+
+
+def make_param_tables() -> Dict[str, List[dict]]:
+    """make_frame 칼럼만 읽는 지표명 → 파라미터 dict 목록."""
+    return {
+        "MA": [{"type": "MA", "short_period": s, "long_period": l}
+               for s in MA_PERIODS for l in MA_PERIODS if s < l],
+        "RSI": [{"type": "RSI", "lookback": lb, "oversold": lo, "overbought": hi}
+                for lb in RSI_PERIODS for lo, hi in ((30, 70), (25, 75))],
+        "OBV": [{"type": "OBV", "short_period": 5, "long_period": 20}],
+        "DONCHIAN_CHANNEL": [{"type": "DONCHIAN_CHANNEL", "lookback": lb} for lb in DONCHIAN_PERIODS],
+        "BOLL": [{"type": "BOLL", "lookback": lb, "stddev_mult": sd} for lb, sd in BOLL_SETTINGS],
+    }
+
+
+def make_space(combo_sizes=(1, 2)) -> ComboSpace:
+    """make_param_tables로 만든 콤보 공간."""
+    return ComboSpace(param_tables=make_param_tables(), combo_sizes=list(combo_sizes))
+
+
+def make_dataframe(n_bars: int = 1200, seed: int = 7) -> pd.DataFrame:
+    """일봉 OHLCV + 지표 칼럼 DataFrame (open_time 오름차순)."""
+    rng = np.random.default_rng(seed)
+    close = 10000.0 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n_bars)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0.0, 0.01, n_bars)) * close
+    df = pd.DataFrame({
+        "open_time": START_MS + np.arange(n_bars, dtype=np.int64) * DAY_MS,
+        "open": open_,
+        "high": np.maximum(open_, close) + spread,
+        "low": np.minimum(open_, close) - spread,
+        "close": close,
+        "volume": rng.gamma(2.0, 50.0, n_bars),
+    })
+    c = df["close"]
+    for p in MA_PERIODS:
+        df[f"ma_{p}"] = c.rolling(p).mean()
+    diff = c.diff()
+    for p in RSI_PERIODS:
+        gain = diff.clip(lower=0).rolling(p).mean()
+        loss = (-diff.clip(upper=0)).rolling(p).mean()
+        df[f"rsi_{p}"] = 100 - 100 / (1 + gain / loss)
+    obv = (np.sign(diff.fillna(0)) * df["volume"]).cumsum()
+    for p in OBV_PERIODS:
+        df[f"obv_sma_{p}"] = obv.rolling(p).mean()
+    for p in DONCHIAN_PERIODS:
+        df[f"dcu_{p}"] = df["high"].rolling(p).max()
+        df[f"dcl_{p}"] = df["low"].rolling(p).min()
+    for lb, sd in BOLL_SETTINGS:
+        mid = c.rolling(lb).mean()
+        std = c.rolling(lb).std()
+        df[f"boll_upper_{lb}_{sd}"] = mid + sd * std
+        df[f"boll_lower_{lb}_{sd}"] = mid - sd * std
+    return df
+
+
+def make_frame(n_bars: int = 1200, seed: int = 7) -> BarFrame:
+    """make_dataframe의 BarFrame."""
+    return BarFrame.from_dataframe(make_dataframe(n_bars, seed))
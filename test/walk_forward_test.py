@@ -0,0 +1,110 @@
+# gptbitcoin/test/walk_forward_test.py
+"""
+워크포워드(backtest/run_walk_forward.py) 검사 스크립트. (합성 데이터, 네트워크/DB 불필요)
+
+검사 항목:
+  1) walk_forward_folds: OOS가 겹치지 않고 이어지며 마지막 OOS가 끝 봉에서 끝나는지,
+     rolling은 IS 길이가 고정, anchored는 IS 시작이 0인지, IS가 항상 OOS 바로 앞에서 끝나는지
+  2) 잘못된 window / 봉 부족이면 ValueError
+  3) run_walk_forward가 고른 fold별 콤보가 콤보를 하나씩 직접 평가한 결과와 같은지,
+     fold 사이 자산이 이어지는지
+
+사용 예 (프로젝트 최상위에서):
+  PYTHONPATH=. python test/walk_forward_test.py
+"""
+
+import math
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_frame import make_frame, make_space  # noqa: E402
+from backtest.run_walk_forward import backtest_score, run_walk_forward, walk_forward_folds  # noqa: E402
+from backtest.worker_pool import BacktestWorkerPool  # noqa: E402
+from strategies.signal_factory import compute_combo_signal  # noqa: E402
+
+
+def _check_folds(n_bars, n_folds, window, ratio) -> None:
+    folds = walk_forward_folds(n_bars, n_folds, window, ratio)
+    assert len(folds) == n_folds
+    oos_len = folds[0][3] - folds[0][2]
+    is_len = folds[0][1] - folds[0][0]
+    assert oos_len >= 1 and is_len >= 1
+    assert folds[-1][3] == n_bars
+    for k, (is_start, is_stop, oos_start, oos_stop) in enumerate(folds):
+        assert 0 <= is_start < is_stop == oos_start < oos_stop <= n_bars
+        assert oos_stop - oos_start == oos_len
+        if k > 0:
+            assert oos_start == folds[k - 1][3]
+        if window == "rolling":
+            assert is_stop - is_start == is_len
+        else:
+            assert is_start == 0
+
+
+def test_fold_bounds() -> None:
+    cases = 0
+    for n_bars in (10, 97, 1200, 5001):
+        for n_folds in (1, 3, 5, 8):
+            for ratio in (0.5, 1.0, 2.0, 3.7):
+                if n_bars // (ratio + n_folds) < 1:
+                    continue
+                for window in ("rolling", "anchored"):
+                    _check_folds(n_bars, n_folds, window, ratio)
+                    cases += 1
+    print(f"[walk_forward_test] fold 경계 {cases}개 경우 확인")
+
+
+def test_fold_errors() -> None:
+    for args in ((100, 4, "expanding", 2.0), (5, 8, "rolling", 2.0), (0, 1, "anchored", 1.0)):
+        try:
+            walk_forward_folds(*args)
+        except ValueError:
+            continue
+        raise AssertionError(f"ValueError가 나야 합니다: {args}")
+    print("[walk_forward_test] 잘못된 입력 ValueError 확인")
+
+
+def test_best_combo_matches_brute_force() -> None:
+    frame = make_frame()
+    space = make_space((1, 2))
+    for window in ("rolling", "anchored"):
+        folds = walk_forward_folds(len(frame), 4, window, 2.0)
+
+        # 콤보를 하나씩 직접 평가해 fold별 최고(같으면 combo_id가 작은 쪽)를 구한다
+        best = [(-math.inf, None)] * len(folds)
+        for cid, combo in space.items():
+            signals = compute_combo_signal(frame, combo)
+            for k, (is_start, is_stop, _, _) in enumerate(folds):
+                _, score = backtest_score(frame.slice(is_start, is_stop), signals[is_start:is_stop],
+                                          "1d", 100_000)
+                v = float(score["Sharpe"])
+                if not math.isnan(v) and (best[k][1] is None or v > best[k][0]):
+                    best[k] = (v, cid)
+
+        with BacktestWorkerPool(max_workers=2) as pool:
+            rows, equity_df = run_walk_forward(frame, space, "1d", start_capital=100_000, pool=pool,
+                                               n_folds=4, window=window, is_oos_ratio=2.0, metric="Sharpe")
+        fold_rows = [r for r in rows if r["fold"] != "all"]
+        assert [r["combo_id"] for r in fold_rows] == [cid for _, cid in best], window
+
+        # fold 사이 자산이 이어지고, 연결 곡선은 OOS 봉만 담는다
+        assert fold_rows[0]["oos_start_cap"] == 100_000
+        for prev, cur in zip(fold_rows, fold_rows[1:]):
+            assert np.isclose(cur["oos_start_cap"], prev["oos_end_cap"])
+        oos_ot = frame.open_time[folds[0][2]:folds[-1][3]]
+        assert np.array_equal(equity_df["open_time"].to_numpy(), oos_ot)
+        print(f"[walk_forward_test] {window}: fold별 콤보 {[cid for _, cid in best]} 일치")
+
+
+def main():
+    test_fold_bounds()
+    test_fold_errors()
+    test_best_combo_matches_brute_force()
+
+
+if __name__ == "__main__":
+    main()
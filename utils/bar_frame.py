@@ -0,0 +1,232 @@
+# gptbitcoin/utils/bar_frame.py
+"""
+백테스트 구간(hot path)용 경량 열(column) 컨테이너.
+
+prepare_ohlcv_with_warmup → 지표 계산까지는 DataFrame을 쓰고,
+그 뒤(구간 필터, IS/OOS 분할, 시그널, 엔진, 채점)는 BarFrame 하나를 공유한다.
+
+- open_time(int64)과 OHLCV(float64)는 각각 연속(contiguous) 1차원 배열.
+- 지표는 (칼럼 수, 봉 수) 모양의 float64 블록 1개 + 칼럼명→행 번호 인덱스.
+  행 단위로 연속이므로 지표 1개를 꺼내도 복사가 없다.
+- 모든 배열은 읽기 전용이며, slice / slice_time / split_at은 복사 없는 view를 돌려준다.
+- symbol, timestamp_kst처럼 숫자가 아닌 칼럼은 export용으로만 따로 보관한다.
+- DataFrame 변환(to_dataframe)은 결과 저장(export) 시점에만 한다.
+- 워커 풀(backtest/worker_pool.py)에 공유된 BarFrame은 pickle 시 배열 대신
+  (공유 스펙, 행 구간)만 보내고, 워커는 같은 파일을 읽기 전용으로 매핑한다.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# 항상 별도 배열로 들고 있는 기본 칼럼
+BAR_FIELDS = ("open_time", "open", "high", "low", "close", "volume")
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    """쓰기 불가 view를 만든다. (원본 배열의 플래그는 건드리지 않음)"""
+    view = arr.view()
+    view.flags.writeable = False
+    return view
+
+
+class BarFrame:
+    """
+    정렬된(open_time 오름차순) 봉 배열 묶음.
+
+    Attributes:
+        open_time (np.ndarray): UTC ms (int64)
+        open, high, low, close, volume (np.ndarray): float64
+        indicators (np.ndarray): (지표 칼럼 수, 봉 수) float64 블록
+        columns (List[str]): to_dataframe 칼럼 순서 (기본 + 지표 + 기타)
+    """
+
+    def __init__(
+        self,
+        bars: Dict[str, np.ndarray],
+        indicators: Optional[np.ndarray] = None,
+        indicator_index: Optional[Dict[str, int]] = None,
+        extras: Optional[Dict[str, np.ndarray]] = None,
+        columns: Optional[List[str]] = None,
+        shared: Optional[Any] = None,
+        row_offset: int = 0
+    ):
+        """
+        Args:
+            bars (Dict[str, np.ndarray]): BAR_FIELDS 배열 (길이 동일)
+            indicators (np.ndarray, optional): (k, n) float64 지표 블록
+            indicator_index (Dict[str, int], optional): 지표 칼럼명 → 블록 행 번호
+            extras (Dict[str, np.ndarray], optional): 숫자가 아닌 칼럼 (export 전용)
+            columns (List[str], optional): 칼럼 순서, None이면 기본+지표+기타 순
+            shared (optional): 공유 메모리 스펙 (attach(start, stop) 메서드 보유, worker_pool 참고)
+            row_offset (int): shared 원본 기준 시작 행 (slice 시 누적)
+
+        Raises:
+            ValueError: 기본 칼럼 누락 또는 길이 불일치
+        """
+        missing = [f for f in BAR_FIELDS if f not in bars]
+        if missing:
+            raise ValueError(f"[bar_frame] 기본 칼럼 누락: {missing}")
+
+        n = len(bars["open_time"])
+        self.open_time = _readonly(np.ascontiguousarray(bars["open_time"], dtype=np.int64))
+        for f in BAR_FIELDS[1:]:
+            arr = np.ascontiguousarray(bars[f], dtype=np.float64)
+            if len(arr) != n:
+                raise ValueError(f"[bar_frame] '{f}' 길이({len(arr)})가 open_time({n})과 다릅니다.")
+            setattr(self, f, _readonly(arr))
+
+        if indicators is None:
+            indicators = np.empty((0, n), dtype=np.float64)
+        if indicators.ndim != 2 or indicators.shape[1] != n:
+            raise ValueError(f"[bar_frame] 지표 블록 모양 {indicators.shape}이 봉 수({n})와 맞지 않습니다.")
+        self.indicators = _readonly(indicators)
+        self._index = dict(indicator_index or {})
+
+        self._extras = {k: _readonly(np.asarray(v)) for k, v in (extras or {}).items()}
+        if columns is None:
+            columns = list(BAR_FIELDS) + list(self._index) + list(self._extras)
+        self.columns = list(columns)
+        self._shared = shared
+        self._row_offset = int(row_offset)
+
+    # ------------------------------------------------------------------
+    # 생성 / 변환
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "BarFrame":
+        """
+        DataFrame(OHLCV + 지표)을 BarFrame으로 바꾼다. 이 시점에 한 번만 복사한다.
+        숫자 칼럼은 지표 블록으로, 그 외(symbol, timestamp_kst 등)는 export용 칼럼으로 보관한다.
+
+        Args:
+            df (pd.DataFrame): open_time 오름차순 정렬된 DataFrame
+
+        Returns:
+            BarFrame
+        """
+        bars = {f: df[f].to_numpy() for f in BAR_FIELDS}
+
+        ind_cols = []
+        extras = {}
+        for col in df.columns:
+            if col in BAR_FIELDS:
+                continue
+            if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+                ind_cols.append(col)
+            else:
+                extras[col] = df[col].to_numpy()
+
+        if ind_cols:
+            block = np.ascontiguousarray(df[ind_cols].to_numpy(dtype=np.float64).T)
+        else:
+            block = np.empty((0, len(df)), dtype=np.float64)
+        index = {c: i for i, c in enumerate(ind_cols)}
+        return cls(bars, block, index, extras, columns=[str(c) for c in df.columns])
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """export용 DataFrame으로 바꾼다. (칼럼 순서는 from_dataframe 원본과 같음)"""
+        data = {}
+        for col in self.columns:
+            if col in self._extras:
+                data[col] = self._extras[col]
+            else:
+                data[col] = self[col]
+        return pd.DataFrame(data, columns=self.columns)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.open_time)
+
+    @property
+    def empty(self) -> bool:
+        """봉이 하나도 없으면 True. (DataFrame.empty와 같은 의미)"""
+        return len(self) == 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in BAR_FIELDS or name in self._index
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """칼럼 배열(view)을 돌려준다. df[col] 대신 쓸 수 있다."""
+        if name in BAR_FIELDS:
+            return getattr(self, name)
+        idx = self._index.get(name)
+        if idx is None:
+            raise KeyError(f"[bar_frame] 칼럼 없음: {name}")
+        return self.indicators[idx]
+
+    def col(self, name: str) -> np.ndarray:
+        """__getitem__과 같음."""
+        return self[name]
+
+    # ------------------------------------------------------------------
+    # 구간 자르기 (복사 없음)
+    # ------------------------------------------------------------------
+    def slice(self, start: int, stop: Optional[int] = None) -> "BarFrame":
+        """
+        [start, stop) 행 구간의 view를 만든다.
+
+        Args:
+            start (int): 시작 행
+            stop (int, optional): 끝 행(미포함), None이면 끝까지
+
+        Returns:
+            BarFrame: 원본 배열을 공유하는 새 BarFrame
+        """
+        sl = slice(start, stop)
+        bars = {f: getattr(self, f)[sl] for f in BAR_FIELDS}
+        extras = {k: v[sl] for k, v in self._extras.items()}
+        row0 = self._row_offset + range(len(self))[sl].start if len(self) else self._row_offset
+        return BarFrame(bars, self.indicators[:, sl], self._index, extras, self.columns, self._shared, row0)
+
+    def slice_time(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> "BarFrame":
+        """
+        start_ms <= open_time <= end_ms 구간의 view를 만든다. (open_time 이진 탐색)
+
+        Args:
+            start_ms (int, optional): UTC ms 시작 (포함)
+            end_ms (int, optional): UTC ms 끝 (포함)
+
+        Returns:
+            BarFrame
+        """
+        lo = 0 if start_ms is None else int(np.searchsorted(self.open_time, start_ms, side="left"))
+        hi = len(self) if end_ms is None else int(np.searchsorted(self.open_time, end_ms, side="right"))
+        return self.slice(lo, max(lo, hi))
+
+    def split_at(self, boundary_ms: int) -> Tuple["BarFrame", "BarFrame"]:
+        """
+        open_time < boundary_ms / >= boundary_ms 두 구간 view로 나눈다. (IS/OOS 분할용)
+
+        Returns:
+            Tuple[BarFrame, BarFrame]: (이전 구간, 이후 구간)
+        """
+        cut = int(np.searchsorted(self.open_time, boundary_ms, side="left"))
+        return self.slice(0, cut), self.slice(cut)
+
+    @property
+    def is_shared(self) -> bool:
+        """워커 풀에 공유된(파일 매핑) BarFrame이면 True."""
+        return self._shared is not None
+
+    def __reduce__(self):
+        """공유된 BarFrame은 배열 대신 (스펙, 행 구간)만 pickle한다."""
+        if self._shared is not None:
+            return self._shared.attach, (self._row_offset, self._row_offset + len(self))
+        return object.__reduce__(self)
+
+    def __repr__(self) -> str:
+        if self.empty:
+            return "BarFrame(rows=0)"
+        return (f"BarFrame(rows={len(self)}, indicators={len(self._index)}, "
+                f"open_time={int(self.open_time[0])}~{int(self.open_time[-1])})")
+
+
+def as_bar_frame(data: Union[BarFrame, pd.DataFrame]) -> BarFrame:
+    """BarFrame이면 그대로, DataFrame이면 변환해서 돌려준다."""
+    if isinstance(data, BarFrame):
+        return data
+    return BarFrame.from_dataframe(data)
@@ -0,0 +1,415 @@
+# gptbitcoin/utils/bar_store.py
+# 컬럼형(columnar) OHLCV 봉 저장소 모듈
+#
+# (DB 파일, symbol, timeframe)마다 하나의 폴더에 필드별 연속 바이너리 파일을 둔다.
+#   {BAR_STORE_DIR}/{DB 이름}_{DB 절대경로 해시}/{symbol}_{timeframe}/
+#   open_time.i8 (int64), open.f8, high.f8, low.f8, close.f8, volume.f8 (float64)
+#   header.json  : {"version", "db_path", "symbol", "timeframe", "count", "last_open_time", ["dirty_from"]}
+# header의 db_path가 조회하는 DB와 다르면 저장소가 없는 것으로 본다. (다른 DB의 봉을 돌려주지 않음)
+# header의 count가 유효 행 수다. 데이터 파일은 줄이지(truncate) 않고 바뀐 위치부터 덮어쓴 뒤
+# 이어 붙이며, header를 마지막에 원자적으로 교체한다. (이전 header의 count를 본 쪽도
+# 파일이 짧아져 잘못 읽는 일이 없다.)
+#
+# SQLite(ohlcv 테이블)가 원본이고, 이 저장소는 sync_bar_store()로 동기화되는 사본이다.
+# db_utils.delete_ohlcv / insert_ohlcv는 (USE_BAR_STORE와 무관하게) SQLite를 바꾸기 전에
+# mark_bar_store_dirty()로 바뀌는 첫 open_time을 header의 dirty_from에 남긴다.
+# - load_bars는 dirty_from 이후가 걸친 구간을 저장소에서 읽지 않는다. (None → SQLite 조회)
+# - sync_bar_store는 dirty_from부터 다시 읽어 반영하고 dirty_from을 지운다.
+# 조회 시에는 np.memmap으로 파일을 열고 open_time을 이진탐색해 필요한 구간만 읽는다.
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.config import DB_PATH, BAR_STORE_DIR
+from utils.date_time import ms_array_to_kst_str
+
+# 저장소 포맷 버전
+BAR_STORE_VERSION = 2
+
+# 필드명 → (파일 확장자, dtype)
+BAR_FIELDS = {
+    "open_time": ("i8", np.int64),
+    "open": ("f8", np.float64),
+    "high": ("f8", np.float64),
+    "low": ("f8", np.float64),
+    "close": ("f8", np.float64),
+    "volume": ("f8", np.float64),
+}
+
+_HEADER_FILE = "header.json"
+
+
+def _real_db_path(db_path: Optional[str]) -> str:
+    """DB 경로를 저장소 키로 쓸 실제 절대경로로 바꾼다. (None이면 config.DB_PATH)"""
+    return os.path.realpath(db_path or DB_PATH)
+
+
+def db_path_of(conn: sqlite3.Connection) -> str:
+    """연결이 연 main DB 파일의 경로. (메모리 DB면 빈 문자열)"""
+    for _, name, path in conn.execute("PRAGMA database_list").fetchall():
+        if name == "main":
+            return path or ""
+    return ""
+
+
+def _store_dir(symbol: str, timeframe: str, db_path: Optional[str] = None, base_dir: Optional[str] = None) -> str:
+    """(DB, symbol, timeframe) 저장소 폴더 경로."""
+    real = _real_db_path(db_path)
+    stem = os.path.splitext(os.path.basename(real))[0]
+    digest = hashlib.blake2b(real.encode("utf-8"), digest_size=6).hexdigest()
+    return os.path.join(base_dir or BAR_STORE_DIR, f"{stem}_{digest}", f"{symbol}_{timeframe}")
+
+
+def _field_path(store_dir: str, field: str) -> str:
+    """필드별 데이터 파일 경로."""
+    ext, _ = BAR_FIELDS[field]
+    return os.path.join(store_dir, f"{field}.{ext}")
+
+
+def read_header(
+    symbol: str,
+    timeframe: str,
+    db_path: Optional[str] = None,
+    base_dir: Optional[str] = None
+) -> Optional[Dict]:
+    """
+    저장소 header를 읽는다.
+
+    Args:
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "1d"
+        db_path (str, optional): 원본 DB 경로 (None이면 config.DB_PATH)
+        base_dir (str, optional): 저장소 루트 (None이면 config.BAR_STORE_DIR)
+
+    Returns:
+        Optional[Dict]: header dict, 저장소가 없거나 버전/원본 DB가 다르면 None
+    """
+    path = os.path.join(_store_dir(symbol, timeframe, db_path, base_dir), _HEADER_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.load(f)
+    if header.get("version") != BAR_STORE_VERSION or header.get("db_path") != _real_db_path(db_path):
+        return None
+    return header
+
+
+def _write_header(store_dir: str, header: Dict) -> None:
+    """header를 임시 파일에 쓴 뒤 원자적으로 교체한다."""
+    path = os.path.join(store_dir, _HEADER_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(header, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def mark_bar_store_dirty(
+    conn: sqlite3.Connection,
+    symbol: str,
+    timeframe: str,
+    from_ot: int,
+    base_dir: Optional[str] = None
+) -> None:
+    """
+    conn의 DB에서 open_time >= from_ot 구간이 바뀔 예정임을 header(dirty_from)에 남긴다.
+    다음 sync_bar_store가 이 시점부터 다시 동기화하며, 그 전까지 load_bars는 이 구간을 읽지 않는다.
+    저장소가 없거나 이미 더 이른 dirty_from이 있으면 아무것도 하지 않는다.
+
+    Args:
+        conn (sqlite3.Connection): 바뀌는 DB의 연결
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "1d"
+        from_ot (int): 바뀌는 첫 open_time (UTC ms)
+        base_dir (str, optional): 저장소 루트
+    """
+    db_path = db_path_of(conn)
+    if not db_path:
+        return
+    header = read_header(symbol, timeframe, db_path, base_dir)
+    if header is None:
+        return
+    dirty_from = header.get("dirty_from")
+    if dirty_from is not None and dirty_from <= from_ot:
+        return
+    header["dirty_from"] = int(from_ot)
+    _write_header(_store_dir(symbol, timeframe, db_path, base_dir), header)
+
+
+def write_bars(
+    symbol: str,
+    timeframe: str,
+    arrays: Dict[str, np.ndarray],
+    db_path: Optional[str] = None,
+    base_dir: Optional[str] = None,
+    from_ot: Optional[int] = None
+) -> int:
+    """
+    봉 배열을 저장소에 반영한다.
+    - from_ot(없으면 새 첫 봉의 open_time) 이후(>=) 저장분을 버리고 그 자리부터 새 봉으로 덮어쓴다.
+      마지막 미완성 봉을 다시 받아 덮어쓰는 경우가 여기에 해당한다.
+    - 파일은 줄이지 않는다. (count 뒤에 남는 옛 데이터는 header의 count로 무시된다.)
+    - arrays는 open_time 오름차순이어야 한다.
+
+    Args:
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "1d"
+        arrays (Dict[str, np.ndarray]): BAR_FIELDS 키를 모두 포함한 배열 dict
+        db_path (str, optional): 원본 DB 경로
+        base_dir (str, optional): 저장소 루트
+        from_ot (int, optional): 버릴 첫 open_time (arrays가 비어 있어도 이후 저장분을 버린다)
+
+    Returns:
+        int: 반영 후 전체 봉 개수
+    """
+    store_dir = _store_dir(symbol, timeframe, db_path, base_dir)
+    os.makedirs(store_dir, exist_ok=True)
+
+    new_ot = np.ascontiguousarray(arrays["open_time"], dtype=np.int64)
+    header = read_header(symbol, timeframe, db_path, base_dir)
+    count = header["count"] if header else 0
+
+    if from_ot is None:
+        if len(new_ot) == 0:
+            return count
+        from_ot = int(new_ot[0])
+
+    # 잘라낼 위치: 기존 open_time 중 from_ot 이상인 첫 위치
+    keep = 0
+    if count > 0:
+        old_ot = np.memmap(_field_path(store_dir, "open_time"), dtype=np.int64, mode="r", shape=(count,))
+        keep = int(np.searchsorted(old_ot, from_ot, side="left"))
+        last_kept_ot = int(old_ot[keep - 1]) if keep > 0 else None
+        del old_ot
+
+    for field, (_, dtype) in BAR_FIELDS.items():
+        path = _field_path(store_dir, field)
+        itemsize = np.dtype(dtype).itemsize
+        mode = "r+b" if os.path.exists(path) else "w+b"
+        with open(path, mode) as f:
+            f.seek(keep * itemsize)
+            np.ascontiguousarray(arrays[field], dtype=dtype).tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+    new_count = keep + len(new_ot)
+    if len(new_ot) > 0:
+        last_ot = int(new_ot[-1])
+    else:
+        last_ot = last_kept_ot if keep > 0 else None
+    _write_header(store_dir, {
+        "version": BAR_STORE_VERSION,
+        "db_path": _real_db_path(db_path),
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "count": new_count,
+        "last_open_time": last_ot,
+    })
+    return new_count
+
+
+def clear_bar_store(
+    symbol: str,
+    timeframe: str,
+    db_path: Optional[str] = None,
+    base_dir: Optional[str] = None
+) -> None:
+    """
+    (DB, symbol, timeframe) 저장소를 비운다. header를 먼저 지워 읽는 쪽이 즉시 무효로 보게 한다.
+    """
+    store_dir = _store_dir(symbol, timeframe, db_path, base_dir)
+    header_path = os.path.join(store_dir, _HEADER_FILE)
+    if os.path.exists(header_path):
+        os.remove(header_path)
+    for field in BAR_FIELDS:
+        path = _field_path(store_dir, field)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _select_arrays(
+    conn: sqlite3.Connection,
+    symbol: str,
+    timeframe: str,
+    start_ot: int
+) -> Dict[str, np.ndarray]:
+    """SQLite ohlcv 테이블에서 open_time >= start_ot 구간을 배열 dict로 읽는다."""
+    # 순환 import 방지를 위해 지역 import
+    from utils.db_utils import OHLCV_TABLE
+
+    cur = conn.execute(f"""
+        SELECT open_time, open, high, low, close, volume
+          FROM {OHLCV_TABLE}
+         WHERE symbol=?
+           AND timeframe=?
+           AND open_time>=?
+         ORDER BY open_time ASC
+    """, (symbol, timeframe, start_ot))
+    rows = cur.fetchall()
+    if not rows:
+        return {field: np.empty(0, dtype=dtype) for field, (_, dtype) in BAR_FIELDS.items()}
+
+    # open_time(ms)은 2^53 미만이므로 float64를 거쳐도 정확히 복원된다.
+    table = np.array(rows, dtype=np.float64)
+    return {
+        "open_time": table[:, 0].astype(np.int64),
+        "open": table[:, 1],
+        "high": table[:, 2],
+        "low": table[:, 3],
+        "close": table[:, 4],
+        "volume": table[:, 5],
+    }
+
+
+def sync_bar_store(
+    conn: sqlite3.Connection,
+    symbol: str,
+    timeframe: str,
+    rebuild: bool = False,
+    base_dir: Optional[str] = None
+) -> int:
+    """
+    SQLite(원본, conn의 DB)의 (symbol, timeframe) 봉을 그 DB의 컬럼형 저장소에 동기화한다.
+    - 평소에는 min(저장소의 마지막 open_time, dirty_from)부터 다시 읽어 그 이후만 덮어쓴다.
+      (delete_ohlcv / insert_ohlcv가 남긴 dirty_from 덕분에 과거 봉을 고쳐 쓴 경우도 반영된다.)
+    - 저장소가 없거나, 그 시점 이전 구간의 행 수가 SQLite와 다르면 또는 rebuild=True면
+      전체를 다시 만든다.
+
+    Args:
+        conn (sqlite3.Connection): DB 연결
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "1d"
+        rebuild (bool): True면 무조건 전체 재생성
+        base_dir (str, optional): 저장소 루트
+
+    Returns:
+        int: 동기화 후 전체 봉 개수
+
+    Raises:
+        ValueError: conn이 메모리 DB인 경우 (저장소를 둘 DB 경로가 없음)
+    """
+    from utils.db_utils import OHLCV_TABLE
+
+    db_path = db_path_of(conn)
+    if not db_path:
+        raise ValueError("[bar_store] 메모리 DB는 컬럼형 저장소를 쓸 수 없습니다.")
+    header = None if rebuild else read_header(symbol, timeframe, db_path, base_dir)
+
+    if header is not None and header["count"] > 0:
+        resync_ot = header["last_open_time"]
+        if header.get("dirty_from") is not None:
+            resync_ot = min(resync_ot, header["dirty_from"])
+
+        store_dir = _store_dir(symbol, timeframe, db_path, base_dir)
+        old_ot = np.memmap(_field_path(store_dir, "open_time"), dtype=np.int64, mode="r",
+                           shape=(header["count"],))
+        store_prefix_count = int(np.searchsorted(old_ot, resync_ot, side="left"))
+        del old_ot
+
+        cur = conn.execute(f"""
+            SELECT COUNT(*)
+              FROM {OHLCV_TABLE}
+             WHERE symbol=?
+               AND timeframe=?
+               AND open_time<?
+        """, (symbol, timeframe, resync_ot))
+        db_prefix_count = cur.fetchone()[0]
+        if db_prefix_count == store_prefix_count:
+            arrays = _select_arrays(conn, symbol, timeframe, resync_ot)
+            return write_bars(symbol, timeframe, arrays, db_path, base_dir, from_ot=resync_ot)
+
+    clear_bar_store(symbol, timeframe, db_path, base_dir)
+    arrays = _select_arrays(conn, symbol, timeframe, 0)
+    return write_bars(symbol, timeframe, arrays, db_path, base_dir)
+
+
+def load_bars(
+    symbol: str,
+    timeframe: str,
+    start_ot: int,
+    end_ot: int,
+    db_path: Optional[str] = None,
+    base_dir: Optional[str] = None
+) -> Optional[Dict[str, np.ndarray]]:
+    """
+    저장소를 np.memmap으로 열어 [start_ot, end_ot] 구간 배열을 반환한다.
+    open_time을 이진탐색(searchsorted)해 구간 경계를 찾으므로 전체를 읽지 않는다.
+    반환 배열은 memmap 위의 view(읽기 전용)다.
+    end_ot가 dirty_from(아직 동기화되지 않은 변경 시작점) 이상이면 저장소 값을 믿을 수 없으므로
+    None을 반환한다. (호출 측은 sync_bar_store 후 다시 읽거나 SQLite에서 조회)
+
+    Args:
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "1d"
+        start_ot (int): UTC ms 시작 시점
+        end_ot (int): UTC ms 종료 시점
+        db_path (str, optional): 원본 DB 경로 (None이면 config.DB_PATH)
+        base_dir (str, optional): 저장소 루트
+
+    Returns:
+        Optional[Dict[str, np.ndarray]]: 필드별 배열 dict, 저장소가 없거나 구간이 dirty면 None
+    """
+    header = read_header(symbol, timeframe, db_path, base_dir)
+    if header is None:
+        return None
+    if header.get("dirty_from") is not None and end_ot >= header["dirty_from"]:
+        return None
+
+    count = header["count"]
+    store_dir = _store_dir(symbol, timeframe, db_path, base_dir)
+    if count == 0:
+        return {field: np.empty(0, dtype=dtype) for field, (_, dtype) in BAR_FIELDS.items()}
+
+    ot = np.memmap(_field_path(store_dir, "open_time"), dtype=np.int64, mode="r", shape=(count,))
+    lo = int(np.searchsorted(ot, start_ot, side="left"))
+    hi = int(np.searchsorted(ot, end_ot, side="right"))
+
+    result = {"open_time": ot[lo:hi]}
+    for field, (_, dtype) in BAR_FIELDS.items():
+        if field == "open_time":
+            continue
+        mm = np.memmap(_field_path(store_dir, field), dtype=dtype, mode="r", shape=(count,))
+        result[field] = mm[lo:hi]
+    return result
+
+
+def load_ohlcv_frame(
+    symbol: str,
+    timeframe: str,
+    start_ot: int,
+    end_ot: int,
+    db_path: Optional[str] = None,
+    base_dir: Optional[str] = None
+) -> Optional[pd.DataFrame]:
+    """
+    load_bars 결과를 db_utils.fetch_ohlcv와 같은 칼럼 구성의 DataFrame으로 만든다.
+    (timestamp_kst는 open_time에서 벡터화로 계산)
+
+    Returns:
+        Optional[pd.DataFrame]: [symbol, timeframe, timestamp_kst, open_time, open, high, low, close, volume],
+                                저장소가 없거나 구간이 dirty면 None
+    """
+    arrays = load_bars(symbol, timeframe, start_ot, end_ot, db_path, base_dir)
+    if arrays is None:
+        return None
+
+    n = len(arrays["open_time"])
+    df = pd.DataFrame({
+        "symbol": np.full(n, symbol, dtype=object),
+        "timeframe": np.full(n, timeframe, dtype=object),
+        "timestamp_kst": ms_array_to_kst_str(arrays["open_time"]),
+        "open_time": np.asarray(arrays["open_time"]),
+        "open": np.asarray(arrays["open"]),
+        "high": np.asarray(arrays["high"]),
+        "low": np.asarray(arrays["low"]),
+        "close": np.asarray(arrays["close"]),
+        "volume": np.asarray(arrays["volume"]),
+    })
+    return df
@@ -1,5 +1,7 @@
 import os
 import csv
+from typing import Iterable
+
 import pandas as pd
 from dateutil.relativedelta import relativedelta
 
@@ -106,6 +108,48 @@ def export_performance(
     print(f"[data_export] Excel 저장 완료: {xlsx_path}")
 
 
+def export_performance_chunks(
+        frames: Iterable[pd.DataFrame],
+        symbol: str,
+        results_dir: str,
+        base_filename: str = "final_performance"
+) -> int:
+    """
+    성과 DataFrame 청크들을 CSV 1개로 이어 쓴다. (엑셀 서식 없음)
+    결과 저장소(utils/result_sink.ResultSink.iter_frames)처럼 전체를 메모리에 올리기 어려울 때 사용하며,
+    CSV 형식(QUOTE_ALL, 인덱스 없음)은 export_performance와 같다.
+
+    Args:
+        frames (Iterable[pd.DataFrame]): 같은 칼럼 순서의 성과 DataFrame 청크
+        symbol (str): 예) "BTCUSDT"
+        results_dir (str): 결과 파일을 저장할 폴더 경로
+        base_filename (str, optional): 파일명 접두어 (확장자 제외)
+
+    Returns:
+        int: 저장한 행 수
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    csv_path = os.path.join(results_dir, f"{base_filename}_{symbol}.csv")
+    tmp_path = csv_path + ".part"
+
+    total = 0
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        for df in frames:
+            if df.empty:
+                continue
+            df.to_csv(f, index=False, header=(total == 0), quoting=csv.QUOTE_ALL)
+            total += len(df)
+
+    if total == 0:
+        os.remove(tmp_path)
+        print("[data_export] 빈 성과 데이터입니다. 저장 스킵.")
+        return 0
+
+    os.replace(tmp_path, csv_path)
+    print(f"[data_export] CSV 저장 완료: {csv_path} ({total}행)")
+    return total
+
+
 def export_ohlcv_with_indicators(
         df: pd.DataFrame,
         symbol: str,
@@ -126,3 +170,30 @@ def export_ohlcv_with_indicators(
     save_path = os.path.join(results_dir, filename)
     df.to_csv(save_path, index=False, encoding="utf-8")
     print(f"[data_export] OHLCV+지표 CSV 저장 완료: {save_path}")
+
+
+def export_equity_curve(
+        df: pd.DataFrame,
+        symbol: str,
+        timeframe: str,
+        results_dir: str,
+        base_filename: str = "walk_forward_equity"
+) -> None:
+    """
+    자산 곡선 DataFrame(예: 워크포워드 연결 OOS 곡선)을 CSV로 저장한다.
+
+    Args:
+        df (pd.DataFrame): open_time, timestamp_kst, equity 등 칼럼
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "1d"
+        results_dir (str): 결과 파일을 저장할 폴더 경로
+        base_filename (str, optional): 파일명 접두어 (확장자 제외)
+    """
+    if df.empty:
+        print("[data_export] 자산 곡선 DataFrame이 비어 있음.")
+        return
+
+    os.makedirs(results_dir, exist_ok=True)
+    save_path = os.path.join(results_dir, f"{base_filename}_{symbol}_{timeframe}.csv")
+    df.to_csv(save_path, index=False, encoding="utf-8")
+    print(f"[data_export] 자산 곡선 CSV 저장 완료: {save_path}")
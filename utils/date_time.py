@@ -5,6 +5,8 @@
 import datetime
 from datetime import timedelta
 
+import numpy as np
+import pandas as pd
 from dateutil.relativedelta import relativedelta
 
 
@@ -61,6 +63,20 @@ def ms_to_kst_str(ms_val: int) -> str:
     return dt_kst.strftime("%Y-%m-%d %H:%M:%S")
 
 
+def ms_array_to_kst_str(ms_arr: np.ndarray) -> np.ndarray:
+    """
+    UTC 밀리초 배열을 KST(UTC+9) 시각 문자열 배열로 한 번에 변환한다. (ms_to_kst_str의 벡터화 버전)
+
+    Args:
+        ms_arr (np.ndarray): UTC 기준 밀리초(에포크) 배열
+
+    Returns:
+        np.ndarray: "YYYY-MM-DD HH:MM:SS" 형식 문자열(object) 배열
+    """
+    dt_kst = pd.to_datetime(np.asarray(ms_arr, dtype=np.int64), unit="ms") + pd.Timedelta(hours=9)
+    return np.asarray(dt_kst.strftime("%Y-%m-%d %H:%M:%S"), dtype=object)
+
+
 def subtract_months(datetime_str: str, months: int) -> str:
     """
     주어진 날짜 문자열에서 원하는 개월 수만큼 빼서 반환한다.
@@ -2,21 +2,84 @@
 # DB 관련 유틸리티 모듈 (open 컬럼 포함)
 # prepare_ohlcv_with_warmup 함수를 수정하여
 # 실제 타임프레임(timeframe)에 맞춰 워밍업 델타를 계산한다.
-
+#
+# OHLCV는 단일 테이블(ohlcv, WITHOUT ROWID)에 저장한다.
+# PRIMARY KEY(symbol, timeframe, open_time)가 곧 클러스터드 인덱스이므로
+# 구간 조회는 한 번의 정렬된 range scan으로 끝난다.
+# 과거 old_data/recent_data 분리는 행 단위 sealed 플래그로 대체한다.
+#   sealed=1 : DB_BOUNDARY_DATE 이전 봉 (절대 덮어쓰지 않음)
+#   sealed=0 : 최신 구간 봉 (갱신 가능)
+#
+# 연결은 get_connection()으로 프로세스(스레드)당 한 번만 열어 재사용한다.
+# WAL 저널링을 사용하므로 업데이트(쓰기) 중에도 다른 프로세스의 조회가 막히지 않는다.
+#
+# INSERT/DELETE 시 바뀐 구간의 결측(빠진 봉) 인덱스(utils/gap_index.py, ohlcv_gaps)를 함께 갱신한다.
+# 또한 커밋 전에 그 DB의 컬럼형 저장소(utils/bar_store.py)에 바뀌는 첫 open_time(dirty_from)을 남겨,
+# 다음 sync_bar_store까지 저장소가 옛 가격을 돌려주지 않게 한다. (USE_BAR_STORE=False인
+# 프로세스가 쓰더라도 다른 프로세스가 만든 저장소가 있으면 표시한다.)
+
+import atexit
 import datetime
+import itertools
+import os
 import sqlite3
-from typing import Optional
+import threading
+from typing import Dict, Iterable, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 import pytz
 
-from config.config import DB_PATH
-from utils.date_time import timeframe_to_timedelta
+from config.config import (
+    DB_PATH,
+    USE_BAR_STORE,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_MMAP_SIZE,
+)
+from utils.bar_store import load_ohlcv_frame, mark_bar_store_dirty, sync_bar_store
+from utils.date_time import ms_array_to_kst_str, timeframe_to_timedelta
+from utils.gap_index import get_gaps, init_gap_table, rebuild_gap_index, refresh_gaps
+
+# 단일 OHLCV 테이블명
+OHLCV_TABLE = "ohlcv"
+
+# 이관 대상 구 스키마 테이블명
+LEGACY_OLD_TABLE = "old_data"
+LEGACY_RECENT_TABLE = "recent_data"
+
+# 스레드별 재사용 연결 {(pid, db_path): Connection}
+_thread_local = threading.local()
+
+# 스키마 확인(init_db)이 끝난 DB 경로 (프로세스당 1회)
+_schema_ready = set()
+_schema_lock = threading.Lock()
+
+# atexit에서 닫기 위한 전체 연결 목록
+_all_connections = []
+_all_connections_lock = threading.Lock()
+
+
+def _apply_pragmas(conn: sqlite3.Connection) -> None:
+    """
+    WAL 저널링, synchronous=NORMAL, mmap/cache 크기 등 연결 단위 pragma를 적용한다.
+
+    Args:
+        conn (sqlite3.Connection): DB 연결
+    """
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA mmap_size={int(SQLITE_MMAP_SIZE)}")
+    # 음수 값은 KiB 단위
+    conn.execute(f"PRAGMA cache_size={-int(SQLITE_CACHE_SIZE_KB)}")
+    conn.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT_MS)}")
 
 
 def connect_db(db_path: str) -> sqlite3.Connection:
     """
-    SQLite DB에 연결하고 Connection 객체를 반환한다.
+    SQLite DB에 새로 연결하고 pragma를 적용한 Connection 객체를 반환한다.
+    반복 호출되는 경로에서는 get_connection()을 사용한다.
 
     Args:
         db_path (str): SQLite DB 파일 경로
@@ -28,153 +91,404 @@ def connect_db(db_path: str) -> sqlite3.Connection:
         sqlite3.Error: 연결 실패 시
     """
     try:
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(db_path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000.0)
+        _apply_pragmas(conn)
         return conn
     except sqlite3.Error as e:
         raise sqlite3.Error(f"DB 연결 실패: {e}")
 
 
+def get_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
+    """
+    현재 스레드에서 재사용할 DB 연결을 반환한다.
+    처음 호출될 때만 연결을 열고, 해당 DB 경로의 스키마 확인(init_db)도
+    프로세스당 한 번만 수행한다. 반환된 연결은 닫지 않는다.
+
+    Args:
+        db_path (str, optional): DB 경로 (None이면 config.DB_PATH 사용)
+
+    Returns:
+        sqlite3.Connection: 재사용 연결
+
+    Raises:
+        sqlite3.Error: 연결 또는 스키마 생성 실패 시
+    """
+    if db_path is None:
+        db_path = DB_PATH
+    db_path = os.path.abspath(db_path)
+
+    conns: Dict[tuple, sqlite3.Connection] = getattr(_thread_local, "conns", None)
+    if conns is None:
+        conns = {}
+        _thread_local.conns = conns
+
+    # fork된 자식 프로세스가 부모 연결을 물려받아 쓰지 않도록 pid를 키에 포함
+    key = (os.getpid(), db_path)
+    conn = conns.get(key)
+    if conn is not None:
+        return conn
+
+    conn = connect_db(db_path)
+    with _schema_lock:
+        schema_key = (os.getpid(), db_path)
+        if schema_key not in _schema_ready:
+            init_db(conn)
+            _schema_ready.add(schema_key)
+
+    conns[key] = conn
+    with _all_connections_lock:
+        _all_connections.append(conn)
+    return conn
+
+
+def close_connections() -> None:
+    """
+    get_connection()으로 열린 모든 연결을 닫는다. (프로세스 종료 시 자동 호출)
+    """
+    with _all_connections_lock:
+        while _all_connections:
+            conn = _all_connections.pop()
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+    conns = getattr(_thread_local, "conns", None)
+    if conns:
+        conns.clear()
+
+
+atexit.register(close_connections)
+
+
 def init_db(conn: sqlite3.Connection) -> None:
     """
-    old_data, recent_data 테이블이 없으면 생성한다. (open 컬럼 포함)
+    ohlcv 테이블이 없으면 생성하고, 구 스키마(old_data/recent_data)가 남아 있으면
+    ohlcv 테이블로 이관한다. 결측 인덱스(ohlcv_gaps) 테이블이 없으면 만들고 기존 봉으로 채운다.
 
     Schema:
       symbol TEXT NOT NULL,
       timeframe TEXT NOT NULL,
-      timestamp_kst TEXT NOT NULL,
       open_time INTEGER NOT NULL,
+      timestamp_kst TEXT NOT NULL,
       open REAL NOT NULL,
       high REAL NOT NULL,
       low REAL NOT NULL,
       close REAL NOT NULL,
       volume REAL NOT NULL,
+      sealed INTEGER NOT NULL DEFAULT 0,
       PRIMARY KEY(symbol, timeframe, open_time)
+      WITHOUT ROWID
 
     Args:
         conn (sqlite3.Connection): DB 연결
 
     Raises:
-        sqlite3.Error: 테이블 생성 실패 시
+        sqlite3.Error: 테이블 생성/이관 실패 시
     """
-    create_sql = """
-    CREATE TABLE IF NOT EXISTS old_data (
+    create_sql = f"""
+    CREATE TABLE IF NOT EXISTS {OHLCV_TABLE} (
         symbol TEXT NOT NULL,
         timeframe TEXT NOT NULL,
-        timestamp_kst TEXT NOT NULL,
         open_time INTEGER NOT NULL,
-        open REAL NOT NULL,
-        high REAL NOT NULL,
-        low REAL NOT NULL,
-        close REAL NOT NULL,
-        volume REAL NOT NULL,
-        PRIMARY KEY(symbol, timeframe, open_time)
-    );
-    CREATE INDEX IF NOT EXISTS idx_old_data
-        ON old_data (symbol, timeframe, open_time);
-
-    CREATE TABLE IF NOT EXISTS recent_data (
-        symbol TEXT NOT NULL,
-        timeframe TEXT NOT NULL,
         timestamp_kst TEXT NOT NULL,
-        open_time INTEGER NOT NULL,
         open REAL NOT NULL,
         high REAL NOT NULL,
         low REAL NOT NULL,
         close REAL NOT NULL,
         volume REAL NOT NULL,
+        sealed INTEGER NOT NULL DEFAULT 0,
         PRIMARY KEY(symbol, timeframe, open_time)
-    );
-    CREATE INDEX IF NOT EXISTS idx_recent_data
-        ON recent_data (symbol, timeframe, open_time);
+    ) WITHOUT ROWID;
     """
     try:
         conn.executescript(create_sql)
     except sqlite3.Error as e:
         raise sqlite3.Error(f"테이블 생성 실패: {e}")
 
+    migrate_legacy_tables(conn)
+
+    try:
+        if init_gap_table(conn):
+            gap_count = rebuild_gap_index(conn)
+            print(f"[db_utils] 결측 인덱스 생성 완료: {gap_count}개 구간")
+    except sqlite3.Error as e:
+        raise sqlite3.Error(f"결측 인덱스 생성 실패: {e}")
+
+
+def migrate_legacy_tables(conn: sqlite3.Connection) -> int:
+    """
+    구 스키마(old_data, recent_data)의 행을 ohlcv 테이블로 옮긴 뒤 구 테이블을 삭제한다.
+    old_data 행은 sealed=1, recent_data 행은 sealed=0으로 이관되어
+    "old 구간은 절대 수정하지 않는다"는 보장이 그대로 유지된다.
+    구 테이블이 없으면 아무 것도 하지 않는다.
+
+    Args:
+        conn (sqlite3.Connection): DB 연결
+
+    Returns:
+        int: 이관된 행 수
+
+    Raises:
+        sqlite3.Error: 이관 실패 시 (롤백됨)
+    """
+    cur = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name IN (?, ?)",
+        (LEGACY_OLD_TABLE, LEGACY_RECENT_TABLE)
+    )
+    legacy_tables = {row[0] for row in cur.fetchall()}
+    if not legacy_tables:
+        return 0
+
+    migrated = 0
+    try:
+        conn.execute("BEGIN")
+        # old_data를 먼저 옮겨 sealed=1 행이 우선하도록 한다.
+        for table_name, sealed in ((LEGACY_OLD_TABLE, 1), (LEGACY_RECENT_TABLE, 0)):
+            if table_name not in legacy_tables:
+                continue
+            cur = conn.execute(f"""
+                INSERT OR IGNORE INTO {OHLCV_TABLE}
+                (symbol, timeframe, open_time, timestamp_kst,
+                 open, high, low, close, volume, sealed)
+                SELECT symbol, timeframe, open_time, timestamp_kst,
+                       open, high, low, close, volume, {sealed}
+                  FROM {table_name}
+            """)
+            migrated += cur.rowcount
+            conn.execute(f"DROP TABLE {table_name}")
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        raise sqlite3.Error(f"구 테이블 이관 실패: {e}")
+
+    print(f"[db_utils] old_data/recent_data -> {OHLCV_TABLE} 이관 완료: {migrated}건")
+    return migrated
+
 
 def delete_ohlcv(
     conn: sqlite3.Connection,
-    table_name: str,
     symbol: str,
     timeframe: str,
     start_ot: int,
-    end_ot: int
+    end_ot: int,
+    include_sealed: bool = False
 ) -> None:
     """
-    특정 테이블에서 (symbol, timeframe)에 대해
+    ohlcv 테이블에서 (symbol, timeframe)에 대해
     open_time이 [start_ot, end_ot] 범위인 행을 삭제한다.
+    include_sealed=False면 sealed=0 행만 삭제한다.
 
     Args:
         conn (sqlite3.Connection): DB 연결
-        table_name (str): "old_data" 또는 "recent_data"
         symbol (str): 예) "BTCUSDT"
         timeframe (str): 예) "1d"
         start_ot (int): UTC ms 시작 시점
         end_ot (int): UTC ms 종료 시점
+        include_sealed (bool): True면 sealed 행까지 삭제 (full 재수집 전용)
 
     Raises:
         sqlite3.Error: DELETE 실패 시
     """
     sql = f"""
-        DELETE FROM {table_name}
+        DELETE FROM {OHLCV_TABLE}
          WHERE symbol=?
            AND timeframe=?
            AND open_time>=?
            AND open_time<=?
     """
+    if not include_sealed:
+        sql += "   AND sealed=0"
+    mark_bar_store_dirty(conn, symbol, timeframe, start_ot)
     try:
         cur = conn.cursor()
         cur.execute(sql, (symbol, timeframe, start_ot, end_ot))
         conn.commit()
     except sqlite3.Error as e:
         conn.rollback()
-        raise sqlite3.Error(f"{table_name} DELETE 실패: {e}")
+        raise sqlite3.Error(f"{OHLCV_TABLE} DELETE 실패: {e}")
+    if cur.rowcount:
+        refresh_gaps(conn, symbol, timeframe, start_ot, end_ot)
+
+
+def iter_ohlcv_rows(
+    symbol: str,
+    timeframe: str,
+    open_time: np.ndarray,
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    sealed_before_ot: int
+) -> Iterator[tuple]:
+    """
+    OHLCV 배열들을 insert_ohlcv용 튜플로 하나씩 내보내는 이터레이터를 만든다.
+    KST 문자열, sealed 플래그, 파이썬 스칼라 변환은 모두 배열 단위로 미리 계산한다.
+
+    Args:
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "1d"
+        open_time (np.ndarray): UTC ms (int64)
+        open_, high, low, close, volume (np.ndarray): 가격/거래량 (float64)
+        sealed_before_ot (int): 이 시점(UTC ms) 이전 봉은 sealed=1
+
+    Returns:
+        Iterator[tuple]: (symbol, timeframe, timestamp_kst, open_time, open, high, low, close, volume, sealed)
+    """
+    ot_arr = np.asarray(open_time, dtype=np.int64)
+    kst_list = ms_array_to_kst_str(ot_arr).tolist()
+    sealed_list = (ot_arr < sealed_before_ot).astype(np.int64).tolist()
+    return zip(
+        itertools.repeat(symbol),
+        itertools.repeat(timeframe),
+        kst_list,
+        ot_arr.tolist(),
+        np.asarray(open_, dtype=np.float64).tolist(),
+        np.asarray(high, dtype=np.float64).tolist(),
+        np.asarray(low, dtype=np.float64).tolist(),
+        np.asarray(close, dtype=np.float64).tolist(),
+        np.asarray(volume, dtype=np.float64).tolist(),
+        sealed_list,
+    )
 
 
 def insert_ohlcv(
     conn: sqlite3.Connection,
-    table_name: str,
-    data_rows: list
+    data_rows: Iterable[tuple]
 ) -> None:
     """
-    (symbol, timeframe, timestamp_kst, open_time, open, high, low, close, volume)
-    순서로 된 튜플 리스트를 INSERT OR REPLACE 방식으로 삽입한다.
+    (symbol, timeframe, timestamp_kst, open_time, open, high, low, close, volume, sealed)
+    순서로 된 튜플들을 UPSERT 방식으로 삽입한다.
+    이미 sealed=1인 행은 절대 덮어쓰지 않는다.
+    data_rows는 리스트뿐 아니라 제너레이터도 받으며, 전체를 한 트랜잭션으로 커밋한다.
+    커밋 전에 (symbol, timeframe)별 삽입 구간 시작을 이 DB의 컬럼형 저장소에 dirty로 표시하고,
+    커밋 후 삽입 구간의 결측 인덱스를 갱신한다.
 
     Args:
         conn (sqlite3.Connection): DB 연결
-        table_name (str): "old_data" 또는 "recent_data"
-        data_rows (list): 위 순서대로 된 튜플들의 리스트
+        data_rows (Iterable[tuple]): 위 순서대로 된 튜플들 (iter_ohlcv_rows 결과 등)
 
     Raises:
         sqlite3.Error: INSERT 실패 시
     """
     sql = f"""
-        INSERT OR REPLACE INTO {table_name}
-        (symbol, timeframe, timestamp_kst, open_time, open, high, low, close, volume)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        INSERT INTO {OHLCV_TABLE}
+        (symbol, timeframe, timestamp_kst, open_time, open, high, low, close, volume, sealed)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(symbol, timeframe, open_time) DO UPDATE SET
+            timestamp_kst=excluded.timestamp_kst,
+            open=excluded.open,
+            high=excluded.high,
+            low=excluded.low,
+            close=excluded.close,
+            volume=excluded.volume,
+            sealed=excluded.sealed
+         WHERE {OHLCV_TABLE}.sealed=0
     """
+    # (symbol, timeframe) -> [min open_time, max open_time]
+    ranges: Dict[tuple, list] = {}
+
+    def _track(rows: Iterable[tuple]) -> Iterator[tuple]:
+        for row in rows:
+            key = (row[0], row[1])
+            r = ranges.get(key)
+            if r is None:
+                ranges[key] = [row[3], row[3]]
+            elif row[3] < r[0]:
+                r[0] = row[3]
+            elif row[3] > r[1]:
+                r[1] = row[3]
+            yield row
+
     try:
         cur = conn.cursor()
-        cur.executemany(sql, data_rows)
+        cur.executemany(sql, _track(data_rows))
+        for (symbol, timeframe), (min_ot, _) in ranges.items():
+            mark_bar_store_dirty(conn, symbol, timeframe, min_ot)
         conn.commit()
     except sqlite3.Error as e:
         conn.rollback()
-        raise sqlite3.Error(f"{table_name} INSERT 실패: {e}")
+        raise sqlite3.Error(f"{OHLCV_TABLE} INSERT 실패: {e}")
 
+    for (symbol, timeframe), (min_ot, max_ot) in ranges.items():
+        refresh_gaps(conn, symbol, timeframe, min_ot, max_ot)
 
-def fetch_ohlcv_merged(
+
+def seal_ohlcv(
+    conn: sqlite3.Connection,
+    symbol: str,
+    timeframe: str,
+    before_ot: int
+) -> int:
+    """
+    open_time < before_ot 인 행을 sealed=1로 표시한다.
+    DB_BOUNDARY_DATE를 앞으로 옮길 때 사용한다.
+
+    Args:
+        conn (sqlite3.Connection): DB 연결
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "1d"
+        before_ot (int): UTC ms 경계 (이 시점 이전 봉을 봉인)
+
+    Returns:
+        int: 새로 봉인된 행 수
+
+    Raises:
+        sqlite3.Error: UPDATE 실패 시
+    """
+    sql = f"""
+        UPDATE {OHLCV_TABLE}
+           SET sealed=1
+         WHERE symbol=?
+           AND timeframe=?
+           AND open_time<?
+           AND sealed=0
+    """
+    try:
+        cur = conn.cursor()
+        cur.execute(sql, (symbol, timeframe, before_ot))
+        conn.commit()
+        return cur.rowcount
+    except sqlite3.Error as e:
+        conn.rollback()
+        raise sqlite3.Error(f"{OHLCV_TABLE} 봉인 실패: {e}")
+
+
+def get_max_open_time(
+    conn: sqlite3.Connection,
+    symbol: str,
+    timeframe: str
+) -> Optional[int]:
+    """
+    (symbol, timeframe)의 마지막 저장 봉 open_time을 반환한다.
+    PRIMARY KEY 끝에서 바로 찾으므로 테이블 크기와 무관하게 즉시 끝난다.
+
+    Args:
+        conn (sqlite3.Connection): DB 연결
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "1d"
+
+    Returns:
+        Optional[int]: UTC ms, 저장된 봉이 없으면 None
+    """
+    cur = conn.execute(
+        f"SELECT MAX(open_time) FROM {OHLCV_TABLE} WHERE symbol=? AND timeframe=?",
+        (symbol, timeframe)
+    )
+    row = cur.fetchone()
+    return row[0] if row and row[0] is not None else None
+
+
+def fetch_ohlcv(
     conn: sqlite3.Connection,
     symbol: str,
     timeframe: str,
     start_ot: int,
-    end_ot: int,
-    boundary_ot: int
+    end_ot: int
 ) -> pd.DataFrame:
     """
-    old_data + recent_data에서 주어진 구간을 조회 후 병합한다.
-    open_time < boundary_ot -> old_data, >= boundary_ot -> recent_data.
-    결과는 open_time ASC로 정렬.
+    ohlcv 테이블에서 주어진 구간을 한 번의 range scan으로 조회한다.
+    PRIMARY KEY 순서대로 읽으므로 결과는 이미 open_time ASC 정렬 상태다.
 
     Args:
         conn (sqlite3.Connection): DB 연결
@@ -182,47 +496,20 @@ def fetch_ohlcv_merged(
         timeframe (str): 예) "1d"
         start_ot (int): UTC ms 시작 시점
         end_ot (int): UTC ms 종료 시점
-        boundary_ot (int): DB_BOUNDARY_DATE(UTC ms)
 
     Returns:
         pd.DataFrame: [symbol, timeframe, timestamp_kst, open_time, open, high, low, close, volume]
     """
-    old_start = start_ot
-    old_end = min(end_ot, boundary_ot - 1)
-
-    recent_start = max(start_ot, boundary_ot)
-    recent_end = end_ot
-
-    df_old = pd.DataFrame()
-    df_recent = pd.DataFrame()
-
-    if old_start <= old_end:
-        sql_old = """
-            SELECT symbol, timeframe, timestamp_kst, open_time, open, high, low, close, volume
-              FROM old_data
-             WHERE symbol=?
-               AND timeframe=?
-               AND open_time>=?
-               AND open_time<=?
-             ORDER BY open_time ASC
-        """
-        df_old = pd.read_sql_query(sql_old, conn, params=(symbol, timeframe, old_start, old_end))
-
-    if recent_start <= recent_end:
-        sql_recent = """
-            SELECT symbol, timeframe, timestamp_kst, open_time, open, high, low, close, volume
-              FROM recent_data
-             WHERE symbol=?
-               AND timeframe=?
-               AND open_time>=?
-               AND open_time<=?
-             ORDER BY open_time ASC
-        """
-        df_recent = pd.read_sql_query(sql_recent, conn, params=(symbol, timeframe, recent_start, recent_end))
-
-    df_merged = pd.concat([df_old, df_recent], ignore_index=True)
-    df_merged.sort_values("open_time", inplace=True)
-    return df_merged
+    sql = f"""
+        SELECT symbol, timeframe, timestamp_kst, open_time, open, high, low, close, volume
+          FROM {OHLCV_TABLE}
+         WHERE symbol=?
+           AND timeframe=?
+           AND open_time>=?
+           AND open_time<=?
+         ORDER BY open_time ASC
+    """
+    return pd.read_sql_query(sql, conn, params=(symbol, timeframe, start_ot, end_ot))
 
 
 def prepare_ohlcv_with_warmup(
@@ -232,17 +519,19 @@ def prepare_ohlcv_with_warmup(
     end_utc_str: str,
     warmup_bars: int,
     exchange_open_date_utc_str: str,
-    boundary_date_utc_str: str,
     db_path: Optional[str] = None
 ) -> pd.DataFrame:
     """
-    워밍업 분량을 반영한 구간을 DB에서 old_data+recent_data로 병합 조회한다.
+    워밍업 분량을 반영한 구간을 DB(ohlcv 테이블)에서 조회한다.
 
     1) timeframe에 맞춰 warmup_bars만큼 (한 봉의 시간간격) * warmup_bars => warmup_delta 계산
     2) start_utc_str에서 warmup_delta만큼 과거로 거슬러 가되,
        거래소 오픈일(exchange_open_date_utc_str) 이전으로는 가지 않도록 보정
-    3) 그 구간부터 end_utc_str까지 old_data/recent_data를 fetch해 merge
-    4) 정렬하여 반환
+    3) 그 구간부터 end_utc_str까지 조회 (결측 인덱스에 미확인 결측 구간이 있으면 경고)
+       - USE_BAR_STORE=True면 db_path의 컬럼형 저장소(memmap)에서 이진탐색으로 구간을 잘라 읽는다.
+         (저장소가 없거나 아직 반영되지 않은 변경(dirty_from)이 구간에 걸치면 SQLite에서 먼저 동기화한다.)
+       - 그 외에는 SQLite 단일 range scan
+    4) open_time ASC 정렬 상태로 반환
 
     Args:
         symbol (str): 예) "BTCUSDT"
@@ -251,11 +540,10 @@ def prepare_ohlcv_with_warmup(
         end_utc_str (str): 백테스트 종료(UTC)
         warmup_bars (int): 필요한 워밍업 봉 수
         exchange_open_date_utc_str (str): 거래소 오픈(UTC)
-        boundary_date_utc_str (str): DB_BOUNDARY_DATE(UTC)
         db_path (str, optional): DB 경로 (None이면 config.DB_PATH 사용)
 
     Returns:
-        pd.DataFrame: 병합된 OHLCV (open_time ASC)
+        pd.DataFrame: OHLCV (open_time ASC)
 
     Raises:
         sqlite3.Error: DB 문제
@@ -280,11 +568,6 @@ def prepare_ohlcv_with_warmup(
     naive_open = datetime.datetime.strptime(exchange_open_date_utc_str, dt_format)
     exch_open_utc = utc.localize(naive_open)
 
-    # DB 경계
-    naive_boundary = datetime.datetime.strptime(boundary_date_utc_str, dt_format)
-    boundary_utc = utc.localize(naive_boundary)
-    boundary_ms = int(boundary_utc.timestamp() * 1000)
-
     # -------------------------------------------
     # 워밍업 delta: 실제 timeframe 간격 × warmup_bars
     # 예) "1d"이고 warmup_bars=200 => 200일
@@ -299,17 +582,28 @@ def prepare_ohlcv_with_warmup(
         warmup_start_dt = exch_open_utc
     warmup_start_ms = int(warmup_start_dt.timestamp() * 1000)
 
-    conn = connect_db(db_path)
-    init_db(conn)
+    conn = get_connection(db_path)
+
+    # 결측 검사: 전체 open_time을 훑지 않고 결측 인덱스만 조회
+    gaps = get_gaps(conn, symbol, timeframe, warmup_start_ms, end_ms, include_confirmed=False)
+    if gaps:
+        print(f"[db_utils] 경고: {symbol} {timeframe} 조회 구간에 빠진 봉 구간 {len(gaps)}개 "
+              f"(update_data.py repair로 복구): {gaps[:5]}")
+
+    if USE_BAR_STORE:
+        df_bars = load_ohlcv_frame(symbol, timeframe, warmup_start_ms, end_ms, db_path)
+        if df_bars is None:
+            sync_bar_store(conn, symbol, timeframe)
+            df_bars = load_ohlcv_frame(symbol, timeframe, warmup_start_ms, end_ms, db_path)
+        if df_bars is not None:
+            return df_bars
 
-    df_merged = fetch_ohlcv_merged(
+    df_merged = fetch_ohlcv(
         conn=conn,
         symbol=symbol,
         timeframe=timeframe,
         start_ot=warmup_start_ms,
-        end_ot=end_ms,
-        boundary_ot=boundary_ms
+        end_ot=end_ms
     )
-    conn.close()
 
     return df_merged
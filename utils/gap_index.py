@@ -0,0 +1,186 @@
+# gptbitcoin/utils/gap_index.py
+# 저장된 봉의 결측(빠진 봉) 구간 인덱스 모듈
+#
+# ohlcv_gaps 테이블에 (symbol, timeframe)별 빠진 봉 구간을 저장한다.
+#   gap_start : 첫 누락 open_time (UTC ms)
+#   gap_end   : 마지막 누락 open_time (UTC ms)
+#   confirmed : 1이면 거래소에도 봉이 없는 것으로 확인된 구간 (거래소 점검 등, 복구 대상 아님)
+#
+# db_utils.insert_ohlcv / delete_ohlcv가 바뀐 구간(과 양옆 이웃 봉)만 다시 검사해 인덱스를 갱신하므로,
+# 조회 시에는 전체 open_time을 훑지 않고 이 테이블만 보면 된다.
+# 검사 자체는 np.diff(open_time) != step 으로 O(n) 벡터화.
+
+import sqlite3
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from utils.date_time import timeframe_to_timedelta
+
+# 결측 구간 인덱스 테이블명
+GAP_TABLE = "ohlcv_gaps"
+
+
+def timeframe_step_ms(timeframe: str) -> int:
+    """타임프레임 간격(ms)."""
+    return int(timeframe_to_timedelta(timeframe).total_seconds() * 1000)
+
+
+def find_gaps(open_time: np.ndarray, step_ms: int) -> np.ndarray:
+    """
+    정렬된 open_time 배열에서 빠진 봉 구간을 찾는다.
+
+    Args:
+        open_time (np.ndarray): UTC ms 배열 (오름차순)
+        step_ms (int): 봉 간격(ms)
+
+    Returns:
+        np.ndarray: shape (k, 2)의 int64 배열, 각 행은 (첫 누락 open_time, 마지막 누락 open_time)
+    """
+    ot = np.asarray(open_time, dtype=np.int64)
+    if len(ot) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    idx = np.flatnonzero(np.diff(ot) > step_ms)
+    return np.column_stack((ot[idx] + step_ms, ot[idx + 1] - step_ms)).astype(np.int64)
+
+
+def init_gap_table(conn: sqlite3.Connection) -> bool:
+    """
+    ohlcv_gaps 테이블이 없으면 만든다.
+
+    Returns:
+        bool: 새로 만들었으면 True (기존 봉으로 인덱스를 채워야 함)
+    """
+    cur = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (GAP_TABLE,))
+    if cur.fetchone():
+        return False
+    conn.executescript(f"""
+    CREATE TABLE IF NOT EXISTS {GAP_TABLE} (
+        symbol TEXT NOT NULL,
+        timeframe TEXT NOT NULL,
+        gap_start INTEGER NOT NULL,
+        gap_end INTEGER NOT NULL,
+        confirmed INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY(symbol, timeframe, gap_start)
+    ) WITHOUT ROWID;
+    """)
+    return True
+
+
+def refresh_gaps(
+    conn: sqlite3.Connection,
+    symbol: str,
+    timeframe: str,
+    start_ot: int,
+    end_ot: int
+) -> int:
+    """
+    [start_ot, end_ot] 구간과 양옆 이웃 봉 사이의 결측 구간을 다시 계산해 인덱스에 반영한다.
+    같은 구간의 confirmed 표시는 유지한다.
+
+    Args:
+        conn (sqlite3.Connection): DB 연결
+        symbol (str): 예) "BTCUSDT"
+        timeframe (str): 예) "1h"
+        start_ot (int): 바뀐 구간 시작 (UTC ms)
+        end_ot (int): 바뀐 구간 끝 (UTC ms)
+
+    Returns:
+        int: 갱신 후 해당 창 안의 결측 구간 수
+    """
+    from utils.db_utils import OHLCV_TABLE
+
+    step_ms = timeframe_step_ms(timeframe)
+    lo_row = conn.execute(f"""
+        SELECT MAX(open_time) FROM {OHLCV_TABLE}
+         WHERE symbol=? AND timeframe=? AND open_time<?
+    """, (symbol, timeframe, start_ot)).fetchone()
+    hi_row = conn.execute(f"""
+        SELECT MIN(open_time) FROM {OHLCV_TABLE}
+         WHERE symbol=? AND timeframe=? AND open_time>?
+    """, (symbol, timeframe, end_ot)).fetchone()
+    lo = lo_row[0] if lo_row[0] is not None else start_ot
+    hi = hi_row[0] if hi_row[0] is not None else end_ot
+
+    cur = conn.execute(f"""
+        SELECT open_time FROM {OHLCV_TABLE}
+         WHERE symbol=? AND timeframe=? AND open_time>=? AND open_time<=?
+         ORDER BY open_time ASC
+    """, (symbol, timeframe, lo, hi))
+    ot = np.fromiter((r[0] for r in cur), dtype=np.int64)
+    gaps = find_gaps(ot, step_ms)
+
+    try:
+        confirmed = {
+            (r[0], r[1]) for r in conn.execute(f"""
+                SELECT gap_start, gap_end FROM {GAP_TABLE}
+                 WHERE symbol=? AND timeframe=? AND gap_start>=? AND gap_start<=? AND confirmed=1
+            """, (symbol, timeframe, lo, hi))
+        }
+        conn.execute(f"""
+            DELETE FROM {GAP_TABLE}
+             WHERE symbol=? AND timeframe=? AND gap_start>=? AND gap_start<=?
+        """, (symbol, timeframe, lo, hi))
+        conn.executemany(f"""
+            INSERT OR REPLACE INTO {GAP_TABLE} (symbol, timeframe, gap_start, gap_end, confirmed)
+            VALUES (?, ?, ?, ?, ?)
+        """, [
+            (symbol, timeframe, int(g0), int(g1), int((int(g0), int(g1)) in confirmed))
+            for g0, g1 in gaps
+        ])
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        raise sqlite3.Error(f"{GAP_TABLE} 갱신 실패: {e}")
+    return len(gaps)
+
+
+def rebuild_gap_index(conn: sqlite3.Connection) -> int:
+    """
+    저장된 모든 (symbol, timeframe)에 대해 결측 인덱스를 처음부터 만든다.
+
+    Returns:
+        int: 전체 결측 구간 수
+    """
+    from utils.db_utils import OHLCV_TABLE
+
+    pairs = conn.execute(f"SELECT DISTINCT symbol, timeframe FROM {OHLCV_TABLE}").fetchall()
+    total = 0
+    for symbol, timeframe in pairs:
+        total += refresh_gaps(conn, symbol, timeframe, -(2 ** 62), 2 ** 62)
+    return total
+
+
+def get_gaps(
+    conn: sqlite3.Connection,
+    symbol: str,
+    timeframe: str,
+    start_ot: Optional[int] = None,
+    end_ot: Optional[int] = None,
+    include_confirmed: bool = True
+) -> List[Tuple[int, int, int]]:
+    """
+    [start_ot, end_ot]와 겹치는 결측 구간을 인덱스에서 조회한다.
+
+    Returns:
+        List[Tuple[int, int, int]]: (gap_start, gap_end, confirmed) 목록 (gap_start 오름차순)
+    """
+    sql = f"""
+        SELECT gap_start, gap_end, confirmed FROM {GAP_TABLE}
+         WHERE symbol=? AND timeframe=? AND gap_end>=? AND gap_start<=?
+    """
+    if not include_confirmed:
+        sql += " AND confirmed=0"
+    sql += " ORDER BY gap_start ASC"
+    lo = -(2 ** 62) if start_ot is None else start_ot
+    hi = 2 ** 62 if end_ot is None else end_ot
+    return [tuple(r) for r in conn.execute(sql, (symbol, timeframe, lo, hi))]
+
+
+def mark_gap_confirmed(conn: sqlite3.Connection, symbol: str, timeframe: str, gap_start: int) -> None:
+    """거래소에도 봉이 없는 것으로 확인된 결측 구간을 표시한다. (이후 복구 대상에서 제외)"""
+    conn.execute(f"""
+        UPDATE {GAP_TABLE} SET confirmed=1
+         WHERE symbol=? AND timeframe=? AND gap_start=?
+    """, (symbol, timeframe, gap_start))
+    conn.commit()
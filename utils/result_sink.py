@@ -0,0 +1,362 @@
+# gptbitcoin/utils/result_sink.py
+"""
+백테스트 성과 행을 메모리에 모으지 않고 SQLite 파일에 바로 쌓는 결과 저장소(sink).
+
+- 워커 청크가 끝날 때마다 write_rows()로 추가하고 즉시 커밋한다.
+  스윕 중간에 프로세스가 죽어도 커밋된 청크까지는 남는다.
+- 테이블(phase)별로 칼럼은 처음 들어온 행의 키 순서대로 만들고, 새 키가 오면 ALTER TABLE로 붙인다.
+  칼럼 타입을 선언하지 않으므로 int/float/str 값이 그대로 저장된다. (REAL은 8바이트 double로 손실 없음)
+- 실행(run)마다 run_id로 구분한다. runs 테이블에 상태(running/done)를 기록한다.
+- 두 phase의 조인(IS + OOS → final)은 write_join()이 SQLite 안에서 INSERT ... SELECT로 처리한다.
+  (행을 파이썬으로 읽지 않으므로 메모리 사용량이 콤보 수와 무관)
+- 읽기는 iter_frames()로 청크 단위 DataFrame을 돌려주므로, CSV 저장도 메모리 일정하게 할 수 있다.
+  칼럼 dtype은 청크가 아니라 전체 행 기준으로 맞춘다. (예: 정수+NULL 칼럼은 모든 청크에서 float)
+"""
+
+import datetime
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+from config.config import RESULT_SINK_READ_CHUNK_ROWS
+
+# 행 순서/그룹 관리용 내부 칼럼
+_SEQ_COL = "_seq"
+_RUN_COL = "_run_id"
+_GROUP_COL = "_group"
+_INTERNAL_COLS = (_RUN_COL, _SEQ_COL, _GROUP_COL)
+
+
+def _quote(name: str) -> str:
+    """SQLite 식별자 인용."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class ResultSink:
+    """
+    append-only 결과 저장소.
+
+    사용 예:
+        sink = ResultSink(path)
+        sink.write_rows("final", rows, group="1d")
+        for df in sink.iter_frames("final"):
+            ...
+        sink.close(status="done")
+    """
+
+    def __init__(self, path: str, run_id: Optional[str] = None):
+        """
+        Args:
+            path (str): SQLite 파일 경로 (없으면 생성)
+            run_id (str, optional): 실행 ID (None이면 현재 시각 기반으로 생성)
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.run_id = run_id or datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                started_at TEXT NOT NULL,
+                finished_at TEXT,
+                status TEXT NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO runs (run_id, started_at, status) VALUES (?, ?, 'running')",
+            (self.run_id, datetime.datetime.now().isoformat(timespec="seconds"))
+        )
+        self._conn.commit()
+        # phase → 칼럼 리스트(순서 유지), 다음 seq
+        self._columns: Dict[str, List[str]] = {}
+        self._next_seq: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # 스키마
+    # ------------------------------------------------------------------
+    def _table(self, phase: str) -> str:
+        return f"perf_{phase}"
+
+    def _load_columns(self, phase: str) -> List[str]:
+        """기존 테이블 칼럼(내부 칼럼 제외)을 읽어 캐시한다. 테이블이 없으면 []."""
+        if phase not in self._columns:
+            info = self._conn.execute(f"PRAGMA table_info({_quote(self._table(phase))})").fetchall()
+            self._columns[phase] = [r[1] for r in info if r[1] not in _INTERNAL_COLS]
+            if info:
+                row = self._conn.execute(
+                    f"SELECT MAX({_SEQ_COL}) FROM {_quote(self._table(phase))} WHERE {_RUN_COL}=?",
+                    (self.run_id,)
+                ).fetchone()
+                self._next_seq[phase] = (row[0] + 1) if row[0] is not None else 0
+            else:
+                self._next_seq[phase] = 0
+        return self._columns[phase]
+
+    def _ensure_columns(self, phase: str, keys: Sequence[str]) -> List[str]:
+        """테이블을 만들거나 새 칼럼을 붙인다."""
+        cols = self._load_columns(phase)
+        table = _quote(self._table(phase))
+        if not cols and not self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (self._table(phase),)
+        ).fetchone():
+            col_defs = ", ".join(_quote(k) for k in keys)
+            self._conn.execute(
+                f"CREATE TABLE {table} ({_RUN_COL} TEXT NOT NULL, {_SEQ_COL} INTEGER NOT NULL, "
+                f"{_GROUP_COL} TEXT, {col_defs}, PRIMARY KEY({_RUN_COL}, {_SEQ_COL}))"
+            )
+            cols.extend(keys)
+            return cols
+        for k in keys:
+            if k not in cols:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {_quote(k)}")
+                cols.append(k)
+        return cols
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def write_rows(self, phase: str, rows: Sequence[Dict[str, Any]], group: Optional[str] = None) -> int:
+        """
+        행 묶음을 phase 테이블 끝에 추가하고 커밋한다.
+
+        Args:
+            phase (str): 테이블 구분 (예: "is", "oos", "final")
+            rows (Sequence[Dict[str, Any]]): 성과 행
+            group (str, optional): 묶음 키 (예: 타임프레임), 읽을 때 필터로 사용
+
+        Returns:
+            int: 추가한 행 수
+        """
+        if not rows:
+            return 0
+        with self._lock:
+            keys: List[str] = []
+            for r in rows:
+                for k in r:
+                    if k not in keys:
+                        keys.append(k)
+            try:
+                cols = self._ensure_columns(phase, keys)
+                seq0 = self._next_seq[phase]
+                names = ", ".join([_RUN_COL, _SEQ_COL, _GROUP_COL] + [_quote(c) for c in cols])
+                marks = ", ".join(["?"] * (3 + len(cols)))
+                self._conn.executemany(
+                    f"INSERT INTO {_quote(self._table(phase))} ({names}) VALUES ({marks})",
+                    [
+                        (self.run_id, seq0 + i, group, *[r.get(c) for c in cols])
+                        for i, r in enumerate(rows)
+                    ]
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                raise sqlite3.Error(f"[result_sink] {phase} 쓰기 실패: {e}")
+            self._next_seq[phase] = seq0 + len(rows)
+        return len(rows)
+
+    def write_join(
+        self,
+        phase: str,
+        left: str,
+        right: str,
+        on: Sequence[str],
+        columns: Sequence[str],
+        group: Optional[str] = None
+    ) -> int:
+        """
+        현재 run의 left/right phase 행을 on 칼럼으로 완전 외부 조인해 phase 테이블 끝에 추가한다.
+        (pandas.merge(how="outer")와 같은 결과를 SQLite 안에서 만든다. 행은 on 칼럼 오름차순)
+        - left에만 또는 right에만 있는 행도 남기고, 없는 쪽 칼럼은 NULL
+        - on이 아닌 같은 이름 칼럼이 양쪽에 있으면 left 값을 쓴다.
+        - columns 중 어느 쪽에도 없는 칼럼은 NULL로 채운다.
+
+        Args:
+            phase (str): 결과 테이블 구분 (예: "final")
+            left (str): 왼쪽 phase (예: "is")
+            right (str): 오른쪽 phase (예: "oos")
+            on (Sequence[str]): 조인 칼럼 (columns에 포함돼야 함)
+            columns (Sequence[str]): 결과 칼럼 순서
+            group (str, optional): 주면 양쪽 모두 해당 group 행만 조인하고 결과도 이 group으로 저장
+
+        Returns:
+            int: 추가한 행 수
+        """
+        missing = [k for k in on if k not in columns]
+        if missing:
+            raise ValueError(f"[result_sink] 조인 칼럼이 결과 칼럼에 없습니다: {missing}")
+
+        with self._lock:
+            lcols = self._load_columns(left)
+            rcols = self._load_columns(right)
+            if not lcols and not rcols:
+                return 0
+            lt, rt = _quote(self._table(left)), _quote(self._table(right))
+
+            def _expr(c: str, has_left: bool) -> str:
+                if has_left and c in lcols:
+                    return f"l.{_quote(c)}"
+                if c in rcols:
+                    return f"r.{_quote(c)}"
+                return "NULL"
+
+            def _filter(alias: str) -> str:
+                sql = f"{alias}.{_RUN_COL}=?"
+                return sql + (f" AND {alias}.{_GROUP_COL}=?" if group is not None else "")
+
+            match = " AND ".join(
+                [f"r.{_RUN_COL}=l.{_RUN_COL}", f"r.{_GROUP_COL} IS l.{_GROUP_COL}"] +
+                [f"r.{_quote(k)}=l.{_quote(k)}" for k in on]
+            )
+            params: List[Any] = []
+            parts = []
+            if lcols:
+                # left 전체 (+ 맞는 right 행)
+                sel = ", ".join([f"l.{_GROUP_COL} AS {_GROUP_COL}"] +
+                                [f"{_expr(c, True)} AS {_quote(c)}" for c in columns])
+                join = f" LEFT JOIN {rt} r ON {match}" if rcols else ""
+                parts.append(f"SELECT {sel} FROM {lt} l{join} WHERE {_filter('l')}")
+                params += self._where(group)[1]
+            if rcols:
+                # left에 짝이 없는 right 행
+                sel = ", ".join([f"r.{_GROUP_COL} AS {_GROUP_COL}"] +
+                                [f"{_expr(c, False)} AS {_quote(c)}" for c in columns])
+                orphan = f" AND NOT EXISTS (SELECT 1 FROM {lt} l WHERE {match})" if lcols else ""
+                parts.append(f"SELECT {sel} FROM {rt} r WHERE {_filter('r')}{orphan}")
+                params += self._where(group)[1]
+
+            try:
+                cols = self._ensure_columns(phase, list(columns))
+                # 조인 칼럼 인덱스 (없으면 right 행마다 전체 탐색)
+                for t, phase_cols in ((left, lcols), (right, rcols)):
+                    if phase_cols and all(k in phase_cols for k in on):
+                        self._conn.execute(
+                            f"CREATE INDEX IF NOT EXISTS {_quote(self._table(t) + '_join')} "
+                            f"ON {_quote(self._table(t))} ({_RUN_COL}, {_GROUP_COL}, "
+                            f"{', '.join(_quote(k) for k in on)})"
+                        )
+                seq0 = self._next_seq[phase]
+                order = ", ".join(_quote(k) for k in on)
+                names = ", ".join([_RUN_COL, _SEQ_COL, _GROUP_COL] + [_quote(c) for c in cols])
+                values = ", ".join(_quote(c) if c in columns else "NULL" for c in cols)
+                cur = self._conn.execute(
+                    f"INSERT INTO {_quote(self._table(phase))} ({names}) "
+                    f"SELECT ?, ? + ROW_NUMBER() OVER (ORDER BY {order}) - 1, {_GROUP_COL}, {values} "
+                    f"FROM ({' UNION ALL '.join(parts)}) ORDER BY {order}",
+                    [self.run_id, seq0] + params
+                )
+                added = cur.rowcount
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                raise sqlite3.Error(f"[result_sink] {left}+{right} -> {phase} 조인 실패: {e}")
+            self._next_seq[phase] = seq0 + added
+        return added
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+    def columns(self, phase: str) -> List[str]:
+        """phase 테이블 칼럼 (쓰기 순서, 내부 칼럼 제외). 테이블이 없으면 []."""
+        with self._lock:
+            return list(self._load_columns(phase))
+
+    def _where(self, group: Optional[str]):
+        """현재 run(과 group) 조건절과 인자."""
+        sql = f" WHERE {_RUN_COL}=?"
+        params: List[Any] = [self.run_id]
+        if group is not None:
+            sql += f" AND {_GROUP_COL}=?"
+            params.append(group)
+        return sql, params
+
+    def _float_columns(self, conn: sqlite3.Connection, phase: str, cols: List[str], group: Optional[str]) -> List[str]:
+        """
+        전체 행을 한 DataFrame으로 읽었을 때 float64가 되는 칼럼.
+        (값이 숫자뿐이고 실수 또는 NULL이 섞인 칼럼, 청크마다 int/float로 갈리지 않게 하기 위함)
+        """
+        where, params = self._where(group)
+        table = _quote(self._table(phase))
+        out = []
+        for c in cols:
+            types = {r[0] for r in conn.execute(
+                f"SELECT DISTINCT typeof({_quote(c)}) FROM {table}{where}", params
+            )}
+            if types <= {"integer", "real", "null"} and types & {"integer", "real"} and types & {"real", "null"}:
+                out.append(c)
+        return out
+
+    def count(self, phase: str, group: Optional[str] = None) -> int:
+        """phase(와 group)의 현재 run 행 수."""
+        with self._lock:
+            if not self._load_columns(phase):
+                return 0
+            where, params = self._where(group)
+            sql = f"SELECT COUNT(*) FROM {_quote(self._table(phase))}{where}"
+            return int(self._conn.execute(sql, params).fetchone()[0])
+
+    def iter_frames(
+        self,
+        phase: str,
+        group: Optional[str] = None,
+        chunk_rows: int = RESULT_SINK_READ_CHUNK_ROWS
+    ) -> Iterator[pd.DataFrame]:
+        """
+        현재 run의 phase 행을 쓰기 순서대로 청크 DataFrame으로 읽는다. (내부 칼럼 제외)
+
+        Args:
+            phase (str): 테이블 구분
+            group (str, optional): 주면 해당 group만
+            chunk_rows (int): 청크당 행 수
+
+        Yields:
+            pd.DataFrame
+        """
+        with self._lock:
+            cols = list(self._load_columns(phase))
+        if not cols:
+            return
+        where, params = self._where(group)
+        sql = (f"SELECT {', '.join(_quote(c) for c in cols)} FROM {_quote(self._table(phase))}"
+               f"{where} ORDER BY {_SEQ_COL} ASC")
+
+        # 읽는 동안 다른 스레드 쓰기와 섞이지 않도록 별도 연결 사용
+        conn = sqlite3.connect(self.path)
+        try:
+            float_cols = self._float_columns(conn, phase, cols, group)
+            cur = conn.execute(sql, params)
+            while True:
+                batch = cur.fetchmany(chunk_rows)
+                if not batch:
+                    break
+                df = pd.DataFrame.from_records(batch, columns=cols)
+                if float_cols:
+                    df[float_cols] = df[float_cols].astype("float64")
+                yield df
+        finally:
+            conn.close()
+
+    def read_frame(self, phase: str, group: Optional[str] = None) -> pd.DataFrame:
+        """phase 행 전체를 DataFrame으로 읽는다. (group 단위처럼 크기가 제한된 경우에만 사용)"""
+        frames = list(self.iter_frames(phase, group))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    # ------------------------------------------------------------------
+    # 종료
+    # ------------------------------------------------------------------
+    def close(self, status: str = "done") -> None:
+        """run 상태를 기록하고 연결을 닫는다."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET finished_at=?, status=? WHERE run_id=?",
+                (datetime.datetime.now().isoformat(timespec="seconds"), status, self.run_id)
+            )
+            self._conn.commit()
+            self._conn.close()